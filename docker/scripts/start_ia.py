@@ -33,7 +33,7 @@ class IAEvolutivaService:
     
     def __init__(self):
         self.memory_manager = GerenciadorMemoria()
-        self.context_recorder = RegistradorContexto()
+        self.context_recorder = RegistradorContexto(gerenciador_memoria=self.memory_manager)
         self.cognitive_level = os.getenv('NIVEL_COGNITIVO_INICIAL', 'REACTIVE')
         self.api_url = os.getenv('API_URL', 'http://autocura-api:8000')
         self.running = False
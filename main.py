@@ -19,7 +19,6 @@ from typing import Dict, Any, List, Optional, Callable
 import uvicorn
 import logging
 import json
-import psutil
 from pathlib import Path
 
 # Adiciona o diretório raiz ao path
@@ -30,6 +29,7 @@ from src.core.memoria.gerenciador_memoria import GerenciadorMemoria
 from src.core.memoria.registrador_contexto import RegistradorContexto
 from src.core.messaging.universal_bus import UniversalEventBus, Message, MessagePriority
 from src.core.serialization.adaptive_serializer import AdaptiveSerializer
+from src.core.monitoring.system_sampler import SystemMetricsSampler
 
 # Importação do cache inteligente
 try:
@@ -202,10 +202,17 @@ class SystemState:
     def __init__(self):
         # Core Components
         self.memory_manager = GerenciadorMemoria()
-        self.context_recorder = RegistradorContexto()
+        # Mesmo arquivo de memória: o registrador usa o gerenciador (e o journal) acima
+        self.context_recorder = RegistradorContexto(gerenciador_memoria=self.memory_manager)
         self.event_bus = UniversalEventBus()
         self.serializer = AdaptiveSerializer()
         
+        # Métricas de sistema coletadas em background (fora do event loop)
+        self.metrics_sampler = SystemMetricsSampler(
+            interval=float(os.getenv("METRICS_SAMPLE_INTERVAL", "5")),
+            history_size=int(os.getenv("METRICS_HISTORY_SIZE", "720"))
+        )
+        
         # Services
         self.monitoring_service = ColetorMetricas() if MONITORING_AVAILABLE else None
         self.ia_service = ClienteIA() if IA_AVAILABLE else None
@@ -363,6 +370,9 @@ async def startup_event():
         # Inicia o event bus
         await system.event_bus.start()
         
+        # Inicia amostragem de métricas do sistema
+        system.metrics_sampler.start()
+        
         # Registra handlers
         await system.event_bus.subscribe("metrics", handle_metrics_event)
         await system.event_bus.subscribe("diagnostics", handle_diagnostics_event)
@@ -395,6 +405,7 @@ async def startup_event():
 async def shutdown_event():
     """Finaliza o sistema"""
     try:
+        system.metrics_sampler.stop(timeout=2)
         await system.event_bus.stop()
         system.context_recorder.registrar_evento(
             "sistema_finalizado",
@@ -620,25 +631,10 @@ async def health_check():
 
 @app.get("/api/metrics")
 async def get_metrics():
-    """Obtém métricas atuais do sistema"""
+    """Obtém métricas atuais do sistema (último snapshot do amostrador)"""
     try:
         # Métricas básicas do sistema
-        current_metrics = {
-            "timestamp": datetime.now().isoformat(),
-            "system": {
-                "cpu_percent": psutil.cpu_percent(interval=1),
-                "memory": {
-                    "percent": psutil.virtual_memory().percent,
-                    "used": psutil.virtual_memory().used,
-                    "total": psutil.virtual_memory().total
-                },
-                "disk": {
-                    "percent": psutil.disk_usage('/').percent,
-                    "used": psutil.disk_usage('/').used,
-                    "total": psutil.disk_usage('/').total
-                }
-            }
-        }
+        current_metrics = dict(system.metrics_sampler.latest())
         
         # Adiciona métricas avançadas se disponível
         if system.metrics_manager:
@@ -646,18 +642,17 @@ async def get_metrics():
             current_metrics["advanced"] = advanced_metrics
         
         # Histórico de métricas
-        history = []
-        if system.monitoring_service:
-            history = await system.monitoring_service.obter_historico(limit=100)
+        history = system.metrics_sampler.history(limit=100)
         
         return {
             "current": current_metrics,
             "history": history,
+            "sampler": system.metrics_sampler.get_status(),
             "capabilities": {
                 "basic_metrics": True,
                 "advanced_metrics": system.metrics_manager is not None,
                 "real_time": True,
-                "historical": system.monitoring_service is not None
+                "historical": True
             }
         }
     except Exception as e:
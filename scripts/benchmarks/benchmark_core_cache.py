@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Cache Core - Sistema AutoCura
+==========================================
+
+Mede o custo das operações de src/core/cache.py com o cache cheio:
+- definir() com despejo LRU a cada inserção
+- obter() com acerto, em uma thread e com várias threads leitoras
+- limpeza de expirados (_limpar_cache) com todas as entradas vencidas
+
+Uso:
+    python scripts/benchmarks/benchmark_core_cache.py --sizes 100000 1000000 --threads 4
+"""
+
+import argparse
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+# O módulo é carregado a partir de src/core (src/__init__ importa serviços opcionais)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src" / "core"))
+
+from cache import Cache  # noqa: E402
+
+
+def make_cache(size: int, ttl: float, partitions: int) -> Cache:
+    cache = Cache(config_path="/nonexistent")
+    cache.config["tipos_cache"]["bench"] = {"ttl": ttl, "max_tamanho": size, "particoes": partitions}
+    return cache
+
+
+def fill(cache: Cache, size: int) -> float:
+    start = time.perf_counter()
+    for i in range(size):
+        cache.definir("bench", f"item-{i}", i)
+    return size / (time.perf_counter() - start)
+
+
+def read_throughput(cache: Cache, size: int, operations: int, threads: int) -> float:
+    per_thread = operations // threads
+
+    def reader(offset: int):
+        for i in range(per_thread):
+            cache.obter("bench", f"item-{(offset + i * 7919) % size}")
+
+    workers = [threading.Thread(target=reader, args=(t * per_thread,)) for t in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--operations", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--partitions", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.getLogger("cache").setLevel(logging.ERROR)
+
+    print(f"{'entradas':>9} | {'enchimento/s':>12} | {'despejo/s':>10} | {'leitura/s':>10} | "
+          f"{f'leitura/s x{args.threads}':>13} | {'expirar s':>9}")
+    print("-" * 80)
+    for size in args.sizes:
+        cache = make_cache(size, ttl=3600, partitions=args.partitions)
+        fill_rate = fill(cache, size)
+
+        # Cache cheio: cada inserção despeja o item menos recente
+        start = time.perf_counter()
+        for i in range(args.operations):
+            cache.definir("bench", f"novo-{i}", i)
+        evict_rate = args.operations / (time.perf_counter() - start)
+
+        fill(cache, size)
+        single = read_throughput(cache, size, args.operations, 1)
+        multi = read_throughput(cache, size, args.operations, args.threads)
+
+        # Expiração: todas as entradas vencem antes da limpeza
+        expiring = make_cache(size, ttl=0.5, partitions=args.partitions)
+        fill(expiring, size)
+        time.sleep(0.5)
+        start = time.perf_counter()
+        expiring._limpar_cache()
+        expire_time = time.perf_counter() - start
+        assert expiring.obter_estatisticas()["tipos"]["bench"] == 0
+
+        print(f"{size:>9} | {fill_rate:>12,.0f} | {evict_rate:>10,.0f} | {single:>10,.0f} | "
+              f"{multi:>13,.0f} | {expire_time:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Universal Event Bus - Sistema AutoCura
+===================================================
+
+Mede a vazão (mensagens/segundo) do UniversalEventBus:
+- consumo nos modos "blocking" (BRPOP + drenagem em pipeline + handlers
+  concorrentes) e "polling" (RPOP por fila + sleep)
+- publicação com send() agrupado por janela, send() sem agrupamento e
+  send_many(), com envelopes JSON e msgpack
+
+Usa um Redis real quando --redis-url é informado; caso contrário,
+fakeredis como substituto local.
+
+Uso:
+    python scripts/benchmarks/benchmark_event_bus.py --messages 20000 --topics 4
+    python scripts/benchmarks/benchmark_event_bus.py --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import redis
+import redis.asyncio as aioredis
+
+# O pacote é carregado a partir de src/core (src/__init__ importa serviços opcionais)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src" / "core"))
+
+from messaging.universal_bus import Message, MessagePriority, UniversalEventBus  # noqa: E402
+
+
+def make_clients(redis_url):
+    """Clientes síncrono e assíncrono apontando para o mesmo servidor"""
+    if redis_url:
+        return redis.Redis.from_url(redis_url), aioredis.Redis.from_url(redis_url)
+    try:
+        import fakeredis
+    except ImportError:
+        sys.exit("fakeredis not installed; pass --redis-url or `pip install fakeredis`")
+    server = fakeredis.FakeServer()
+    return fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server)
+
+
+def enqueue(client, topics, messages):
+    """Pré-carrega as filas no formato usado pelo bus"""
+    priorities = list(MessagePriority)
+    pipe = client.pipeline(transaction=False)
+    for i in range(messages):
+        topic = topics[i % len(topics)]
+        priority = priorities[i % len(priorities)]
+        message = Message(topic, {"seq": i}, priority=priority)
+        pipe.lpush(f"queue:{topic}:{priority.value}", json.dumps(message.to_dict()))
+        if i % 1000 == 999:
+            pipe.execute()
+    pipe.execute()
+
+
+async def run(mode, client, topics, messages, handler_delay):
+    client.flushdb()
+    enqueue(client, topics, messages)
+
+    bus = UniversalEventBus(redis_client=client, consumer_mode=mode)
+    done = asyncio.Event()
+    received = 0
+
+    async def handler(message):
+        nonlocal received
+        if handler_delay:
+            await asyncio.sleep(handler_delay)
+        received += 1
+        if received == messages:
+            done.set()
+
+    for topic in topics:
+        await bus.subscribe(topic, handler)
+
+    start = time.perf_counter()
+    await bus.start()
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    await bus.stop()
+    return messages / elapsed
+
+
+async def run_publish(strategy, envelope, client, async_client, topics, messages):
+    client.flushdb()
+    window = 0.0 if strategy == "send (sem lote)" else 0.002
+    bus = UniversalEventBus(redis_client=client, async_redis_client=async_client,
+                            envelope=envelope, publish_batch_window=window)
+    batch = [Message(topics[i % len(topics)], {"seq": i, "value": i * 0.5}) for i in range(messages)]
+
+    start = time.perf_counter()
+    if strategy == "send_many":
+        for i in range(0, messages, bus.publish_batch_size):
+            await bus.send_many(batch[i:i + bus.publish_batch_size])
+    elif strategy == "send (sem lote)":
+        # Uma round trip por mensagem, como no envio original
+        for message in batch:
+            await bus.send(message)
+    else:
+        await asyncio.gather(*(bus.send(message) for message in batch))
+    elapsed = time.perf_counter() - start
+
+    published = sum(client.llen(f"queue:{topic}:{MessagePriority.NORMAL.value}") for topic in topics)
+    assert published == messages, f"expected {messages} queued messages, found {published}"
+    return messages / elapsed
+
+
+async def main_async(args):
+    client, async_client = make_clients(args.redis_url)
+    topics = [f"bench_{i}" for i in range(args.topics)]
+
+    print(f"mensagens={args.messages}, tópicos={args.topics}, atraso do handler={args.handler_delay * 1000:.1f} ms")
+    print(f"{'consumo':>18} | {'msgs/s':>12}")
+    print("-" * 33)
+    for mode in ("blocking", "polling"):
+        count = args.messages if mode == "blocking" else min(args.messages, args.polling_messages)
+        throughput = await run(mode, client, topics, count, args.handler_delay)
+        print(f"{mode:>18} | {throughput:>12,.0f}")
+
+    print()
+    print(f"{'publicação':>18} | {'envelope':>8} | {'msgs/s':>12}")
+    print("-" * 44)
+    for strategy in ("send (sem lote)", "send (janela)", "send_many"):
+        for envelope in ("json", "msgpack"):
+            throughput = await run_publish(strategy, envelope, client, async_client, topics, args.messages)
+            print(f"{strategy:>18} | {envelope:>8} | {throughput:>12,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--polling-messages", type=int, default=2000,
+                        help="Limite para o modo polling (lento por construção)")
+    parser.add_argument("--topics", type=int, default=4)
+    parser.add_argument("--handler-delay", type=float, default=0.0,
+                        help="Segundos de espera simulada em cada handler")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
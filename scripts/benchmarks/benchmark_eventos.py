@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Armazenamento de Eventos - Sistema AutoCura
+========================================================
+
+Compara as buscas do ArmazenamentoEventos (índices + partições por
+tipo/tempo) com a varredura linear usada antes por
+GerenciadorEventos.buscar_eventos, e mede a expiração por TTL.
+
+Uso:
+    python scripts/benchmarks/benchmark_eventos.py --events 1000000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Os módulos são carregados a partir de src (src/__init__ importa serviços opcionais)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from eventos.armazenamento_eventos import ArmazenamentoEventos, GeradorIds  # noqa: E402
+from eventos.gerenciador_eventos import Evento  # noqa: E402
+
+TIPOS = ["sistema", "aplicacao", "seguranca", "monitoramento"]
+STATUS = ["pendente", "processado", "erro"]
+
+
+def gerar_eventos(total: int, dias: int, seed: int):
+    rng = random.Random(seed)
+    gerador = GeradorIds()
+    inicio = datetime.now() - timedelta(days=dias)
+    passo = dias * 86400 / total
+    origens = [f"servico_{i}" for i in range(20)]
+    tags = [f"tag_{i}" for i in range(50)]
+
+    for i in range(total):
+        tipo = rng.choice(TIPOS)
+        yield Evento(
+            id=gerador.proximo(tipo),
+            tipo=tipo,
+            dados={"seq": i},
+            timestamp=inicio + timedelta(seconds=i * passo),
+            origem=rng.choice(origens),
+            prioridade=0,
+            tags=rng.sample(tags, 2),
+            status=rng.choices(STATUS, weights=[1, 8, 1])[0]
+        )
+
+
+def varredura_linear(eventos, tipo=None, status=None, origem=None, tags=None, inicio=None, fim=None):
+    """Algoritmo anterior de buscar_eventos"""
+    resultado = []
+    for evento in eventos.values():
+        if tipo and evento.tipo != tipo:
+            continue
+        if status and evento.status != status:
+            continue
+        if origem and evento.origem != origem:
+            continue
+        if tags and not all(tag in evento.tags for tag in tags):
+            continue
+        if inicio and evento.timestamp < inicio:
+            continue
+        if fim and evento.timestamp > fim:
+            continue
+        resultado.append(evento)
+    return resultado
+
+
+def medir(funcao, repeticoes: int):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000, len(resultado)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    armazenamento = ArmazenamentoEventos()
+    inicio = time.perf_counter()
+    for evento in gerar_eventos(args.events, args.days, args.seed):
+        armazenamento.adicionar(evento)
+    print(f"inserção: {args.events / (time.perf_counter() - inicio):,.0f} eventos/s "
+          f"({len(armazenamento._particoes)} partições)")
+
+    agora = datetime.now()
+    consultas = {
+        "tipo + última hora": dict(tipo="seguranca", inicio=agora - timedelta(hours=1)),
+        "tipo + último dia": dict(tipo="sistema", inicio=agora - timedelta(days=1)),
+        "status=erro + origem": dict(status="erro", origem="servico_3"),
+        "tag + período de 6h": dict(tags=["tag_7"], inicio=agora - timedelta(days=3),
+                                   fim=agora - timedelta(days=3) + timedelta(hours=6)),
+        "duas tags": dict(tags=["tag_1", "tag_2"]),
+    }
+
+    print(f"\n{'consulta':>22} | {'resultados':>10} | {'índice ms':>10} | {'varredura ms':>12} | {'ganho':>7}")
+    print("-" * 74)
+    for nome, filtros in consultas.items():
+        indice_ms, encontrados = medir(lambda: armazenamento.buscar(**filtros), args.repeat)
+        varredura_ms, esperados = medir(lambda: varredura_linear(armazenamento.por_id, **filtros), 1)
+        assert encontrados == esperados, f"{nome}: {encontrados} != {esperados}"
+        print(f"{nome:>22} | {encontrados:>10,} | {indice_ms:>10.2f} | {varredura_ms:>12.1f} | "
+              f"{varredura_ms / max(indice_ms, 1e-6):>6.0f}x")
+
+    # Expiração: TTL de metade do período para todos os tipos
+    limite = agora - timedelta(days=args.days / 2)
+    inicio = time.perf_counter()
+    removidos = sum(armazenamento.expirar(tipo, limite) for tipo in TIPOS)
+    print(f"\nexpiração: {removidos:,} eventos em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
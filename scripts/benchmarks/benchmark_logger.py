@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Logger Core - Sistema AutoCura
+===========================================
+
+Mede chamadas de log por segundo a partir de N corrotinas concorrentes,
+com escrita síncrona (handlers chamados por quem registra) e com a fila
+de escrita em thread dedicada (configuracoes.assincrono). Cada chamada
+mistura debug desabilitado, info habilitado e registrar_metricas.
+
+Uso:
+    python scripts/benchmarks/benchmark_logger.py --coroutines 32 --calls 5000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# O pacote é carregado a partir de src (src/__init__ importa serviços opcionais)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from core.logger import Logger  # noqa: E402
+
+
+def criar_logger(diretorio: str, assincrono: bool, tamanho_fila: int) -> Logger:
+    config = Logger.__new__(Logger)._criar_config_padrao()
+    for handler in ("arquivo", "estruturado"):
+        config["handlers"][handler]["caminho"] = diretorio
+    config["handlers"]["console"]["nivel"] = "CRITICAL"
+    config["loggers"]["sistema"]["handlers"] = ["arquivo", "estruturado"]
+    config["loggers"]["diagnostico"]["handlers"] = ["arquivo", "estruturado"]
+    config["configuracoes"]["assincrono"].update(ativo=assincrono, tamanho_fila=tamanho_fila)
+
+    caminho_config = Path(diretorio) / "logger.json"
+    caminho_config.write_text(json.dumps(config))
+    return Logger(config_path=str(caminho_config))
+
+
+async def produtor(logger: Logger, id_corrotina: int, chamadas: int, latencias: list):
+    sistema = logging.getLogger("sistema")
+    for i in range(chamadas):
+        inicio = time.perf_counter()
+        if i % 4 == 0:
+            logger.registrar_metricas(f"servico_{id_corrotina}", {"cpu": i % 100, "memoria": i})
+        elif i % 4 == 1:
+            sistema.info("requisição %d da corrotina %d", i, id_corrotina)
+        else:
+            sistema.debug("detalhe %d da corrotina %d", i, id_corrotina)  # nível desabilitado
+        latencias.append(time.perf_counter() - inicio)
+        if i % 64 == 0:
+            await asyncio.sleep(0)
+
+
+async def executar(logger: Logger, corrotinas: int, chamadas: int):
+    latencias: list = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(produtor(logger, c, chamadas, latencias) for c in range(corrotinas)))
+    duracao = time.perf_counter() - inicio
+
+    inicio_escrita = time.perf_counter()
+    logger.descarregar(timeout=None)
+    return duracao, time.perf_counter() - inicio_escrita, latencias
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--coroutines", type=int, default=32)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    total = args.coroutines * args.calls
+    print(f"{'modo':>10} | {'chamadas/s':>11} | {'p50 µs':>7} | {'p99 µs':>7} | {'dreno s':>7} | {'descartados':>11}")
+    print("-" * 70)
+    for assincrono in (False, True):
+        with tempfile.TemporaryDirectory() as diretorio:
+            logger = criar_logger(diretorio, assincrono, args.queue_size)
+            duracao, dreno, latencias = asyncio.run(executar(logger, args.coroutines, args.calls))
+            estatisticas = logger.obter_estatisticas()
+            logger.fechar()
+
+            quantis = statistics.quantiles(latencias, n=100)
+            print(f"{'fila' if assincrono else 'síncrono':>10} | {total / duracao:>11,.0f} | "
+                  f"{quantis[49] * 1e6:>7.1f} | {quantis[98] * 1e6:>7.1f} | {dreno:>7.2f} | "
+                  f"{estatisticas.get('descartados', 0):>11,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark da Consulta de Logs - Sistema AutoCura
+================================================
+
+Grava logs com o HandlerJSONIndexado (com rotação) e compara
+consultar_logs, que usa o índice esparso, com a varredura completa
+dos arquivos JSON.
+
+Uso:
+    python scripts/benchmarks/benchmark_logs.py --records 500000
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# O pacote é carregado a partir de src (src/__init__ importa serviços opcionais)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from core.log_estruturado import HandlerJSONIndexado, arquivos_rotacionados, consultar_logs  # noqa: E402
+
+LOGGERS = ["sistema", "metricas", "diagnostico", "cache", "raro"]
+NIVEIS = [logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR]
+
+
+def gravar(caminho: str, total: int, segundos: float, backup_count: int, seed: int) -> datetime:
+    """Grava `total` registros espalhados por `segundos` de tempo simulado"""
+    rng = random.Random(seed)
+    handler = HandlerJSONIndexado(caminho, intervalo_indice=10, maxBytes=50 * 1024 * 1024,
+                                  backupCount=backup_count)
+    inicio = time.time() - segundos
+    passo = segundos / total
+    for i in range(total):
+        # Logger "raro" aparece em ~0,1% dos registros
+        nome = "raro" if rng.random() < 0.001 else rng.choice(LOGGERS[:-1])
+        nivel = rng.choices(NIVEIS, weights=[60, 30, 8, 2])[0]
+        registro = logging.LogRecord(nome, nivel, __file__, 0, "evento %d", (i,), None)
+        registro.created = inicio + i * passo
+        handler.handle(registro)
+    handler.close()
+    return datetime.fromtimestamp(inicio)
+
+
+def varredura(caminho: str, backup_count: int, logger=None, nivel=None, inicio=None, fim=None):
+    """Leitura integral de todos os arquivos, sem índice"""
+    resultado = []
+    for arquivo in arquivos_rotacionados(caminho, backup_count):
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            for linha in f:
+                log = json.loads(linha)
+                if logger and log["logger"] != logger:
+                    continue
+                if nivel and log["nivel"] != nivel:
+                    continue
+                if inicio and log["ts"] < inicio.timestamp():
+                    continue
+                if fim and log["ts"] > fim.timestamp():
+                    continue
+                resultado.append(log)
+    return resultado
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return (time.perf_counter() - inicio) * 1000, len(resultado)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=500000)
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--backup-count", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = str(Path(diretorio) / "autocura.jsonl")
+        segundos = args.hours * 3600
+
+        inicio = time.perf_counter()
+        t0 = gravar(caminho, args.records, segundos, args.backup_count, args.seed)
+        print(f"gravação: {args.records / (time.perf_counter() - inicio):,.0f} registros/s")
+
+        t1 = t0 + timedelta(seconds=segundos)
+        consultas = {
+            "último minuto": dict(inicio=t1 - timedelta(minutes=1)),
+            "logger raro": dict(logger="raro"),
+            "ERROR na última hora": dict(nivel="ERROR", inicio=t1 - timedelta(hours=1)),
+            "cache, 10 min no meio": dict(logger="cache", inicio=t0 + timedelta(hours=args.hours / 2),
+                                          fim=t0 + timedelta(hours=args.hours / 2, minutes=10)),
+        }
+
+        print(f"\n{'consulta':>22} | {'resultados':>10} | {'índice ms':>10} | {'varredura ms':>12} | {'ganho':>7}")
+        print("-" * 74)
+        for nome, filtros in consultas.items():
+            indice_ms, encontrados = medir(lambda: list(consultar_logs(caminho, args.backup_count, **filtros)))
+            varredura_ms, esperados = medir(lambda: varredura(caminho, args.backup_count, **filtros))
+            assert encontrados == esperados, f"{nome}: {encontrados} != {esperados}"
+            print(f"{nome:>22} | {encontrados:>10,} | {indice_ms:>10.2f} | {varredura_ms:>12.1f} | "
+                  f"{varredura_ms / max(indice_ms, 1e-6):>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
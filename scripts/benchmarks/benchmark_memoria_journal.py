@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark da Memória Compartilhada - Sistema AutoCura
+=====================================================
+
+Mede eventos/segundo de GerenciadorMemoria.registrar_acao em função do
+tamanho do histórico, comparando o journal append-only com a
+reescrita completa do arquivo a cada evento (modo legado).
+
+Uso:
+    python scripts/benchmarks/benchmark_memoria_journal.py --sizes 0 1000 10000 50000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# O pacote é carregado a partir de src/core (src/__init__ importa serviços opcionais)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src" / "core"))
+
+from memoria.gerenciador_memoria import GerenciadorMemoria  # noqa: E402
+
+
+def seed(path: Path, history: int) -> None:
+    """Cria arquivo de memória com `history` interações"""
+    memoria = GerenciadorMemoria(str(path), usar_journal=False)._criar_memoria_inicial()
+    memoria["fase_beta_iniciada"] = {"timestamp": datetime.now().isoformat()}
+    memoria["historico_interacoes"] = [
+        {"timestamp": datetime.now().isoformat(), "acao": "seed", "detalhes": f"interação {i}"}
+        for i in range(history)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(memoria, f, indent=2, ensure_ascii=False)
+
+
+def run(history: int, events: int, journal: bool) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "memoria.json"
+        seed(path, history)
+
+        gerenciador = GerenciadorMemoria(str(path), usar_journal=journal)
+        start = time.perf_counter()
+        for i in range(events):
+            gerenciador.registrar_acao("evento", f"evento de benchmark {i}")
+        gerenciador.sincronizar()
+        elapsed = time.perf_counter() - start
+        gerenciador.fechar()
+
+        # Confere a reconstrução (snapshot + cauda do journal)
+        reaberto = GerenciadorMemoria(str(path), usar_journal=journal)
+        assert len(reaberto.obter_historico()) == history + events
+        reaberto.fechar()
+
+    return events / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1000, 10000, 50000])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--legacy-events", type=int, default=200,
+                        help="Eventos no modo legado (reescrita completa, lento por construção)")
+    args = parser.parse_args()
+
+    print(f"{'histórico':>10} | {'journal ev/s':>13} | {'legado ev/s':>12}")
+    print("-" * 42)
+    for size in args.sizes:
+        journal = run(size, args.events, journal=True)
+        legacy = run(size, args.legacy_events, journal=False)
+        print(f"{size:>10} | {journal:>13,.0f} | {legacy:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
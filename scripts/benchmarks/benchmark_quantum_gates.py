@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Portas Quânticas - Sistema AutoCura
+================================================
+
+Mede portas/segundo do SimulatorCircuit em função do número de qubits,
+com e sem fusão de portas de um qubit.
+
+Uso:
+    python scripts/benchmarks/benchmark_quantum_gates.py --min-qubits 4 --max-qubits 24
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# O pacote quantum é importado a partir da raiz do módulo (src.*)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src" / "modulos" / "quantum"))
+
+from src.circuits.simulator_circuit import SimulatorCircuit  # noqa: E402
+
+
+def build_layers(circuit: SimulatorCircuit, num_qubits: int, depth: int) -> int:
+    """Aplica camadas de ansatz (RY, RZ, H + cadeia de CNOT) e retorna nº de portas"""
+    rng = np.random.default_rng(42)
+    gates = 0
+
+    for _ in range(depth):
+        for q in range(num_qubits):
+            circuit.add_rotation_y(q, float(rng.uniform(0, 2 * np.pi)))
+            circuit.add_rotation_z(q, float(rng.uniform(0, 2 * np.pi)))
+            circuit.add_hadamard(q)
+            gates += 3
+        for q in range(num_qubits - 1):
+            circuit.add_cnot(q, q + 1)
+            gates += 1
+
+    return gates
+
+
+def run(num_qubits: int, depth: int, fuse: bool) -> float:
+    """Retorna portas/segundo para um tamanho de circuito"""
+    circuit = SimulatorCircuit(fuse_single_qubit_gates=fuse)
+    circuit.create_circuit(num_qubits)
+
+    start = time.perf_counter()
+    gates = build_layers(circuit, num_qubits, depth)
+    circuit.get_statevector()  # Força aplicação das portas pendentes
+    elapsed = time.perf_counter() - start
+
+    return gates / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-qubits", type=int, default=4)
+    parser.add_argument("--max-qubits", type=int, default=24)
+    parser.add_argument("--step", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=4)
+    args = parser.parse_args()
+
+    run(args.min_qubits, 1, fuse=True)  # Aquecimento (imports/alocações)
+
+    print(f"{'qubits':>6} | {'gates/s (fused)':>16} | {'gates/s (unfused)':>18}")
+    print("-" * 47)
+
+    for n in range(args.min_qubits, args.max_qubits + 1, args.step):
+        fused = run(n, args.depth, fuse=True)
+        unfused = run(n, args.depth, fuse=False)
+        print(f"{n:>6} | {fused:>16,.0f} | {unfused:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
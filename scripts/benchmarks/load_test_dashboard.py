@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Teste de Carga do Dashboard - Sistema AutoCura
+==============================================
+
+Dispara requisições concorrentes contra a API em execução e reporta
+latências (p50/p95/p99/máx) e vazão por endpoint. Com as métricas
+servidas pelo amostrador em background, a latência não deve crescer
+com a concorrência por causa de coletas bloqueantes no event loop.
+
+Uso:
+    python main.py  # em outro terminal
+    python scripts/benchmarks/load_test_dashboard.py --url http://localhost:8000 \\
+        --concurrency 50 --requests 1000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+import numpy as np
+
+DEFAULT_ENDPOINTS = ["/api/dashboard/data", "/api/metrics"]
+
+
+async def run_endpoint(client: httpx.AsyncClient,
+                       path: str,
+                       total: int,
+                       concurrency: int) -> List[float]:
+    """Executa `total` requisições com no máximo `concurrency` em voo"""
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    if errors:
+        print(f"  {path}: {errors} requisições com erro")
+    return latencies
+
+
+def report(path: str, latencies: List[float], elapsed: float) -> None:
+    if not latencies:
+        print(f"{path:<24} | sem respostas válidas")
+        return
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    print(f"{path:<24} | {len(ms):>6} | {len(ms) / elapsed:>8.1f} | "
+          f"{p50:>8.1f} | {p95:>8.1f} | {p99:>8.1f} | {ms.max():>8.1f}")
+
+
+async def main_async(args) -> None:
+    endpoints = args.endpoint or DEFAULT_ENDPOINTS
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        # Aquecimento (conexões, caches, primeira amostra)
+        await run_endpoint(client, endpoints[0], args.concurrency, args.concurrency)
+
+        print(f"concorrência={args.concurrency}, requisições por endpoint={args.requests}")
+        print(f"{'endpoint':<24} | {'ok':>6} | {'req/s':>8} | {'p50 ms':>8} | "
+              f"{'p95 ms':>8} | {'p99 ms':>8} | {'máx ms':>8}")
+        print("-" * 88)
+
+        for path in endpoints:
+            start = time.perf_counter()
+            latencies = await run_endpoint(client, path, args.requests, args.concurrency)
+            report(path, latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", action="append",
+                        help="Endpoint a testar (repetível; padrão: dashboard e métricas)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
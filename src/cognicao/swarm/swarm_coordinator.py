@@ -9,6 +9,7 @@ e comportamento emergente inteligente.
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from enum import Enum
@@ -58,6 +59,121 @@ class SwarmDecision:
     timestamp: str
     execution_approved: bool = False
 
+class _ConsensusTracker:
+    """
+    Acumula as decisões de uma rodada e avalia o quorum incrementalmente
+    (O(1) por decisão, exceto o consenso emergente: O(chaves da decisão))
+    """
+    
+    # Limite superior da confiança de um agente (usado para limitar os que faltam)
+    MAX_CONFIDENCE = 1.0
+    
+    def __init__(self, consensus_type: ConsensusType, config: Dict[str, Any],
+                 agent_weights: Dict[str, float]):
+        self.consensus_type = consensus_type
+        self.config = config
+        self.total_agents = len(agent_weights)
+        self.total_weight = sum(agent_weights.values())
+        
+        self.count = 0
+        self.excluded = 0
+        self.confidence_sum = 0.0
+        self.weight_sum = 0.0
+        self.weighted_confidence_sum = 0.0
+        
+        # Melhor decisão como em _majority_vote_consensus / _weighted_consensus
+        self.best_confidence = 0.0
+        self.best_score = 0.0
+        
+        # Pesos em ordem decrescente para limitar o score dos agentes que faltam
+        self._weights_desc = sorted(((weight, agent_id) for agent_id, weight in agent_weights.items()),
+                                    reverse=True)
+        self._answered: set = set()
+        
+        # BFT: ação -> [contagem, soma de confianças]; maior grupo como no consenso final
+        self.groups: Dict[str, List[float]] = {}
+        self.largest_group: Optional[List[float]] = None
+        
+        # Emergente: chave -> valor -> soma de confiança * peso
+        self.patterns: Dict[str, Dict[Any, float]] = {}
+    
+    def add(self, decision: AgentDecision) -> None:
+        self.count += 1
+        self.confidence_sum += decision.confidence
+        self.weight_sum += decision.weight
+        self.weighted_confidence_sum += decision.confidence * decision.weight
+        self.best_confidence = max(self.best_confidence, decision.confidence)
+        self.best_score = max(self.best_score, decision.confidence * decision.weight)
+        self._answered.add(decision.agent_id)
+        
+        if self.consensus_type == ConsensusType.BYZANTINE_FAULT_TOLERANT:
+            group = self.groups.setdefault(str(decision.decision.get("action", "")), [0, 0.0])
+            group[0] += 1
+            group[1] += decision.confidence
+            if self.largest_group is None or group[0] > self.largest_group[0]:
+                self.largest_group = group
+        
+        elif self.consensus_type == ConsensusType.EMERGENT_CONSENSUS:
+            for key, value in decision.decision.items():
+                values = self.patterns.setdefault(key, {})
+                values[value] = values.get(value, 0.0) + decision.confidence * decision.weight
+    
+    def exclude(self) -> None:
+        """Registra um agente que falhou ou excedeu o prazo"""
+        self.excluded += 1
+    
+    @property
+    def remaining(self) -> int:
+        return self.total_agents - self.count - self.excluded
+    
+    def _max_remaining_weight(self) -> float:
+        """Maior peso entre os agentes que ainda não responderam (excluídos contam, por segurança)"""
+        while self._weights_desc and self._weights_desc[0][1] in self._answered:
+            self._weights_desc.pop(0)
+        return self._weights_desc[0][0] if self._weights_desc else 0.0
+    
+    def quorum_met(self) -> bool:
+        """
+        Indica se o resultado final já está garantido, quaisquer que sejam
+        as decisões dos agentes que ainda não responderam (confiança entre
+        0 e MAX_CONFIDENCE).
+        
+        BFT: o maior grupo concordante já soma (1 - fault_tolerance) de
+        todos os agentes, e a confiança média do grupo atinge
+        `min_confidence` mesmo que os restantes entrem nele com confiança 0.
+        Voto majoritário / ponderado: além da fração `quorum`, nenhuma
+        decisão restante pode superar a melhor (confiança, ou confiança x
+        peso) e a confiança média atinge `min_confidence` com os restantes
+        em 0. Como a ação escolhida é a de maior confiança, isso só ocorre
+        quando alguma decisão chega a MAX_CONFIDENCE (ponderado: confiança
+        x peso >= maior peso restante); com confianças abaixo de 1 (os
+        papéis simulados vão até 0.95) não há saída antecipada e a coleta
+        termina pelos prazos. Emergente: agentes restantes podem trazer
+        chaves novas, então não há saída antecipada.
+        """
+        if self.count < self.config["min_agents"]:
+            return False
+        min_confidence = self.config["min_confidence"]
+        remaining = self.remaining
+        
+        if self.consensus_type == ConsensusType.BYZANTINE_FAULT_TOLERANT:
+            agreeing, confidence_sum = self.largest_group
+            quorum = (1 - self.config["fault_tolerance"]) * self.total_agents
+            return agreeing >= quorum and confidence_sum / (agreeing + remaining) >= min_confidence
+        
+        if self.consensus_type == ConsensusType.MAJORITY_VOTE:
+            return (self.count > self.config["quorum"] * self.total_agents and
+                    (remaining == 0 or self.best_confidence >= self.MAX_CONFIDENCE) and
+                    self.confidence_sum / (self.count + remaining) >= min_confidence)
+        
+        if self.consensus_type == ConsensusType.WEIGHTED_CONSENSUS:
+            remaining_weight = self.total_weight - self.weight_sum
+            return (self.weight_sum > self.config["quorum"] * self.total_weight and
+                    self.best_score >= self.MAX_CONFIDENCE * self._max_remaining_weight() and
+                    self.weighted_confidence_sum / (self.weight_sum + remaining_weight) >= min_confidence)
+        
+        return False
+
 class SwarmCoordinator:
     """
     Coordenador de Swarm Intelligence para decisões coletivas
@@ -85,10 +201,12 @@ class SwarmCoordinator:
             },
             ConsensusType.MAJORITY_VOTE: {
                 "min_agents": 3,
+                "quorum": 0.5,
                 "min_confidence": 0.6
             },
             ConsensusType.WEIGHTED_CONSENSUS: {
                 "min_agents": 3,
+                "quorum": 0.5,
                 "min_confidence": 0.65
             },
             ConsensusType.EMERGENT_CONSENSUS: {
@@ -98,6 +216,18 @@ class SwarmCoordinator:
             }
         }
         
+        # Coleta de decisões: prazo da rodada, prazo por agente e saída antecipada por quorum.
+        # A saída antecipada só ocorre quando o resultado já está garantido (ver
+        # _ConsensusTracker.quorum_met): na prática no BFT; voto majoritário e ponderado
+        # só saem antes com uma decisão de confiança máxima, e o emergente nunca.
+        # Nos demais casos a latência fica limitada por agent_timeout
+        self.collection_config = {
+            "round_timeout": 30.0,
+            "agent_timeout": 10.0,
+            "early_exit": True
+        }
+        self.last_collection_stats: Dict[str, Any] = {}
+        
         logger.info(f"SwarmCoordinator inicializado com consenso: {consensus_mechanism.value}")
     
     def register_agent(self, agent_id: str, role: AgentRole, weight: float = 1.0) -> bool:
@@ -192,7 +322,15 @@ class SwarmCoordinator:
         agent_ids: List[str]
     ) -> List[AgentDecision]:
         """
-        Coleta decisões individuais de todos os agentes
+        Coleta decisões individuais dos agentes à medida que ficam prontas
+        
+        O consenso configurado é avaliado a cada decisão recebida; assim
+        que a ação e a aprovação finais estão garantidas (quorum e confiança
+        mínima, independentemente dos agentes restantes) a coleta termina e
+        os agentes restantes são cancelados. Isso é comum no BFT; nos demais
+        consensos, ver _ConsensusTracker.quorum_met. Agentes que excedem o prazo
+        individual (ou falham) são excluídos da rodada, e no prazo da
+        rodada as decisões já coletadas são mantidas.
         
         Args:
             decision_id: ID da decisão
@@ -202,34 +340,87 @@ class SwarmCoordinator:
         Returns:
             List[AgentDecision]: Lista de decisões individuais
         """
-        tasks = []
+        start = time.perf_counter()
+        agent_timeout = self.collection_config.get("agent_timeout")
+        tracker = _ConsensusTracker(
+            self.consensus_mechanism,
+            self.consensus_config[self.consensus_mechanism],
+            {agent_id: self.agents[agent_id]["weight"] for agent_id in agent_ids}
+        )
+        
+        tasks = [
+            asyncio.create_task(self._get_agent_decision_within(decision_id, agent_id, problem, agent_timeout))
+            for agent_id in agent_ids
+        ]
+        
+        valid_decisions = []
+        excluded = 0
+        early_exit = False
         
-        for agent_id in agent_ids:
-            task = asyncio.create_task(
-                self._get_agent_decision(decision_id, agent_id, problem)
-            )
-            tasks.append(task)
+        try:
+            for next_decision in asyncio.as_completed(tasks, timeout=self.collection_config["round_timeout"]):
+                decision = await next_decision
+                if decision is None:
+                    excluded += 1
+                    tracker.exclude()
+                    continue
+                
+                valid_decisions.append(decision)
+                tracker.add(decision)
+                
+                # Com todos os agentes já contabilizados a coleta termina normalmente
+                if self.collection_config["early_exit"] and tracker.remaining and tracker.quorum_met():
+                    early_exit = True
+                    break
+                
+        except asyncio.TimeoutError:
+            logger.warning(f"Timeout na coleta de decisões para {decision_id}; "
+                           f"usando {len(valid_decisions)} decisões coletadas")
+        
+        finally:
+            # Cancela agentes que ainda não responderam
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        self.last_collection_stats = {
+            "decision_id": decision_id,
+            "agents": len(agent_ids),
+            "collected": len(valid_decisions),
+            "excluded": excluded,
+            "cancelled": len(pending),
+            "early_exit": early_exit,
+            "elapsed": time.perf_counter() - start
+        }
+        
+        logger.info(f"Coletadas {len(valid_decisions)} decisões válidas de {len(agent_ids)} agentes "
+                    f"({excluded} excluídos, {len(pending)} cancelados)")
+        
+        return valid_decisions
+    
+    async def _get_agent_decision_within(
+        self,
+        decision_id: str,
+        agent_id: str,
+        problem: Dict[str, Any],
+        timeout: Optional[float]
+    ) -> Optional[AgentDecision]:
+        """
+        Obtém a decisão de um agente dentro do prazo individual
         
-        # Aguardar todas as decisões com timeout
+        Returns:
+            Optional[AgentDecision]: Decisão do agente ou None se ele falhou
+            ou excedeu o prazo
+        """
         try:
-            decisions = await asyncio.wait_for(
-                asyncio.gather(*tasks, return_exceptions=True),
-                timeout=30.0
-            )
-            
-            # Filtrar decisões válidas
-            valid_decisions = [
-                d for d in decisions 
-                if isinstance(d, AgentDecision)
-            ]
-            
-            logger.info(f"Coletadas {len(valid_decisions)} decisões válidas de {len(agent_ids)} agentes")
-            
-            return valid_decisions
-            
+            return await asyncio.wait_for(self._get_agent_decision(decision_id, agent_id, problem), timeout)
         except asyncio.TimeoutError:
-            logger.warning(f"Timeout na coleta de decisões para {decision_id}")
-            return []
+            logger.warning(f"Agente {agent_id} excedeu o prazo de {timeout}s e foi excluído da decisão {decision_id}")
+            return None
+        except Exception:
+            return None
     
     async def _get_agent_decision(
         self, 
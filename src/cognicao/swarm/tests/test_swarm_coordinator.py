@@ -0,0 +1,87 @@
+"""
+Testes para a coleta de decisões com saída antecipada do SwarmCoordinator.
+"""
+
+import asyncio
+import unittest
+
+from ..swarm_coordinator import AgentDecision, AgentRole, ConsensusType, SwarmCoordinator
+
+class SwarmRoteirizado(SwarmCoordinator):
+    """Agentes com latência, ação, confiança e peso fixos por agente."""
+
+    def __init__(self, consensus, agentes):
+        super().__init__(consensus)
+        self.roteiro = {}
+        for agent_id, (latencia, acao, confianca, peso) in agentes.items():
+            self.register_agent(agent_id, AgentRole.ORCHESTRATOR, peso)
+            self.roteiro[agent_id] = (latencia, acao, confianca)
+
+    async def _get_agent_decision(self, decision_id, agent_id, problem):
+        latencia, acao, confianca = self.roteiro[agent_id]
+        await asyncio.sleep(latencia)
+        return AgentDecision(agent_id=agent_id, role=AgentRole.ORCHESTRATOR,
+                             decision={"action": acao, "origem": agent_id},
+                             confidence=confianca, reasoning="", timestamp="",
+                             weight=self.agents[agent_id]["weight"])
+
+# consenso -> agentes (latência, ação, confiança, peso); os lentos chegam por último
+CENARIOS = {
+    ConsensusType.BYZANTINE_FAULT_TOLERANT: {
+        **{f"a{i}": (0.01 * i, "reiniciar", 0.9, 1.0) for i in range(8)},
+        "lento_1": (0.3, "escalar", 0.95, 1.0),
+        "lento_2": (0.3, "reiniciar", 0.1, 1.0),
+    },
+    ConsensusType.MAJORITY_VOTE: {
+        "certo": (0.01, "reiniciar", 1.0, 1.0),
+        **{f"a{i}": (0.01 * (i + 2), "escalar", 0.8, 1.0) for i in range(5)},
+        "lento_1": (0.3, "isolar", 1.0, 1.0),
+        "lento_2": (0.3, "isolar", 0.2, 1.0),
+    },
+    ConsensusType.WEIGHTED_CONSENSUS: {
+        "pesado": (0.01, "reiniciar", 1.0, 3.0),
+        **{f"a{i}": (0.01 * (i + 2), "escalar", 0.8, 1.0) for i in range(5)},
+        "lento_1": (0.3, "isolar", 1.0, 1.0),
+        "lento_2": (0.3, "isolar", 0.9, 2.0),
+    },
+    ConsensusType.EMERGENT_CONSENSUS: {
+        **{f"a{i}": (0.01 * i, "reiniciar", 0.9, 1.0) for i in range(6)},
+        "lento_1": (0.3, "escalar", 0.95, 4.0),
+    },
+}
+
+# Tipos em que o cenário garante o resultado antes dos agentes lentos
+SAEM_ANTES = {ConsensusType.BYZANTINE_FAULT_TOLERANT, ConsensusType.MAJORITY_VOTE,
+              ConsensusType.WEIGHTED_CONSENSUS}
+
+class TestSaidaAntecipada(unittest.IsolatedAsyncioTestCase):
+    async def coordenar(self, consensus, early_exit):
+        swarm = SwarmRoteirizado(consensus, CENARIOS[consensus])
+        swarm.collection_config.update(early_exit=early_exit, agent_timeout=None)
+        self.addCleanup(swarm.executor.shutdown, wait=False)
+        decisao = await swarm.coordinate_decision({"problema": "teste"})
+        return decisao, swarm.last_collection_stats
+
+    async def test_resultado_antecipado_igual_ao_da_coleta_completa(self):
+        for consensus in ConsensusType:
+            with self.subTest(consensus=consensus.value):
+                completa, stats_completa = await self.coordenar(consensus, early_exit=False)
+                antecipada, stats_antecipada = await self.coordenar(consensus, early_exit=True)
+
+                self.assertFalse(stats_completa["early_exit"])
+                self.assertEqual(stats_antecipada["early_exit"], consensus in SAEM_ANTES)
+                self.assertEqual(antecipada.consensus_decision["action"], completa.consensus_decision["action"])
+                self.assertEqual(antecipada.execution_approved, completa.execution_approved)
+
+    async def test_confianca_abaixo_do_maximo_nao_sai_antes_no_voto_majoritario(self):
+        """Sem decisão de confiança máxima, o voto majoritário aguarda todos os agentes."""
+        agentes = {f"a{i}": (0.01 * i, "reiniciar", 0.95, 1.0) for i in range(5)}
+        swarm = SwarmRoteirizado(ConsensusType.MAJORITY_VOTE, agentes)
+        self.addCleanup(swarm.executor.shutdown, wait=False)
+        await swarm.coordinate_decision({"problema": "teste"})
+
+        self.assertFalse(swarm.last_collection_stats["early_exit"])
+        self.assertEqual(swarm.last_collection_stats["collected"], 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,25 +1,136 @@
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime
+from collections import OrderedDict
+import heapq
 import json
 from pathlib import Path
 import threading
 import time
-import hashlib
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("cache")
 
+class _Particao:
+    """
+    Partição de um tipo de cache: LRU O(1) (OrderedDict) com heap de
+    expiração e lock próprio.
+    """
+    
+    __slots__ = ("itens", "expiracoes", "max_tamanho", "lock", "hits", "misses", "expirados", "despejados")
+    
+    def __init__(self, max_tamanho: int):
+        # identificador -> (valor, expiracao monotônica); ordem = recência de uso
+        self.itens: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        # (expiracao, identificador); entradas obsoletas são descartadas ao sair do heap
+        self.expiracoes: List[Tuple[float, str]] = []
+        self.max_tamanho = max_tamanho
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirados = 0
+        self.despejados = 0
+    
+    def obter(self, identificador: str, agora: float) -> Optional[Any]:
+        with self.lock:
+            item = self.itens.get(identificador)
+            if item is None:
+                self.misses += 1
+                return None
+            
+            if item[1] <= agora:
+                del self.itens[identificador]
+                self.expirados += 1
+                self.misses += 1
+                return None
+            
+            self.itens.move_to_end(identificador)
+            self.hits += 1
+            return item[0]
+    
+    def definir(self, identificador: str, valor: Any, expiracao: float) -> None:
+        with self.lock:
+            self.itens[identificador] = (valor, expiracao)
+            self.itens.move_to_end(identificador)
+            heapq.heappush(self.expiracoes, (expiracao, identificador))
+            
+            # LRU: despeja o menos recentemente usado
+            while len(self.itens) > self.max_tamanho:
+                self.itens.popitem(last=False)
+                self.despejados += 1
+            
+            # Redefinições deixam entradas obsoletas no heap: reconstrói se crescer demais
+            if len(self.expiracoes) > 2 * len(self.itens) + 64:
+                self.expiracoes = [(item[1], chave) for chave, item in self.itens.items()]
+                heapq.heapify(self.expiracoes)
+    
+    def remover(self, identificador: str) -> bool:
+        with self.lock:
+            return self.itens.pop(identificador, None) is not None
+    
+    def expirar(self, agora: float) -> int:
+        """Remove itens vencidos em O(k log n) para k itens expirados"""
+        removidos = 0
+        with self.lock:
+            while self.expiracoes and self.expiracoes[0][0] <= agora:
+                expiracao, identificador = heapq.heappop(self.expiracoes)
+                item = self.itens.get(identificador)
+                # Ignora entradas de valores já removidos ou redefinidos
+                if item is not None and item[1] == expiracao:
+                    del self.itens[identificador]
+                    removidos += 1
+            self.expirados += removidos
+        return removidos
+    
+    def limpar(self) -> int:
+        with self.lock:
+            total = len(self.itens)
+            self.itens.clear()
+            self.expiracoes.clear()
+            return total
+
+
+class _CacheTipo:
+    """Sub-cache de um tipo, dividido em partições (locks listrados)"""
+    
+    # Itens mínimos por partição para que o despejo por partição se aproxime do LRU do tipo
+    MIN_ITENS_PARTICAO = 64
+    
+    def __init__(self, ttl: float, max_tamanho: int, num_particoes: int):
+        # Tipos pequenos ficam em uma única partição (LRU exato, limite respeitado);
+        # nos maiores, cada partição recebe uma fração do limite do tipo
+        num_particoes = max(1, min(num_particoes, max_tamanho // self.MIN_ITENS_PARTICAO))
+        base, resto = divmod(max_tamanho, num_particoes)
+        self.ttl = ttl
+        self.max_tamanho = max_tamanho
+        self.particoes = [_Particao(base + (1 if i < resto else 0)) for i in range(num_particoes)]
+    
+    def particao(self, identificador: str) -> _Particao:
+        return self.particoes[hash(identificador) % len(self.particoes)]
+    
+    def __len__(self) -> int:
+        return sum(len(particao.itens) for particao in self.particoes)
+
+
 class Cache:
-    """Sistema de cache"""
+    """
+    Sistema de cache.
+    
+    Cada tipo tem seu próprio sub-cache com TTL e `max_tamanho`; dentro
+    de tipos grandes, os itens são distribuídos em partições com lock
+    próprio, de modo que leitores de chaves diferentes não se serializam. Leitura,
+    escrita e despejo LRU são O(1); a expiração usa um heap por partição.
+    """
     
     def __init__(self, config_path: str = "config/cache.json"):
         self.config = self._carregar_config(config_path)
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        self.tipos: Dict[str, _CacheTipo] = {}
+        # Protege apenas a criação de sub-caches
         self.lock = threading.Lock()
         self.thread_limpeza = None
         self.running = False
+        self._parada = threading.Event()
         logger.info("Sistema de Cache inicializado")
     
     def _carregar_config(self, config_path: str) -> Dict[str, Any]:
@@ -43,7 +154,8 @@ class Cache:
                 "max_tamanho": 1000,
                 "ttl_padrao": 3600,
                 "limpeza_intervalo": 300,
-                "politica_limpeza": "lru"
+                "politica_limpeza": "lru",
+                "particoes": 8
             },
             "tipos_cache": {
                 "metricas": {
@@ -69,6 +181,7 @@ class Cache:
                 return
             
             self.running = True
+            self._parada.clear()
             self.thread_limpeza = threading.Thread(target=self._executar_limpeza)
             self.thread_limpeza.start()
             
@@ -86,6 +199,7 @@ class Cache:
                 return
             
             self.running = False
+            self._parada.set()
             if self.thread_limpeza:
                 self.thread_limpeza.join()
             
@@ -99,7 +213,7 @@ class Cache:
         try:
             while self.running:
                 self._limpar_cache()
-                time.sleep(self.config["configuracoes"]["limpeza_intervalo"])
+                self._parada.wait(self.config["configuracoes"]["limpeza_intervalo"])
             
         except Exception as e:
             logger.error(f"Erro no processo de limpeza: {str(e)}")
@@ -108,80 +222,53 @@ class Cache:
     def _limpar_cache(self) -> None:
         """Limpa itens expirados do cache"""
         try:
-            with self.lock:
-                agora = datetime.now()
-                chaves_remover = []
-                
-                # Identifica itens expirados
-                for chave, valor in self.cache.items():
-                    if valor["expiracao"] < agora:
-                        chaves_remover.append(chave)
-                
-                # Remove itens expirados
-                for chave in chaves_remover:
-                    del self.cache[chave]
-                
-                # Verifica limite de tamanho
-                if len(self.cache) > self.config["configuracoes"]["max_tamanho"]:
-                    self._aplicar_politica_limpeza()
-                
-                logger.info(f"Cache limpo: {len(chaves_remover)} itens removidos")
+            agora = time.monotonic()
+            removidos = 0
+            
+            # Uma partição por vez: leitores das demais não esperam
+            for cache_tipo in list(self.tipos.values()):
+                for particao in cache_tipo.particoes:
+                    removidos += particao.expirar(agora)
+            
+            logger.info(f"Cache limpo: {removidos} itens removidos")
             
         except Exception as e:
             logger.error(f"Erro ao limpar cache: {str(e)}")
     
-    def _aplicar_politica_limpeza(self) -> None:
-        """Aplica política de limpeza quando cache excede limite"""
-        try:
-            if self.config["configuracoes"]["politica_limpeza"] == "lru":
-                # Remove itens menos recentemente usados
-                itens_ordenados = sorted(
-                    self.cache.items(),
-                    key=lambda x: x[1]["ultimo_acesso"]
+    def _obter_tipo(self, tipo: str) -> _CacheTipo:
+        """Retorna (criando na primeira vez) o sub-cache do tipo"""
+        cache_tipo = self.tipos.get(tipo)
+        if cache_tipo is not None:
+            return cache_tipo
+        
+        configuracoes = self.config["configuracoes"]
+        config_tipo = self.config["tipos_cache"].get(
+            tipo,
+            {
+                "ttl": configuracoes["ttl_padrao"],
+                "max_tamanho": configuracoes["max_tamanho"]
+            }
+        )
+        
+        with self.lock:
+            cache_tipo = self.tipos.get(tipo)
+            if cache_tipo is None:
+                cache_tipo = _CacheTipo(
+                    config_tipo["ttl"],
+                    config_tipo["max_tamanho"],
+                    config_tipo.get("particoes", configuracoes.get("particoes", 8))
                 )
-                
-                # Remove 20% dos itens mais antigos
-                num_remover = int(len(self.cache) * 0.2)
-                for chave, _ in itens_ordenados[:num_remover]:
-                    del self.cache[chave]
-                
-                logger.info(f"Política LRU aplicada: {num_remover} itens removidos")
-            
-        except Exception as e:
-            logger.error(f"Erro ao aplicar política de limpeza: {str(e)}")
-    
-    def _gerar_chave(self, tipo: str, identificador: str) -> str:
-        """Gera chave única para o cache"""
-        try:
-            # Combina tipo e identificador
-            chave_base = f"{tipo}:{identificador}"
-            
-            # Gera hash MD5
-            return hashlib.md5(chave_base.encode()).hexdigest()
-            
-        except Exception as e:
-            logger.error(f"Erro ao gerar chave: {str(e)}")
-            raise
+                self.tipos[tipo] = cache_tipo
+        return cache_tipo
     
     def obter(self, tipo: str, identificador: str) -> Optional[Any]:
         """Obtém item do cache"""
         try:
-            chave = self._gerar_chave(tipo, identificador)
+            cache_tipo = self.tipos.get(tipo)
+            if cache_tipo is None:
+                return None
             
-            with self.lock:
-                if chave in self.cache:
-                    item = self.cache[chave]
-                    
-                    # Verifica expiração
-                    if item["expiracao"] > datetime.now():
-                        # Atualiza último acesso
-                        item["ultimo_acesso"] = datetime.now()
-                        return item["valor"]
-                    else:
-                        # Remove item expirado
-                        del self.cache[chave]
-            
-            return None
+            return cache_tipo.particao(identificador).obter(identificador, time.monotonic())
             
         except Exception as e:
             logger.error(f"Erro ao obter item do cache: {str(e)}")
@@ -190,33 +277,12 @@ class Cache:
     def definir(self, tipo: str, identificador: str, valor: Any) -> None:
         """Define item no cache"""
         try:
-            chave = self._gerar_chave(tipo, identificador)
-            
-            # Obtém configuração do tipo
-            config_tipo = self.config["tipos_cache"].get(
-                tipo,
-                {
-                    "ttl": self.config["configuracoes"]["ttl_padrao"],
-                    "max_tamanho": self.config["configuracoes"]["max_tamanho"]
-                }
+            cache_tipo = self._obter_tipo(tipo)
+            cache_tipo.particao(identificador).definir(
+                identificador, valor, time.monotonic() + cache_tipo.ttl
             )
             
-            with self.lock:
-                # Verifica limite do tipo
-                if len(self.cache) >= config_tipo["max_tamanho"]:
-                    self._aplicar_politica_limpeza()
-                
-                # Define item
-                self.cache[chave] = {
-                    "valor": valor,
-                    "tipo": tipo,
-                    "identificador": identificador,
-                    "criacao": datetime.now(),
-                    "ultimo_acesso": datetime.now(),
-                    "expiracao": datetime.now() + timedelta(seconds=config_tipo["ttl"])
-                }
-            
-            logger.info(f"Item definido no cache: {tipo}:{identificador}")
+            logger.debug(f"Item definido no cache: {tipo}:{identificador}")
             
         except Exception as e:
             logger.error(f"Erro ao definir item no cache: {str(e)}")
@@ -224,12 +290,9 @@ class Cache:
     def remover(self, tipo: str, identificador: str) -> None:
         """Remove item do cache"""
         try:
-            chave = self._gerar_chave(tipo, identificador)
-            
-            with self.lock:
-                if chave in self.cache:
-                    del self.cache[chave]
-                    logger.info(f"Item removido do cache: {tipo}:{identificador}")
+            cache_tipo = self.tipos.get(tipo)
+            if cache_tipo is not None and cache_tipo.particao(identificador).remover(identificador):
+                logger.debug(f"Item removido do cache: {tipo}:{identificador}")
             
         except Exception as e:
             logger.error(f"Erro ao remover item do cache: {str(e)}")
@@ -237,19 +300,10 @@ class Cache:
     def limpar_tipo(self, tipo: str) -> None:
         """Limpa todos os itens de um tipo específico"""
         try:
-            with self.lock:
-                chaves_remover = []
-                
-                # Identifica itens do tipo
-                for chave, valor in self.cache.items():
-                    if valor["tipo"] == tipo:
-                        chaves_remover.append(chave)
-                
-                # Remove itens
-                for chave in chaves_remover:
-                    del self.cache[chave]
-                
-                logger.info(f"Cache limpo para tipo '{tipo}': {len(chaves_remover)} itens removidos")
+            cache_tipo = self.tipos.get(tipo)
+            removidos = sum(particao.limpar() for particao in cache_tipo.particoes) if cache_tipo else 0
+            
+            logger.info(f"Cache limpo para tipo '{tipo}': {removidos} itens removidos")
             
         except Exception as e:
             logger.error(f"Erro ao limpar tipo do cache: {str(e)}")
@@ -257,16 +311,28 @@ class Cache:
     def obter_estatisticas(self) -> Dict[str, Any]:
         """Retorna estatísticas do cache"""
         try:
-            with self.lock:
-                return {
-                    "total_itens": len(self.cache),
-                    "tipos": {
-                        tipo: len([v for v in self.cache.values() if v["tipo"] == tipo])
-                        for tipo in self.config["tipos_cache"].keys()
-                    },
-                    "timestamp": datetime.now().isoformat()
+            tipos = {tipo: 0 for tipo in self.config["tipos_cache"].keys()}
+            detalhes = {}
+            for tipo, cache_tipo in list(self.tipos.items()):
+                particoes = cache_tipo.particoes
+                tipos[tipo] = len(cache_tipo)
+                detalhes[tipo] = {
+                    "itens": tipos[tipo],
+                    "max_tamanho": cache_tipo.max_tamanho,
+                    "particoes": len(particoes),
+                    "hits": sum(p.hits for p in particoes),
+                    "misses": sum(p.misses for p in particoes),
+                    "expirados": sum(p.expirados for p in particoes),
+                    "despejados": sum(p.despejados for p in particoes)
                 }
             
+            return {
+                "total_itens": sum(tipos.values()),
+                "tipos": tipos,
+                "detalhes": detalhes,
+                "timestamp": datetime.now().isoformat()
+            }
+            
         except Exception as e:
             logger.error(f"Erro ao obter estatísticas do cache: {str(e)}")
-            return {} 
\ No newline at end of file
+            return {}
@@ -5,114 +5,297 @@ Otimiza o uso de cache baseado em padrões de acesso
 
 import json
 import redis
+import redis.asyncio as aioredis
 import hashlib
-from typing import Any, Dict, Callable, Optional, Tuple
+from typing import Any, Dict, Callable, Iterable, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from collections import defaultdict
 import numpy as np
-from sklearn.linear_model import LinearRegression
 import pickle
 import asyncio
 import logging
+import math
 import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+
+from .local_cache import WTinyLFUCache
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-class AccessPredictor:
-    """Preditor de padrões de acesso usando ML"""
+# Chaves por comando nos lotes de UNLINK
+UNLINK_BATCH_SIZE = 500
+
+
+class CacheSerializer(ABC):
+    """Codec dos valores armazenados no Redis"""
+    
+    name = "base"
+    
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """Serializa um valor"""
+        pass
+    
+    @abstractmethod
+    def loads(self, raw: bytes) -> Any:
+        """Deserializa um valor"""
+        pass
+
+
+class JSONCacheSerializer(CacheSerializer):
+    """JSON (formato original do cache)"""
+    
+    name = "json"
+    
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data).encode('utf-8')
+    
+    def loads(self, raw: bytes) -> Any:
+        return json.loads(raw)
+
+
+class MsgpackCacheSerializer(CacheSerializer):
+    """MessagePack: binário, menor e mais rápido que JSON"""
+    
+    name = "msgpack"
+    
+    def __init__(self):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is not installed")
+    
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+    
+    def loads(self, raw: bytes) -> Any:
+        return msgpack.unpackb(raw, raw=False)
+
+
+SERIALIZERS = {
+    "json": JSONCacheSerializer,
+    "msgpack": MsgpackCacheSerializer
+}
+
+
+class KeyAccessStats:
+    """
+    Estado incremental de acessos de uma chave (memória constante).
+    
+    Mantém média/variância dos intervalos entre acessos (Welford), uma
+    média exponencial do intervalo recente e o último acesso.
+    """
+    
+    __slots__ = ("count", "last_access", "mean_interval", "m2_interval", "ewma_interval")
     
     def __init__(self):
-        self.access_history = defaultdict(list)
-        self.model = LinearRegression()
-        self.is_trained = False
+        self.count = 0
+        self.last_access = 0.0
+        self.mean_interval = 0.0
+        self.m2_interval = 0.0
+        self.ewma_interval = 0.0
+    
+    def update(self, timestamp: float, alpha: float) -> Optional[float]:
+        """Registra um acesso em O(1); retorna o intervalo desde o anterior"""
+        self.count += 1
+        if self.count == 1:
+            self.last_access = timestamp
+            return None
+        
+        interval = max(0.0, timestamp - self.last_access)
+        self.last_access = max(self.last_access, timestamp)
+        
+        # Welford sobre os intervalos (count - 1 intervalos)
+        n = self.count - 1
+        delta = interval - self.mean_interval
+        self.mean_interval += delta / n
+        self.m2_interval += delta * (interval - self.mean_interval)
+        
+        if n == 1:
+            self.ewma_interval = interval
+        else:
+            self.ewma_interval += alpha * (interval - self.ewma_interval)
+        return interval
+    
+    @property
+    def std_interval(self) -> float:
+        n = self.count - 1
+        return (self.m2_interval / n) ** 0.5 if n > 1 else 0.0
+    
+    def features(self) -> list:
+        """Features estatísticas (a recência é tratada à parte, em predict)"""
+        mean = self.mean_interval
+        std = self.std_interval
+        return [
+            1.0,                                                  # Viés
+            math.log1p(self.count),                               # Número total de acessos
+            math.log1p(mean),                                     # Intervalo médio entre acessos
+            math.log1p(std),                                      # Desvio padrão dos intervalos
+            math.log1p(mean) - math.log1p(self.ewma_interval),    # Tendência (>0 = acelerando)
+            1.0 / (1.0 + std / mean) if mean > 0 else 1.0         # Periodicidade (regularidade)
+        ]
+
+
+class AccessPredictor:
+    """
+    Preditor de padrões de acesso com aprendizado online.
+    
+    Cada acesso atualiza as estatísticas da chave em O(1) e dá um passo
+    de SGD (regressão logística) com o rótulo "o acesso chegou dentro
+    do horizonte", usando as features que a chave tinha antes dele.
+    Chaves que esfriam recebem o rótulo 0 na varredura periódica (`sweep`).
+    """
+    
+    NUM_FEATURES = 6
+    
+    def __init__(self,
+                 horizon: float = 300.0,
+                 learning_rate: float = 0.05,
+                 ewma_alpha: float = 0.2,
+                 min_updates: int = 100):
+        """
+        Args:
+            horizon: Janela (s) em que um novo acesso conta como positivo
+            learning_rate: Passo do SGD
+            ewma_alpha: Peso do intervalo mais recente na média exponencial
+            min_updates: Passos de treino antes de usar o modelo
+        """
+        self.key_stats: Dict[str, KeyAccessStats] = {}
+        self.weights = [0.0] * self.NUM_FEATURES
+        self.horizon = horizon
+        self.learning_rate = learning_rate
+        self.ewma_alpha = ewma_alpha
+        self.min_updates = min_updates
+        self.updates = 0
         self.min_history = 10
+        # Chaves cujo último acesso já gerou o exemplo negativo na varredura
+        self._labeled: set = set()
+        
+    @property
+    def is_trained(self) -> bool:
+        return self.updates >= self.min_updates
         
     def record_access(self, key: str, timestamp: float):
-        """Registra um acesso ao cache"""
-        self.access_history[key].append(timestamp)
+        """Registra um acesso ao cache e atualiza o modelo incrementalmente"""
+        stats = self.key_stats.get(key)
+        if stats is None:
+            stats = self.key_stats[key] = KeyAccessStats()
+        
+        # Exemplo de treino: features antes deste acesso -> chegou dentro do horizonte?
+        features = stats.features() if stats.count >= self.min_history else None
+        interval = stats.update(timestamp, self.ewma_alpha)
+        
+        if key in self._labeled:
+            # A varredura já registrou este intervalo como negativo
+            self._labeled.discard(key)
+        elif features is not None and interval is not None:
+            self._sgd_step(features, 1.0 if interval < self.horizon else 0.0)
+    
+    def sweep(self, now: float, max_idle: float = 3600.0) -> int:
+        """
+        Rotula as chaves que esfriaram e descarta as inativas.
         
-        # Limita histórico para economizar memória
-        if len(self.access_history[key]) > 1000:
-            self.access_history[key] = self.access_history[key][-500:]
+        Uma chave sem novo acesso dentro do horizonte gera, uma única vez,
+        o exemplo negativo com as features do último acesso; sem isso só
+        chaves reacessadas produziriam exemplos e o modelo tenderia a 1.
+        
+        Args:
+            now: Instante atual (timestamp)
+            max_idle: Chaves sem acesso há mais que isso (s) são esquecidas
+            
+        Returns:
+            int: Número de chaves esquecidas
+        """
+        idle_keys = []
+        for key, stats in self.key_stats.items():
+            idle = now - stats.last_access
+            if idle >= self.horizon and stats.count >= self.min_history and key not in self._labeled:
+                self._sgd_step(stats.features(), 0.0)
+                self._labeled.add(key)
+            if idle > max_idle:
+                idle_keys.append(key)
+        
+        for key in idle_keys:
+            self.forget(key)
+        return len(idle_keys)
+    
+    def _sgd_step(self, features: list, target: float):
+        """Um passo de SGD da regressão logística (escalar: evita overhead do NumPy)"""
+        z = sum(w * x for w, x in zip(self.weights, features))
+        error = 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z)))) - target
+        # Passo decrescente para estabilizar com o volume de acessos
+        step = self.learning_rate / (1.0 + self.updates * 1e-4) * error
+        self.weights = [w - step * x for w, x in zip(self.weights, features)]
+        self.updates += 1
+    
+    @staticmethod
+    def _sigmoid(z):
+        return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+    
+    def _recency_factor(self, elapsed, mean_interval):
+        """Decai a probabilidade quando a chave está parada além do esperado"""
+        overdue = np.maximum(0.0, elapsed - np.maximum(mean_interval, 1.0))
+        return np.exp(-overdue / self.horizon)
     
     def predict(self, key: str, context: Dict = None) -> float:
         """Prediz a probabilidade de acesso futuro (0-1)"""
-        history = self.access_history.get(key, [])
+        stats = self.key_stats.get(key)
         
-        if len(history) < self.min_history:
+        if stats is None or stats.count < self.min_history or not self.is_trained:
             # Sem histórico suficiente, usa heurística
             return self._heuristic_prediction(key, context)
         
-        # Extrai features do histórico
-        features = self._extract_features(history)
-        
-        # Se modelo não está treinado, treina agora
-        if not self.is_trained:
-            self._train_model()
-        
         try:
-            # Predição usando modelo
-            prediction = self.model.predict([features])[0]
-            return max(0, min(1, prediction))  # Clamp entre 0 e 1
+            probability = self._sigmoid(np.dot(stats.features(), np.asarray(self.weights)))
+            elapsed = datetime.now().timestamp() - stats.last_access
+            return float(probability * self._recency_factor(elapsed, stats.mean_interval))
         except Exception as e:
             logger.warning(f"Erro na predição ML: {e}")
             return self._heuristic_prediction(key, context)
     
-    def _extract_features(self, history: list) -> list:
-        """Extrai features estatísticas do histórico"""
-        if not history:
-            return [0] * 6
-        
-        # Converte para array numpy
-        timestamps = np.array(history)
-        current_time = datetime.now().timestamp()
-        
-        # Features
-        features = [
-            len(history),  # Número total de acessos
-            current_time - timestamps[-1] if len(timestamps) > 0 else 0,  # Tempo desde último acesso
-            np.mean(np.diff(timestamps)) if len(timestamps) > 1 else 0,  # Intervalo médio entre acessos
-            np.std(np.diff(timestamps)) if len(timestamps) > 1 else 0,  # Desvio padrão dos intervalos
-            self._calculate_trend(timestamps),  # Tendência de acesso
-            self._calculate_periodicity(timestamps)  # Periodicidade
-        ]
+    def predict_many(self, keys: List[str], context: Dict = None) -> np.ndarray:
+        """
+        Prediz a probabilidade de acesso de várias chaves de uma vez.
         
-        return features
+        Args:
+            keys: Chaves a pontuar
+            context: Contexto usado na heurística das chaves sem histórico
+            
+        Returns:
+            np.ndarray: Probabilidades (0-1) na ordem de `keys`
+        """
+        scores = np.empty(len(keys))
+        model_rows = []
+        model_index = []
+        
+        for i, key in enumerate(keys):
+            stats = self.key_stats.get(key)
+            if stats is None or stats.count < self.min_history or not self.is_trained:
+                scores[i] = self._heuristic_prediction(key, context)
+            else:
+                model_index.append(i)
+                model_rows.append(stats)
+        
+        if model_rows:
+            features = np.array([stats.features() for stats in model_rows])
+            last_access = np.fromiter((stats.last_access for stats in model_rows), float, len(model_rows))
+            mean_interval = np.fromiter((stats.mean_interval for stats in model_rows), float, len(model_rows))
+            elapsed = datetime.now().timestamp() - last_access
+            scores[model_index] = (self._sigmoid(features @ np.asarray(self.weights))
+                                   * self._recency_factor(elapsed, mean_interval))
+        
+        return scores
     
-    def _calculate_trend(self, timestamps: np.ndarray) -> float:
-        """Calcula tendência de acesso (crescente/decrescente)"""
-        if len(timestamps) < 2:
-            return 0
-        
-        # Regressão linear simples
-        x = np.arange(len(timestamps)).reshape(-1, 1)
-        y = timestamps.reshape(-1, 1)
-        
-        try:
-            reg = LinearRegression().fit(x, y)
-            return reg.coef_[0][0]
-        except:
-            return 0
-    
-    def _calculate_periodicity(self, timestamps: np.ndarray) -> float:
-        """Calcula score de periodicidade dos acessos"""
-        if len(timestamps) < 3:
-            return 0
-        
-        intervals = np.diff(timestamps)
-        if len(intervals) < 2:
-            return 0
-        
-        # Calcula autocorrelação
-        mean = np.mean(intervals)
-        var = np.var(intervals)
-        
-        if var == 0:
-            return 1.0  # Perfeitamente periódico
-        
-        # Autocorrelação normalizada
-        autocorr = np.correlate(intervals - mean, intervals - mean, mode='valid')[0]
-        return autocorr / (var * len(intervals))
+    def forget(self, key: str):
+        """Descarta o estado de uma chave"""
+        self.key_stats.pop(key, None)
+        self._labeled.discard(key)
     
     def _heuristic_prediction(self, key: str, context: Dict = None) -> float:
         """Predição heurística quando não há dados suficientes"""
@@ -136,51 +319,146 @@ class AccessPredictor:
                 score += 0.1
         
         return min(1.0, score)
-    
-    def _train_model(self):
-        """Treina o modelo com dados históricos"""
-        X = []
-        y = []
-        
-        # Prepara dados de treino
-        for key, history in self.access_history.items():
-            if len(history) >= self.min_history:
-                features = self._extract_features(history[:-1])
-                # Target: se houve acesso próximo
-                target = 1 if len(history) > 1 and (history[-1] - history[-2]) < 300 else 0
-                
-                X.append(features)
-                y.append(target)
-        
-        if len(X) >= 10:
-            try:
-                self.model.fit(X, y)
-                self.is_trained = True
-                logger.info("Modelo de predição de cache treinado com sucesso")
-            except Exception as e:
-                logger.error(f"Erro ao treinar modelo: {e}")
 
 
 class IntelligentCacheManager:
-    """Gerenciador de Cache Inteligente com Redis"""
+    """
+    Gerenciador de Cache Inteligente em dois níveis.
+    
+    L1: cache em processo (W-TinyLFU) com valores serializados; cada
+    leitura decodifica uma cópia independente.
+    L2: Redis, compartilhado entre workers. Escritas e remoções são
+    anunciadas em um canal pub/sub para que os demais workers descartem
+    a cópia L1 da chave.
+    """
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(self,
+                 redis_url: str = "redis://localhost:6379",
+                 l1_max_entries: int = 10000,
+                 l1_max_bytes: Optional[int] = None,
+                 l1_ttl: float = 300.0,
+                 invalidation_channel: Optional[str] = "autocura:cache:invalidate",
+                 serializer: Union[str, CacheSerializer] = "json",
+                 async_redis_client: Optional[aioredis.Redis] = None,
+                 max_connections: int = 50):
+        """
+        Args:
+            redis_url: URL do Redis (L2)
+            l1_max_entries: Capacidade do L1 em entradas
+            l1_max_bytes: Capacidade do L1 em bytes serializados (substitui l1_max_entries)
+            l1_ttl: Tempo de vida máximo de uma entrada no L1 (s)
+            invalidation_channel: Canal pub/sub de invalidação (None desativa)
+            serializer: Codec dos valores ("json", "msgpack" ou instância de CacheSerializer)
+            async_redis_client: Cliente redis.asyncio já configurado (opcional)
+            max_connections: Tamanho do pool de conexões assíncronas
+        """
+        # Cliente síncrono apenas para o listener de invalidação (thread própria)
         self.redis_client = redis.from_url(redis_url)
+        
+        # Operações de cache no event loop: pool bloqueante aguarda conexão em picos
+        # Só o pool criado aqui é fechado em aclose(); o cliente injetado pertence a quem chamou
+        self._owns_async_redis = async_redis_client is None
+        self.async_redis = async_redis_client or aioredis.Redis(
+            connection_pool=aioredis.BlockingConnectionPool.from_url(redis_url, max_connections=max_connections)
+        )
+        
+        if isinstance(serializer, str):
+            if serializer not in SERIALIZERS:
+                raise ValueError(f"Unknown cache serializer: {serializer}")
+            serializer = SERIALIZERS[serializer]()
+        self.serializer = serializer
+        
         self.predictor = AccessPredictor()
         self.usage_patterns = defaultdict(dict)
         self.performance_metrics = {
             'hits': 0,
             'misses': 0,
+            'l1_hits': 0,
+            'l2_hits': 0,
+            'coalesced': 0,
+            'invalidations_sent': 0,
+            'invalidations_received': 0,
             'predictions_correct': 0,
             'predictions_total': 0
         }
         
+        self.l1 = WTinyLFUCache(max_entries=l1_max_entries, max_bytes=l1_max_bytes)
+        self.l1_ttl = l1_ttl
+        
+        # Single-flight: uma única computação em voo por chave
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        self.instance_id = uuid.uuid4().hex
+        self.invalidation_channel = invalidation_channel
+        self._pubsub = None
+        self._pubsub_thread: Optional[threading.Thread] = None
+        if invalidation_channel:
+            self._start_invalidation_listener()
+    
+    def _start_invalidation_listener(self):
+        """Assina o canal de invalidação em uma thread própria"""
+        try:
+            self._pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{self.invalidation_channel: self._handle_invalidation})
+            self._pubsub_thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except redis.RedisError as e:
+            # Sem o canal, outros workers podem servir cópias L1 antigas até o l1_ttl
+            logger.warning(f"Cache invalidation listener unavailable: {e}")
+            self._pubsub = None
+    
+    def _handle_invalidation(self, message: Dict):
+        """Descarta do L1 a chave alterada por outro worker"""
+        data = message.get('data')
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        origin, _, key = str(data).partition(':')
+        if origin != self.instance_id:
+            self.l1.delete(key)
+            self.performance_metrics['invalidations_received'] += 1
+    
+    async def _publish_invalidations(self, keys: Iterable[str]):
+        """Anuncia as chaves alteradas (um único round trip)"""
+        if not self.invalidation_channel:
+            return
+        keys = list(keys)
+        if not keys:
+            return
+        try:
+            pipe = self.async_redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.publish(self.invalidation_channel, f"{self.instance_id}:{key}")
+            await pipe.execute()
+            self.performance_metrics['invalidations_sent'] += len(keys)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to publish cache invalidation for {len(keys)} keys: {e}")
+    
+    async def invalidate(self, key: str):
+        """Remove a chave dos dois níveis e avisa os demais workers"""
+        self.l1.delete(key)
+        await self.async_redis.unlink(self._generate_key(key))
+        await self._publish_invalidations([key])
+    
+    def close(self):
+        """Encerra o listener de invalidação"""
+        if self._pubsub_thread is not None:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+    
+    async def aclose(self):
+        """Encerra o listener e o pool de conexões assíncronas criado pelo gerenciador"""
+        self.close()
+        if self._owns_async_redis:
+            await self.async_redis.aclose()
+        
     def _generate_key(self, key: str, namespace: str = "autocura") -> str:
         """Gera chave única para o cache"""
         return f"{namespace}:{key}"
     
-    async def smart_cache(self, key: str, data: Any, context: Dict = None):
-        """Armazena dados com TTL inteligente baseado em predição"""
+    def _prepare_entry(self, key: str, data: Any, context: Dict = None) -> Tuple[int, bytes]:
+        """Registra o acesso, calcula o TTL predito e serializa o valor"""
         # Registra acesso
         self.predictor.record_access(key, datetime.now().timestamp())
         
@@ -190,17 +468,107 @@ class IntelligentCacheManager:
         # Define TTL baseado na predição
         ttl = self._calculate_ttl(access_score, context)
         
-        # Serializa dados
-        serialized_data = json.dumps(data)
-        
-        # Armazena no Redis com TTL
-        cache_key = self._generate_key(key)
-        self.redis_client.setex(cache_key, ttl, serialized_data)
-        
         # Atualiza padrões de uso
         self._update_usage_patterns(key, access_score, ttl)
         
         logger.debug(f"Cache armazenado: {key} (score: {access_score:.2f}, TTL: {ttl}s)")
+        return ttl, self.serializer.dumps(data)
+    
+    async def smart_cache(self, key: str, data: Any, context: Dict = None):
+        """Armazena dados com TTL inteligente baseado em predição"""
+        await self._store(key, data, context)
+    
+    async def _store(self, key: str, data: Any, context: Dict = None) -> bytes:
+        """Grava no L2 e no L1, avisa os demais workers e retorna o valor serializado"""
+        ttl, serialized_data = self._prepare_entry(key, data, context)
+        
+        # Armazena no Redis com TTL
+        await self.async_redis.setex(self._generate_key(key), ttl, serialized_data)
+        
+        # L1 guarda o valor serializado; demais workers descartam sua cópia
+        self.l1.set(key, serialized_data, weight=len(serialized_data), ttl=min(ttl, self.l1_ttl))
+        await self._publish_invalidations([key])
+        return serialized_data
+    
+    async def set_many(self, items: Dict[str, Any], context: Dict = None):
+        """
+        Armazena vários valores em um único round trip (SETEX em pipeline).
+        
+        Args:
+            items: Valores por chave
+            context: Contexto usado no cálculo do TTL de todas as chaves
+        """
+        if not items:
+            return
+        
+        pipe = self.async_redis.pipeline(transaction=False)
+        entries = []
+        for key, data in items.items():
+            ttl, serialized_data = self._prepare_entry(key, data, context)
+            pipe.setex(self._generate_key(key), ttl, serialized_data)
+            if self.invalidation_channel:
+                pipe.publish(self.invalidation_channel, f"{self.instance_id}:{key}")
+            entries.append((key, serialized_data, ttl))
+        await pipe.execute()
+        
+        for key, serialized_data, ttl in entries:
+            self.l1.set(key, serialized_data, weight=len(serialized_data), ttl=min(ttl, self.l1_ttl))
+        if self.invalidation_channel:
+            self.performance_metrics['invalidations_sent'] += len(entries)
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Obtém várias chaves: L1 primeiro, o restante com um único MGET.
+        
+        Cada valor retornado é uma cópia decodificada, independente do cache.
+        
+        Args:
+            keys: Chaves desejadas
+            
+        Returns:
+            Dict[str, Any]: Valores encontrados (chaves ausentes ficam de fora)
+        """
+        results = {}
+        pending = []
+        now = datetime.now().timestamp()
+        
+        for key in dict.fromkeys(keys):
+            found, raw = self.l1.get(key)
+            if found:
+                results[key] = self.serializer.loads(raw)
+                self.performance_metrics['hits'] += 1
+                self.performance_metrics['l1_hits'] += 1
+                self.predictor.record_access(key, now)
+            else:
+                pending.append(key)
+        
+        if not pending:
+            return results
+        
+        raw_values = await self.async_redis.mget([self._generate_key(key) for key in pending])
+        corrupted = []
+        for key, raw in zip(pending, raw_values):
+            if raw is None:
+                self.performance_metrics['misses'] += 1
+                continue
+            try:
+                data = self.serializer.loads(raw)
+            except (ValueError, TypeError):
+                logger.error(f"Erro ao decodificar cache para {key}")
+                corrupted.append(self._generate_key(key))
+                self.performance_metrics['misses'] += 1
+                continue
+            results[key] = data
+            self.performance_metrics['hits'] += 1
+            self.performance_metrics['l2_hits'] += 1
+            self.predictor.record_access(key, now)
+            self.l1.set(key, raw, weight=len(raw), ttl=self.l1_ttl)
+        
+        if corrupted:
+            # Remove entradas corrompidas
+            await self.async_redis.unlink(*corrupted)
+        
+        return results
     
     def _calculate_ttl(self, access_score: float, context: Dict = None) -> int:
         """Calcula TTL baseado no score de acesso e contexto"""
@@ -239,23 +607,60 @@ class IntelligentCacheManager:
         return max(60, min(86400, ttl))  # Entre 1 minuto e 24 horas
     
     async def get_with_fallback(self, key: str, fallback_fn: Callable, context: Dict = None) -> Any:
-        """Obtém do cache com fallback para função original"""
+        """
+        Obtém do cache (L1, depois L2) com fallback para função original.
+        
+        Misses concorrentes da mesma chave aguardam uma única execução
+        de `fallback_fn`, feita em uma task própria: se um chamador for
+        cancelado, a carga continua para os demais. Cada chamador recebe
+        uma cópia decodificada, independente do cache e dos demais.
+        """
+        # L1: valor serializado, sem round trip
+        found, raw = self.l1.get(key)
+        if found:
+            self.performance_metrics['hits'] += 1
+            self.performance_metrics['l1_hits'] += 1
+            self.predictor.record_access(key, datetime.now().timestamp())
+            return self.serializer.loads(raw)
+        
+        task = self._inflight.get(key)
+        if task is not None:
+            self.performance_metrics['coalesced'] += 1
+        else:
+            task = asyncio.create_task(self._load(key, fallback_fn, context))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        
+        # O cancelamento de um chamador não cancela a carga compartilhada
+        return self.serializer.loads(await asyncio.shield(task))
+    
+    def _finish_inflight(self, key: str, task: asyncio.Future) -> None:
+        """Remove a carga concluída do registro de cargas em voo"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Marca como consumida quando não há outros aguardando
+    
+    async def _load(self, key: str, fallback_fn: Callable, context: Dict = None) -> bytes:
+        """Busca no L2 e, em caso de miss, executa o fallback; retorna o valor serializado"""
         cache_key = self._generate_key(key)
         
         # Tenta obter do cache
-        cached = self.redis_client.get(cache_key)
+        cached = await self.async_redis.get(cache_key)
         
         if cached:
             # Hit no cache
-            self.performance_metrics['hits'] += 1
-            self.predictor.record_access(key, datetime.now().timestamp())
-            
             try:
-                return json.loads(cached)
-            except json.JSONDecodeError:
+                self.serializer.loads(cached)  # Valida antes de promover ao L1
+                self.performance_metrics['hits'] += 1
+                self.performance_metrics['l2_hits'] += 1
+                self.predictor.record_access(key, datetime.now().timestamp())
+                self.l1.set(key, cached, weight=len(cached), ttl=self.l1_ttl)
+                return cached
+            except (ValueError, TypeError):
                 logger.error(f"Erro ao decodificar cache para {key}")
                 # Remove entrada corrompida
-                self.redis_client.delete(cache_key)
+                await self.async_redis.unlink(cache_key)
         
         # Miss no cache
         self.performance_metrics['misses'] += 1
@@ -267,9 +672,7 @@ class IntelligentCacheManager:
             data = fallback_fn()
         
         # Armazena resultado no cache
-        await self.smart_cache(key, data, context)
-        
-        return data
+        return await self._store(key, data, context)
     
     def _update_usage_patterns(self, key: str, access_score: float, ttl: int):
         """Atualiza padrões de uso para análise"""
@@ -301,7 +704,25 @@ class IntelligentCacheManager:
                 self.performance_metrics['predictions_total']
             ) if self.performance_metrics['predictions_total'] > 0 else 0,
             'active_keys': len(self.usage_patterns),
-            'model_trained': self.predictor.is_trained
+            'model_trained': self.predictor.is_trained,
+            'coalesced_requests': self.performance_metrics['coalesced'],
+            'serializer': self.serializer.name,
+            'tiers': {
+                'l1': self.l1.get_stats(),
+                'l2': {
+                    'hits': self.performance_metrics['l2_hits'],
+                    'misses': self.performance_metrics['misses'],
+                    'hit_rate': (
+                        self.performance_metrics['l2_hits'] /
+                        (self.performance_metrics['l2_hits'] + self.performance_metrics['misses'])
+                    ) if self.performance_metrics['l2_hits'] + self.performance_metrics['misses'] > 0 else 0
+                },
+                'invalidation': {
+                    'channel': self.invalidation_channel if self._pubsub is not None else None,
+                    'sent': self.performance_metrics['invalidations_sent'],
+                    'received': self.performance_metrics['invalidations_received']
+                }
+            }
         }
     
     async def optimize_cache(self):
@@ -315,13 +736,22 @@ class IntelligentCacheManager:
             if (current_time - last_access) > timedelta(hours=1):
                 keys_to_remove.append(key)
         
-        # Remove chaves
+        # Remove chaves em lotes (UNLINK libera a memória fora da thread principal do Redis)
+        for i in range(0, len(keys_to_remove), UNLINK_BATCH_SIZE):
+            batch = keys_to_remove[i:i + UNLINK_BATCH_SIZE]
+            await self.async_redis.unlink(*(self._generate_key(key) for key in batch))
+            await self._publish_invalidations(batch)
+        
         for key in keys_to_remove:
-            cache_key = self._generate_key(key)
-            self.redis_client.delete(cache_key)
+            self.l1.delete(key)
             del self.usage_patterns[key]
+            self.predictor.forget(key)
+        
+        # Inclui chaves só lidas (sem usage_patterns) e gera os exemplos negativos
+        forgotten = self.predictor.sweep(current_time.timestamp(), max_idle=timedelta(hours=1).total_seconds())
         
-        logger.info(f"Cache otimizado: {len(keys_to_remove)} chaves removidas")
+        logger.info(f"Cache otimizado: {len(keys_to_remove)} chaves removidas, "
+                    f"{forgotten} estatísticas de acesso descartadas")
         
         return len(keys_to_remove)
     
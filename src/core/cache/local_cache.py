@@ -0,0 +1,259 @@
+"""
+Cache Local (L1) com Admissão W-TinyLFU
+Camada em processo à frente do Redis para o IntelligentCacheManager
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Multiplicadores ímpares para derivar os índices de cada linha do sketch
+_SKETCH_SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+_MAX_COUNTER = 15
+
+
+class FrequencySketch:
+    """
+    Count-Min Sketch com contadores de 4 bits e envelhecimento.
+
+    Estima a frequência recente de cada chave com memória fixa; ao
+    atingir `sample_size` incrementos todos os contadores são divididos
+    por dois, para que o histórico antigo perca peso.
+    """
+
+    def __init__(self, capacity: int):
+        width = 16
+        while width < capacity * 4:
+            width <<= 1
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in _SKETCH_SEEDS]
+        self.sample_size = max(10 * capacity, 100)
+        self._additions = 0
+
+    def _indexes(self, key: Hashable):
+        h = hash(key)
+        return [((h * seed) >> 16) & self._mask for seed in _SKETCH_SEEDS]
+
+    def increment(self, key: Hashable) -> None:
+        added = False
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < _MAX_COUNTER:
+                row[index] += 1
+                added = True
+
+        if added:
+            self._additions += 1
+            if self._additions >= self.sample_size:
+                self._reset()
+
+    def frequency(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def _reset(self) -> None:
+        for i, row in enumerate(self._rows):
+            self._rows[i] = bytearray(count >> 1 for count in row)
+        self._additions //= 2
+
+
+class WTinyLFUCache:
+    """
+    Cache em processo com política W-TinyLFU.
+
+    Novas entradas passam por uma janela LRU pequena; ao sair dela, só
+    entram na região principal (SLRU: probatória + protegida) se forem
+    mais frequentes, segundo o sketch, que a vítima da região principal.
+    A capacidade é medida em entradas ou em bytes (peso por entrada);
+    janela e região principal nunca somam mais que ela.
+    """
+
+    def __init__(self,
+                 max_entries: int = 10000,
+                 max_bytes: Optional[int] = None,
+                 window_ratio: float = 0.01,
+                 protected_ratio: float = 0.8):
+        """
+        Args:
+            max_entries: Número máximo de entradas (ignorado se max_bytes for dado)
+            max_bytes: Soma máxima dos pesos (bytes serializados) das entradas
+            window_ratio: Fração da capacidade para a janela de admissão
+            protected_ratio: Fração da região principal reservada à parte protegida
+        """
+        self.capacity = max_bytes if max_bytes is not None else max_entries
+        self.weighted = max_bytes is not None
+        self.window_capacity = max(1, int(self.capacity * window_ratio))
+        self.main_capacity = max(0, self.capacity - self.window_capacity)
+        self.protected_capacity = int(self.main_capacity * protected_ratio)
+
+        # Estimativa de entradas para dimensionar o sketch
+        self.sketch = FrequencySketch(max_entries if not self.weighted else max(1024, max_bytes // 1024))
+
+        # chave -> (valor, peso, expira_em)
+        self._window: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._probation: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._protected: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._weights = {"window": 0, "probation": 0, "protected": 0}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._window or key in self._probation or key in self._protected
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Busca uma entrada.
+
+        Returns:
+            Tuple[bool, Any]: (encontrada, valor)
+        """
+        with self._lock:
+            self.sketch.increment(key)
+
+            for region, segment in (("window", self._window),
+                                    ("probation", self._probation),
+                                    ("protected", self._protected)):
+                entry = segment.get(key)
+                if entry is None:
+                    continue
+
+                value, weight, expires_at = entry
+                if expires_at and expires_at <= time.monotonic():
+                    del segment[key]
+                    self._weights[region] -= weight
+                    break
+
+                if region == "probation":
+                    # Segundo acesso: promove para a parte protegida
+                    del segment[key]
+                    self._weights["probation"] -= weight
+                    self._protected[key] = entry
+                    self._weights["protected"] += weight
+                    self._demote_protected()
+                else:
+                    segment.move_to_end(key)
+
+                self.hits += 1
+                return True, value
+
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any, weight: int = 1, ttl: Optional[float] = None) -> None:
+        """
+        Armazena uma entrada (novas entradas começam na janela).
+
+        Args:
+            key: Chave
+            value: Valor (guardado por referência, sem cópia)
+            weight: Peso da entrada quando a capacidade é em bytes
+            ttl: Tempo de vida em segundos
+        """
+        weight = weight if self.weighted else 1
+        if weight > self.capacity:
+            return
+        expires_at = time.monotonic() + ttl if ttl else 0.0
+
+        with self._lock:
+            self._remove(key)
+            self.sketch.increment(key)
+            self._window[key] = (value, weight, expires_at)
+            self._weights["window"] += weight
+
+            # Uma entrada maior que a janela segue direto para a admissão
+            while self._weights["window"] > self.window_capacity:
+                candidate_key, candidate = self._window.popitem(last=False)
+                self._weights["window"] -= candidate[1]
+                self._admit(candidate_key, candidate)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove uma entrada; retorna True se existia"""
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._window.clear()
+            self._probation.clear()
+            self._protected.clear()
+            self._weights = {"window": 0, "probation": 0, "protected": 0}
+
+    def _remove(self, key: Hashable) -> bool:
+        for region, segment in (("window", self._window),
+                                ("probation", self._probation),
+                                ("protected", self._protected)):
+            entry = segment.pop(key, None)
+            if entry is not None:
+                self._weights[region] -= entry[1]
+                return True
+        return False
+
+    def _main_weight(self) -> int:
+        return self._weights["probation"] + self._weights["protected"]
+
+    def _admit(self, key: Hashable, entry: Tuple[Any, int, float]) -> None:
+        """Filtro TinyLFU: candidato da janela contra vítimas da região principal"""
+        weight = entry[1]
+        if weight > self.main_capacity:
+            self.rejections += 1
+            self.evictions += 1
+            return
+        candidate_frequency = self.sketch.frequency(key)
+
+        victims = []
+        freed = 0
+        available = self.main_capacity - self._main_weight()
+        probation = iter(self._probation.items())
+
+        while available + freed < weight:
+            victim = next(probation, None)
+            if victim is None:
+                break
+            if self.sketch.frequency(victim[0]) >= candidate_frequency:
+                self.rejections += 1
+                self.evictions += 1
+                return
+            victims.append(victim[0])
+            freed += victim[1][1]
+
+        if available + freed < weight:
+            # Região probatória vazia: a parte protegida cede espaço
+            while self._protected and self._main_weight() - freed + weight > self.main_capacity:
+                _, evicted = self._protected.popitem(last=False)
+                self._weights["protected"] -= evicted[1]
+                self.evictions += 1
+
+        for victim_key in victims:
+            self._weights["probation"] -= self._probation.pop(victim_key)[1]
+            self.evictions += 1
+
+        self._probation[key] = entry
+        self._weights["probation"] += weight
+
+    def _demote_protected(self) -> None:
+        """Excesso da parte protegida volta para a probatória (LRU)"""
+        while self._weights["protected"] > self.protected_capacity and len(self._protected) > 1:
+            key, entry = self._protected.popitem(last=False)
+            self._weights["protected"] -= entry[1]
+            self._probation[key] = entry
+            self._weights["probation"] += entry[1]
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0,
+            "entries": len(self),
+            "size": self._main_weight() + self._weights["window"],
+            "capacity": self.capacity,
+            "capacity_unit": "bytes" if self.weighted else "entries",
+            "evictions": self.evictions,
+            "rejections": self.rejections
+        }
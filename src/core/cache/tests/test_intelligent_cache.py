@@ -0,0 +1,88 @@
+"""
+Testes para o single-flight do IntelligentCacheManager.
+"""
+
+import asyncio
+import unittest
+
+from ..intelligent_cache import IntelligentCacheManager
+
+class RedisEmMemoria:
+    """Cliente redis.asyncio falso com os comandos usados pelo gerenciador."""
+
+    def __init__(self):
+        self.dados = {}
+
+    async def get(self, chave):
+        return self.dados.get(chave)
+
+    async def setex(self, chave, ttl, valor):
+        self.dados[chave] = valor
+
+    async def unlink(self, *chaves):
+        for chave in chaves:
+            self.dados.pop(chave, None)
+
+class TestGetWithFallback(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Configuração inicial para os testes."""
+        self.redis = RedisEmMemoria()
+        self.cache = IntelligentCacheManager(invalidation_channel=None, async_redis_client=self.redis)
+        self.chamadas = 0
+        self.liberar = asyncio.Event()
+
+    async def carregar(self):
+        self.chamadas += 1
+        await self.liberar.wait()
+        return {"valor": [1, 2, 3]}
+
+    async def test_misses_concorrentes_executam_o_fallback_uma_vez(self):
+        chamadores = [asyncio.create_task(self.cache.get_with_fallback("chave", self.carregar))
+                      for _ in range(20)]
+        await asyncio.sleep(0)
+        self.liberar.set()
+        resultados = await asyncio.gather(*chamadores)
+
+        self.assertEqual(self.chamadas, 1)
+        self.assertEqual(self.cache.performance_metrics["coalesced"], 19)
+        self.assertTrue(all(resultado == {"valor": [1, 2, 3]} for resultado in resultados))
+        # Cada chamador recebe uma cópia independente
+        resultados[0]["valor"].append(4)
+        self.assertEqual(resultados[1], {"valor": [1, 2, 3]})
+        self.assertEqual(self.cache._inflight, {})
+
+        # Com o valor no L1, novas leituras não chamam o fallback
+        self.assertEqual(await self.cache.get_with_fallback("chave", self.carregar), {"valor": [1, 2, 3]})
+        self.assertEqual(self.chamadas, 1)
+
+    async def test_chamador_cancelado_nao_falha_os_demais(self):
+        chamadores = [asyncio.create_task(self.cache.get_with_fallback("chave", self.carregar))
+                      for _ in range(3)]
+        await asyncio.sleep(0)
+        chamadores[0].cancel()
+        await asyncio.sleep(0)
+        self.liberar.set()
+
+        resultados = await asyncio.gather(*chamadores, return_exceptions=True)
+        self.assertIsInstance(resultados[0], asyncio.CancelledError)
+        self.assertEqual(resultados[1:], [{"valor": [1, 2, 3]}] * 2)
+        self.assertEqual(self.chamadas, 1)
+        self.assertIn("autocura:chave", self.redis.dados)
+
+    async def test_erro_no_fallback_chega_a_todos_e_libera_a_chave(self):
+        async def falhar():
+            self.chamadas += 1
+            await self.liberar.wait()
+            raise RuntimeError("origem indisponível")
+
+        chamadores = [asyncio.create_task(self.cache.get_with_fallback("chave", falhar)) for _ in range(3)]
+        await asyncio.sleep(0)
+        self.liberar.set()
+        resultados = await asyncio.gather(*chamadores, return_exceptions=True)
+
+        self.assertTrue(all(isinstance(resultado, RuntimeError) for resultado in resultados))
+        self.assertEqual(self.chamadas, 1)
+        self.assertEqual(self.cache._inflight, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Testes para o cache L1 com admissão W-TinyLFU.
+"""
+
+import random
+import unittest
+
+from ..local_cache import WTinyLFUCache
+
+class TestWTinyLFUCache(unittest.TestCase):
+    def test_capacidade_em_bytes_nunca_excedida(self):
+        """Janela e região principal somadas respeitam max_bytes com pesos variados."""
+        cache = WTinyLFUCache(max_bytes=10000)
+        aleatorio = random.Random(7)
+        maior = 0
+        for _ in range(20000):
+            chave = aleatorio.randint(0, 2000)
+            if aleatorio.random() < 0.5:
+                cache.get(chave)
+            else:
+                cache.set(chave, "valor", weight=aleatorio.randint(1, 300))
+            maior = max(maior, cache.get_stats()["size"])
+
+        self.assertLessEqual(maior, 10000)
+        pesos = sum(entrada[1] for segmento in (cache._window, cache._probation, cache._protected)
+                    for entrada in segmento.values())
+        self.assertEqual(pesos, cache.get_stats()["size"])
+
+    def test_entrada_maior_que_a_janela(self):
+        """Uma entrada maior que a janela disputa a admissão em vez de ficar acima da capacidade."""
+        cache = WTinyLFUCache(max_bytes=1000, window_ratio=0.1)
+        for chave in range(9):
+            cache.set(chave, "valor", weight=100)
+            cache.get(chave)
+        cache.set("grande", "valor", weight=500)
+
+        self.assertLessEqual(cache.get_stats()["size"], 1000)
+        cache.set("enorme", "valor", weight=1001)
+        self.assertNotIn("enorme", cache)
+
+    def test_capacidade_em_entradas(self):
+        cache = WTinyLFUCache(max_entries=50)
+        for chave in range(1000):
+            cache.set(chave, chave)
+            self.assertLessEqual(len(cache), 50)
+
+    def test_varredura_nao_expulsa_chaves_quentes(self):
+        """Chaves acessadas uma única vez não tomam o lugar das frequentes."""
+        cache = WTinyLFUCache(max_entries=100)
+        quentes = [f"quente_{i}" for i in range(50)]
+        for chave in quentes:
+            cache.set(chave, chave)
+        for _ in range(5):
+            for chave in quentes:
+                cache.get(chave)
+
+        # Varredura longa enquanto as chaves quentes continuam em uso
+        for i in range(5000):
+            chave = f"varredura_{i}"
+            cache.get(chave)
+            cache.set(chave, chave)
+            if i % 5 == 0:
+                cache.get(quentes[(i // 5) % len(quentes)])
+
+        self.assertEqual([chave for chave in quentes if chave not in cache], [])
+        self.assertGreater(cache.rejections, 0)
+
+    def test_expiracao_por_ttl(self):
+        cache = WTinyLFUCache(max_entries=10)
+        cache.set("a", 1, ttl=-1)
+        self.assertEqual(cache.get("a"), (False, None))
+        self.assertEqual(cache.get_stats()["size"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+import logging
+import logging.handlers
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+class FilaDescarteAntigo:
+    """
+    Fila limitada de registros de log com descarte do mais antigo.
+
+    Quem registra nunca bloqueia: com a fila cheia, o registro mais
+    antigo é descartado e contado em `descartados`. Expõe a interface
+    usada por QueueHandler/QueueListener (put_nowait, get, task_done).
+    """
+
+    def __init__(self, capacidade: int = 10000):
+        self.capacidade = capacidade
+        self._itens: deque = deque()
+        self._condicao = threading.Condition(threading.Lock())
+        self._pendentes = 0
+        self.descartados = 0
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def put_nowait(self, item: Any) -> None:
+        with self._condicao:
+            if len(self._itens) >= self.capacidade:
+                self._itens.popleft()
+                self.descartados += 1
+            else:
+                self._pendentes += 1
+            self._itens.append(item)
+            self._condicao.notify_all()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        return self.obter_lote(1, timeout if block else 0)[0]
+
+    def obter_lote(self, maximo: int, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Aguarda o primeiro item e retira até `maximo` itens de uma vez.
+
+        Raises:
+            IndexError: Timeout sem nenhum item disponível
+        """
+        with self._condicao:
+            if not self._condicao.wait_for(lambda: self._itens, timeout):
+                raise IndexError("fila vazia")
+            quantidade = min(maximo, len(self._itens))
+            return [self._itens.popleft() for _ in range(quantidade)]
+
+    def task_done(self, quantidade: int = 1) -> None:
+        with self._condicao:
+            self._pendentes -= quantidade
+            if self._pendentes <= 0:
+                self._pendentes = 0
+                self._condicao.notify_all()
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda até que todos os itens enfileirados tenham sido processados"""
+        with self._condicao:
+            return self._condicao.wait_for(lambda: self._pendentes == 0, timeout)
+
+class HandlerFila(logging.handlers.QueueHandler):
+    """
+    Enfileira registros para os handlers de destino sem formatá-los.
+
+    A mensagem (msg % args) e o traceback são montados na thread de
+    escrita; os argumentos do log são guardados por referência e não
+    devem ser alterados depois da chamada.
+    """
+
+    def __init__(self, fila: FilaDescarteAntigo, destinos: Sequence[logging.Handler]):
+        super().__init__(fila)
+        self.destinos = tuple(destinos)
+
+    def prepare(self, record: logging.LogRecord) -> Tuple[Tuple[logging.Handler, ...], logging.LogRecord]:
+        return self.destinos, record
+
+    def enqueue(self, item: Any) -> None:
+        self.queue.put_nowait(item)
+
+class FlushEmLote:
+    """
+    Mixin para StreamHandlers escritos pelo EscritorLotes.
+
+    Enquanto `em_lote` estiver ativo, o flush feito a cada registro é
+    adiado; o escritor chama `descarregar` uma vez ao fim de cada lote.
+    """
+
+    em_lote = False
+
+    def flush(self) -> None:
+        if not self.em_lote:
+            super().flush()
+
+    def descarregar(self) -> None:
+        super().flush()
+
+class ArquivoRotativoLote(FlushEmLote, logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler cuja verificação de tamanho não força flush.
+
+    O tamanho do arquivo é mantido em um contador de bytes, iniciado pelo
+    tamanho em disco ao abrir o arquivo e incrementado pelo tamanho
+    codificado de cada registro escrito (tell() em arquivo texto
+    esvaziaria o buffer a cada registro).
+    """
+
+    _tamanho = 0
+    _tamanho_registro = 0
+
+    def _open(self):
+        stream = super()._open()
+        self._tamanho = os.path.getsize(self.baseFilename)
+        return stream
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        self._tamanho_registro = 0
+        if self.maxBytes > 0:
+            msg = "%s%s" % (self.format(record), self.terminator)
+            self._tamanho_registro = len(msg.encode(self.stream.encoding, self.errors or "strict"))
+            return self._tamanho + self._tamanho_registro >= self.maxBytes
+        return False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            self._escrever(record)
+        except Exception:
+            self.handleError(record)
+
+    def _escrever(self, record: logging.LogRecord) -> None:
+        """Escreve o registro (após shouldRollover) e atualiza o contador de bytes"""
+        logging.FileHandler.emit(self, record)
+        self._tamanho += self._tamanho_registro
+
+class ConsoleLote(FlushEmLote, logging.StreamHandler):
+    """StreamHandler com flush por lote"""
+
+class EscritorLotes(logging.handlers.QueueListener):
+    """
+    Thread de escrita dos registros enfileirados pelos HandlerFila.
+
+    Retira os registros em lotes, entrega cada um aos seus handlers de
+    destino (respeitando o nível de cada handler) e faz um único flush
+    por handler ao fim do lote. Descartes por fila cheia são reportados
+    com um aviso escrito em todos os handlers.
+    """
+
+    def __init__(self, fila: FilaDescarteAntigo, handlers: Sequence[logging.Handler],
+                 tamanho_lote: int = 256):
+        super().__init__(fila, *handlers, respect_handler_level=True)
+        self.tamanho_lote = tamanho_lote
+        self._descartados_reportados = 0
+        self.lotes_escritos = 0
+        self.registros_escritos = 0
+
+    def start(self) -> None:
+        for handler in self.handlers:
+            if isinstance(handler, FlushEmLote):
+                handler.em_lote = True
+        super().start()
+
+    def stop(self) -> None:
+        super().stop()
+        for handler in self.handlers:
+            if isinstance(handler, FlushEmLote):
+                handler.em_lote = False
+            handler.flush()
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda a escrita de tudo o que já foi enfileirado"""
+        return self.queue.aguardar(timeout)
+
+    def _monitor(self) -> None:
+        fila = self.queue
+        while True:
+            lote = fila.obter_lote(self.tamanho_lote)
+            parar = False
+            usados = set()
+
+            for item in lote:
+                if item is self._sentinel:
+                    parar = True
+                    continue
+                destinos, record = item
+                self._escrever(record, destinos)
+                usados.update(destinos)
+
+            self._reportar_descartes()
+            for handler in usados:
+                self._descarregar(handler)
+
+            self.lotes_escritos += 1
+            self.registros_escritos += len(lote) - parar
+            fila.task_done(len(lote))
+            if parar:
+                break
+
+    def _escrever(self, record: logging.LogRecord, destinos: Sequence[logging.Handler]) -> None:
+        for handler in destinos:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    @staticmethod
+    def _descarregar(handler: logging.Handler) -> None:
+        try:
+            if isinstance(handler, FlushEmLote):
+                handler.descarregar()
+            else:
+                handler.flush()
+        except Exception:
+            pass
+
+    def _reportar_descartes(self) -> None:
+        descartados = self.queue.descartados
+        if descartados == self._descartados_reportados:
+            return
+        novos = descartados - self._descartados_reportados
+        self._descartados_reportados = descartados
+        record = logging.LogRecord(
+            "logger", logging.WARNING, __file__, 0,
+            "%d log records dropped (queue full)", (novos,), None
+        )
+        self._escrever(record, self.handlers)
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        return {
+            "fila": len(self.queue),
+            "capacidade": self.queue.capacidade,
+            "descartados": self.queue.descartados,
+            "lotes_escritos": self.lotes_escritos,
+            "registros_escritos": self.registros_escritos
+        }
@@ -0,0 +1,251 @@
+import logging
+import logging.handlers
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+from datetime import datetime
+import json
+import os
+
+from .log_assincrono import ArquivoRotativoLote
+
+# Sufixo do índice esparso gravado ao lado de cada arquivo de log
+SUFIXO_INDICE = ".idx"
+
+class FormatadorJSON(logging.Formatter):
+    """Formata cada registro como uma linha JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log = {
+            "ts": record.created,
+            "logger": record.name,
+            "nivel": record.levelname,
+            "mensagem": record.getMessage()
+        }
+        if record.exc_info:
+            log["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(log, ensure_ascii=False)
+
+class HandlerJSONIndexado(ArquivoRotativoLote):
+    """
+    Sink de logs JSON (uma linha por registro) com índice esparso.
+
+    A cada `intervalo_indice` segundos de logs um bloco é fechado e uma
+    linha é anexada ao arquivo `<log>.idx` com o offset do bloco, o
+    intervalo de tempo coberto e bitmaps dos loggers e níveis presentes.
+    Consultas usam o índice para ir direto aos blocos relevantes. A
+    rotação move o índice junto com o arquivo de log.
+    """
+
+    def __init__(self, filename: str, intervalo_indice: float = 10.0,
+                 maxBytes: int = 0, backupCount: int = 0, encoding: str = 'utf-8'):
+        self.intervalo_indice = intervalo_indice
+        self._bits_logger: Dict[str, int] = {}
+        self._bits_nivel: Dict[str, int] = {}
+        self._bloco: Optional[Dict[str, Any]] = None
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        self.setFormatter(FormatadorJSON())
+        self._carregar_bits()
+
+    @property
+    def arquivo_indice(self) -> str:
+        return self.baseFilename + SUFIXO_INDICE
+
+    def _carregar_bits(self) -> None:
+        """Recupera a tabela de bits de um índice existente (reabertura do processo)"""
+        self._bits_logger.clear()
+        self._bits_nivel.clear()
+        if not os.path.exists(self.arquivo_indice):
+            return
+        tabelas, _ = ler_indice(self.arquivo_indice)
+        self._bits_logger.update(tabelas["logger"])
+        self._bits_nivel.update(tabelas["nivel"])
+
+    def _bit(self, tabela: str, nome: str) -> int:
+        bits = self._bits_logger if tabela == "logger" else self._bits_nivel
+        bit = bits.get(nome)
+        if bit is None:
+            bit = bits[nome] = len(bits)
+            self._gravar_indice({tabela: nome, "bit": bit})
+        return bit
+
+    def _gravar_indice(self, entrada: Dict[str, Any]) -> None:
+        with open(self.arquivo_indice, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+
+    def _fechar_bloco(self) -> None:
+        if self._bloco is not None:
+            if self.stream is not None:
+                self.stream.flush()
+                self._bloco["fim_offset"] = self.stream.tell()
+                self._gravar_indice(self._bloco)
+            self._bloco = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+
+            if self._bloco is None or record.created - self._bloco["inicio"] >= self.intervalo_indice:
+                self._fechar_bloco()
+                self.stream.flush()
+                self._bloco = {"offset": self.stream.tell(), "inicio": record.created,
+                               "fim": record.created, "loggers": 0, "niveis": 0}
+
+            bloco = self._bloco
+            bloco["inicio"] = min(bloco["inicio"], record.created)
+            bloco["fim"] = max(bloco["fim"], record.created)
+            bloco["loggers"] |= 1 << self._bit("logger", record.name)
+            bloco["niveis"] |= 1 << self._bit("nivel", record.levelname)
+
+            self._escrever(record)
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self) -> None:
+        self._fechar_bloco()
+
+        # Desloca os índices como o RotatingFileHandler desloca os logs
+        if self.backupCount > 0:
+            for i in range(self.backupCount - 1, 0, -1):
+                origem = f"{self.baseFilename}.{i}{SUFIXO_INDICE}"
+                if os.path.exists(origem):
+                    os.replace(origem, f"{self.baseFilename}.{i + 1}{SUFIXO_INDICE}")
+            if os.path.exists(self.arquivo_indice):
+                os.replace(self.arquivo_indice, f"{self.baseFilename}.1{SUFIXO_INDICE}")
+        elif os.path.exists(self.arquivo_indice):
+            os.remove(self.arquivo_indice)
+
+        super().doRollover()
+        self._carregar_bits()
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            self._fechar_bloco()
+        finally:
+            self.release()
+        super().close()
+
+def ler_indice(caminho: str) -> Tuple[Dict[str, Dict[str, int]], List[Dict[str, Any]]]:
+    """
+    Lê um índice esparso.
+
+    Returns:
+        Tuple: (tabelas de bits por logger e nível, blocos em ordem de offset)
+    """
+    tabelas = {"logger": {}, "nivel": {}}
+    blocos = []
+    with open(caminho, 'r', encoding='utf-8') as f:
+        for linha in f:
+            try:
+                entrada = json.loads(linha)
+            except json.JSONDecodeError:
+                continue  # Última linha incompleta
+            if "offset" in entrada:
+                blocos.append(entrada)
+            elif "logger" in entrada:
+                tabelas["logger"][entrada["logger"]] = entrada["bit"]
+            elif "nivel" in entrada:
+                tabelas["nivel"][entrada["nivel"]] = entrada["bit"]
+    return tabelas, blocos
+
+def arquivos_rotacionados(caminho_base: str, backup_count: int) -> List[str]:
+    """Arquivos de log do mais antigo para o mais recente"""
+    arquivos = [f"{caminho_base}.{i}" for i in range(backup_count, 0, -1)]
+    arquivos.append(caminho_base)
+    return [arquivo for arquivo in arquivos if os.path.exists(arquivo)]
+
+def _linhas_intervalo(f, inicio: int, fim: Optional[int]) -> Iterator[bytes]:
+    f.seek(inicio)
+    while fim is None or f.tell() < fim:
+        linha = f.readline()
+        if not linha:
+            return
+        yield linha
+
+def consultar_logs(caminho_base: str, backup_count: int = 0,
+                   logger: Optional[str] = None, nivel: Optional[str] = None,
+                   inicio: Optional[datetime] = None, fim: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Consulta logs JSON usando os índices esparsos.
+
+    Percorre os arquivos rotacionados em ordem cronológica; em cada um,
+    lê apenas os blocos cujo intervalo de tempo cruza o período pedido e
+    cujos bitmaps contêm o logger e o nível pedidos. Trechos sem índice
+    (bloco ainda aberto) são lidos integralmente.
+
+    Args:
+        caminho_base: Arquivo de log atual
+        backup_count: Número máximo de arquivos rotacionados
+        logger: Nome do logger (opcional)
+        nivel: Nível do log (opcional)
+        inicio: Data inicial (opcional)
+        fim: Data final (opcional)
+
+    Yields:
+        Dict[str, Any]: Logs no formato de Logger.obter_logs
+    """
+    ts_inicio = inicio.timestamp() if inicio else None
+    ts_fim = fim.timestamp() if fim else None
+    nivel = nivel.upper() if nivel else None
+
+    for arquivo in arquivos_rotacionados(caminho_base, backup_count):
+        # Trechos (offset inicial, offset final) a ler; None = até o fim do arquivo
+        trechos = []
+        cursor = 0
+
+        caminho_indice = arquivo + SUFIXO_INDICE
+        if os.path.exists(caminho_indice):
+            tabelas, blocos = ler_indice(caminho_indice)
+
+            # Logger ou nível nunca vistos neste arquivo não casam com nenhum bloco
+            mascara_logger = mascara_nivel = None
+            if logger is not None:
+                bit = tabelas["logger"].get(logger)
+                mascara_logger = 0 if bit is None else 1 << bit
+            if nivel is not None:
+                bit = tabelas["nivel"].get(nivel)
+                mascara_nivel = 0 if bit is None else 1 << bit
+
+            for bloco in sorted(blocos, key=lambda bloco: bloco["offset"]):
+                # Lacuna não indexada (processo encerrado com bloco aberto): lê inteira
+                if bloco["offset"] > cursor:
+                    trechos.append((cursor, bloco["offset"]))
+                cursor = max(cursor, bloco["fim_offset"])
+
+                if ts_inicio is not None and bloco["fim"] < ts_inicio:
+                    continue
+                if ts_fim is not None and bloco["inicio"] > ts_fim:
+                    continue
+                if mascara_logger is not None and not bloco["loggers"] & mascara_logger:
+                    continue
+                if mascara_nivel is not None and not bloco["niveis"] & mascara_nivel:
+                    continue
+                trechos.append((bloco["offset"], bloco["fim_offset"]))
+
+        # Bloco ainda aberto (ou arquivo sem índice): lido integralmente
+        trechos.append((cursor, None))
+
+        with open(arquivo, 'rb') as f:
+            for offset, fim_trecho in trechos:
+                for linha in _linhas_intervalo(f, offset, fim_trecho):
+                    try:
+                        log = json.loads(linha)
+                    except ValueError:
+                        continue
+                    if logger is not None and log.get("logger") != logger:
+                        continue
+                    if nivel is not None and log.get("nivel") != nivel:
+                        continue
+                    ts = log.get("ts", 0)
+                    if ts_inicio is not None and ts < ts_inicio:
+                        continue
+                    if ts_fim is not None and ts > ts_fim:
+                        continue
+                    yield {
+                        "timestamp": datetime.fromtimestamp(ts).isoformat(),
+                        "logger": log.get("logger"),
+                        "nivel": log.get("nivel"),
+                        "mensagem": log.get("mensagem", "")
+                    }
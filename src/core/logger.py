@@ -1,12 +1,18 @@
 import logging
-from typing import Dict, Any, Optional, List
+import logging.handlers
+from typing import Dict, Any, Optional, List, Iterator
 from datetime import datetime
+from itertools import islice
 import json
 from pathlib import Path
 import threading
 import time
 import os
 import sys
+import atexit
+
+from .log_assincrono import ArquivoRotativoLote, ConsoleLote, EscritorLotes, FilaDescarteAntigo, HandlerFila
+from .log_estruturado import HandlerJSONIndexado, consultar_logs
 
 class Logger:
     """Sistema de logs"""
@@ -15,6 +21,8 @@ class Logger:
         self.config = self._carregar_config(config_path)
         self.loggers: Dict[str, logging.Logger] = {}
         self.lock = threading.Lock()
+        self.escritor: Optional[EscritorLotes] = None
+        self._handlers_fila: Dict[tuple, HandlerFila] = {}
         self._configurar_logging()
         logger = logging.getLogger("logger")
         logger.info("Sistema de Logs inicializado")
@@ -41,7 +49,12 @@ class Logger:
                 "formato": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
                 "data_format": "%Y-%m-%d %H:%M:%S",
                 "max_bytes": 10485760,
-                "backup_count": 5
+                "backup_count": 5,
+                "assincrono": {
+                    "ativo": True,
+                    "tamanho_fila": 10000,
+                    "tamanho_lote": 256
+                }
             },
             "handlers": {
                 "console": {
@@ -53,24 +66,30 @@ class Logger:
                     "formato": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
                     "caminho": "logs",
                     "prefixo": "autocura"
+                },
+                "estruturado": {
+                    "nivel": "DEBUG",
+                    "caminho": "logs",
+                    "prefixo": "autocura",
+                    "intervalo_indice": 10
                 }
             },
             "loggers": {
                 "sistema": {
                     "nivel": "INFO",
-                    "handlers": ["console", "arquivo"]
+                    "handlers": ["console", "arquivo", "estruturado"]
                 },
                 "metricas": {
                     "nivel": "DEBUG",
-                    "handlers": ["arquivo"]
+                    "handlers": ["arquivo", "estruturado"]
                 },
                 "diagnostico": {
                     "nivel": "INFO",
-                    "handlers": ["console", "arquivo"]
+                    "handlers": ["console", "arquivo", "estruturado"]
                 },
                 "cache": {
                     "nivel": "DEBUG",
-                    "handlers": ["arquivo"]
+                    "handlers": ["arquivo", "estruturado"]
                 }
             }
         }
@@ -103,12 +122,12 @@ class Logger:
         """Configura os handlers de logging"""
         try:
             # Handler Console
-            console_handler = logging.StreamHandler()
+            console_handler = ConsoleLote()
             console_handler.setLevel(getattr(logging, self.config["handlers"]["console"]["nivel"]))
             console_handler.setFormatter(logging.Formatter(self.config["handlers"]["console"]["formato"]))
             
             # Handler Arquivo
-            arquivo_handler = logging.handlers.RotatingFileHandler(
+            arquivo_handler = ArquivoRotativoLote(
                 filename=os.path.join(
                     self.config["handlers"]["arquivo"]["caminho"],
                     f"{self.config['handlers']['arquivo']['prefixo']}.log"
@@ -125,10 +144,45 @@ class Logger:
                 "arquivo": arquivo_handler
             }
             
+            # Handler JSON com índice esparso (consultas de obter_logs)
+            config_estruturado = self.config["handlers"].get("estruturado")
+            if config_estruturado:
+                Path(config_estruturado["caminho"]).mkdir(parents=True, exist_ok=True)
+                estruturado_handler = HandlerJSONIndexado(
+                    filename=self._caminho_estruturado(),
+                    intervalo_indice=config_estruturado.get("intervalo_indice", 10),
+                    maxBytes=self.config["configuracoes"]["max_bytes"],
+                    backupCount=self.config["configuracoes"]["backup_count"]
+                )
+                estruturado_handler.setLevel(getattr(logging, config_estruturado["nivel"]))
+                self.handlers["estruturado"] = estruturado_handler
+            
+            # Escrita em thread dedicada: os loggers só enfileiram os registros
+            config_assincrono = self.config["configuracoes"].get("assincrono", {})
+            if config_assincrono.get("ativo", False):
+                fila = FilaDescarteAntigo(config_assincrono.get("tamanho_fila", 10000))
+                self.escritor = EscritorLotes(
+                    fila, list(self.handlers.values()),
+                    tamanho_lote=config_assincrono.get("tamanho_lote", 256)
+                )
+                self.escritor.start()
+                atexit.register(self.fechar)
+            
         except Exception as e:
             print(f"Erro ao configurar handlers: {str(e)}")
             raise
     
+    def _handlers_logger(self, nomes: List[str]) -> List[logging.Handler]:
+        """Handlers a anexar a um logger: os próprios ou um HandlerFila para eles"""
+        destinos = [self.handlers[nome] for nome in nomes]
+        if self.escritor is None:
+            return destinos
+        
+        chave = tuple(nomes)
+        if chave not in self._handlers_fila:
+            self._handlers_fila[chave] = HandlerFila(self.escritor.queue, destinos)
+        return [self._handlers_fila[chave]]
+    
     def _configurar_loggers(self) -> None:
         """Configura os loggers específicos"""
         try:
@@ -142,8 +196,8 @@ class Logger:
                     logger.removeHandler(handler)
                 
                 # Adiciona handlers configurados
-                for handler_name in config["handlers"]:
-                    logger.addHandler(self.handlers[handler_name])
+                for handler in self._handlers_logger(config["handlers"]):
+                    logger.addHandler(handler)
                 
                 # Desabilita propagação para root logger
                 logger.propagate = False
@@ -166,7 +220,7 @@ class Logger:
                 logger.setLevel(getattr(logging, self.config["configuracoes"]["nivel_padrao"]))
                 
                 # Adiciona handlers padrão
-                for handler in self.handlers.values():
+                for handler in self._handlers_logger(list(self.handlers)):
                     logger.addHandler(handler)
                 
                 # Desabilita propagação
@@ -185,6 +239,8 @@ class Logger:
         try:
             logger = self.obter_logger(nome)
             nivel_log = getattr(logging, nivel.upper())
+            if not logger.isEnabledFor(nivel_log):
+                return
             
             # Adiciona timestamp
             kwargs["timestamp"] = datetime.now().isoformat()
@@ -217,6 +273,8 @@ class Logger:
         """Registra métricas no log"""
         try:
             logger = self.obter_logger("metricas")
+            if not logger.isEnabledFor(logging.DEBUG):
+                return
             
             # Formata métricas
             mensagem = f"Métricas {nome}: {json.dumps(metricas, indent=2)}"
@@ -231,6 +289,8 @@ class Logger:
         """Registra diagnóstico no log"""
         try:
             logger = self.obter_logger("diagnostico")
+            if not logger.isEnabledFor(logging.INFO):
+                return
             
             # Formata diagnóstico
             mensagem = f"Diagnóstico {nome}: {json.dumps(diagnostico, indent=2)}"
@@ -245,6 +305,8 @@ class Logger:
         """Registra operação de cache no log"""
         try:
             logger = self.obter_logger("cache")
+            if not logger.isEnabledFor(logging.DEBUG):
+                return
             
             # Formata operação
             mensagem = f"Cache {nome} - {operacao}: {json.dumps(dados, indent=2)}"
@@ -255,38 +317,120 @@ class Logger:
         except Exception as e:
             print(f"Erro ao registrar cache: {str(e)}")
     
+    def descarregar(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Aguarda a escrita dos registros já enfileirados.
+        
+        Args:
+            timeout: Tempo máximo de espera em segundos
+            
+        Returns:
+            bool: True se a fila foi esvaziada dentro do timeout
+        """
+        if self.escritor is None:
+            return True
+        return self.escritor.aguardar(timeout)
+    
+    def fechar(self) -> None:
+        """
+        Esvazia a fila e encerra a thread de escrita.
+        
+        Os loggers voltam a escrever diretamente nos handlers de destino,
+        então registros feitos depois (por exemplo, em outros hooks de
+        atexit) não ficam retidos na fila.
+        """
+        with self.lock:
+            escritor, self.escritor = self.escritor, None
+            if escritor is None:
+                return
+            
+            for logger in self.loggers.values():
+                for handler in logger.handlers[:]:
+                    if isinstance(handler, HandlerFila):
+                        logger.removeHandler(handler)
+                        for destino in handler.destinos:
+                            logger.addHandler(destino)
+            self._handlers_fila.clear()
+            
+            escritor.stop()
+    
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        """Estatísticas da fila de escrita"""
+        if self.escritor is None:
+            return {"assincrono": False}
+        return {"assincrono": True, **self.escritor.obter_estatisticas()}
+    
+    def _caminho_estruturado(self) -> str:
+        """Caminho do arquivo de logs JSON"""
+        config_estruturado = self.config["handlers"]["estruturado"]
+        return os.path.join(config_estruturado["caminho"], f"{config_estruturado['prefixo']}.jsonl")
+    
     def obter_logs(self, nome: str, nivel: Optional[str] = None, 
-                  inicio: Optional[datetime] = None, fim: Optional[datetime] = None) -> List[Dict[str, Any]]:
+                  inicio: Optional[datetime] = None, fim: Optional[datetime] = None,
+                  offset: int = 0, limite: Optional[int] = None) -> List[Dict[str, Any]]:
         """Obtém logs filtrados"""
         try:
-            logger = self.obter_logger(nome)
-            
-            # Obtém caminho do arquivo de log
-            caminho_log = os.path.join(
-                self.config["handlers"]["arquivo"]["caminho"],
-                f"{self.config['handlers']['arquivo']['prefixo']}.log"
-            )
-            
-            logs = []
-            with open(caminho_log, 'r', encoding='utf-8') as f:
-                for linha in f:
-                    try:
-                        # Parse log
-                        log = self._parse_log(linha)
-                        
-                        # Aplica filtros
-                        if self._aplicar_filtros(log, nome, nivel, inicio, fim):
-                            logs.append(log)
-                            
-                    except Exception:
-                        continue
-            
-            return logs
+            return list(self.iterar_logs(nome, nivel, inicio, fim, offset, limite))
             
         except Exception as e:
             print(f"Erro ao obter logs: {str(e)}")
             return []
     
+    def iterar_logs(self, nome: str, nivel: Optional[str] = None,
+                    inicio: Optional[datetime] = None, fim: Optional[datetime] = None,
+                    offset: int = 0, limite: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Gera os logs filtrados sob demanda, em ordem cronológica.
+        
+        Com o handler estruturado configurado, usa o índice esparso dos
+        arquivos JSON (incluindo os rotacionados); caso contrário, varre
+        o arquivo de texto.
+        
+        Args:
+            nome: Nome do logger
+            nivel: Nível do log (opcional)
+            inicio: Data inicial (opcional)
+            fim: Data final (opcional)
+            offset: Logs iniciais a pular
+            limite: Número máximo de logs (opcional)
+        """
+        self.obter_logger(nome)
+        self.descarregar()
+        
+        if "estruturado" in self.handlers:
+            self.handlers["estruturado"].flush()
+            logs = consultar_logs(
+                self._caminho_estruturado(),
+                self.config["configuracoes"]["backup_count"],
+                logger=nome, nivel=nivel, inicio=inicio, fim=fim
+            )
+        else:
+            logs = self._varrer_log_texto(nome, nivel, inicio, fim)
+        
+        return islice(logs, offset, None if limite is None else offset + limite)
+    
+    def _varrer_log_texto(self, nome: str, nivel: Optional[str] = None,
+                          inicio: Optional[datetime] = None, fim: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Varredura completa do arquivo de texto (sem handler estruturado)"""
+        # Obtém caminho do arquivo de log
+        caminho_log = os.path.join(
+            self.config["handlers"]["arquivo"]["caminho"],
+            f"{self.config['handlers']['arquivo']['prefixo']}.log"
+        )
+        
+        with open(caminho_log, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    # Parse log
+                    log = self._parse_log(linha)
+                    
+                    # Aplica filtros
+                    if self._aplicar_filtros(log, nome, nivel, inicio, fim):
+                        yield log
+                        
+                except Exception:
+                    continue
+    
     def _parse_log(self, linha: str) -> Dict[str, Any]:
         """Parse uma linha de log"""
         try:
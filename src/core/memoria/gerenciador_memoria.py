@@ -4,29 +4,60 @@ Gerenciador de Memória Compartilhada - Sistema AutoCura
 
 Este módulo gerencia a memória compartilhada do sistema, mantendo o contexto
 entre diferentes interações e sessões.
+
+Por padrão as mutações são gravadas em um journal append-only (ver
+journal.py) e o arquivo JSON completo só é reescrito na compactação.
+O journal pertence a um único gerenciador: componentes do mesmo
+processo devem compartilhar a instância (ex.: RegistradorContexto).
 """
 
+import atexit
 import json
 import os
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+from .journal import JournalMemoria
+
 class GerenciadorMemoria:
     """
     Gerencia a memória compartilhada do sistema.
     Mantém o contexto entre diferentes interações.
     """
     
-    def __init__(self, arquivo_memoria: str = "memoria_compartilhada.json"):
+    def __init__(self,
+                 arquivo_memoria: str = "memoria_compartilhada.json",
+                 usar_journal: bool = True,
+                 compactar_a_cada: int = 1000,
+                 fsync_lote: int = 64,
+                 fsync_intervalo: float = 1.0):
         """
         Inicializa o gerenciador de memória.
         
         Args:
             arquivo_memoria: Caminho do arquivo de memória compartilhada
+            usar_journal: Grava mutações em journal (False = reescreve o arquivo a cada mutação)
+            compactar_a_cada: Mínimo de registros no journal para um novo snapshot
+            fsync_lote: Registros pendentes que forçam fsync do journal
+            fsync_intervalo: Segundos máximos entre fsyncs do journal
         """
         self.arquivo_memoria = arquivo_memoria
+        self.compactar_a_cada = compactar_a_cada
+        # Serializa mutações e compactações de threads que compartilham a instância
+        self._lock = threading.RLock()
+        # Bloqueia gravações se a memória não pôde ser carregada nem preservada
+        self._persistencia_bloqueada = False
+        self.journal = JournalMemoria(arquivo_memoria, fsync_lote, fsync_intervalo) if usar_journal else None
         self.memoria = self._carregar_memoria()
+        
+        if self.journal is not None:
+            # Incorpora a cauda reaplicada em um snapshot novo
+            if self.journal.registros_desde_snapshot:
+                self.salvar_memoria()
+            atexit.register(self.fechar)
+        
         self._registrar_inicio_fase_beta()
     
     def _registrar_inicio_fase_beta(self):
@@ -56,14 +87,40 @@ class GerenciadorMemoria:
             Dict: Memória carregada
         """
         try:
+            if self.journal is not None:
+                return self.journal.carregar(self._criar_memoria_inicial, self._aplicar_registro)
             if os.path.exists(self.arquivo_memoria):
                 with open(self.arquivo_memoria, 'r', encoding='utf-8') as f:
                     return json.load(f)
             return self._criar_memoria_inicial()
         except Exception as e:
             print(f"Erro ao carregar memória: {e}")
+            self._preservar_arquivos_ilegiveis()
             return self._criar_memoria_inicial()
     
+    def _preservar_arquivos_ilegiveis(self) -> None:
+        """
+        Move para o lado os arquivos que falharam ao carregar.
+        
+        Assim a memória inicial nunca sobrescreve o snapshot (ou o journal)
+        original; se não for possível movê-los, a persistência é bloqueada.
+        """
+        sufixo = f".corrompido-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        arquivos = [self.arquivo_memoria]
+        if self.journal is not None:
+            arquivos.append(self.journal.arquivo_journal)
+        try:
+            for arquivo in arquivos:
+                if os.path.exists(arquivo):
+                    os.replace(arquivo, arquivo + sufixo)
+                    print(f"Arquivo ilegível preservado em {arquivo + sufixo}")
+        except OSError as e:
+            print(f"Erro ao preservar memória ilegível, persistência bloqueada: {e}")
+            self._persistencia_bloqueada = True
+        if self.journal is not None:
+            self.journal.sequencia = 0
+            self.journal.registros_desde_snapshot = 0
+    
     def _criar_memoria_inicial(self) -> Dict:
         """
         Cria uma memória inicial vazia.
@@ -86,22 +143,93 @@ class GerenciadorMemoria:
             "historico_interacoes": []
         }
     
+    @staticmethod
+    def _aplicar_registro(memoria: Dict, registro: Dict) -> None:
+        """
+        Aplica uma mutação do journal à memória.
+        
+        Args:
+            memoria: Memória a alterar
+            registro: Registro com "op", "v" e "ts"
+        """
+        operacao, valor = registro["op"], registro.get("v")
+        
+        if operacao == "acao":
+            memoria.setdefault("historico_interacoes", []).append(valor)
+        elif operacao == "estado":
+            memoria.setdefault("estado_atual", {}).update(valor)
+        elif operacao == "contexto":
+            memoria.setdefault("estado_atual", {})["contexto_atual"] = valor
+        elif operacao == "limpar_historico":
+            memoria["historico_interacoes"] = []
+        
+        if registro.get("ts"):
+            memoria["ultima_atualizacao"] = registro["ts"]
+    
+    def _registrar_mutacao(self, operacao: str, valor: Any = None) -> bool:
+        """
+        Registra uma mutação: aplica em memória e, se for aceita, anexa ao journal.
+        
+        Uma mutação rejeitada (exceção ao aplicar) nunca chega ao journal,
+        para não ser reaplicada na próxima inicialização. Sem journal, aplica
+        e reescreve o arquivo completo.
+        
+        Returns:
+            bool: True se a mutação foi persistida
+        """
+        registro = {"op": operacao, "v": valor, "ts": datetime.now().isoformat()}
+        
+        with self._lock:
+            self._aplicar_registro(self.memoria, registro)
+            if self.journal is None or self._persistencia_bloqueada:
+                return self.salvar_memoria()
+            
+            self.journal.anexar(operacao, valor, registro["ts"])
+            
+            # Compacta quando o journal alcança o tamanho do histórico (ou o mínimo
+            # configurado): o custo de reescrita fica O(1) amortizado por mutação
+            limite = max(self.compactar_a_cada, len(self.memoria.get("historico_interacoes", [])))
+            if self.journal.registros_desde_snapshot >= limite:
+                return self.salvar_memoria()
+            return True
+    
     def salvar_memoria(self) -> bool:
         """
         Salva a memória compartilhada no arquivo.
         
+        Com journal, grava um snapshot compactado e trunca o journal.
+        
         Returns:
             bool: True se salvou com sucesso
         """
+        if self._persistencia_bloqueada:
+            print("Persistência bloqueada: memória original não pôde ser carregada")
+            return False
         try:
-            self.memoria["ultima_atualizacao"] = datetime.now().isoformat()
-            with open(self.arquivo_memoria, 'w', encoding='utf-8') as f:
-                json.dump(self.memoria, f, indent=2, ensure_ascii=False)
-            return True
+            with self._lock:
+                self.memoria["ultima_atualizacao"] = datetime.now().isoformat()
+                if self.journal is not None:
+                    self.journal.compactar(self.memoria)
+                    return True
+                with open(self.arquivo_memoria, 'w', encoding='utf-8') as f:
+                    json.dump(self.memoria, f, indent=2, ensure_ascii=False)
+                return True
         except Exception as e:
             print(f"Erro ao salvar memória: {e}")
             return False
     
+    def sincronizar(self) -> None:
+        """Força fsync das mutações pendentes no journal"""
+        if self.journal is not None:
+            with self._lock:
+                self.journal.sincronizar()
+    
+    def fechar(self) -> None:
+        """Sincroniza e fecha o journal"""
+        if self.journal is not None:
+            with self._lock:
+                self.journal.fechar()
+    
     def atualizar_estado(self, estado: Dict) -> bool:
         """
         Atualiza o estado atual da memória.
@@ -113,8 +241,7 @@ class GerenciadorMemoria:
             bool: True se atualizou com sucesso
         """
         try:
-            self.memoria["estado_atual"].update(estado)
-            return self.salvar_memoria()
+            return self._registrar_mutacao("estado", estado)
         except Exception as e:
             print(f"Erro ao atualizar estado: {e}")
             return False
@@ -131,12 +258,11 @@ class GerenciadorMemoria:
             bool: True se registrou com sucesso
         """
         try:
-            self.memoria["historico_interacoes"].append({
+            return self._registrar_mutacao("acao", {
                 "timestamp": datetime.now().isoformat(),
                 "acao": acao,
                 "detalhes": detalhes
             })
-            return self.salvar_memoria()
         except Exception as e:
             print(f"Erro ao registrar ação: {e}")
             return False
@@ -160,7 +286,7 @@ class GerenciadorMemoria:
         Returns:
             List[Dict]: Histórico de interações
         """
-        historico = self.memoria["historico_interacoes"]
+        historico = self.memoria.get("historico_interacoes", [])
         if limite:
             return historico[-limite:]
         return historico
@@ -173,8 +299,7 @@ class GerenciadorMemoria:
             bool: True se limpou com sucesso
         """
         try:
-            self.memoria["historico_interacoes"] = []
-            return self.salvar_memoria()
+            return self._registrar_mutacao("limpar_historico")
         except Exception as e:
             print(f"Erro ao limpar histórico: {e}")
             return False
@@ -192,12 +317,11 @@ class GerenciadorMemoria:
             bool: True se atualizou com sucesso
         """
         try:
-            self.memoria["estado_atual"]["contexto_atual"] = {
+            return self._registrar_mutacao("contexto", {
                 "tarefa": tarefa,
                 "status": status,
                 "proximos_passos": proximos_passos
-            }
-            return self.salvar_memoria()
+            })
         except Exception as e:
             print(f"Erro ao atualizar contexto: {e}")
             return False 
\ No newline at end of file
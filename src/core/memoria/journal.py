@@ -0,0 +1,178 @@
+"""
+Journal da Memória Compartilhada - Sistema AutoCura
+===================================================
+
+Armazenamento com write-ahead log para o GerenciadorMemoria: cada
+mutação é anexada como uma linha JSON (JSONL) em vez de reescrever o
+arquivo inteiro. Snapshots compactados são gravados periodicamente de
+forma atômica (arquivo temporário + fsync + rename) e o journal é
+truncado. Na inicialização, o snapshot é carregado e a cauda do
+journal é reaplicada.
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Chave do snapshot com a sequência da última mutação já incorporada
+CHAVE_SEQUENCIA = "journal_seq"
+
+
+class JournalMemoria:
+    """
+    Journal append-only de mutações com fsync em lote.
+
+    Cada registro é escrito e enviado ao sistema operacional
+    imediatamente (sobrevive à queda do processo); o fsync, que protege
+    contra queda do sistema, é agrupado por quantidade ou por tempo.
+    """
+
+    def __init__(self,
+                 arquivo_snapshot: str,
+                 fsync_lote: int = 64,
+                 fsync_intervalo: float = 1.0):
+        """
+        Args:
+            arquivo_snapshot: Caminho do snapshot JSON (o journal fica ao lado)
+            fsync_lote: Registros pendentes que forçam um fsync
+            fsync_intervalo: Segundos máximos entre fsyncs (0 = fsync a cada registro)
+        """
+        self.arquivo_snapshot = arquivo_snapshot
+        self.arquivo_journal = f"{arquivo_snapshot}.journal"
+        self.fsync_lote = fsync_lote
+        self.fsync_intervalo = fsync_intervalo
+
+        self.sequencia = 0
+        self.registros_desde_snapshot = 0
+        self._pendentes_fsync = 0
+        self._ultimo_fsync = time.monotonic()
+        self._arquivo = None
+
+    def carregar(self,
+                 criar_inicial: Callable[[], Dict],
+                 aplicar: Callable[[Dict, Dict], None]) -> Dict:
+        """
+        Carrega o snapshot e reaplica a cauda do journal.
+
+        Registros com sequência já incorporada ao snapshot são ignorados
+        (queda entre a troca do snapshot e o truncamento do journal), assim
+        como uma última linha incompleta (queda durante a escrita), que é
+        removida do arquivo. Um registro que não pode ser aplicado é
+        ignorado e reportado, sem descartar o snapshot.
+
+        Args:
+            criar_inicial: Fábrica da memória quando não há snapshot
+            aplicar: Função que aplica um registro à memória
+
+        Returns:
+            Dict: Memória reconstruída
+        """
+        if os.path.exists(self.arquivo_snapshot):
+            with open(self.arquivo_snapshot, 'r', encoding='utf-8') as f:
+                memoria = json.load(f)
+        else:
+            memoria = criar_inicial()
+
+        self.sequencia = memoria.get(CHAVE_SEQUENCIA, 0)
+
+        if os.path.exists(self.arquivo_journal):
+            validos = 0
+            with open(self.arquivo_journal, 'rb') as f:
+                for linha in f:
+                    try:
+                        if not linha.endswith(b"\n"):
+                            raise ValueError("linha incompleta")
+                        registro = json.loads(linha)
+                    except ValueError:
+                        break  # Escrita interrompida: descarta a cauda
+                    validos += len(linha)
+                    if registro["seq"] <= self.sequencia:
+                        continue
+                    try:
+                        aplicar(memoria, registro)
+                    except Exception as e:
+                        print(f"Registro {registro['seq']} do journal ignorado: {e}")
+                    self.sequencia = registro["seq"]
+                    self.registros_desde_snapshot += 1
+
+            # Remove a cauda descartada para que novos registros não sejam anexados a ela
+            if validos < os.path.getsize(self.arquivo_journal):
+                os.truncate(self.arquivo_journal, validos)
+
+        return memoria
+
+    def _abrir(self):
+        if self._arquivo is None:
+            self._arquivo = open(self.arquivo_journal, 'a', encoding='utf-8')
+        return self._arquivo
+
+    def anexar(self, operacao: str, valor: Any = None, timestamp: Optional[str] = None) -> Dict:
+        """
+        Anexa uma mutação ao journal.
+
+        Args:
+            operacao: Nome da operação
+            valor: Dados da operação
+            timestamp: Momento da mutação (ISO)
+
+        Returns:
+            Dict: Registro gravado
+        """
+        self.sequencia += 1
+        registro = {"seq": self.sequencia, "op": operacao, "v": valor, "ts": timestamp}
+
+        arquivo = self._abrir()
+        arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        arquivo.flush()
+
+        self.registros_desde_snapshot += 1
+        self._pendentes_fsync += 1
+        if (self._pendentes_fsync >= self.fsync_lote
+                or time.monotonic() - self._ultimo_fsync >= self.fsync_intervalo):
+            self.sincronizar()
+
+        return registro
+
+    def sincronizar(self) -> None:
+        """Força fsync dos registros pendentes"""
+        if self._arquivo is not None and self._pendentes_fsync:
+            os.fsync(self._arquivo.fileno())
+        self._pendentes_fsync = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def compactar(self, memoria: Dict, indent: Optional[int] = 2) -> None:
+        """
+        Grava snapshot completo de forma atômica e trunca o journal.
+
+        Args:
+            memoria: Estado completo (recebe a sequência incorporada)
+            indent: Indentação do JSON do snapshot
+        """
+        memoria[CHAVE_SEQUENCIA] = self.sequencia
+
+        temporario = f"{self.arquivo_snapshot}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(memoria, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, self.arquivo_snapshot)
+
+        # O snapshot já contém tudo até `sequencia`: o journal pode recomeçar
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+        with open(self.arquivo_journal, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.registros_desde_snapshot = 0
+        self._pendentes_fsync = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def fechar(self) -> None:
+        """Sincroniza e fecha o journal"""
+        self.sincronizar()
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
@@ -3,29 +3,86 @@ Registrador de Contexto Automático - Sistema AutoCura
 =====================================================
 
 Este módulo mantém registro automático de todas as interações e eventos do sistema.
+
+Eventos entram em uma fila em memória e são persistidos por uma thread
+escritora em group commits (por tamanho ou tempo), de modo que o
+caminho da requisição não espera por disco, exceto com durabilidade
+síncrona.
 """
 
+import asyncio
+import atexit
 import json
 import os
+import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from enum import Enum
+from itertools import islice
+from typing import Callable, Deque, Dict, List, Optional, Any, Tuple
 from .gerenciador_memoria import GerenciadorMemoria
 
+
+class Durabilidade(Enum):
+    """Garantia de persistência de um evento ao retornar do registro"""
+    NENHUMA = "none"           # Gravado em lote, sem fsync
+    LOTE = "batched"           # Gravado em lote com um fsync por lote
+    SINCRONA = "synchronous"   # Chamador aguarda o lote com fsync
+
+
+# Item pendente: (tipo, descrição, callback de conclusão); tipo None é marcador de descarga
+_Pendente = Tuple[Optional[str], Optional[str], Optional[Callable[[bool], None]]]
+
+
 class RegistradorContexto:
     """
     Registra automaticamente o contexto e eventos do sistema.
     """
     
-    def __init__(self, arquivo_memoria: str = "memoria_compartilhada.json"):
+    def __init__(self,
+                 arquivo_memoria: str = "memoria_compartilhada.json",
+                 durabilidade: Durabilidade = Durabilidade.LOTE,
+                 tamanho_lote: int = 64,
+                 intervalo_lote: float = 0.05,
+                 max_eventos_recentes: int = 100,
+                 gerenciador_memoria: Optional[GerenciadorMemoria] = None):
         """
         Inicializa o registrador de contexto.
         
         Args:
             arquivo_memoria: Caminho do arquivo de memória compartilhada
+            durabilidade: Nível de durabilidade (none/batched/synchronous)
+            tamanho_lote: Eventos pendentes que disparam um commit
+            intervalo_lote: Segundos máximos que um evento aguarda o commit
+            max_eventos_recentes: Eventos mantidos para obter_eventos_recentes
+            gerenciador_memoria: Gerenciador já aberto sobre o mesmo arquivo
+                (ignora arquivo_memoria). Cada journal numera seus registros,
+                então o arquivo deve ter um único gerenciador por processo.
         """
-        self.gerenciador_memoria = GerenciadorMemoria(arquivo_memoria)
-        self.eventos_recentes = []
+        self._possui_gerenciador = gerenciador_memoria is None
+        if gerenciador_memoria is None:
+            # fsync apenas nos group commits (e nas compactações)
+            gerenciador_memoria = GerenciadorMemoria(
+                arquivo_memoria, fsync_lote=sys.maxsize, fsync_intervalo=float("inf")
+            )
+        self.gerenciador_memoria = gerenciador_memoria
+        self.durabilidade = Durabilidade(durabilidade)
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_lote = intervalo_lote
+        self.eventos_recentes: Deque[Dict] = deque(maxlen=max_eventos_recentes)
         self.instrucoes_pendentes = []
+        
+        self.lotes_gravados = 0
+        self.eventos_gravados = 0
+        self._pendentes: Deque[_Pendente] = deque()
+        self._condicao = threading.Condition()
+        self._lock_memoria = threading.Lock()
+        self._commit_imediato = False
+        self._encerrando = False
+        self._escritor: Optional[threading.Thread] = None
+        atexit.register(self.fechar)
     
     def registrar_evento(self, tipo_evento: str, descricao: str, dados_extras: Optional[Dict] = None) -> bool:
         """
@@ -47,19 +104,176 @@ class RegistradorContexto:
                 "dados": dados_extras or {}
             }
             
+            # Deque limitada descarta os mais antigos
             self.eventos_recentes.append(evento)
             
-            # Mantém apenas os últimos 100 eventos na memória
-            if len(self.eventos_recentes) > 100:
-                self.eventos_recentes.pop(0)
+            # Persistência em group commit
+            if self.durabilidade != Durabilidade.SINCRONA:
+                self._enfileirar((tipo_evento, descricao, None))
+                return True
+            
+            concluido = threading.Event()
+            resultado = []
+            
+            def notificar(sucesso: bool):
+                resultado.append(sucesso)
+                concluido.set()
+            
+            self._enfileirar((tipo_evento, descricao, notificar))
+            concluido.wait()
+            return resultado[0]
+            
+        except Exception as e:
+            print(f"Erro ao registrar evento: {e}")
+            return False
+    
+    async def registrar_evento_async(self, tipo_evento: str, descricao: str,
+                                     dados_extras: Optional[Dict] = None) -> bool:
+        """
+        Registra um evento sem bloquear o event loop.
+        
+        Com durabilidade síncrona, aguarda (de forma assíncrona) o commit do
+        lote que contém o evento.
+        
+        Args:
+            tipo_evento: Tipo do evento
+            descricao: Descrição do evento
+            dados_extras: Dados adicionais opcionais
+            
+        Returns:
+            bool: True se registrou com sucesso
+        """
+        if self.durabilidade != Durabilidade.SINCRONA:
+            return self.registrar_evento(tipo_evento, descricao, dados_extras)
+        
+        try:
+            self.eventos_recentes.append({
+                "timestamp": datetime.now().isoformat(),
+                "tipo": tipo_evento,
+                "descricao": descricao,
+                "dados": dados_extras or {}
+            })
+            
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            
+            def notificar(sucesso: bool):
+                loop.call_soon_threadsafe(
+                    lambda: future.done() or future.set_result(sucesso)
+                )
             
-            # Registra no gerenciador de memória
-            return self.gerenciador_memoria.registrar_acao(tipo_evento, descricao)
+            self._enfileirar((tipo_evento, descricao, notificar))
+            return await future
             
         except Exception as e:
             print(f"Erro ao registrar evento: {e}")
             return False
     
+    def _enfileirar(self, pendente: _Pendente) -> None:
+        """Adiciona item à fila do escritor (iniciando-o se necessário)"""
+        with self._condicao:
+            if self._escritor is None or not self._escritor.is_alive():
+                self._encerrando = False
+                self._escritor = threading.Thread(
+                    target=self._executar_escritor,
+                    name="registrador-contexto-escritor",
+                    daemon=True
+                )
+                self._escritor.start()
+            
+            self._pendentes.append(pendente)
+            if pendente[2] is not None or len(self._pendentes) >= self.tamanho_lote:
+                # Chamadores aguardando não esperam a janela de tempo
+                self._commit_imediato = True
+                self._condicao.notify()
+            elif len(self._pendentes) == 1:
+                self._condicao.notify()
+    
+    def _executar_escritor(self) -> None:
+        """Laço da thread escritora: agrupa pendentes e grava em lotes"""
+        while True:
+            with self._condicao:
+                while not self._pendentes and not self._encerrando:
+                    self._condicao.wait()
+                
+                # Janela de agrupamento: até encher o lote ou expirar o intervalo
+                prazo = time.monotonic() + self.intervalo_lote
+                while not (self._commit_imediato or self._encerrando):
+                    restante = prazo - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._condicao.wait(restante)
+                
+                lote = list(self._pendentes)
+                self._pendentes.clear()
+                self._commit_imediato = False
+                
+                if not lote and self._encerrando:
+                    return
+            
+            self._gravar_lote(lote)
+    
+    def _gravar_lote(self, lote: List[_Pendente]) -> None:
+        """Group commit: grava os eventos do lote e faz um único fsync"""
+        resultados = []
+        with self._lock_memoria:
+            for tipo_evento, descricao, _ in lote:
+                if tipo_evento is None:
+                    resultados.append(True)
+                    continue
+                try:
+                    resultados.append(self.gerenciador_memoria.registrar_acao(tipo_evento, descricao))
+                except Exception as e:
+                    print(f"Erro ao gravar evento: {e}")
+                    resultados.append(False)
+            
+            if self.durabilidade != Durabilidade.NENHUMA:
+                try:
+                    self.gerenciador_memoria.sincronizar()
+                except Exception as e:
+                    print(f"Erro ao sincronizar eventos: {e}")
+                    resultados = [False] * len(lote)
+        
+        self.lotes_gravados += 1
+        self.eventos_gravados += sum(1 for tipo_evento, _, _ in lote if tipo_evento is not None)
+        
+        for (_, _, notificar), sucesso in zip(lote, resultados):
+            if notificar is not None:
+                notificar(sucesso)
+    
+    def descarregar(self, timeout: Optional[float] = None) -> bool:
+        """
+        Grava imediatamente todos os eventos pendentes.
+        
+        Args:
+            timeout: Tempo máximo de espera em segundos
+            
+        Returns:
+            bool: True se os pendentes foram gravados dentro do prazo
+        """
+        if self._escritor is None or not self._escritor.is_alive():
+            return True
+        
+        concluido = threading.Event()
+        self._enfileirar((None, None, lambda sucesso: concluido.set()))
+        return concluido.wait(timeout)
+    
+    def fechar(self) -> None:
+        """Grava pendentes, encerra o escritor e fecha o journal (se o gerenciador for próprio)"""
+        escritor = self._escritor
+        if escritor is not None and escritor.is_alive():
+            with self._condicao:
+                self._encerrando = True
+                self._condicao.notify()
+            escritor.join()
+        self._escritor = None
+        
+        with self._lock_memoria:
+            if self._possui_gerenciador:
+                self.gerenciador_memoria.fechar()
+            else:
+                self.gerenciador_memoria.sincronizar()
+    
     def registrar_instrucao(self, titulo: str, descricao: str, prioridade: int = 1) -> bool:
         """
         Registra uma instrução para outras IAs.
@@ -100,7 +314,8 @@ class RegistradorContexto:
         Returns:
             List[Dict]: Lista de eventos recentes
         """
-        return self.eventos_recentes[-limit:]
+        inicio = max(0, len(self.eventos_recentes) - limit)
+        return list(islice(self.eventos_recentes, inicio, None))
     
     def obter_instrucoes_pendentes(self) -> List[Dict]:
         """
@@ -146,7 +361,8 @@ class RegistradorContexto:
             Dict: Estado atual
         """
         try:
-            estado = self.gerenciador_memoria.obter_estado_atual()
+            with self._lock_memoria:
+                estado = self.gerenciador_memoria.obter_estado_atual()
             
             # Adiciona informações do registrador
             estado["eventos_recentes_count"] = len(self.eventos_recentes)
@@ -170,12 +386,17 @@ class RegistradorContexto:
             bool: True se exportou com sucesso
         """
         try:
+            # Inclui no histórico os eventos ainda na fila
+            self.descarregar()
+            with self._lock_memoria:
+                historico = list(self.gerenciador_memoria.obter_historico())
+            
             contexto_completo = {
                 "timestamp_exportacao": datetime.now().isoformat(),
                 "estado_sistema": self.obter_estado_atual(),
-                "eventos_recentes": self.eventos_recentes,
+                "eventos_recentes": list(self.eventos_recentes),
                 "instrucoes_pendentes": self.instrucoes_pendentes,
-                "historico_interacoes": self.gerenciador_memoria.obter_historico()
+                "historico_interacoes": historico
             }
             
             with open(arquivo_destino, 'w', encoding='utf-8') as f:
@@ -195,10 +416,13 @@ class RegistradorContexto:
             bool: True se limpou com sucesso
         """
         try:
+            # Eventos registrados antes da limpeza também são descartados
+            self.descarregar()
             self.eventos_recentes.clear()
             self.instrucoes_pendentes.clear()
             
-            return self.gerenciador_memoria.limpar_historico()
+            with self._lock_memoria:
+                return self.gerenciador_memoria.limpar_historico()
             
         except Exception as e:
             print(f"Erro ao limpar histórico: {e}")
@@ -0,0 +1,176 @@
+"""
+Testes para o journal da memória compartilhada.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..gerenciador_memoria import GerenciadorMemoria
+from ..journal import CHAVE_SEQUENCIA, JournalMemoria
+from ..registrador_contexto import RegistradorContexto
+
+class TestJournalMemoria(unittest.TestCase):
+    def setUp(self):
+        """Configuração inicial para os testes."""
+        self.diretorio = tempfile.mkdtemp()
+        self.arquivo = os.path.join(self.diretorio, "memoria.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def abrir(self, **kwargs):
+        gerenciador = GerenciadorMemoria(self.arquivo, compactar_a_cada=kwargs.pop("compactar_a_cada", 1000),
+                                         **kwargs)
+        self.addCleanup(gerenciador.fechar)
+        return gerenciador
+
+    def acoes(self, gerenciador):
+        return [item["acao"] for item in gerenciador.obter_historico()]
+
+    def test_reaplica_cauda_do_journal(self):
+        """Mutações gravadas só no journal são reaplicadas ao reabrir."""
+        gerenciador = self.abrir()
+        for i in range(5):
+            gerenciador.registrar_acao(f"acao_{i}", "detalhes")
+        gerenciador.atualizar_contexto("tarefa", "em_andamento", ["passo"])
+        gerenciador.fechar()
+
+        reaberto = self.abrir()
+        self.assertEqual(self.acoes(reaberto), [f"acao_{i}" for i in range(5)])
+        self.assertEqual(reaberto.obter_estado_atual()["contexto_atual"]["tarefa"], "tarefa")
+        # A cauda reaplicada é incorporada em um snapshot novo
+        self.assertEqual(os.path.getsize(reaberto.journal.arquivo_journal), 0)
+
+    def test_compactacao_trunca_journal(self):
+        """A compactação grava o snapshot com a sequência e esvazia o journal."""
+        gerenciador = self.abrir(compactar_a_cada=4)
+        for i in range(10):
+            gerenciador.registrar_acao(f"acao_{i}", "detalhes")
+        gerenciador.fechar()
+
+        with open(self.arquivo, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        with open(gerenciador.journal.arquivo_journal, 'r', encoding='utf-8') as f:
+            registros = [json.loads(linha) for linha in f]
+        self.assertEqual(snapshot[CHAVE_SEQUENCIA] + len(registros), gerenciador.journal.sequencia)
+
+        reaberto = self.abrir()
+        self.assertEqual(self.acoes(reaberto), [f"acao_{i}" for i in range(10)])
+
+    def test_ignora_registros_ja_incorporados(self):
+        """Queda entre a troca do snapshot e o truncamento não duplica registros."""
+        gerenciador = self.abrir()
+        for i in range(3):
+            gerenciador.registrar_acao(f"acao_{i}", "detalhes")
+        gerenciador.sincronizar()
+        journal_antigo = gerenciador.journal.arquivo_journal + ".copia"
+        shutil.copyfile(gerenciador.journal.arquivo_journal, journal_antigo)
+        gerenciador.salvar_memoria()
+        gerenciador.fechar()
+        os.replace(journal_antigo, gerenciador.journal.arquivo_journal)
+
+        reaberto = self.abrir()
+        self.assertEqual(self.acoes(reaberto), ["acao_0", "acao_1", "acao_2"])
+
+    def test_descarta_linha_incompleta(self):
+        """Uma última linha truncada (queda durante a escrita) é descartada."""
+        gerenciador = self.abrir()
+        for i in range(3):
+            gerenciador.registrar_acao(f"acao_{i}", "detalhes")
+        gerenciador.fechar()
+        with open(gerenciador.journal.arquivo_journal, 'a', encoding='utf-8') as f:
+            f.write('{"seq": 4, "op": "acao", "v": {"aca')
+
+        journal = JournalMemoria(self.arquivo)
+        aplicados = []
+        journal.carregar(dict, lambda memoria, registro: aplicados.append(registro["seq"]))
+        self.assertEqual(aplicados, [1, 2, 3])
+
+        reaberto = self.abrir()
+        self.assertEqual(self.acoes(reaberto), ["acao_0", "acao_1", "acao_2"])
+        # Novas mutações continuam a sequência após a cauda descartada
+        reaberto.registrar_acao("acao_3", "detalhes")
+        reaberto.fechar()
+        self.assertEqual(self.acoes(self.abrir()), ["acao_0", "acao_1", "acao_2", "acao_3"])
+
+    def test_remove_cauda_incompleta_antes_de_anexar(self):
+        """Registros novos não são anexados à linha truncada."""
+        journal = JournalMemoria(self.arquivo, fsync_intervalo=0)
+        journal.carregar(dict, lambda memoria, registro: None)
+        journal.anexar("acao", {"acao": "acao_0"})
+        journal.fechar()
+        with open(journal.arquivo_journal, 'a', encoding='utf-8') as f:
+            f.write('{"seq": 2, "op": "ac')
+
+        journal = JournalMemoria(self.arquivo, fsync_intervalo=0)
+        journal.carregar(dict, lambda memoria, registro: None)
+        journal.anexar("acao", {"acao": "acao_1"})
+        journal.fechar()
+
+        aplicados = []
+        JournalMemoria(self.arquivo).carregar(dict, lambda memoria, registro: aplicados.append(registro["v"]))
+        self.assertEqual(aplicados, [{"acao": "acao_0"}, {"acao": "acao_1"}])
+
+    def test_mutacao_rejeitada_nao_apaga_memoria(self):
+        """Uma mutação que falha não vai ao journal nem apaga a memória ao reabrir."""
+        gerenciador = self.abrir()
+        for i in range(5):
+            gerenciador.registrar_acao(f"acao_{i}", "detalhes")
+        self.assertFalse(gerenciador.atualizar_estado(None))
+        gerenciador.fechar()
+
+        for _ in range(2):
+            reaberto = self.abrir()
+            self.assertEqual(self.acoes(reaberto), [f"acao_{i}" for i in range(5)])
+            reaberto.fechar()
+
+    def test_registro_invalido_no_journal_e_ignorado(self):
+        """Um registro que não pode ser reaplicado é ignorado sem descartar o snapshot."""
+        gerenciador = self.abrir()
+        gerenciador.registrar_acao("acao_0", "detalhes")
+        gerenciador.salvar_memoria()
+        gerenciador.registrar_acao("acao_1", "detalhes")
+        gerenciador.fechar()
+        with open(gerenciador.journal.arquivo_journal, 'a', encoding='utf-8') as f:
+            seq = gerenciador.journal.sequencia + 1
+            f.write(json.dumps({"seq": seq, "op": "estado", "v": None, "ts": None}) + "\n")
+            f.write(json.dumps({"seq": seq + 1, "op": "acao", "v": {"acao": "acao_2"}, "ts": None}) + "\n")
+
+        reaberto = self.abrir()
+        self.assertEqual(self.acoes(reaberto), ["acao_0", "acao_1", "acao_2"])
+
+    def test_snapshot_ilegivel_nao_e_sobrescrito(self):
+        """Falha ao carregar preserva o snapshot original em vez de sobrescrevê-lo."""
+        with open(self.arquivo, 'w', encoding='utf-8') as f:
+            f.write('{"historico_interacoes": [')
+
+        gerenciador = self.abrir()
+        self.assertEqual(self.acoes(gerenciador), [])
+        preservados = [nome for nome in os.listdir(self.diretorio) if ".corrompido-" in nome]
+        self.assertEqual(len(preservados), 1)
+        with open(os.path.join(self.diretorio, preservados[0]), 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), '{"historico_interacoes": [')
+
+    def test_registrador_compartilha_gerenciador(self):
+        """Registrador e gerenciador no mesmo arquivo não perdem mutações um do outro."""
+        gerenciador = self.abrir(compactar_a_cada=3)
+        registrador = RegistradorContexto(gerenciador_memoria=gerenciador, intervalo_lote=0)
+        self.addCleanup(registrador.fechar)
+
+        for i in range(5):
+            gerenciador.registrar_acao(f"gerenciador_{i}", "detalhes")
+            registrador.registrar_evento(f"registrador_{i}", "descricao")
+            self.assertTrue(registrador.descarregar(timeout=5))
+        registrador.fechar()
+        gerenciador.fechar()
+
+        acoes = self.acoes(self.abrir())
+        for i in range(5):
+            self.assertIn(f"gerenciador_{i}", acoes)
+            self.assertIn(f"registrador_{i}", acoes)
+
+if __name__ == '__main__':
+    unittest.main()
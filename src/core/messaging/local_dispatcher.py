@@ -0,0 +1,296 @@
+"""
+Despacho Local de Mensagens - AutoCura
+======================================
+
+Caminho em processo do UniversalEventBus (modo sem Redis):
+- Índice de tópicos em trie com curingas ("*" = um segmento,
+  "#" = zero ou mais segmentos finais; segmentos separados por ".")
+- Filas asyncio limitadas por tópico, consumidas por workers próprios,
+  para que um handler lento não paralise quem publica
+- Backpressure ou descarte quando a fila enche
+- Filas ociosas são recolhidas junto com seus workers
+- Métricas de profundidade e atraso (lag) por tópico
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SEPARATOR = "."
+SINGLE_WILDCARD = "*"
+MULTI_WILDCARD = "#"
+
+# Fila consumida pelo worker atual: um handler não pode esperar vaga na própria fila
+_current_queue: ContextVar[Optional["_TopicQueue"]] = ContextVar("local_dispatcher_queue", default=None)
+
+
+def is_pattern(topic: str) -> bool:
+    """Verifica se a inscrição usa curingas"""
+    return any(segment in (SINGLE_WILDCARD, MULTI_WILDCARD)
+               for segment in topic.split(SEGMENT_SEPARATOR))
+
+
+class _TrieNode:
+    __slots__ = ("children", "handlers")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.handlers: List[Callable] = []
+
+
+class TopicTrie:
+    """Índice de inscrições por segmentos de tópico"""
+
+    def __init__(self):
+        self._root = _TrieNode()
+
+    def add(self, pattern: str, handler: Callable) -> None:
+        node = self._root
+        for segment in pattern.split(SEGMENT_SEPARATOR):
+            node = node.children.setdefault(segment, _TrieNode())
+        node.handlers.append(handler)
+
+    def remove(self, pattern: str, handler: Callable) -> bool:
+        path = [self._root]
+        segments = pattern.split(SEGMENT_SEPARATOR)
+        for segment in segments:
+            child = path[-1].children.get(segment)
+            if child is None:
+                return False
+            path.append(child)
+
+        node = path[-1]
+        if handler not in node.handlers:
+            return False
+        node.handlers.remove(handler)
+
+        # Poda ramos vazios
+        for parent, segment, child in zip(reversed(path[:-1]), reversed(segments), reversed(path[1:])):
+            if child.handlers or child.children:
+                break
+            del parent.children[segment]
+        return True
+
+    def match(self, topic: str) -> List[Callable]:
+        """Handlers de todas as inscrições que casam com o tópico"""
+        segments = topic.split(SEGMENT_SEPARATOR)
+        handlers: List[Callable] = []
+
+        def walk(node: _TrieNode, index: int) -> None:
+            multi = node.children.get(MULTI_WILDCARD)
+            if multi is not None:
+                handlers.extend(multi.handlers)
+            if index == len(segments):
+                handlers.extend(node.handlers)
+                return
+            exact = node.children.get(segments[index])
+            if exact is not None:
+                walk(exact, index + 1)
+            single = node.children.get(SINGLE_WILDCARD)
+            if single is not None:
+                walk(single, index + 1)
+
+        walk(self._root, 0)
+        return handlers
+
+
+class OverflowPolicy(Enum):
+    """Comportamento ao publicar em uma fila cheia"""
+    BLOCK = "block"              # Publicador aguarda vaga (backpressure)
+    DROP_NEWEST = "drop_newest"  # Descarta a mensagem publicada
+    DROP_OLDEST = "drop_oldest"  # Descarta a mais antiga da fila
+
+
+class _TopicQueue:
+    """Fila de um tópico com seus workers e contadores"""
+
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.workers: List[asyncio.Task] = []
+        # Workers processando uma mensagem (fora do get)
+        self.busy = 0
+        # Instantes de enfileiramento das mensagens pendentes, na ordem da fila
+        self.enqueued_at: deque = deque()
+        self.published = 0
+        self.processed = 0
+        self.dropped = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+
+class LocalDispatcher:
+    """
+    Despachante em processo com uma fila limitada por tópico.
+
+    Workers são criados na primeira publicação de cada tópico; cada
+    mensagem é entregue a todos os handlers resolvidos para o tópico.
+    Um tópico sem mensagens por idle_timeout segundos tem a fila e os
+    workers recolhidos (e seus contadores descartados), para que tópicos
+    de alta cardinalidade não acumulem tarefas.
+    """
+
+    def __init__(self,
+                 resolve: Callable[[str], List[Callable]],
+                 max_queue_size: int = 1000,
+                 workers_per_topic: int = 1,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                 idle_timeout: Optional[float] = 30.0):
+        """
+        Args:
+            resolve: Função que retorna os handlers de um tópico
+            max_queue_size: Capacidade de cada fila de tópico
+            workers_per_topic: Workers consumindo cada fila
+            overflow_policy: Política quando a fila está cheia
+            idle_timeout: Segundos ociosos antes de recolher a fila de um tópico (None = nunca)
+        """
+        self.resolve = resolve
+        self.max_queue_size = max_queue_size
+        self.workers_per_topic = workers_per_topic
+        self.overflow_policy = overflow_policy
+        self.idle_timeout = idle_timeout
+        self._topics: Dict[str, _TopicQueue] = {}
+
+    def _topic_queue(self, topic: str) -> _TopicQueue:
+        topic_queue = self._topics.get(topic)
+        if topic_queue is None:
+            topic_queue = _TopicQueue(self.max_queue_size)
+            topic_queue.workers = [
+                asyncio.create_task(self._worker(topic, topic_queue))
+                for _ in range(self.workers_per_topic)
+            ]
+            self._topics[topic] = topic_queue
+        return topic_queue
+
+    async def publish(self, message: Any) -> bool:
+        """
+        Enfileira a mensagem no tópico.
+
+        Sob BLOCK, um handler que publica no próprio tópico não aguarda vaga
+        (o worker dele é quem esvazia a fila): com a fila cheia, a mensagem
+        é descartada. Publicações em outros tópicos aguardam normalmente.
+
+        Returns:
+            bool: False se a mensagem foi descartada pela política
+        """
+        topic_queue = self._topic_queue(message.topic)
+        item = (time.monotonic(), message)
+
+        if (self.overflow_policy == OverflowPolicy.BLOCK
+                and topic_queue.queue.full() and _current_queue.get() is topic_queue):
+            # O worker que publica pode ser o único consumidor da fila cheia:
+            # aguardar vaga travaria o tópico para sempre
+            topic_queue.dropped += 1
+            logger.error(f"Fila local cheia; mensagem publicada por handler descartada ({message.topic})")
+            return False
+        elif self.overflow_policy == OverflowPolicy.BLOCK:
+            await topic_queue.queue.put(item)
+            topic_queue.enqueued_at.append(item[0])
+        elif topic_queue.queue.full() and self.overflow_policy == OverflowPolicy.DROP_NEWEST:
+            topic_queue.dropped += 1
+            return False
+        else:
+            if topic_queue.queue.full():
+                topic_queue.queue.get_nowait()
+                topic_queue.queue.task_done()
+                topic_queue.enqueued_at.popleft()
+                topic_queue.dropped += 1
+            topic_queue.queue.put_nowait(item)
+            topic_queue.enqueued_at.append(item[0])
+
+        topic_queue.published += 1
+        return True
+
+    async def _worker(self, topic: str, topic_queue: _TopicQueue) -> None:
+        _current_queue.set(topic_queue)
+        while True:
+            try:
+                enqueued_at, message = await asyncio.wait_for(topic_queue.queue.get(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                if topic_queue.queue.empty() and not topic_queue.busy:
+                    self._reap(topic, topic_queue)
+                    return
+                continue
+            topic_queue.enqueued_at.popleft()
+            topic_queue.busy += 1
+            try:
+                lag = time.monotonic() - enqueued_at
+                topic_queue.last_lag = lag
+                topic_queue.max_lag = max(topic_queue.max_lag, lag)
+                topic_queue.total_lag += lag
+
+                for handler in self.resolve(topic):
+                    try:
+                        await handler(message)
+                    except Exception as e:
+                        logger.error(f"Erro no handler local ({topic}): {e}")
+                topic_queue.processed += 1
+            finally:
+                topic_queue.busy -= 1
+                topic_queue.queue.task_done()
+
+    def _reap(self, topic: str, topic_queue: _TopicQueue) -> None:
+        """Remove um tópico ocioso e cancela os demais workers dele"""
+        if self._topics.get(topic) is topic_queue:
+            del self._topics[topic]
+        current = asyncio.current_task()
+        for worker in topic_queue.workers:
+            if worker is not current:
+                worker.cancel()
+
+    async def join(self) -> None:
+        """Aguarda o esvaziamento de todas as filas"""
+        while True:
+            await asyncio.gather(*(topic_queue.queue.join() for topic_queue in list(self._topics.values())))
+            # Handlers podem ter publicado em filas já esvaziadas ou em tópicos novos
+            if all(topic_queue.queue.empty() and not topic_queue.busy for topic_queue in self._topics.values()):
+                return
+
+    async def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Para os workers.
+
+        Args:
+            drain: Entrega as mensagens pendentes antes de parar
+            timeout: Tempo máximo aguardando a drenagem
+        """
+        if drain and self._topics:
+            try:
+                await asyncio.wait_for(self.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Local dispatcher stopped with pending messages")
+
+        # Publicações posteriores recriam filas com workers novos
+        topics, self._topics = self._topics, {}
+        workers = [worker for topic_queue in topics.values() for worker in topic_queue.workers]
+        current = asyncio.current_task()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*(worker for worker in workers if worker is not current), return_exceptions=True)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Profundidade, atraso e contadores por tópico"""
+        now = time.monotonic()
+        metrics = {}
+        for topic, topic_queue in self._topics.items():
+            # Atraso atual: idade da mensagem mais antiga ainda na fila
+            pending = topic_queue.enqueued_at
+            oldest_age = now - pending[0] if pending else 0.0
+            metrics[topic] = {
+                "depth": topic_queue.queue.qsize(),
+                "capacity": self.max_queue_size,
+                "published": topic_queue.published,
+                "processed": topic_queue.processed,
+                "dropped": topic_queue.dropped,
+                "lag_seconds": oldest_age,
+                "last_lag_seconds": topic_queue.last_lag,
+                "max_lag_seconds": topic_queue.max_lag,
+                "avg_lag_seconds": topic_queue.total_lag / topic_queue.processed if topic_queue.processed else 0.0
+            }
+        return metrics
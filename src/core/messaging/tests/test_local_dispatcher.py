@@ -0,0 +1,174 @@
+"""
+Testes para o despacho local do UniversalEventBus.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from ..local_dispatcher import LocalDispatcher, OverflowPolicy, TopicTrie
+
+def mensagem(topic, payload=None):
+    return SimpleNamespace(topic=topic, payload=payload)
+
+class TestTopicTrie(unittest.TestCase):
+    def setUp(self):
+        self.trie = TopicTrie()
+        for pattern in ("a.b.c", "a.*.c", "a.#", "*.b", "#"):
+            self.trie.add(pattern, pattern)
+
+    def test_curinga_simples_casa_um_segmento(self):
+        self.assertIn("a.*.c", self.trie.match("a.x.c"))
+        self.assertNotIn("a.*.c", self.trie.match("a.x.y.c"))
+        self.assertNotIn("a.*.c", self.trie.match("a.c"))
+
+    def test_curinga_multiplo_casa_segmentos_finais(self):
+        self.assertIn("a.#", self.trie.match("a"))
+        self.assertIn("a.#", self.trie.match("a.x.y.z"))
+        self.assertNotIn("a.#", self.trie.match("b.a"))
+        self.assertIn("#", self.trie.match("qualquer.topico"))
+
+    def test_resolve_todas_as_inscricoes(self):
+        self.assertEqual(sorted(self.trie.match("a.b.c")), ["#", "a.#", "a.*.c", "a.b.c"])
+        self.assertEqual(sorted(self.trie.match("a.b")), ["#", "*.b", "a.#"])
+
+    def test_remove_poda_ramos(self):
+        self.assertTrue(self.trie.remove("a.*.c", "a.*.c"))
+        self.assertFalse(self.trie.remove("a.*.c", "a.*.c"))
+        self.assertNotIn("a.*.c", self.trie.match("a.x.c"))
+        self.assertIn("a.b.c", self.trie.match("a.b.c"))
+
+class TestLocalDispatcher(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.trie = TopicTrie()
+        self.recebidas = []
+
+    def dispatcher(self, **kwargs):
+        dispatcher = LocalDispatcher(self.trie.match, **kwargs)
+        self.addAsyncCleanup(dispatcher.stop, drain=False)
+        return dispatcher
+
+    def inscrever(self, pattern, handler=None):
+        async def registrar(message):
+            self.recebidas.append((message.topic, message.payload))
+        self.trie.add(pattern, handler or registrar)
+
+    async def test_publicacao_entre_topicos_aguarda_vaga(self):
+        """Sob BLOCK, um handler publicando em outro tópico cheio aguarda em vez de descartar."""
+        dispatcher = self.dispatcher(max_queue_size=2)
+
+        async def repassar(message):
+            for i in range(5):
+                self.assertTrue(await dispatcher.publish(mensagem("destino", i)))
+
+        self.trie.add("origem", repassar)
+        self.inscrever("destino")
+        await dispatcher.publish(mensagem("origem"))
+        await asyncio.wait_for(dispatcher.join(), timeout=2)
+
+        self.assertEqual(self.recebidas, [("destino", i) for i in range(5)])
+        self.assertEqual(dispatcher.get_metrics()["destino"]["dropped"], 0)
+
+    async def test_publicacao_no_proprio_topico_cheio_descarta(self):
+        """Sob BLOCK, o worker não espera vaga na fila que só ele consome."""
+        dispatcher = self.dispatcher(max_queue_size=2)
+        resultados = []
+
+        async def republicar(message):
+            self.recebidas.append(message.payload)
+            if message.payload is None:
+                for i in range(3):
+                    resultados.append(await dispatcher.publish(mensagem("eco", i)))
+
+        self.trie.add("eco", republicar)
+        await dispatcher.publish(mensagem("eco"))
+        await asyncio.wait_for(dispatcher.join(), timeout=2)
+
+        self.assertEqual(resultados, [True, True, False])
+        self.assertEqual(self.recebidas, [None, 0, 1])
+        self.assertEqual(dispatcher.get_metrics()["eco"]["dropped"], 1)
+
+    async def test_drop_newest_descarta_a_publicada(self):
+        dispatcher = self.dispatcher(max_queue_size=2, overflow_policy=OverflowPolicy.DROP_NEWEST)
+        self.inscrever("t")
+        # Sem suspender, os workers ainda não consumiram nada
+        resultados = [await dispatcher.publish(mensagem("t", i)) for i in range(5)]
+        await asyncio.wait_for(dispatcher.join(), timeout=2)
+
+        metricas = dispatcher.get_metrics()["t"]
+        self.assertEqual(resultados, [True, True, False, False, False])
+        self.assertEqual(self.recebidas, [("t", 0), ("t", 1)])
+        self.assertEqual((metricas["published"], metricas["processed"], metricas["dropped"]), (2, 2, 3))
+
+    async def test_drop_oldest_descarta_a_mais_antiga(self):
+        dispatcher = self.dispatcher(max_queue_size=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        self.inscrever("t")
+        resultados = [await dispatcher.publish(mensagem("t", i)) for i in range(5)]
+        await asyncio.wait_for(dispatcher.join(), timeout=2)
+
+        metricas = dispatcher.get_metrics()["t"]
+        self.assertEqual(resultados, [True] * 5)
+        self.assertEqual(self.recebidas, [("t", 3), ("t", 4)])
+        self.assertEqual((metricas["published"], metricas["processed"], metricas["dropped"]), (5, 2, 3))
+        self.assertEqual(metricas["depth"], 0)
+
+    async def test_entrega_por_curingas(self):
+        dispatcher = self.dispatcher()
+        self.inscrever("sensor.*.temperatura")
+        self.inscrever("alerta.#")
+        for topic in ("sensor.sala.temperatura", "sensor.sala.umidade", "alerta", "alerta.critico.cpu"):
+            await dispatcher.publish(mensagem(topic))
+        await asyncio.wait_for(dispatcher.join(), timeout=2)
+
+        self.assertEqual(sorted(topic for topic, _ in self.recebidas),
+                         ["alerta", "alerta.critico.cpu", "sensor.sala.temperatura"])
+
+    async def test_stop_com_drenagem_entrega_pendentes(self):
+        dispatcher = self.dispatcher(max_queue_size=10)
+        liberar = asyncio.Event()
+
+        async def lento(message):
+            await liberar.wait()
+            self.recebidas.append(message.payload)
+
+        self.trie.add("t", lento)
+        for i in range(5):
+            await dispatcher.publish(mensagem("t", i))
+        asyncio.get_running_loop().call_later(0.01, liberar.set)
+        await dispatcher.stop(drain=True, timeout=2)
+
+        self.assertEqual(self.recebidas, list(range(5)))
+        self.assertEqual(dispatcher.get_metrics(), {})
+
+    async def test_publicacao_apos_stop_usa_workers_novos(self):
+        """Depois do stop, BLOCK não trava em filas cujos workers foram cancelados."""
+        dispatcher = self.dispatcher(max_queue_size=1)
+        self.inscrever("t")
+        await dispatcher.publish(mensagem("t", 0))
+        await dispatcher.stop(drain=False)
+
+        for i in range(1, 4):
+            await asyncio.wait_for(dispatcher.publish(mensagem("t", i)), timeout=2)
+        await asyncio.wait_for(dispatcher.join(), timeout=2)
+        self.assertEqual(self.recebidas[-3:], [("t", 1), ("t", 2), ("t", 3)])
+
+    async def test_recolhe_topicos_ociosos(self):
+        dispatcher = self.dispatcher(workers_per_topic=2, idle_timeout=0.02)
+        self.inscrever("#")
+        for i in range(20):
+            await dispatcher.publish(mensagem(f"dispositivo.{i}"))
+        workers = [worker for topic_queue in dispatcher._topics.values() for worker in topic_queue.workers]
+        self.assertEqual(len(workers), 40)
+        await asyncio.wait_for(dispatcher.join(), timeout=2)
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(dispatcher._topics, {})
+        self.assertTrue(all(worker.done() for worker in workers))
+
+        # Um tópico recolhido volta a funcionar na próxima publicação
+        await dispatcher.publish(mensagem("dispositivo.0", "de novo"))
+        await asyncio.wait_for(dispatcher.join(), timeout=2)
+        self.assertEqual(self.recebidas[-1], ("dispositivo.0", "de novo"))
+
+if __name__ == '__main__':
+    unittest.main()
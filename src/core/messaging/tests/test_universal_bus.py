@@ -0,0 +1,49 @@
+"""
+Testes para o consumidor bloqueante do UniversalEventBus.
+"""
+
+import asyncio
+import unittest
+
+from ..universal_bus import Message, UniversalEventBus
+
+class RedisFalhandoNaDrenagem:
+    """Cliente síncrono falso: entrega uma mensagem no BRPOP e falha no pipeline."""
+
+    def __init__(self, mensagem):
+        self.pendentes = [mensagem]
+
+    def ping(self):
+        return True
+
+    def brpop(self, queues, timeout=0):
+        if self.pendentes:
+            return (queues[0].encode(), self.pendentes.pop())
+        return None
+
+    def pipeline(self, transaction=False):
+        raise ConnectionError("conexão reiniciada")
+
+class TestConsumidorBloqueante(unittest.IsolatedAsyncioTestCase):
+    async def test_mensagem_do_brpop_e_despachada_se_a_drenagem_falhar(self):
+        mensagem = Message("sensores", {"valor": 1})
+        bus = UniversalEventBus(redis_client=RedisFalhandoNaDrenagem(mensagem.encode().encode()),
+                                async_redis_client=object(), block_timeout=0)
+        recebidas = asyncio.Queue()
+
+        async def handler(message):
+            await recebidas.put(message)
+
+        await bus.subscribe("sensores", handler)
+        await bus.start()
+        try:
+            recebida = await asyncio.wait_for(recebidas.get(), timeout=2)
+        finally:
+            bus.running = False
+            await asyncio.gather(bus._consumer_task, return_exceptions=True)
+
+        self.assertEqual(recebida.payload, {"valor": 1})
+        self.assertEqual(bus.messages_consumed, 1)
+
+if __name__ == '__main__':
+    unittest.main()
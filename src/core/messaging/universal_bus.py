@@ -9,15 +9,28 @@ e prepara para comunicação quântica futura.
 import asyncio
 import json
 import redis
-from typing import Dict, Any, Callable, Optional, List
+import redis.asyncio as aioredis
+from typing import Dict, Any, Callable, Optional, List, Set, Tuple, Union
 from datetime import datetime
 from enum import Enum
 import logging
 from abc import ABC, abstractmethod
 import os
 
+from .local_dispatcher import LocalDispatcher, OverflowPolicy, TopicTrie, is_pattern
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Primeiro byte de um envelope binário (fixarray msgpack de 8 campos);
+# envelopes JSON sempre começam com "{"
+_MSGPACK_ENVELOPE_MARKER = 0x98
+
 class MessageProtocol(Enum):
     """Protocolos de comunicação suportados"""
     CLASSICAL = "classical"
@@ -75,6 +88,57 @@ class Message:
         msg.timestamp = datetime.fromisoformat(data["timestamp"])
         msg.metadata = data.get("metadata", {})
         return msg
+    
+    def to_msgpack(self) -> bytes:
+        """
+        Serializa em envelope binário compacto.
+        
+        Campos posicionais (sem nomes repetidos) e timestamp como epoch
+        float, evitando a formatação ISO a cada envio.
+        """
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is not installed")
+        return msgpack.packb([
+            self.id,
+            self.topic,
+            self.payload,
+            self.protocol.value,
+            self.priority.value,
+            self.sender,
+            self.timestamp.timestamp(),
+            self.metadata
+        ], use_bin_type=True)
+    
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> 'Message':
+        """Cria mensagem a partir do envelope binário"""
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is not installed")
+        msg_id, topic, payload, protocol, priority, sender, timestamp, metadata = msgpack.unpackb(data, raw=False)
+        
+        msg = cls.__new__(cls)
+        msg.id = msg_id
+        msg.topic = topic
+        msg.payload = payload
+        msg.protocol = MessageProtocol(protocol)
+        msg.priority = MessagePriority(priority)
+        msg.sender = sender
+        msg.timestamp = datetime.fromtimestamp(timestamp)
+        msg.metadata = metadata
+        return msg
+    
+    def encode(self, envelope: str = "json") -> Union[str, bytes]:
+        """Serializa no envelope indicado ("json" ou "msgpack")"""
+        if envelope == "msgpack":
+            return self.to_msgpack()
+        return json.dumps(self.to_dict())
+    
+    @classmethod
+    def decode(cls, data: Union[str, bytes]) -> 'Message':
+        """Desserializa envelope JSON ou binário (detectado pelo primeiro byte)"""
+        if isinstance(data, bytes) and data[:1] == bytes([_MSGPACK_ENVELOPE_MARKER]):
+            return cls.from_msgpack(data)
+        return cls.from_dict(json.loads(data))
 
 class UniversalEventBus:
     """
@@ -82,7 +146,67 @@ class UniversalEventBus:
     Preparado para evolução tecnológica.
     """
     
-    def __init__(self, redis_host: Optional[str] = None, redis_port: int = 6379):
+    def __init__(self,
+                 redis_host: Optional[str] = None,
+                 redis_port: int = 6379,
+                 redis_client: Optional[redis.Redis] = None,
+                 consumer_mode: str = "blocking",
+                 batch_size: int = 100,
+                 max_concurrent_handlers: int = 64,
+                 block_timeout: int = 1,
+                 async_redis_client: Optional[aioredis.Redis] = None,
+                 envelope: str = "json",
+                 publish_batch_window: float = 0.002,
+                 publish_batch_size: int = 500,
+                 max_connections: int = 20,
+                 local_queue_size: int = 1000,
+                 local_workers_per_topic: int = 1,
+                 local_idle_timeout: Optional[float] = 30.0,
+                 overflow_policy: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK):
+        """
+        Args:
+            redis_host: Host do Redis (None = detecta Docker/local)
+            redis_port: Porta do Redis
+            redis_client: Cliente Redis já configurado (dispensa host/porta)
+            consumer_mode: "blocking" (BRPOP + drenagem em lote) ou "polling" (legado)
+            batch_size: Máximo de mensagens drenadas por fila a cada lote
+            max_concurrent_handlers: Handlers executando simultaneamente
+            block_timeout: Segundos bloqueado no BRPOP antes de reavaliar tópicos
+            async_redis_client: Cliente redis.asyncio para publicação (None = cria com pool)
+            envelope: Formato das mensagens publicadas ("json" ou "msgpack")
+            publish_batch_window: Segundos em que envios são agrupados em um pipeline
+            publish_batch_size: Envios pendentes que disparam o pipeline antes da janela
+            max_connections: Tamanho do pool de conexões assíncronas
+            local_queue_size: Capacidade de cada fila por tópico no modo em processo
+            local_workers_per_topic: Workers por tópico no modo em processo
+            local_idle_timeout: Segundos ociosos antes de recolher a fila de um tópico local
+            overflow_policy: "block" (backpressure), "drop_newest" ou "drop_oldest"
+        """
+        if consumer_mode not in ("blocking", "polling"):
+            raise ValueError(f"Unknown consumer mode: {consumer_mode}")
+        if envelope not in ("json", "msgpack"):
+            raise ValueError(f"Unknown envelope: {envelope}")
+        if envelope == "msgpack" and not MSGPACK_AVAILABLE:
+            raise ValueError("msgpack envelope requires the msgpack package")
+        
+        self.consumer_mode = consumer_mode
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+        self.max_concurrent_handlers = max_concurrent_handlers
+        self._handler_semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self._consumer_task: Optional[asyncio.Task] = None
+        self.messages_consumed = 0
+        
+        self.envelope = envelope
+        self.publish_batch_window = publish_batch_window
+        self.publish_batch_size = publish_batch_size
+        self._pending: List[Tuple[str, Union[str, bytes], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self.messages_published = 0
+        self.publish_batches = 0
+        
         # Detecta automaticamente se está rodando em Docker
         if redis_host is None:
             # Verifica se está em container Docker
@@ -97,10 +221,10 @@ class UniversalEventBus:
         self.redis_port = redis_port
         
         try:
-            self.redis_client = redis.Redis(
+            self.redis_client = redis_client or redis.Redis(
                 host=self.redis_host, 
                 port=self.redis_port, 
-                decode_responses=True,
+                decode_responses=False,  # Envelopes binários; JSON é decodificado de bytes
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True
@@ -113,7 +237,34 @@ class UniversalEventBus:
             # Fallback para modo sem Redis
             self.redis_client = None
         
+        # Publicação assíncrona com pool de conexões (sem bloquear o event loop)
+        self.async_redis = async_redis_client
+        # Só o cliente criado aqui é fechado em stop(); o injetado pertence a quem chamou
+        self._owns_async_redis = False
+        if self.async_redis is None and self.redis_client is not None and redis_client is None:
+            # Pool bloqueante: picos de envios aguardam conexão em vez de falhar
+            self.async_redis = aioredis.Redis(connection_pool=aioredis.BlockingConnectionPool(
+                host=self.redis_host,
+                port=self.redis_port,
+                max_connections=max_connections,
+                socket_connect_timeout=5,
+                socket_timeout=5
+            ))
+            self._owns_async_redis = True
+        
+        # Inscrições por tópico ou padrão ("a.*", "a.#"); o trie resolve curingas
         self.subscribers: Dict[str, List[Callable]] = {}
+        self._topic_index = TopicTrie()
+        
+        # Caminho em processo (sem Redis ou em falha de publicação)
+        self.local_dispatcher = LocalDispatcher(
+            self._topic_index.match,
+            max_queue_size=local_queue_size,
+            workers_per_topic=local_workers_per_topic,
+            idle_timeout=local_idle_timeout,
+            overflow_policy=OverflowPolicy(overflow_policy)
+        )
+        
         self.running = False
         self.quantum_ready = False
         self.protocol_handlers = {
@@ -127,13 +278,34 @@ class UniversalEventBus:
         self.running = True
         logger.info("Universal Event Bus iniciado")
         if self.redis_client:
-            asyncio.create_task(self._message_processor())
+            self._handler_semaphore = asyncio.Semaphore(self.max_concurrent_handlers)
+            if self.consumer_mode == "blocking":
+                self._consumer_task = asyncio.create_task(self._blocking_consumer())
+            else:
+                self._consumer_task = asyncio.create_task(self._message_processor())
         else:
             logger.warning("Event Bus iniciado em modo fallback (sem Redis)")
     
     async def stop(self):
         """Para o event bus"""
         self.running = False
+        
+        # Publica envios ainda agrupados
+        await self.flush()
+        
+        # Aguarda o consumidor sair do BRPOP e os handlers em execução
+        if self._consumer_task is not None:
+            await asyncio.gather(self._consumer_task, return_exceptions=True)
+            self._consumer_task = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        
+        # Entrega o que restou nas filas locais
+        await self.local_dispatcher.stop(drain=True, timeout=5)
+        
+        if self.async_redis is not None and self._owns_async_redis:
+            await self.async_redis.aclose()
+        
         logger.info("Universal Event Bus parado")
     
     async def send(self, message: Message) -> bool:
@@ -163,12 +335,67 @@ class UniversalEventBus:
         message = Message(topic, payload, MessageProtocol.CLASSICAL, priority)
         return await self.send(message)
     
+    async def send_many(self, messages: List[Message]) -> bool:
+        """
+        Envia várias mensagens em um único pipeline.
+        
+        Mensagens quânticas e híbridas seguem pelo canal clássico, como em send().
+        
+        Args:
+            messages: Mensagens a enviar
+            
+        Returns:
+            bool: True se todas foram enviadas
+        """
+        if not messages:
+            return True
+        
+        for message in messages:
+            if message.protocol == MessageProtocol.QUANTUM and not self.quantum_ready:
+                message.protocol = MessageProtocol.CLASSICAL
+        
+        if not self.redis_client:
+            for message in messages:
+                await self._process_message_direct(message)
+            return True
+        
+        try:
+            await self._publish_batch([
+                (f"queue:{message.topic}:{message.priority.value}", message.encode(self.envelope))
+                for message in messages
+            ])
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao enviar lote de mensagens: {e}")
+            for message in messages:
+                try:
+                    await self._process_message_direct(message)
+                except Exception as fallback_error:
+                    logger.error(f"Erro no fallback: {fallback_error}")
+                    return False
+            return True
+    
+    async def flush(self) -> None:
+        """Publica imediatamente os envios agrupados pendentes"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending:
+            await self._flush_pending()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+    
     async def subscribe(self, topic: str, handler: Callable) -> bool:
         """
         Inscreve handler para receber mensagens de um tópico.
         
+        O tópico pode ser um padrão com segmentos separados por ".":
+        "*" casa um segmento e "#" casa os segmentos restantes. Padrões
+        recebem mensagens entregues em processo e mensagens das filas
+        Redis de tópicos com inscrição exata.
+        
         Args:
-            topic: Tópico a inscrever
+            topic: Tópico (ou padrão) a inscrever
             handler: Função callback
             
         Returns:
@@ -178,6 +405,7 @@ class UniversalEventBus:
             self.subscribers[topic] = []
         
         self.subscribers[topic].append(handler)
+        self._topic_index.add(topic, handler)
         logger.info(f"Handler inscrito no tópico: {topic}")
         return True
     
@@ -185,6 +413,7 @@ class UniversalEventBus:
         """Remove inscrição de handler"""
         if topic in self.subscribers and handler in self.subscribers[topic]:
             self.subscribers[topic].remove(handler)
+            self._topic_index.remove(topic, handler)
             return True
         return False
     
@@ -198,11 +427,11 @@ class UniversalEventBus:
                 return True
             
             # Serializa e envia via Redis
-            serialized = json.dumps(message.to_dict())
+            serialized = message.encode(self.envelope)
             
-            # Usa lista com prioridade
+            # Usa lista com prioridade; envios próximos compartilham um pipeline
             queue_name = f"queue:{message.topic}:{message.priority.value}"
-            self.redis_client.lpush(queue_name, serialized)
+            await self._enqueue_publish(queue_name, serialized)
             
             logger.debug(f"Mensagem clássica enviada: {message.id}")
             return True
@@ -216,15 +445,96 @@ class UniversalEventBus:
                 logger.error(f"Erro no fallback: {fallback_error}")
                 return False
     
+    async def _enqueue_publish(self, queue_name: str, serialized: Union[str, bytes]) -> None:
+        """
+        Agrupa o envio com outros feitos na mesma janela.
+        
+        O primeiro envio agenda a publicação após publish_batch_window;
+        ao atingir publish_batch_size, o lote sai imediatamente. Retorna
+        quando o pipeline do lote for executado (ou propaga seu erro).
+        """
+        if self.publish_batch_window <= 0:
+            await self._publish_batch([(queue_name, serialized)])
+            return
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((queue_name, serialized, future))
+        
+        if len(self._pending) >= self.publish_batch_size:
+            self._schedule_flush(loop, 0)
+        elif self._flush_handle is None:
+            self._schedule_flush(loop, self.publish_batch_window)
+        
+        await future
+    
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop, delay: float) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        
+        def start_flush():
+            self._flush_handle = None
+            task = loop.create_task(self._flush_pending())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+        
+        self._flush_handle = loop.call_later(delay, start_flush) if delay > 0 else loop.call_soon(start_flush)
+    
+    async def _flush_pending(self) -> None:
+        """Publica o lote agrupado e resolve as futures dos remetentes"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        
+        try:
+            await self._publish_batch([(queue_name, data) for queue_name, data, _ in pending])
+        except Exception as e:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for _, _, future in pending:
+            if not future.done():
+                future.set_result(True)
+    
+    async def _publish_batch(self, items: List[Tuple[str, Union[str, bytes]]]) -> None:
+        """
+        LPUSH de um lote em um único pipeline.
+        
+        Mensagens da mesma fila vão em um só LPUSH, na ordem de envio
+        (o consumidor, via RPOP, as recebe em ordem FIFO).
+        """
+        by_queue: Dict[str, List[Union[str, bytes]]] = {}
+        for queue_name, data in items:
+            by_queue.setdefault(queue_name, []).append(data)
+        
+        if self.async_redis is not None:
+            async with self.async_redis.pipeline(transaction=False) as pipe:
+                for queue_name, values in by_queue.items():
+                    pipe.lpush(queue_name, *values)
+                await pipe.execute()
+        else:
+            # Cliente síncrono injetado: executa o pipeline fora do event loop
+            def execute():
+                pipe = self.redis_client.pipeline(transaction=False)
+                for queue_name, values in by_queue.items():
+                    pipe.lpush(queue_name, *values)
+                pipe.execute()
+            await asyncio.to_thread(execute)
+        
+        self.messages_published += len(items)
+        self.publish_batches += 1
+    
     async def _process_message_direct(self, message: Message):
-        """Processa mensagem diretamente (modo fallback)"""
-        topic = message.topic
-        if topic in self.subscribers:
-            for handler in self.subscribers[topic]:
-                try:
-                    await handler(message)
-                except Exception as e:
-                    logger.error(f"Erro no handler direto: {e}")
+        """
+        Processa mensagem em processo (modo fallback).
+        
+        A mensagem entra na fila limitada do tópico e é entregue pelos
+        workers do despachante local, fora da task de quem publica.
+        """
+        if not await self.local_dispatcher.publish(message):
+            logger.debug(f"Mensagem descartada (fila local cheia): {message.id}")
     
     async def _handle_quantum(self, message: Message) -> bool:
         """Prepara para processamento quântico futuro"""
@@ -252,16 +562,18 @@ class UniversalEventBus:
                 
                 # Processa mensagens por prioridade
                 for priority in sorted([p.value for p in MessagePriority], reverse=True):
-                    for topic in self.subscribers:
+                    for topic in list(self.subscribers):
+                        if is_pattern(topic):
+                            continue
                         queue_name = f"queue:{topic}:{priority}"
                         
                         # Busca mensagem
                         msg_data = self.redis_client.rpop(queue_name)
                         if msg_data:
-                            message = Message.from_dict(json.loads(msg_data))
+                            message = Message.decode(msg_data)
                             
                             # Notifica subscribers
-                            for handler in self.subscribers.get(topic, []):
+                            for handler in self._topic_index.match(topic):
                                 try:
                                     await handler(message)
                                 except Exception as e:
@@ -273,6 +585,88 @@ class UniversalEventBus:
                 logger.error(f"Erro no processador de mensagens: {e}")
                 await asyncio.sleep(1)
     
+    def _queue_names(self) -> List[str]:
+        """Filas de todos os tópicos inscritos, da maior para a menor prioridade"""
+        return [
+            f"queue:{topic}:{priority}"
+            for priority in sorted([p.value for p in MessagePriority], reverse=True)
+            for topic in list(self.subscribers)
+            if not is_pattern(topic)
+        ]
+    
+    async def _blocking_consumer(self):
+        """
+        Consome mensagens bloqueando em todas as filas de uma vez.
+        
+        BRPOP recebe as filas em ordem de prioridade (o Redis atende a
+        primeira não vazia); em seguida as demais mensagens pendentes são
+        drenadas em um único pipeline. Nenhuma round trip ocorre enquanto
+        o bus está ocioso além do BRPOP bloqueado.
+        """
+        while self.running:
+            try:
+                queues = self._queue_names()
+                if not queues:
+                    await asyncio.sleep(self.block_timeout)
+                    continue
+                
+                # BRPOP bloqueia: executa fora do event loop
+                popped = await asyncio.to_thread(
+                    self.redis_client.brpop, queues, timeout=self.block_timeout
+                )
+                if not popped:
+                    continue
+                
+                # A mensagem do BRPOP já saiu do Redis: é despachada mesmo se a drenagem falhar
+                batch = [popped]
+                try:
+                    batch.extend(await asyncio.to_thread(self._drain_batch, queues))
+                except Exception as e:
+                    logger.error(f"Erro ao drenar lote; despachando a mensagem já retirada: {e}")
+                
+                for queue_name, msg_data in batch:
+                    try:
+                        message = Message.decode(msg_data)
+                    except Exception as e:
+                        logger.error(f"Invalid message in {queue_name}: {e}")
+                        continue
+                    await self._dispatch(message)
+                
+                self.messages_consumed += len(batch)
+                
+            except Exception as e:
+                logger.error(f"Erro no consumidor bloqueante: {e}")
+                await asyncio.sleep(1)
+    
+    def _drain_batch(self, queues: List[str]) -> List[tuple]:
+        """Retira até batch_size mensagens de cada fila em um pipeline (ordem de prioridade)"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for queue_name in queues:
+            pipe.rpop(queue_name, self.batch_size)
+        
+        drained = []
+        for queue_name, items in zip(queues, pipe.execute()):
+            if items:
+                drained.extend((queue_name, item) for item in items)
+        return drained
+    
+    async def _dispatch(self, message: Message):
+        """Agenda os handlers do tópico, limitados pelo semáforo de concorrência"""
+        for handler in self._topic_index.match(message.topic):
+            # Aguarda vaga antes de criar a task: backpressure sobre a drenagem
+            await self._handler_semaphore.acquire()
+            task = asyncio.create_task(self._run_handler(handler, message))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _run_handler(self, handler: Callable, message: Message):
+        try:
+            await handler(message)
+        except Exception as e:
+            logger.error(f"Erro no handler: {e}")
+        finally:
+            self._handler_semaphore.release()
+    
     def prepare_quantum_channel(self) -> None:
         """Preparação para comunicação quântica futura"""
         logger.info("Preparando canal quântico (simulado)")
@@ -288,13 +682,23 @@ class UniversalEventBus:
             "supported_protocols": [p.value for p in MessageProtocol],
             "redis_connected": self.redis_client is not None,
             "redis_host": self.redis_host,
-            "redis_port": self.redis_port
+            "redis_port": self.redis_port,
+            "consumer_mode": self.consumer_mode,
+            "messages_consumed": self.messages_consumed,
+            "messages_published": self.messages_published,
+            "publish_batches": self.publish_batches,
+            "envelope": self.envelope,
+            "handlers_inflight": len(self._inflight),
+            # Profundidade e atraso por tópico no despacho em processo
+            "local_dispatch": self.local_dispatcher.get_metrics()
         }
         
         # Métricas de fila por tópico (apenas se Redis estiver disponível)
         if self.redis_client:
             try:
                 for topic in self.subscribers:
+                    if is_pattern(topic):
+                        continue
                     for priority in MessagePriority:
                         queue_name = f"queue:{topic}:{priority.value}"
                         queue_size = self.redis_client.llen(queue_name)
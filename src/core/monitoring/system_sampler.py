@@ -0,0 +1,171 @@
+"""
+Amostrador de Métricas do Sistema - Sistema AutoCura
+====================================================
+
+Coleta CPU, memória e disco em uma thread de fundo, em intervalo
+configurável, e publica cada snapshot em um buffer compartilhado sem
+locks. Endpoints assíncronos apenas leem o último snapshot e o
+histórico recente, sem bloquear o event loop com chamadas ao psutil.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class SystemMetricsSampler:
+    """
+    Amostrador periódico de métricas do sistema.
+
+    O buffer é uma tupla imutável substituída a cada amostra (copy-on-write):
+    a troca de referência é atômica, então leitores nunca observam um
+    histórico parcialmente escrito e não disputam lock com o escritor.
+    """
+
+    def __init__(self,
+                 interval: float = 5.0,
+                 history_size: int = 720,
+                 disk_path: str = "/"):
+        """
+        Inicializa o amostrador.
+
+        Args:
+            interval: Segundos entre amostras
+            history_size: Número máximo de snapshots mantidos no histórico
+            disk_path: Ponto de montagem usado para métricas de disco
+        """
+        self.interval = interval
+        self.history_size = history_size
+        self.disk_path = disk_path
+
+        self._history: Tuple[Dict[str, Any], ...] = ()
+        self._latest: Optional[Dict[str, Any]] = None
+        self._latest_monotonic = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Inicia a thread de amostragem (idempotente)"""
+        if self.running:
+            return
+
+        # cpu_percent(interval=None) mede desde a chamada anterior; a
+        # primeira chamada só estabelece a referência
+        psutil.cpu_percent(interval=None)
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="system-metrics-sampler",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"System metrics sampler started (interval={self.interval}s)")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Para a thread de amostragem"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sample_now()
+            except Exception as e:
+                logger.error(f"Error sampling system metrics: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def _collect(self) -> Dict[str, Any]:
+        """Lê CPU, memória e disco uma única vez cada"""
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "system": {
+                "cpu_percent": psutil.cpu_percent(interval=None),
+                "memory": {
+                    "percent": memory.percent,
+                    "used": memory.used,
+                    "total": memory.total
+                },
+                "disk": {
+                    "percent": disk.percent,
+                    "used": disk.used,
+                    "total": disk.total
+                }
+            }
+        }
+
+    def sample_now(self) -> Dict[str, Any]:
+        """
+        Coleta e publica um snapshot imediatamente.
+
+        Não bloqueia por um intervalo de CPU: a porcentagem é calculada
+        desde a amostra anterior.
+
+        Returns:
+            O snapshot publicado
+        """
+        snapshot = self._collect()
+        history = self._history + (snapshot,)
+        if len(history) > self.history_size:
+            history = history[-self.history_size:]
+
+        # Publicação: histórico primeiro, depois o último snapshot
+        self._history = history
+        self._latest = snapshot
+        self._latest_monotonic = time.monotonic()
+        return snapshot
+
+    def latest(self) -> Dict[str, Any]:
+        """
+        Último snapshot publicado.
+
+        Se nenhuma amostra existir ainda (amostrador não iniciado), coleta
+        uma de forma não bloqueante.
+        """
+        snapshot = self._latest
+        if snapshot is None:
+            snapshot = self.sample_now()
+        return snapshot
+
+    def history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Snapshots recentes, do mais antigo ao mais novo.
+
+        Args:
+            limit: Número máximo de snapshots retornados (os mais recentes)
+        """
+        history = self._history
+        if limit is not None:
+            history = history[-limit:] if limit > 0 else ()
+        return list(history)
+
+    def age(self) -> Optional[float]:
+        """Segundos desde o último snapshot (None se ainda não houver)"""
+        if self._latest is None:
+            return None
+        return time.monotonic() - self._latest_monotonic
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado do amostrador para exposição na API"""
+        age = self.age()
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "samples": len(self._history),
+            "age_seconds": round(age, 3) if age is not None else None
+        }
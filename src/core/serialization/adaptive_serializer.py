@@ -3,19 +3,54 @@ Serialização Adaptativa - AutoCura
 ==================================
 
 Sistema de serialização que se adapta ao tipo de dado e tecnologia alvo.
+
+Formato binário (padrão): cabeçalho fixo seguido dos bytes do payload,
+sem base64 nem envelope JSON. Arrays NumPy são gravados crus (dtype e
+shape no cabeçalho) e lidos de volta sem cópia via np.frombuffer.
+
+    magic "ACSB" | versão | formato | codec | ndim | tamanho original (u64)
+    | tamanho gravado (u64) | shape (ndim x u64) | dtype | padding | payload
+
+O envelope JSON legado (base64) continua sendo lido.
+
+Streaming: iter_chunks/serialize_to produzem o mesmo envelope em
+pedaços limitados (arrays sempre sem compressão, de modo que o arquivo
+resultante pode ser mapeado em memória com open_mapped_array);
+deserialize_from/iter_deserialize leem envelopes de um stream.
 """
 
 import json
 import pickle
 import base64
-from typing import Any, Dict, Union, Type
+import struct
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple, Union, Type
 from abc import ABC, abstractmethod
 import numpy as np
 from datetime import datetime
 import logging
 
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+BINARY_MAGIC = b"ACSB"
+BINARY_VERSION = 1
+# magic, versão, formato, codec, ndim, tamanho original, tamanho gravado
+BINARY_HEADER = struct.Struct("<4sBBBBQQ")
+# Início do payload alinhado para leitura direta pelo NumPy
+PAYLOAD_ALIGNMENT = 16
+
 class SerializationFormat:
     """Formatos de serialização suportados"""
     JSON = "json"
@@ -24,6 +59,53 @@ class SerializationFormat:
     QUANTUM = "quantum"  # Preparação futura
     NANO = "nano"        # Preparação futura
 
+
+# Identificadores estáveis dos formatos no cabeçalho binário
+FORMAT_IDS = {
+    SerializationFormat.JSON: 1,
+    SerializationFormat.PICKLE: 2,
+    SerializationFormat.NUMPY: 3,
+    SerializationFormat.QUANTUM: 4,
+    SerializationFormat.NANO: 5,
+}
+FORMAT_NAMES = {format_id: name for name, format_id in FORMAT_IDS.items()}
+
+
+class CompressionCodec:
+    """Codecs de compressão do envelope binário"""
+    NONE = 0
+    ZLIB = 1
+    LZ4 = 2
+    ZSTD = 3
+
+    NAMES = {"zlib": ZLIB, "lz4": LZ4, "zstd": ZSTD}
+
+    @classmethod
+    def available(cls, codec: int) -> bool:
+        if codec == cls.LZ4:
+            return LZ4_AVAILABLE
+        if codec == cls.ZSTD:
+            return ZSTD_AVAILABLE
+        return True
+
+    @classmethod
+    def compress(cls, codec: int, payload) -> bytes:
+        if codec == cls.LZ4:
+            return lz4.frame.compress(payload)
+        if codec == cls.ZSTD:
+            return zstandard.ZstdCompressor().compress(payload)
+        return zlib.compress(payload, 1)
+
+    @classmethod
+    def decompress(cls, codec: int, payload, raw_size: int) -> bytes:
+        if not cls.available(codec):
+            raise RuntimeError(f"Compression codec {codec} is not installed")
+        if codec == cls.LZ4:
+            return lz4.frame.decompress(payload)
+        if codec == cls.ZSTD:
+            return zstandard.ZstdDecompressor().decompress(payload, max_output_size=raw_size)
+        return zlib.decompress(payload)
+
 class BaseSerializer(ABC):
     """Interface base para serializadores"""
     
@@ -146,13 +228,147 @@ class QuantumSerializer(BaseSerializer):
         logger.info("Deserialização quântica simulada - usando fallback clássico")
         return PickleSerializer().deserialize(data)
 
+def _is_raw_array(data: Any) -> bool:
+    """Arrays que podem ir crus no payload (sem objetos nem campos)"""
+    return isinstance(data, np.ndarray) and not data.dtype.hasobject and data.dtype.fields is None
+
+
+def encode_array_metadata(array: np.ndarray) -> bytes:
+    """Shape e dtype do array no formato do cabeçalho binário"""
+    dtype = array.dtype.str.encode('ascii')
+    return struct.pack(f"<{array.ndim}Q", *array.shape) + bytes([len(dtype)]) + dtype
+
+
+def pack_header(format_id: int, codec: int, ndim: int, raw_size: int, stored_size: int,
+                metadata: bytes = b"") -> bytes:
+    """Cabeçalho + metadados, com padding até o alinhamento do payload"""
+    header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, format_id, codec, ndim,
+                                raw_size, stored_size) + metadata
+    return header + b"\0" * (-len(header) % PAYLOAD_ALIGNMENT)
+
+
+def unpack_header(buffer) -> Tuple[int, int, int, int, Optional[Tuple[int, ...]], Optional[np.dtype], int]:
+    """
+    Lê o cabeçalho binário.
+    
+    Returns:
+        Tuple: (formato, codec, tamanho original, tamanho gravado, shape, dtype, offset do payload)
+    """
+    if len(buffer) < BINARY_HEADER.size:
+        raise ValueError("Truncated binary envelope header")
+    magic, version, format_id, codec, ndim, raw_size, stored_size = BINARY_HEADER.unpack_from(buffer, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Not a binary serialization envelope")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary envelope version: {version}")
+    
+    offset = BINARY_HEADER.size
+    shape = dtype = None
+    if FORMAT_NAMES.get(format_id) == SerializationFormat.NUMPY:
+        if len(buffer) < offset + 8 * ndim + 1:
+            raise ValueError("Truncated binary envelope header")
+        shape = struct.unpack_from(f"<{ndim}Q", buffer, offset)
+        offset += 8 * ndim
+        dtype_size = buffer[offset]
+        if len(buffer) < offset + 1 + dtype_size:
+            raise ValueError("Truncated binary envelope header")
+        dtype = np.dtype(bytes(buffer[offset + 1:offset + 1 + dtype_size]).decode('ascii'))
+        offset += 1 + dtype_size
+    
+    offset += -offset % PAYLOAD_ALIGNMENT
+    return format_id, codec, raw_size, stored_size, shape, dtype, offset
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    """Lê exatamente `size` bytes (streams de socket devolvem leituras parciais)"""
+    parts = []
+    remaining = size
+    while remaining:
+        part = stream.read(remaining)
+        if not part:
+            raise EOFError(f"Stream ended {remaining} bytes before the end of the envelope")
+        parts.append(part)
+        remaining -= len(part)
+    return b"".join(parts)
+
+
+def _readinto_exact(stream: BinaryIO, target: memoryview) -> None:
+    """Preenche `target` diretamente a partir do stream"""
+    filled = 0
+    while filled < len(target):
+        count = stream.readinto(target[filled:])
+        if not count:
+            raise EOFError(f"Stream ended {len(target) - filled} bytes before the end of the envelope")
+        filled += count
+
+
+def _read_header_prefix(stream: BinaryIO) -> Optional[bytes]:
+    """Lê o cabeçalho completo (com metadados e padding); None no fim do stream"""
+    first = stream.read(BINARY_HEADER.size)
+    if not first:
+        return None
+    prefix = first + _read_exact(stream, BINARY_HEADER.size - len(first))
+    
+    format_id, ndim = prefix[5], prefix[7]
+    size = BINARY_HEADER.size
+    if FORMAT_NAMES.get(format_id) == SerializationFormat.NUMPY:
+        prefix += _read_exact(stream, 8 * ndim + 1)
+        prefix += _read_exact(stream, prefix[-1])
+        size = len(prefix)
+    return prefix + _read_exact(stream, -size % PAYLOAD_ALIGNMENT)
+
+
+def open_mapped_array(path: str, offset: int = 0, mode: str = 'r') -> np.memmap:
+    """
+    Mapeia em memória um array gravado com serialize_to, sem carregá-lo.
+    
+    Args:
+        path: Arquivo com o envelope binário
+        offset: Posição do envelope no arquivo
+        mode: Modo do np.memmap ('r' ou 'r+')
+        
+    Returns:
+        np.memmap: Array com acesso aleatório sob demanda
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        prefix = _read_header_prefix(f)
+    if prefix is None:
+        raise EOFError(f"No envelope at offset {offset} of {path}")
+    
+    format_id, codec, _, _, shape, dtype, payload_offset = unpack_header(prefix)
+    if FORMAT_NAMES.get(format_id) != SerializationFormat.NUMPY or codec != CompressionCodec.NONE:
+        raise ValueError("Only uncompressed NumPy envelopes can be memory-mapped")
+    return np.memmap(path, dtype=dtype, mode=mode, offset=offset + payload_offset, shape=shape)
+
+
 class AdaptiveSerializer:
     """
     Serializador adaptativo que escolhe o melhor formato
     baseado no tipo de dado e destino.
     """
     
-    def __init__(self):
+    def __init__(self,
+                 binary_envelope: bool = True,
+                 compression: Optional[str] = None,
+                 compression_threshold: int = 64 * 1024):
+        """
+        Args:
+            binary_envelope: Usa o formato binário (False gera o envelope JSON legado)
+            compression: Codec para payloads grandes ("zlib", "lz4", "zstd" ou None)
+            compression_threshold: Tamanho mínimo (bytes) para comprimir o payload
+        """
+        self.binary_envelope = binary_envelope
+        self.compression_threshold = compression_threshold
+        self.compression = CompressionCodec.NONE
+        if compression is not None:
+            if compression not in CompressionCodec.NAMES:
+                raise ValueError(f"Unknown compression codec: {compression}")
+            self.compression = CompressionCodec.NAMES[compression]
+            if not CompressionCodec.available(self.compression):
+                logger.warning(f"Compression codec {compression} not installed, using zlib")
+                self.compression = CompressionCodec.ZLIB
+        
         self.serializers = {
             SerializationFormat.JSON: JSONSerializer(),
             SerializationFormat.PICKLE: PickleSerializer(),
@@ -199,6 +415,9 @@ class AdaptiveSerializer:
                 logger.warning(f"Formato {format_type} não disponível, usando pickle")
                 serializer = self.serializers[SerializationFormat.PICKLE]
             
+            if self.binary_envelope and format_type in FORMAT_IDS:
+                return self._serialize_binary(data, format_type, serializer)
+            
             # Adiciona metadados
             serialized = serializer.serialize(data)
             
@@ -215,10 +434,60 @@ class AdaptiveSerializer:
             logger.error(f"Erro na serialização adaptativa: {e}")
             raise
     
-    def deserialize(self, data: bytes) -> Any:
+    def _serialize_binary(self, data: Any, format_type: str, serializer: BaseSerializer) -> bytes:
+        """Cabeçalho fixo + payload cru (arrays sem cópia intermediária)"""
+        metadata = b""
+        ndim = 0
+        if format_type == SerializationFormat.NUMPY and _is_raw_array(data):
+            # ascontiguousarray promoveria arrays 0-d para 1-d
+            array = data if data.flags.c_contiguous else np.ascontiguousarray(data)
+            metadata = encode_array_metadata(array)
+            ndim = array.ndim
+            payload = memoryview(array.reshape(-1).view(np.uint8))
+        else:
+            if format_type == SerializationFormat.NUMPY:
+                # dtype com objetos ou campos: não cabe no layout cru
+                format_type = SerializationFormat.PICKLE
+                serializer = self.serializers[format_type]
+            payload = serializer.serialize(data)
+        
+        raw_size = len(payload)
+        codec = CompressionCodec.NONE
+        if self.compression and raw_size >= self.compression_threshold:
+            compressed = CompressionCodec.compress(self.compression, payload)
+            # Só mantém a compressão quando compensa
+            if len(compressed) < raw_size:
+                payload, codec = compressed, self.compression
+        
+        header = pack_header(FORMAT_IDS[format_type], codec, ndim, raw_size, len(payload), metadata)
+        return b"".join((header, payload))
+    
+    def _deserialize_binary(self, buffer: memoryview) -> Any:
+        """Lê o envelope binário; arrays sem compressão apontam para o buffer"""
+        format_id, codec, raw_size, stored_size, shape, dtype, offset = unpack_header(buffer)
+        payload = buffer[offset:offset + stored_size]
+        if len(payload) != stored_size:
+            raise ValueError("Truncated binary envelope")
+        
+        if codec != CompressionCodec.NONE:
+            payload = memoryview(CompressionCodec.decompress(codec, payload, raw_size))
+        
+        format_type = FORMAT_NAMES.get(format_id)
+        if format_type == SerializationFormat.NUMPY:
+            return np.frombuffer(payload, dtype=dtype).reshape(shape)
+        
+        serializer = self.serializers.get(format_type)
+        if serializer is None:
+            raise ValueError(f"Unknown serialization format id: {format_id}")
+        return serializer.deserialize(payload.tobytes())
+    
+    def deserialize(self, data: Union[bytes, bytearray, memoryview]) -> Any:
         """
         Deserializa dados detectando formato automaticamente.
         
+        Aceita o envelope binário e o envelope JSON legado. Arrays NumPy
+        sem compressão são views somente leitura sobre `data`.
+        
         Args:
             data: Dados serializados
             
@@ -226,8 +495,12 @@ class AdaptiveSerializer:
             Any: Dados deserializados
         """
         try:
-            # Decodifica envelope
-            envelope = json.loads(data.decode('utf-8'))
+            buffer = memoryview(data)
+            if buffer[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+                return self._deserialize_binary(buffer)
+            
+            # Decodifica envelope legado
+            envelope = json.loads(bytes(buffer).decode('utf-8'))
             
             # Obtém formato
             format_type = envelope.get("format", SerializationFormat.PICKLE)
@@ -245,6 +518,101 @@ class AdaptiveSerializer:
             logger.error(f"Erro na deserialização adaptativa: {e}")
             raise
     
+    def iter_chunks(self, data: Any, chunk_size: int = 1 << 20, target: str = "classical") -> Iterator[bytes]:
+        """
+        Gera o envelope binário em pedaços de até `chunk_size` bytes.
+        
+        Arrays NumPy são fatiados direto do buffer (ou por blocos do
+        primeiro eixo, quando não contíguos), sem montar o envelope
+        inteiro em memória. Outros dados são serializados e então
+        fatiados. A concatenação dos pedaços é um envelope válido.
+        
+        Args:
+            data: Dados a serializar
+            chunk_size: Tamanho máximo de cada pedaço
+            target: Destino (classical, quantum, nano)
+            
+        Yields:
+            bytes: Pedaços (memoryview para dados de arrays)
+        """
+        if target == "classical" and _is_raw_array(data):
+            yield pack_header(FORMAT_IDS[SerializationFormat.NUMPY], CompressionCodec.NONE, data.ndim,
+                              data.nbytes, data.nbytes, encode_array_metadata(data))
+            
+            if data.flags.c_contiguous:
+                flat = memoryview(data.reshape(-1).view(np.uint8))
+                for start in range(0, len(flat), chunk_size):
+                    yield flat[start:start + chunk_size]
+            else:
+                # Cópia limitada a um bloco de linhas por vez
+                row_bytes = max(1, data[0].nbytes) if len(data) else 1
+                rows = max(1, chunk_size // row_bytes)
+                for start in range(0, len(data), rows):
+                    yield memoryview(np.ascontiguousarray(data[start:start + rows]).reshape(-1).view(np.uint8))
+            return
+        
+        envelope = memoryview(self.serialize(data, target))
+        if envelope[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise ValueError("Streaming requires the binary envelope")
+        for start in range(0, len(envelope), chunk_size):
+            yield envelope[start:start + chunk_size]
+    
+    def serialize_to(self, data: Any, stream: BinaryIO, chunk_size: int = 1 << 20,
+                     target: str = "classical") -> int:
+        """
+        Escreve o envelope binário em um stream (arquivo, socket, pipe).
+        
+        Args:
+            data: Dados a serializar
+            stream: Destino com método write()
+            chunk_size: Tamanho máximo de cada escrita
+            target: Destino (classical, quantum, nano)
+            
+        Returns:
+            int: Bytes escritos
+        """
+        written = 0
+        for chunk in self.iter_chunks(data, chunk_size, target):
+            stream.write(chunk)
+            written += len(chunk)
+        return written
+    
+    def deserialize_from(self, stream: BinaryIO) -> Any:
+        """
+        Lê um envelope binário do stream.
+        
+        Arrays sem compressão são lidos diretamente no buffer final
+        (readinto), sem cópias intermediárias.
+        
+        Args:
+            stream: Origem com read()/readinto()
+            
+        Returns:
+            Any: Dados deserializados
+        """
+        prefix = _read_header_prefix(stream)
+        if prefix is None:
+            raise EOFError("Stream is empty")
+        return self._deserialize_stream_payload(prefix, stream)
+    
+    def iter_deserialize(self, stream: BinaryIO) -> Iterator[Any]:
+        """Lê envelopes consecutivos até o fim do stream"""
+        while True:
+            prefix = _read_header_prefix(stream)
+            if prefix is None:
+                return
+            yield self._deserialize_stream_payload(prefix, stream)
+    
+    def _deserialize_stream_payload(self, prefix: bytes, stream: BinaryIO) -> Any:
+        format_id, codec, _, stored_size, shape, dtype, _ = unpack_header(prefix)
+        if FORMAT_NAMES.get(format_id) == SerializationFormat.NUMPY and codec == CompressionCodec.NONE:
+            array = np.empty(shape, dtype=dtype)
+            if array.nbytes:
+                _readinto_exact(stream, memoryview(array.reshape(-1).view(np.uint8)))
+            return array
+        
+        return self._deserialize_binary(memoryview(prefix + _read_exact(stream, stored_size)))
+    
     def _detect_format(self, data: Any) -> str:
         """Detecta melhor formato para o tipo de dado"""
         data_type = type(data)
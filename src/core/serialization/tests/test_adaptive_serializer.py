@@ -0,0 +1,158 @@
+"""
+Testes para o envelope binário do AdaptiveSerializer.
+"""
+
+import io
+import json
+import unittest
+
+import numpy as np
+
+from ..adaptive_serializer import (
+    BINARY_HEADER,
+    BINARY_MAGIC,
+    LZ4_AVAILABLE,
+    ZSTD_AVAILABLE,
+    AdaptiveSerializer,
+    CompressionCodec,
+)
+
+def codec_do_envelope(envelope):
+    return envelope[6]
+
+class TestEnvelopeBinario(unittest.TestCase):
+    def setUp(self):
+        """Configuração inicial para os testes."""
+        self.serializer = AdaptiveSerializer()
+
+    def ida_e_volta(self, dados, serializer=None):
+        serializer = serializer or self.serializer
+        envelope = serializer.serialize(dados)
+        return envelope, serializer.deserialize(envelope)
+
+    def assertArrayIgual(self, original, restaurado):
+        self.assertIsInstance(restaurado, np.ndarray)
+        self.assertEqual(restaurado.dtype, original.dtype)
+        self.assertEqual(restaurado.shape, original.shape)
+        np.testing.assert_array_equal(restaurado, original)
+
+    def test_array_contiguo_sem_copia(self):
+        array = np.arange(24, dtype=np.float64).reshape(4, 6)
+        envelope, restaurado = self.ida_e_volta(array)
+
+        self.assertTrue(envelope.startswith(BINARY_MAGIC))
+        self.assertArrayIgual(array, restaurado)
+        # Sem compressão o array é uma view somente leitura sobre o envelope
+        self.assertFalse(restaurado.flags.writeable)
+
+    def test_array_nao_contiguo(self):
+        base = np.arange(60, dtype=np.int32).reshape(6, 10)
+        for array in (base[::2, 1::3], base.T, base[:, 5]):
+            with self.subTest(shape=array.shape):
+                self.assertFalse(array.flags.c_contiguous)
+                self.assertArrayIgual(array, self.ida_e_volta(array)[1])
+
+    def test_array_0d(self):
+        array = np.array(3.5, dtype=np.float32)
+        restaurado = self.ida_e_volta(array)[1]
+        self.assertArrayIgual(array, restaurado)
+        self.assertEqual(restaurado.ndim, 0)
+
+    def test_array_vazio(self):
+        array = np.zeros((0, 3), dtype=np.int16)
+        self.assertArrayIgual(array, self.ida_e_volta(array)[1])
+
+    def test_array_big_endian(self):
+        array = np.arange(10, dtype='>i4')
+        restaurado = self.ida_e_volta(array)[1]
+        self.assertArrayIgual(array, restaurado)
+        self.assertEqual(restaurado.dtype.byteorder, '>')
+
+    def test_array_estruturado(self):
+        array = np.array([(1, 2.5, b"ab"), (3, -1.0, b"cd")],
+                         dtype=[("id", "<i4"), ("valor", "<f8"), ("nome", "S2")])
+        self.assertArrayIgual(array, self.ida_e_volta(array)[1])
+
+    def test_array_de_objetos(self):
+        array = np.array([{"a": 1}, [1, 2], "texto", None], dtype=object)
+        restaurado = self.ida_e_volta(array)[1]
+        self.assertEqual(restaurado.dtype, object)
+        self.assertEqual(list(restaurado), list(array))
+
+    def test_valores_json(self):
+        for dados in ({"a": 1, "b": [1, 2, {"c": None}], "d": "ç"}, [1, "dois", 3.0, True], "texto", ""):
+            with self.subTest(dados=dados):
+                envelope, restaurado = self.ida_e_volta(dados)
+                self.assertTrue(envelope.startswith(BINARY_MAGIC))
+                self.assertEqual(restaurado, dados)
+
+    def test_compressao_acima_do_limite(self):
+        serializer = AdaptiveSerializer(compression="zlib", compression_threshold=1024)
+
+        pequeno = np.zeros(16, dtype=np.float64)
+        envelope, restaurado = self.ida_e_volta(pequeno, serializer)
+        self.assertEqual(codec_do_envelope(envelope), CompressionCodec.NONE)
+        self.assertArrayIgual(pequeno, restaurado)
+
+        for dados in (np.zeros((256, 64), dtype=np.float64), {"lista": list(range(2000))}):
+            with self.subTest(tipo=type(dados).__name__):
+                envelope, restaurado = self.ida_e_volta(dados, serializer)
+                self.assertEqual(codec_do_envelope(envelope), CompressionCodec.ZLIB)
+                if isinstance(dados, np.ndarray):
+                    self.assertArrayIgual(dados, restaurado)
+                else:
+                    self.assertEqual(restaurado, dados)
+
+    def test_compressao_que_nao_compensa_e_descartada(self):
+        serializer = AdaptiveSerializer(compression="zlib", compression_threshold=1024)
+        aleatorio = np.random.default_rng(0).bytes(4096)
+        array = np.frombuffer(aleatorio, dtype=np.uint8)
+        envelope, restaurado = self.ida_e_volta(array, serializer)
+        self.assertEqual(codec_do_envelope(envelope), CompressionCodec.NONE)
+        self.assertArrayIgual(array, restaurado)
+
+    @unittest.skipUnless(LZ4_AVAILABLE and ZSTD_AVAILABLE, "lz4/zstandard não instalados")
+    def test_codecs_opcionais(self):
+        array = np.zeros((128, 128), dtype=np.int64)
+        for nome, codec in (("lz4", CompressionCodec.LZ4), ("zstd", CompressionCodec.ZSTD)):
+            with self.subTest(codec=nome):
+                serializer = AdaptiveSerializer(compression=nome, compression_threshold=1024)
+                envelope, restaurado = self.ida_e_volta(array, serializer)
+                self.assertEqual(codec_do_envelope(envelope), codec)
+                self.assertArrayIgual(array, restaurado)
+
+    def test_envelope_json_legado(self):
+        legado = AdaptiveSerializer(binary_envelope=False)
+        array = np.arange(12, dtype=np.int64).reshape(3, 4)
+        for dados in ({"a": [1, 2]}, ["x", 1], "texto", array, {1, 2, 3}):
+            with self.subTest(tipo=type(dados).__name__):
+                envelope = legado.serialize(dados)
+                self.assertIn("format", json.loads(envelope))
+                # O serializador padrão continua lendo o formato antigo
+                restaurado = self.serializer.deserialize(envelope)
+                if isinstance(dados, np.ndarray):
+                    self.assertArrayIgual(dados, restaurado)
+                else:
+                    self.assertEqual(restaurado, dados)
+
+    def test_envelope_truncado(self):
+        for dados in (np.arange(100, dtype=np.float64), {"chave": "valor" * 20}):
+            envelope = self.serializer.serialize(dados)
+            for tamanho in (len(BINARY_MAGIC), BINARY_HEADER.size - 1, BINARY_HEADER.size + 3, len(envelope) - 1):
+                with self.subTest(tipo=type(dados).__name__, tamanho=tamanho):
+                    with self.assertRaises(ValueError):
+                        self.serializer.deserialize(envelope[:tamanho])
+
+    def test_stream_com_varios_envelopes(self):
+        dados = [np.arange(1000, dtype=np.float32).reshape(10, 100)[:, ::3], {"a": 1}, "fim"]
+        stream = io.BytesIO()
+        for item in dados:
+            self.serializer.serialize_to(item, stream, chunk_size=64)
+        stream.seek(0)
+
+        lidos = list(self.serializer.iter_deserialize(stream))
+        self.assertArrayIgual(dados[0], lidos[0])
+        self.assertEqual(lidos[1:], dados[1:])
+
+if __name__ == '__main__':
+    unittest.main()
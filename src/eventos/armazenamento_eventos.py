@@ -0,0 +1,282 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .gerenciador_eventos import Evento
+
+
+class GeradorIds:
+    """Gera IDs de evento únicos e monotônicos (resolução de microssegundos)."""
+
+    def __init__(self):
+        self._ultimo = 0
+        self._lock = threading.Lock()
+
+    def proximo(self, tipo: str) -> str:
+        """Gera o próximo ID.
+
+        Args:
+            tipo: Tipo do evento (prefixo do ID)
+
+        Returns:
+            ID no formato tipo_AAAAMMDD_HHMMSS_micros
+        """
+        with self._lock:
+            # Relógio parado ou retrocedendo: avança 1 µs sobre o último ID
+            instante = max(time.time_ns() // 1000, self._ultimo + 1)
+            self._ultimo = instante
+
+        segundos, micros = divmod(instante, 1_000_000)
+        return f"{tipo}_{datetime.fromtimestamp(segundos).strftime('%Y%m%d_%H%M%S')}_{micros:06d}"
+
+
+class _Particao:
+    """Eventos de um tipo em um intervalo de tempo, com índices próprios."""
+
+    __slots__ = ("inicio", "fim", "eventos", "por_origem", "por_status", "por_tag")
+
+    def __init__(self, inicio: datetime, fim: datetime):
+        self.inicio = inicio
+        self.fim = fim
+        self.eventos: Dict[str, "Evento"] = {}
+        self.por_origem: Dict[str, Set[str]] = defaultdict(set)
+        self.por_status: Dict[str, Set[str]] = defaultdict(set)
+        self.por_tag: Dict[str, Set[str]] = defaultdict(set)
+
+    def adicionar(self, evento: "Evento") -> None:
+        self.eventos[evento.id] = evento
+        self.por_origem[evento.origem].add(evento.id)
+        self.por_status[evento.status].add(evento.id)
+        for tag in evento.tags:
+            self.por_tag[tag].add(evento.id)
+
+    def remover(self, evento: "Evento") -> None:
+        del self.eventos[evento.id]
+        self._descartar(self.por_origem, evento.origem, evento.id)
+        self._descartar(self.por_status, evento.status, evento.id)
+        for tag in evento.tags:
+            self._descartar(self.por_tag, tag, evento.id)
+
+    def mudar_status(self, evento: "Evento", anterior: str) -> None:
+        self._descartar(self.por_status, anterior, evento.id)
+        self.por_status[evento.status].add(evento.id)
+
+    @staticmethod
+    def _descartar(indice: Dict[str, Set[str]], chave: str, evento_id: str) -> None:
+        ids = indice.get(chave)
+        if ids is not None:
+            ids.discard(evento_id)
+            if not ids:
+                del indice[chave]
+
+    def candidatos(self, status: Optional[str], origem: Optional[str],
+                   tags: Optional[List[str]]) -> Iterable[str]:
+        """IDs que satisfazem os filtros indexados (interseção dos menores conjuntos)."""
+        conjuntos = []
+        if status:
+            conjuntos.append(self.por_status.get(status, set()))
+        if origem:
+            conjuntos.append(self.por_origem.get(origem, set()))
+        for tag in tags or []:
+            conjuntos.append(self.por_tag.get(tag, set()))
+
+        if not conjuntos:
+            return self.eventos.keys()
+
+        conjuntos.sort(key=len)
+        return conjuntos[0].intersection(*conjuntos[1:])
+
+
+class ArmazenamentoEventos:
+    """Armazenamento de eventos particionado por tipo e intervalo de tempo.
+
+    Cada partição (tipo, intervalo) mantém índices por origem, status e
+    tags. Buscas visitam apenas as partições do tipo e do período pedidos
+    e a expiração por TTL descarta partições inteiras.
+
+    O timestamp de um evento não deve ser alterado depois do registro.
+    """
+
+    def __init__(self, intervalo_particao: timedelta = timedelta(hours=1)):
+        """Inicializa o armazenamento.
+
+        Args:
+            intervalo_particao: Duração coberta por cada partição
+        """
+        self.intervalo_particao = intervalo_particao
+        self._segundos_particao = intervalo_particao.total_seconds()
+
+        # Índice primário por ID (exposto somente leitura como GerenciadorEventos.eventos)
+        self.por_id: Dict[str, "Evento"] = {}
+        # tipo -> chaves de partição ordenadas e partições
+        self._chaves: Dict[str, List[int]] = defaultdict(list)
+        self._particoes: Dict[Tuple[str, int], _Particao] = {}
+
+    def __len__(self) -> int:
+        return len(self.por_id)
+
+    def __contains__(self, evento_id: str) -> bool:
+        return evento_id in self.por_id
+
+    def _chave_particao(self, timestamp: datetime) -> int:
+        return int(timestamp.timestamp() // self._segundos_particao)
+
+    def _particao(self, evento: "Evento", criar: bool = False) -> Optional[_Particao]:
+        chave = self._chave_particao(evento.timestamp)
+        particao = self._particoes.get((evento.tipo, chave))
+        if particao is None and criar:
+            inicio = datetime.fromtimestamp(chave * self._segundos_particao)
+            particao = _Particao(inicio, inicio + self.intervalo_particao)
+            self._particoes[(evento.tipo, chave)] = particao
+            bisect.insort(self._chaves[evento.tipo], chave)
+        return particao
+
+    def adicionar(self, evento: "Evento") -> None:
+        """Adiciona um evento.
+
+        Args:
+            evento: Evento a armazenar
+        """
+        if evento.id in self.por_id:
+            self.remover(evento.id)
+        self._particao(evento, criar=True).adicionar(evento)
+        self.por_id[evento.id] = evento
+
+    def obter(self, evento_id: str) -> Optional["Evento"]:
+        """Obtém um evento pelo ID."""
+        return self.por_id.get(evento_id)
+
+    def remover(self, evento_id: str) -> Optional["Evento"]:
+        """Remove um evento pelo ID.
+
+        Returns:
+            Evento removido ou None se não encontrado
+        """
+        evento = self.por_id.pop(evento_id, None)
+        if evento is None:
+            return None
+
+        particao = self._particao(evento)
+        if particao is not None:
+            particao.remover(evento)
+            if not particao.eventos:
+                self._descartar_particao(evento.tipo, self._chave_particao(evento.timestamp))
+        return evento
+
+    def atualizar_status(self, evento: "Evento", status: str) -> None:
+        """Altera o status de um evento mantendo o índice coerente.
+
+        Args:
+            evento: Evento armazenado
+            status: Novo status
+        """
+        anterior = evento.status
+        evento.status = status
+        particao = self._particao(evento)
+        if particao is not None and evento.id in particao.eventos:
+            particao.mudar_status(evento, anterior)
+
+    def _descartar_particao(self, tipo: str, chave: int) -> None:
+        del self._particoes[(tipo, chave)]
+        chaves = self._chaves[tipo]
+        del chaves[bisect.bisect_left(chaves, chave)]
+        if not chaves:
+            del self._chaves[tipo]
+
+    def _particoes_no_periodo(self, tipo: Optional[str], inicio: Optional[datetime],
+                              fim: Optional[datetime]) -> Iterator[_Particao]:
+        tipos = [tipo] if tipo else list(self._chaves)
+        for tipo_atual in tipos:
+            chaves = self._chaves.get(tipo_atual, [])
+            primeira = bisect.bisect_left(chaves, self._chave_particao(inicio)) if inicio else 0
+            ultima = bisect.bisect_right(chaves, self._chave_particao(fim)) if fim else len(chaves)
+            for chave in chaves[primeira:ultima]:
+                yield self._particoes[(tipo_atual, chave)]
+
+    def buscar(self, tipo: Optional[str] = None, status: Optional[str] = None,
+               origem: Optional[str] = None, tags: Optional[List[str]] = None,
+               inicio: Optional[datetime] = None, fim: Optional[datetime] = None) -> List["Evento"]:
+        """Busca eventos pelos índices.
+
+        Args:
+            tipo: Tipo do evento (opcional)
+            status: Status do evento (opcional)
+            origem: Origem do evento (opcional)
+            tags: Tags que o evento deve ter (todas; opcional)
+            inicio: Data inicial (opcional)
+            fim: Data final (opcional)
+
+        Returns:
+            Lista de eventos encontrados
+        """
+        eventos = []
+        for particao in self._particoes_no_periodo(tipo, inicio, fim):
+            # Só partições nas bordas do período precisam do filtro por timestamp
+            filtrar_inicio = inicio is not None and particao.inicio < inicio
+            filtrar_fim = fim is not None and particao.fim > fim
+
+            for evento_id in particao.candidatos(status, origem, tags):
+                evento = particao.eventos[evento_id]
+                if filtrar_inicio and evento.timestamp < inicio:
+                    continue
+                if filtrar_fim and evento.timestamp > fim:
+                    continue
+                eventos.append(evento)
+
+        # Ordem cronológica, como na varredura original
+        eventos.sort(key=lambda evento: evento.timestamp)
+        return eventos
+
+    def expirar(self, tipo: str, limite: datetime) -> int:
+        """Remove eventos do tipo anteriores ao limite.
+
+        Partições totalmente anteriores ao limite são descartadas inteiras;
+        apenas a partição que contém o limite é filtrada evento a evento.
+
+        Args:
+            tipo: Tipo dos eventos
+            limite: Eventos com timestamp anterior são removidos
+
+        Returns:
+            Número de eventos removidos
+        """
+        removidos = 0
+        chaves = self._chaves.get(tipo, [])
+        chave_limite = self._chave_particao(limite)
+
+        for chave in chaves[:bisect.bisect_left(chaves, chave_limite)]:
+            particao = self._particoes[(tipo, chave)]
+            for evento_id in particao.eventos:
+                del self.por_id[evento_id]
+            removidos += len(particao.eventos)
+            self._descartar_particao(tipo, chave)
+
+        particao = self._particoes.get((tipo, chave_limite))
+        if particao is not None:
+            antigos = [evento for evento in particao.eventos.values() if evento.timestamp < limite]
+            for evento in antigos:
+                self.remover(evento.id)
+            removidos += len(antigos)
+
+        return removidos
+
+    def contagens(self) -> Dict[str, Dict[str, int]]:
+        """Contagens por tipo, status, origem e tag a partir dos índices."""
+        contagens = {
+            "por_tipo": defaultdict(int),
+            "por_status": defaultdict(int),
+            "por_origem": defaultdict(int),
+            "por_tag": defaultdict(int)
+        }
+        for (tipo, _), particao in self._particoes.items():
+            contagens["por_tipo"][tipo] += len(particao.eventos)
+            for nome, indice in (("por_status", particao.por_status),
+                                 ("por_origem", particao.por_origem),
+                                 ("por_tag", particao.por_tag)):
+                for chave, ids in indice.items():
+                    contagens[nome][chave] += len(ids)
+        return {nome: dict(valores) for nome, valores in contagens.items()}
@@ -1,11 +1,22 @@
 import logging
 import asyncio
+import itertools
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from types import MappingProxyType
+from typing import Deque, Dict, List, Mapping, Optional, Any, Callable, Tuple
 from dataclasses import dataclass
 import json
 from prometheus_client import Counter, Gauge, Histogram
 
+from .armazenamento_eventos import ArmazenamentoEventos, GeradorIds
+
+# Marca o contexto dos workers: handlers que publicam não podem esperar vaga na fila
+_em_worker: ContextVar[bool] = ContextVar("eventos_em_worker", default=False)
+
 @dataclass
 class Evento:
     """Representa um evento do sistema."""
@@ -30,8 +41,14 @@ class GerenciadorEventos:
         self.config = config
         self.logger = logging.getLogger(__name__)
         
-        # Cache de eventos
-        self.eventos: Dict[str, Evento] = {}
+        # Armazenamento indexado e particionado por tipo/tempo
+        self.armazenamento = ArmazenamentoEventos(
+            timedelta(seconds=config.get("intervalo_particao", 3600))
+        )
+        self.gerador_ids = GeradorIds()
+        
+        # Índice por ID (somente leitura; alterações passam pelo armazenamento)
+        self.eventos: Mapping[str, Evento] = MappingProxyType(self.armazenamento.por_id)
         
         # Handlers de eventos
         self.handlers: Dict[str, List[Callable]] = {}
@@ -57,6 +74,15 @@ class GerenciadorEventos:
                 "tempo_processamento_evento_seconds",
                 "Tempo de processamento de eventos",
                 ["tipo"]
+            ),
+            "fila_profundidade": Gauge(
+                "eventos_fila_profundidade",
+                "Eventos aguardando processamento (na fila ou adiados pelo limite do tipo)"
+            ),
+            "tempo_espera_fila": Histogram(
+                "tempo_espera_fila_evento_seconds",
+                "Tempo de espera dos eventos na fila de processamento",
+                ["tipo"]
             )
         }
         
@@ -80,11 +106,121 @@ class GerenciadorEventos:
             }
         }
         
+        # Despacho: fila por prioridade (menor valor primeiro) e pool fixo de workers.
+        # tamanho_fila limita os eventos aguardando processamento, na fila ou adiados
+        self.num_workers = config.get("num_workers", 8)
+        self.tamanho_fila = config.get("tamanho_fila", 10000)
+        self._fila: Optional[asyncio.PriorityQueue] = None
+        self._vagas: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+        self._sequencia = itertools.count()
+        
+        # Concorrência máxima por tipo ("max_concorrencia" em tipos_evento ou padrão da config)
+        self.max_concorrencia_tipo = config.get("max_concorrencia_tipo", self.num_workers)
+        self._em_execucao: Dict[str, int] = {}
+        # Eventos retirados da fila com o tipo no limite, aguardando uma vaga do tipo
+        self._adiados: Dict[str, Deque[Tuple]] = {}
+        
+        # Handlers síncronos pesados podem rodar fora do event loop
+        self._modo_handlers: Dict[Callable, str] = {}
+        self._executores: Dict[str, Executor] = {}
+        self.max_workers_executor = config.get("max_workers_executor")
+        
         self.logger.info("Gerenciador de Eventos inicializado")
     
+    def _iniciar_workers(self) -> None:
+        """Cria a fila e os workers no event loop atual (na primeira publicação)."""
+        if self._fila is None:
+            self._fila = asyncio.PriorityQueue()
+            self._vagas = asyncio.Semaphore(self.tamanho_fila)
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"eventos-worker-{i}")
+                for i in range(self.num_workers)
+            ]
+    
+    def _limite_concorrencia(self, tipo: str) -> int:
+        return self.tipos_evento.get(tipo, {}).get("max_concorrencia", self.max_concorrencia_tipo)
+    
+    def _profundidade(self) -> int:
+        """Eventos aguardando processamento: na fila e adiados."""
+        return self._fila.qsize() + sum(len(adiados) for adiados in self._adiados.values())
+    
+    async def _worker(self) -> None:
+        """Consome a fila em ordem de prioridade.
+        
+        Um evento cujo tipo já está no limite de concorrência é adiado (sem
+        ocupar o worker), e o worker segue para o próximo da fila. Quando
+        uma vaga do tipo é liberada, o próximo adiado volta para a fila com
+        sua prioridade original. Adiados continuam ocupando vaga da fila.
+        """
+        _em_worker.set(True)
+        while True:
+            item = await self._fila.get()
+            tipo = item[3].tipo
+            if self._em_execucao.get(tipo, 0) >= self._limite_concorrencia(tipo):
+                # task_done só quando o evento for processado, para que join() o aguarde
+                self._adiados.setdefault(tipo, deque()).append(item)
+                continue
+            
+            await self._executar_item(item)
+    
+    async def _executar_item(self, item: Tuple) -> None:
+        """Processa um item da fila ocupando uma vaga de concorrência do tipo."""
+        _, _, enfileirado_em, evento = item
+        self._em_execucao[evento.tipo] = self._em_execucao.get(evento.tipo, 0) + 1
+        # O evento deixou de aguardar: libera a vaga para os produtores
+        self._vagas.release()
+        self.metricas["fila_profundidade"].set(self._profundidade())
+        try:
+            self.metricas["tempo_espera_fila"].labels(tipo=evento.tipo).observe(
+                time.monotonic() - enfileirado_em
+            )
+            await self._processar_evento(evento)
+        finally:
+            self._em_execucao[evento.tipo] -= 1
+            adiados = self._adiados.get(evento.tipo)
+            if adiados:
+                # Reenfileira antes do task_done do item adiado para join() não retornar no meio
+                self._fila.put_nowait(adiados.popleft())
+                self._fila.task_done()
+            self._fila.task_done()
+    
+    async def aguardar_processamento(self) -> None:
+        """Aguarda até que todos os eventos enfileirados sejam processados."""
+        if self._fila is not None:
+            await self._fila.join()
+    
+    async def parar(self, drenar: bool = True, timeout: Optional[float] = None) -> None:
+        """Para os workers e os executores de handlers.
+        
+        Args:
+            drenar: Processa os eventos pendentes antes de parar
+            timeout: Tempo máximo aguardando a drenagem
+        """
+        if drenar and self._fila is not None:
+            try:
+                await asyncio.wait_for(self._fila.join(), timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Workers parados com {self._profundidade()} eventos na fila")
+        
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        
+        for executor in self._executores.values():
+            executor.shutdown(wait=drenar)
+        self._executores.clear()
+    
     async def registrar_evento(self, tipo: str, dados: Dict[str, Any], origem: str, tags: List[str] = None) -> Optional[Evento]:
         """Registra um novo evento.
         
+        Fora dos workers aguarda vaga quando a fila está cheia (eventos
+        adiados pelo limite do tipo também ocupam vaga). Chamado de
+        dentro de um handler não aguarda: com a fila cheia o evento fica com
+        status "erro" e o retorno é None.
+        
         Args:
             tipo: Tipo do evento
             dados: Dados do evento
@@ -99,8 +235,8 @@ class GerenciadorEventos:
             return None
         
         try:
-            # Gera ID único
-            evento_id = f"{tipo}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            # Gera ID único e monotônico
+            evento_id = self.gerador_ids.proximo(tipo)
             
             # Cria evento
             evento = Evento(
@@ -114,15 +250,29 @@ class GerenciadorEventos:
                 status="pendente"
             )
             
-            # Adiciona ao cache
-            self.eventos[evento_id] = evento
+            # Adiciona ao armazenamento
+            self.armazenamento.adicionar(evento)
             
             # Atualiza métricas
             self.metricas["eventos_criados"].labels(tipo=tipo, origem=origem).inc()
             self.metricas["eventos_pendentes"].labels(tipo=tipo).inc()
             
-            # Agenda processamento
-            asyncio.create_task(self._processar_evento(evento))
+            # Enfileira para os workers (aguarda vaga quando a fila está cheia)
+            self._iniciar_workers()
+            item = (evento.prioridade, next(self._sequencia), time.monotonic(), evento)
+            if _em_worker.get():
+                # Dentro de um handler o worker não pode esperar a fila esvaziar:
+                # se todos os workers publicarem com a fila cheia, ninguém a consome
+                if self._vagas.locked():
+                    self.logger.error(f"Fila cheia; evento publicado por handler descartado: {evento_id}")
+                    self.armazenamento.atualizar_status(evento, "erro")
+                    self.metricas["eventos_processados"].labels(tipo=tipo, status=evento.status).inc()
+                    self.metricas["eventos_pendentes"].labels(tipo=tipo).dec()
+                    return None
+            # Com vaga livre o acquire retorna sem suspender
+            await self._vagas.acquire()
+            self._fila.put_nowait(item)
+            self.metricas["fila_profundidade"].set(self._profundidade())
             
             self.logger.info(f"Evento registrado: {evento_id}")
             return evento
@@ -147,12 +297,12 @@ class GerenciadorEventos:
                 # Processa com cada handler
                 for handler in self.handlers[evento.tipo]:
                     try:
-                        await handler(evento)
+                        await self._executar_handler(handler, evento)
                     except Exception as e:
                         self.logger.error(f"Erro no handler {handler.__name__}: {e}")
                 
                 # Atualiza status
-                evento.status = "processado"
+                self.armazenamento.atualizar_status(evento, "processado")
                 
                 # Atualiza métricas
                 self.metricas["eventos_processados"].labels(
@@ -165,7 +315,7 @@ class GerenciadorEventos:
                 
         except Exception as e:
             self.logger.error(f"Erro ao processar evento: {e}")
-            evento.status = "erro"
+            self.armazenamento.atualizar_status(evento, "erro")
             
             # Atualiza métricas
             self.metricas["eventos_processados"].labels(
@@ -174,17 +324,47 @@ class GerenciadorEventos:
             ).inc()
             self.metricas["eventos_pendentes"].labels(tipo=evento.tipo).dec()
     
-    def registrar_handler(self, tipo: str, handler: Callable) -> None:
+    async def _executar_handler(self, handler: Callable, evento: Evento) -> None:
+        """Executa o handler no event loop ou no executor configurado."""
+        modo = self._modo_handlers.get(handler)
+        if modo is None:
+            resultado = handler(evento)
+            if asyncio.iscoroutine(resultado):
+                await resultado
+            return
+        
+        executor = self._executores.get(modo)
+        if executor is None:
+            if modo == "processo":
+                executor = ProcessPoolExecutor(max_workers=self.max_workers_executor)
+            else:
+                executor = ThreadPoolExecutor(max_workers=self.max_workers_executor,
+                                              thread_name_prefix="eventos-handler")
+            self._executores[modo] = executor
+        
+        await asyncio.get_running_loop().run_in_executor(executor, handler, evento)
+    
+    def registrar_handler(self, tipo: str, handler: Callable, executor: Optional[str] = None) -> None:
         """Registra um handler para um tipo de evento.
         
         Args:
             tipo: Tipo do evento
-            handler: Função handler
+            handler: Função handler (corrotina ou função síncrona)
+            executor: "thread" ou "processo" para rodar handlers síncronos
+                pesados fora do event loop (no modo processo, handler e
+                evento precisam ser serializáveis com pickle)
         """
+        if executor not in (None, "thread", "processo"):
+            raise ValueError(f"Executor de handler inválido: {executor}")
+        if executor is not None and asyncio.iscoroutinefunction(handler):
+            raise ValueError("Handlers assíncronos rodam no event loop; executor é apenas para funções síncronas")
+        
         if tipo not in self.handlers:
             self.handlers[tipo] = []
         
         self.handlers[tipo].append(handler)
+        if executor is not None:
+            self._modo_handlers[handler] = executor
         self.logger.info(f"Handler registrado para evento: {tipo}")
     
     async def obter_evento(self, evento_id: str) -> Optional[Evento]:
@@ -214,50 +394,21 @@ class GerenciadorEventos:
         Returns:
             Lista de eventos encontrados
         """
-        eventos = []
-        
-        for evento in self.eventos.values():
-            # Filtra por tipo
-            if tipo and evento.tipo != tipo:
-                continue
-            
-            # Filtra por status
-            if status and evento.status != status:
-                continue
-            
-            # Filtra por origem
-            if origem and evento.origem != origem:
-                continue
-            
-            # Filtra por tags
-            if tags and not all(tag in evento.tags for tag in tags):
-                continue
-            
-            # Filtra por período
-            if inicio and evento.timestamp < inicio:
-                continue
-            if fim and evento.timestamp > fim:
-                continue
-            
-            eventos.append(evento)
-        
-        return eventos
+        return self.armazenamento.buscar(
+            tipo=tipo, status=status, origem=origem, tags=tags, inicio=inicio, fim=fim
+        )
     
     async def limpar_eventos_antigos(self) -> None:
         """Limpa eventos antigos baseado no TTL configurado."""
         agora = datetime.now()
-        eventos_remover = []
-        
-        for evento in self.eventos.values():
-            ttl = self.tipos_evento[evento.tipo]["ttl"]
-            if agora - evento.timestamp > ttl:
-                eventos_remover.append(evento.id)
+        removidos = 0
         
-        for evento_id in eventos_remover:
-            del self.eventos[evento_id]
+        # Partições inteiramente fora do TTL são descartadas de uma vez
+        for tipo, config_tipo in self.tipos_evento.items():
+            removidos += self.armazenamento.expirar(tipo, agora - config_tipo["ttl"])
         
-        if eventos_remover:
-            self.logger.info(f"Eventos antigos removidos: {len(eventos_remover)}")
+        if removidos:
+            self.logger.info(f"Eventos antigos removidos: {removidos}")
     
     async def obter_estatisticas(self) -> Dict[str, Any]:
         """Obtém estatísticas dos eventos.
@@ -267,30 +418,10 @@ class GerenciadorEventos:
         """
         stats = {
             "timestamp": datetime.now(),
-            "total_eventos": len(self.eventos),
-            "por_tipo": {},
-            "por_status": {},
-            "por_origem": {},
-            "por_tag": {}
+            "total_eventos": len(self.eventos)
         }
         
-        # Conta eventos por tipo, status, origem e tag
-        for evento in self.eventos.values():
-            if evento.tipo not in stats["por_tipo"]:
-                stats["por_tipo"][evento.tipo] = 0
-            stats["por_tipo"][evento.tipo] += 1
-            
-            if evento.status not in stats["por_status"]:
-                stats["por_status"][evento.status] = 0
-            stats["por_status"][evento.status] += 1
-            
-            if evento.origem not in stats["por_origem"]:
-                stats["por_origem"][evento.origem] = 0
-            stats["por_origem"][evento.origem] += 1
-            
-            for tag in evento.tags:
-                if tag not in stats["por_tag"]:
-                    stats["por_tag"][tag] = 0
-                stats["por_tag"][tag] += 1
+        # Conta eventos por tipo, status, origem e tag a partir dos índices
+        stats.update(self.armazenamento.contagens())
         
         return stats 
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Testes para o armazenamento particionado de eventos.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from .. import armazenamento_eventos
+from ..armazenamento_eventos import ArmazenamentoEventos, GeradorIds
+from ..gerenciador_eventos import Evento
+
+# Início de uma partição de uma hora
+INICIO = datetime.fromtimestamp(1_700_000_000 // 3600 * 3600)
+
+def criar_evento(evento_id, timestamp, tipo="sistema", origem="api", tags=None, status="pendente"):
+    return Evento(id=evento_id, tipo=tipo, dados={}, timestamp=timestamp, origem=origem,
+                  prioridade=1, tags=tags or [], status=status)
+
+class TestArmazenamentoEventos(unittest.TestCase):
+    def setUp(self):
+        """Configuração inicial para os testes."""
+        self.armazenamento = ArmazenamentoEventos(timedelta(hours=1))
+
+    def adicionar(self, *eventos):
+        for evento in eventos:
+            self.armazenamento.adicionar(evento)
+
+    def ids(self, eventos):
+        return [evento.id for evento in eventos]
+
+    def test_atualizar_status_mantem_indices(self):
+        """Buscas e contagens por status acompanham atualizar_status."""
+        self.adicionar(criar_evento("a", INICIO), criar_evento("b", INICIO + timedelta(minutes=1)))
+
+        self.armazenamento.atualizar_status(self.armazenamento.obter("a"), "processado")
+
+        self.assertEqual(self.ids(self.armazenamento.buscar(status="processado")), ["a"])
+        self.assertEqual(self.ids(self.armazenamento.buscar(status="pendente")), ["b"])
+        self.assertEqual(self.armazenamento.contagens()["por_status"], {"processado": 1, "pendente": 1})
+
+        # Remover depois da mudança limpa o índice do status novo
+        self.armazenamento.remover("a")
+        self.assertEqual(self.armazenamento.buscar(status="processado"), [])
+        self.assertEqual(self.armazenamento.contagens()["por_status"], {"pendente": 1})
+
+    def test_buscar_por_tags_e_origem(self):
+        """Tags exigem todas as informadas e combinam com origem."""
+        self.adicionar(
+            criar_evento("a", INICIO, origem="api", tags=["cpu", "critico"]),
+            criar_evento("b", INICIO + timedelta(seconds=1), origem="api", tags=["cpu"]),
+            criar_evento("c", INICIO + timedelta(seconds=2), origem="agente", tags=["cpu", "critico"]),
+            criar_evento("d", INICIO + timedelta(hours=2), tipo="seguranca", origem="api", tags=["cpu"]),
+        )
+
+        self.assertEqual(self.ids(self.armazenamento.buscar(tags=["cpu", "critico"])), ["a", "c"])
+        self.assertEqual(self.ids(self.armazenamento.buscar(origem="api", tags=["cpu"])), ["a", "b", "d"])
+        self.assertEqual(self.ids(self.armazenamento.buscar(tipo="sistema", origem="api", tags=["critico"])), ["a"])
+        self.assertEqual(self.armazenamento.buscar(tags=["inexistente"]), [])
+
+    def test_buscar_por_periodo_nas_bordas_das_particoes(self):
+        """O período é inclusivo e filtra apenas dentro das partições de borda."""
+        instantes = [
+            INICIO - timedelta(microseconds=1),      # fim da partição anterior
+            INICIO,                                  # início exato da partição
+            INICIO + timedelta(minutes=30),
+            INICIO + timedelta(hours=1) - timedelta(microseconds=1),
+            INICIO + timedelta(hours=1),             # início da partição seguinte
+            INICIO + timedelta(hours=3),
+        ]
+        self.adicionar(*(criar_evento(str(i), instante) for i, instante in enumerate(instantes)))
+
+        buscar = self.armazenamento.buscar
+        self.assertEqual(self.ids(buscar(inicio=INICIO, fim=INICIO + timedelta(hours=1))), ["1", "2", "3", "4"])
+        self.assertEqual(self.ids(buscar(inicio=INICIO + timedelta(minutes=30))), ["2", "3", "4", "5"])
+        self.assertEqual(self.ids(buscar(fim=INICIO)), ["0", "1"])
+        self.assertEqual(self.ids(buscar(inicio=INICIO + timedelta(hours=1, minutes=1),
+                                         fim=INICIO + timedelta(hours=2))), [])
+
+    def test_expirar_descarta_particoes_inteiras_e_filtra_a_de_borda(self):
+        """Partições anteriores ao limite somem; a que contém o limite é filtrada."""
+        self.adicionar(
+            criar_evento("antigo_1", INICIO - timedelta(hours=2)),
+            criar_evento("antigo_2", INICIO - timedelta(minutes=1)),
+            criar_evento("borda_antes", INICIO + timedelta(minutes=10)),
+            criar_evento("borda_limite", INICIO + timedelta(minutes=20)),
+            criar_evento("borda_depois", INICIO + timedelta(minutes=30)),
+            criar_evento("outro_tipo", INICIO - timedelta(hours=2), tipo="seguranca"),
+        )
+
+        removidos = self.armazenamento.expirar("sistema", INICIO + timedelta(minutes=20))
+
+        self.assertEqual(removidos, 3)
+        self.assertEqual(sorted(self.armazenamento.por_id), ["borda_depois", "borda_limite", "outro_tipo"])
+        self.assertEqual(self.armazenamento._chaves["sistema"], [self.armazenamento._chave_particao(INICIO)])
+        self.assertEqual(self.ids(self.armazenamento.buscar(tipo="sistema")), ["borda_limite", "borda_depois"])
+        self.assertEqual(self.armazenamento.contagens()["por_tipo"], {"sistema": 2, "seguranca": 1})
+
+    def test_expirar_esvaziando_a_particao_de_borda(self):
+        self.adicionar(criar_evento("a", INICIO + timedelta(minutes=5)))
+
+        self.assertEqual(self.armazenamento.expirar("sistema", INICIO + timedelta(minutes=10)), 1)
+        self.assertEqual(len(self.armazenamento), 0)
+        self.assertEqual(self.armazenamento._particoes, {})
+        self.assertNotIn("sistema", self.armazenamento._chaves)
+
+class TestGeradorIds(unittest.TestCase):
+    def test_ids_unicos_com_relogio_parado(self):
+        gerador = GeradorIds()
+        instante = 1_700_000_000 * 1_000_000_000
+        with mock.patch.object(armazenamento_eventos.time, "time_ns", return_value=instante):
+            ids = [gerador.proximo("sistema") for _ in range(1000)]
+
+        self.assertEqual(len(set(ids)), 1000)
+        # Monotônicos: o sufixo de microssegundos avança a cada ID
+        self.assertEqual(ids, sorted(ids))
+
+    def test_ids_unicos_com_relogio_retrocedendo(self):
+        gerador = GeradorIds()
+        instantes = iter([2_000_000_000, 1_000_000_000, 1_000_000_000])
+        with mock.patch.object(armazenamento_eventos.time, "time_ns", side_effect=lambda: next(instantes)):
+            ids = [gerador.proximo("sistema") for _ in range(3)]
+
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(ids, sorted(ids))
+
+if __name__ == '__main__':
+    unittest.main()
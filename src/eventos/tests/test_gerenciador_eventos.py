@@ -0,0 +1,170 @@
+"""
+Testes para o despacho de eventos do gerenciador.
+"""
+
+import asyncio
+import unittest
+
+from prometheus_client import REGISTRY
+
+from ..gerenciador_eventos import GerenciadorEventos
+
+class TestDespachoEventos(unittest.IsolatedAsyncioTestCase):
+    def criar_gerenciador(self, config):
+        """Cria um gerenciador e remove suas métricas do registro global ao final."""
+        gerenciador = GerenciadorEventos(config)
+
+        async def finalizar():
+            await gerenciador.parar(drenar=False)
+            for metrica in gerenciador.metricas.values():
+                REGISTRY.unregister(metrica)
+
+        self.addAsyncCleanup(finalizar)
+        return gerenciador
+
+    async def test_handler_publicando_com_fila_cheia_nao_trava(self):
+        """Handlers que publicam com a fila cheia não bloqueiam os workers."""
+        gerenciador = self.criar_gerenciador({"num_workers": 2, "tamanho_fila": 1})
+        publicados = []
+
+        async def handler(evento):
+            if evento.dados.get("nivel", 0) < 2:
+                for _ in range(2):
+                    publicados.append(await gerenciador.registrar_evento(
+                        "aplicacao", {"nivel": evento.dados.get("nivel", 0) + 1}, "teste"
+                    ))
+
+        async def publicar():
+            for _ in range(2):
+                await gerenciador.registrar_evento("aplicacao", {}, "teste")
+            await gerenciador.aguardar_processamento()
+
+        gerenciador.registrar_handler("aplicacao", handler)
+        await asyncio.wait_for(publicar(), timeout=5)
+
+        # Eventos sem vaga na fila são descartados com status "erro"
+        descartados = [evento for evento in gerenciador.eventos.values() if evento.status == "erro"]
+        self.assertEqual(publicados.count(None), len(descartados))
+        self.assertTrue(descartados)
+        self.assertTrue(all(
+            evento.status in ("processado", "erro") for evento in gerenciador.eventos.values()
+        ))
+
+    async def test_handler_publicando_com_vaga_na_fila(self):
+        """Com vaga na fila, eventos publicados por handlers são processados."""
+        gerenciador = self.criar_gerenciador({"num_workers": 2, "tamanho_fila": 100})
+
+        async def handler(evento):
+            if not evento.dados.get("derivado"):
+                await gerenciador.registrar_evento("sistema", {"derivado": True}, "teste")
+
+        gerenciador.registrar_handler("sistema", handler)
+        await gerenciador.registrar_evento("sistema", {}, "teste")
+        await asyncio.wait_for(gerenciador.aguardar_processamento(), timeout=5)
+
+        self.assertEqual(len(gerenciador.eventos), 2)
+        self.assertTrue(all(evento.status == "processado" for evento in gerenciador.eventos.values()))
+
+    async def test_tipo_no_limite_nao_bloqueia_outros_tipos(self):
+        """Eventos de um tipo no limite de concorrência são adiados sem ocupar workers."""
+        gerenciador = self.criar_gerenciador({"num_workers": 2})
+        gerenciador.tipos_evento["monitoramento"]["max_concorrencia"] = 1
+        liberar = asyncio.Event()
+        ordem = []
+
+        async def handler_lento(evento):
+            ordem.append(("monitoramento", evento.id))
+            await liberar.wait()
+
+        async def handler_seguranca(evento):
+            ordem.append(("seguranca", evento.id))
+            liberar.set()
+
+        gerenciador.registrar_handler("monitoramento", handler_lento)
+        gerenciador.registrar_handler("seguranca", handler_seguranca)
+
+        for _ in range(3):
+            await gerenciador.registrar_evento("monitoramento", {}, "teste")
+        await asyncio.sleep(0.01)
+        await gerenciador.registrar_evento("seguranca", {}, "teste")
+
+        await asyncio.wait_for(gerenciador.aguardar_processamento(), timeout=5)
+
+        # Só um evento de monitoramento rodou antes do de segurança
+        self.assertEqual([tipo for tipo, _ in ordem][:2], ["monitoramento", "seguranca"])
+        self.assertEqual(len(ordem), 4)
+        self.assertEqual(gerenciador._em_execucao, {"monitoramento": 0, "seguranca": 0})
+
+    async def test_tipo_saturado_aplica_backpressure_ao_produtor(self):
+        """Eventos adiados ocupam vaga da fila: o produtor aguarda em vez de acumulá-los."""
+        gerenciador = self.criar_gerenciador({"num_workers": 4, "tamanho_fila": 10, "max_concorrencia_tipo": 1})
+        liberar = asyncio.Event()
+
+        async def handler_lento(evento):
+            await liberar.wait()
+
+        gerenciador.registrar_handler("monitoramento", handler_lento)
+        registrados = []
+
+        async def produzir():
+            for _ in range(50):
+                registrados.append(await gerenciador.registrar_evento("monitoramento", {}, "teste"))
+
+        produtor = asyncio.create_task(produzir())
+        await asyncio.sleep(0.05)
+
+        # Um evento em execução e tamanho_fila aguardando (na fila ou adiados)
+        self.assertFalse(produtor.done())
+        self.assertEqual(len(registrados), 11)
+        self.assertEqual(gerenciador._profundidade(), 10)
+        self.assertEqual(gerenciador.metricas["fila_profundidade"]._value.get(), 10)
+
+        liberar.set()
+        await asyncio.wait_for(produtor, timeout=5)
+        await asyncio.wait_for(gerenciador.aguardar_processamento(), timeout=5)
+        self.assertTrue(all(evento.status == "processado" for evento in registrados))
+        self.assertEqual(gerenciador._profundidade(), 0)
+
+    async def test_adiado_nao_passa_a_frente_de_prioridade_maior(self):
+        """Um evento adiado volta à fila com sua prioridade em vez de rodar antes dos demais."""
+        gerenciador = self.criar_gerenciador({"num_workers": 2})
+        gerenciador.tipos_evento["monitoramento"]["max_concorrencia"] = 1
+        liberar_monitoramento = asyncio.Event()
+        liberar_aplicacao = asyncio.Event()
+        ordem = []
+
+        async def handler(evento):
+            ordem.append(evento.tipo)
+            if evento.tipo == "monitoramento":
+                await liberar_monitoramento.wait()
+            elif evento.tipo == "aplicacao":
+                await liberar_aplicacao.wait()
+
+        for tipo in ("monitoramento", "aplicacao", "seguranca"):
+            gerenciador.registrar_handler(tipo, handler)
+
+        # O segundo monitoramento é adiado e o outro worker fica preso na aplicação
+        for tipo in ("monitoramento", "monitoramento", "aplicacao", "seguranca"):
+            await gerenciador.registrar_evento(tipo, {}, "teste")
+            await asyncio.sleep(0.01)
+
+        liberar_monitoramento.set()
+        await asyncio.sleep(0.01)
+        liberar_aplicacao.set()
+        await asyncio.wait_for(gerenciador.aguardar_processamento(), timeout=5)
+
+        self.assertEqual(ordem, ["monitoramento", "aplicacao", "seguranca", "monitoramento"])
+
+    async def test_eventos_somente_leitura(self):
+        """O índice por ID não pode ser alterado por fora do armazenamento."""
+        gerenciador = self.criar_gerenciador({})
+        evento = await gerenciador.registrar_evento("sistema", {}, "teste")
+
+        with self.assertRaises(TypeError):
+            gerenciador.eventos["outro"] = evento
+        with self.assertRaises(TypeError):
+            del gerenciador.eventos[evento.id]
+        self.assertIs(gerenciador.eventos[evento.id], evento)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,7 +12,7 @@ Implementa:
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Any, Optional, Tuple, Set
+from typing import List, Dict, Any, Optional, Tuple, Set, Protocol
 import numpy as np
 from datetime import datetime
 import json
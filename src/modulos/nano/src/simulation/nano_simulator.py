@@ -7,6 +7,7 @@ Implementa:
 - Dinâmica molecular simplificada
 - Interações nano-escala
 - Visualização 3D
+- Gravação de trajetória com passo configurável (ring buffer ou disco)
 """
 
 import numpy as np
@@ -16,6 +17,7 @@ import asyncio
 from datetime import datetime
 import json
 import math
+import os
 
 from ..interfaces.nanobot_interface import (
     NanobotInterface, NanobotType, NanobotState, 
@@ -24,6 +26,18 @@ from ..interfaces.nanobot_interface import (
 from ..interfaces.molecular_interface import (
     MolecularStructure, Atom, Bond, AtomType, BondType
 )
+from .particle_engine import (
+    ParticleArrays, BoundNanoPosition, neighbor_pairs, pair_geometry,
+    accumulate_pair_forces, resolve_collisions
+)
+from .trajectory import (
+    STATISTICS_FIELDS, FrameSequence, MappedTrajectory, RingBufferTrajectory,
+    SegmentedTrajectory, TrajectoryFrame, TrajectoryStore
+)
+
+# Códigos compactos de estado gravados na trajetória
+STATE_CODES = {state: code for code, state in enumerate(NanobotState)}
+STATES_BY_CODE = list(NanobotState)
 
 
 @dataclass
@@ -57,18 +71,89 @@ class SimulationParameters:
     electrostatic_interactions: bool = True
     van_der_waals: bool = True
     collision_detection: bool = True
+    interaction_cutoff: Optional[float] = 300.0  # nm (None = todos os pares)
+    record_stride: int = 1000  # passos entre quadros gravados (1000 × 1 ps = 1 ns)
+    trajectory_capacity: int = 1000  # quadros mantidos no ring buffer em memória
+    trajectory_path: Optional[str] = None  # diretório para gravação em disco (memmap, um subdiretório por segmento)
+    trajectory_chunk_frames: int = 64  # quadros por bloco anexado ao disco
 
 
 class SimulatedNanobot(NanobotInterface):
-    """Implementação simulada de um nanobot"""
+    """
+    Implementação simulada de um nanobot.
+    
+    Quando adicionado a um NanoSimulator, posição, velocidade e força
+    passam a ser views sobre os arrays SoA do simulador. A posição é
+    resolvida a cada acesso; os arrays retornados por `velocity` e `force`
+    são views da linha atual e ficam desatualizados quando a inserção de
+    outro nanobot realoca os arrays, então devem ser relidos (ou
+    atribuídos pelo setter) em vez de mantidos.
+    """
     
     def __init__(self, bot_id: str, bot_type: NanobotType):
+        self._particles: Optional[ParticleArrays] = None
+        self._index: Optional[int] = None
         super().__init__(bot_id, bot_type)
         self.velocity = np.array([0.0, 0.0, 0.0])  # nm/s
         self.force = np.array([0.0, 0.0, 0.0])  # pN (piconewtons)
         self.mass = self._calculate_mass()  # kg
         self.radius = self._calculate_radius()  # nm
         self.drag_coefficient = 6 * np.pi * PhysicsConstants.VISCOSITY_WATER * self.radius * PhysicsConstants.NANO_TO_METER
+    
+    def bind(self, particles: ParticleArrays) -> int:
+        """Move o estado físico para os arrays SoA e retorna o índice"""
+        position = self.position
+        self._index = particles.add(
+            (position.x, position.y, position.z),
+            self.velocity,
+            self.force,
+            self.mass,
+            self.radius,
+            self.drag_coefficient
+        )
+        self._particles = particles
+        return self._index
+    
+    @property
+    def position(self) -> NanoPosition:
+        if self._particles is None:
+            return self._position
+        return BoundNanoPosition(self._particles, self._index)
+    
+    @position.setter
+    def position(self, value: NanoPosition) -> None:
+        if self._particles is None:
+            self._position = value
+        else:
+            self._particles.positions[self._index] = (value.x, value.y, value.z)
+    
+    @property
+    def velocity(self) -> np.ndarray:
+        # View da linha nos arrays atuais (invalidada por ParticleArrays.add)
+        if self._particles is None:
+            return self._velocity
+        return self._particles.velocities[self._index]
+    
+    @velocity.setter
+    def velocity(self, value: np.ndarray) -> None:
+        if self._particles is None:
+            self._velocity = np.asarray(value, dtype=float)
+        else:
+            self._particles.velocities[self._index] = value
+    
+    @property
+    def force(self) -> np.ndarray:
+        # View da linha nos arrays atuais (invalidada por ParticleArrays.add)
+        if self._particles is None:
+            return self._force
+        return self._particles.forces[self._index]
+    
+    @force.setter
+    def force(self, value: np.ndarray) -> None:
+        if self._particles is None:
+            self._force = np.asarray(value, dtype=float)
+        else:
+            self._particles.forces[self._index] = value
         
     def _calculate_mass(self) -> float:
         """Calcula massa baseada no tipo de nanobot"""
@@ -334,11 +419,13 @@ class NanoSimulator:
     def __init__(self, params: SimulationParameters = None):
         self.params = params or SimulationParameters()
         self.nanobots: Dict[str, SimulatedNanobot] = {}
+        self.particles = ParticleArrays()
+        self._bot_order: List[SimulatedNanobot] = []  # Índice SoA -> nanobot
         self.molecules: Dict[str, MolecularStructure] = {}
         self.time = 0.0  # Tempo de simulação em segundos
-        self.history: List[Dict[str, Any]] = []
+        self.step_count = 0
+        self.trajectory: Optional[SegmentedTrajectory] = None
         self.running = False
-        self.visualization_data = []
         
         # Callbacks para eventos
         self.event_callbacks: Dict[str, List[Callable]] = {
@@ -352,10 +439,23 @@ class NanoSimulator:
         """Adiciona nanobot à simulação"""
         if nanobot.bot_id not in self.nanobots:
             self.nanobots[nanobot.bot_id] = nanobot
+            nanobot.bind(self.particles)
+            self._bot_order.append(nanobot)
             self._place_randomly(nanobot)
             return True
         return False
     
+    @property
+    def history(self) -> FrameSequence:
+        """Estados gravados, materializados sob demanda a partir da trajetória"""
+        return FrameSequence(self.trajectory, self._history_entry)
+    
+    @property
+    def visualization_data(self) -> FrameSequence:
+        """Quadros de visualização, materializados sob demanda a partir da trajetória"""
+        molecules = self._molecules_visualization()
+        return FrameSequence(self.trajectory, lambda frame: self._visualization_frame(frame, molecules))
+    
     def add_molecule(self, molecule: MolecularStructure) -> bool:
         """Adiciona molécula à simulação"""
         if molecule.structure_id not in self.molecules:
@@ -378,9 +478,10 @@ class NanoSimulator:
             
             # Atualiza tempo
             self.time += self.params.time_step
+            self.step_count += 1
             
-            # Registra estado
-            if int(self.time * 1e12) % 1000 == 0:  # A cada nanosegundo
+            # Registra estado a cada `record_stride` passos
+            if self.step_count % self.params.record_stride == 0:
                 self._record_state()
             
             # Delay para simulação em tempo real
@@ -388,264 +489,220 @@ class NanoSimulator:
                 await asyncio.sleep(self.params.time_step)
         
         self.running = False
+        
+        # Torna os quadros pendentes visíveis a leitores externos
+        if self.trajectory is not None:
+            self.trajectory.flush()
     
     def stop_simulation(self):
         """Para a simulação"""
         self.running = False
     
     def _update_physics(self):
-        """Atualiza física de todos os nanobots"""
-        for nanobot in self.nanobots.values():
-            if not nanobot.is_operational():
-                continue
-            
-            # Reseta forças
-            nanobot.force = np.zeros(3)
-            
-            # Aplica forças
-            if self.params.brownian_motion:
-                self._apply_brownian_force(nanobot)
+        """Atualiza física de todos os nanobots (vetorizado sobre os arrays SoA)"""
+        particles = self.particles
+        n = particles.count
+        if n == 0:
+            return
+        
+        box = np.asarray(self.params.box_size, dtype=float)
+        periodic = self.params.periodic_boundary
+        
+        active = particles.operational[:n]
+        active[:] = [bot.is_operational() for bot in self._bot_order]
+        if not active.any():
+            return
+        
+        # Reseta forças
+        F = particles.F
+        F[active] = 0.0
+        
+        # Aplica forças
+        if self.params.brownian_motion:
+            self._apply_brownian_force(active)
+        
+        if self.params.gravity_enabled:
+            self._apply_gravity(active)
+        
+        # Força de arrasto
+        self._apply_drag_force(active)
+        
+        # Lista de vizinhos (também cobre a distância de colisão)
+        i = j = None
+        needs_pairs = (self.params.electrostatic_interactions or self.params.van_der_waals
+                       or self.params.collision_detection)
+        if needs_pairs:
+            cutoff = self.params.interaction_cutoff
+            if cutoff is not None:
+                cutoff = max(cutoff, 2 * float(particles.radii[:n].max()))
+            i, j = neighbor_pairs(particles.P, cutoff, box, periodic)
+            both_active = active[i] & active[j]
+            i, j = i[both_active], j[both_active]
+        
+        # Forças intermoleculares
+        if self.params.electrostatic_interactions or self.params.van_der_waals:
+            r_vec, r = pair_geometry(particles.P, i, j, box, periodic)
+            if self.params.interaction_cutoff is not None:
+                in_range = r < self.params.interaction_cutoff
+                i_f, j_f, r_vec, r = i[in_range], j[in_range], r_vec[in_range], r[in_range]
+            else:
+                i_f, j_f = i, j
             
-            if self.params.gravity_enabled:
-                self._apply_gravity(nanobot)
-            
-            # Força de arrasto
-            self._apply_drag_force(nanobot)
-            
-            # Forças intermoleculares
             if self.params.electrostatic_interactions:
-                self._apply_electrostatic_forces(nanobot)
+                self._apply_electrostatic_forces(i_f, j_f, r_vec, r)
             
             if self.params.van_der_waals:
-                self._apply_van_der_waals_forces(nanobot)
-            
-            # Integração de movimento (Verlet)
-            self._integrate_motion(nanobot)
-            
-            # Aplica condições de contorno
-            self._apply_boundary_conditions(nanobot)
-            
-            # Detecção de colisão
-            if self.params.collision_detection:
-                self._check_collisions(nanobot)
+                self._apply_van_der_waals_forces(i_f, j_f, r_vec, r)
+        
+        # Integração de movimento (Verlet)
+        self._integrate_motion(active)
+        
+        # Aplica condições de contorno
+        self._apply_boundary_conditions(active)
+        
+        # Detecção de colisão
+        if self.params.collision_detection:
+            self._check_collisions(i, j)
     
-    def _apply_brownian_force(self, nanobot: SimulatedNanobot):
+    def _apply_brownian_force(self, active: np.ndarray):
         """Aplica força browniana (movimento térmico aleatório)"""
         # Força browniana: F = sqrt(2 * k_B * T * gamma / dt) * N(0,1)
         kT = PhysicsConstants.BOLTZMANN * self.params.temperature
-        magnitude = np.sqrt(2 * kT * nanobot.drag_coefficient / self.params.time_step)
+        drag = self.particles.drag[:self.particles.count][active]
+        magnitude = np.sqrt(2 * kT * drag / self.params.time_step)
         
         # Força aleatória em cada direção
-        brownian_force = magnitude * np.random.normal(0, 1, 3) * 1e12  # Converte para pN
-        nanobot.force += brownian_force
+        brownian_force = magnitude[:, np.newaxis] * np.random.normal(0, 1, (len(drag), 3)) * 1e12  # Converte para pN
+        self.particles.F[active] += brownian_force
     
-    def _apply_gravity(self, nanobot: SimulatedNanobot):
+    def _apply_gravity(self, active: np.ndarray):
         """Aplica força gravitacional (geralmente negligível em nanoescala)"""
         g = 9.81  # m/s²
-        gravity_force = nanobot.mass * g * 1e12  # Converte para pN
-        nanobot.force[2] -= gravity_force
+        masses = self.particles.masses[:self.particles.count][active]
+        self.particles.F[active, 2] -= masses * g * 1e12  # Converte para pN
     
-    def _apply_drag_force(self, nanobot: SimulatedNanobot):
+    def _apply_drag_force(self, active: np.ndarray):
         """Aplica força de arrasto viscoso"""
         # Lei de Stokes: F = -gamma * v
-        drag_force = -nanobot.drag_coefficient * nanobot.velocity * 1e3  # Converte para pN
-        nanobot.force += drag_force
+        drag = self.particles.drag[:self.particles.count][active]
+        self.particles.F[active] -= drag[:, np.newaxis] * self.particles.V[active] * 1e3  # Converte para pN
     
-    def _apply_electrostatic_forces(self, nanobot: SimulatedNanobot):
+    def _apply_electrostatic_forces(self, i: np.ndarray, j: np.ndarray,
+                                    r_vec: np.ndarray, r: np.ndarray):
         """Aplica forças eletrostáticas entre partículas carregadas"""
         # Simplificado - apenas entre nanobots
-        for other_id, other in self.nanobots.items():
-            if other_id == nanobot.bot_id or not other.is_operational():
-                continue
-            
-            # Calcula vetor distância
-            r_vec = np.array([
-                other.position.x - nanobot.position.x,
-                other.position.y - nanobot.position.y,
-                other.position.z - nanobot.position.z
-            ])
-            
-            r = np.linalg.norm(r_vec)
-            if r < 1.0:  # Evita singularidade
-                r = 1.0
-            
-            # Lei de Coulomb simplificada (assumindo cargas unitárias)
-            k_e = 1 / (4 * np.pi * PhysicsConstants.VACUUM_PERMITTIVITY)
-            q1 = q2 = PhysicsConstants.ELEMENTARY_CHARGE  # Carga elementar
-            
-            force_magnitude = k_e * q1 * q2 / (r * PhysicsConstants.NANO_TO_METER)**2
-            force_magnitude *= 1e12  # Converte para pN
-            
-            # Aplica força na direção correta
-            if r > 0:
-                force_direction = r_vec / r
-                nanobot.force += force_magnitude * force_direction
+        r_eff = np.maximum(r, 1.0)  # Evita singularidade
+        
+        # Lei de Coulomb simplificada (assumindo cargas unitárias)
+        k_e = 1 / (4 * np.pi * PhysicsConstants.VACUUM_PERMITTIVITY)
+        q1 = q2 = PhysicsConstants.ELEMENTARY_CHARGE  # Carga elementar
+        
+        force_magnitude = k_e * q1 * q2 / (r_eff * PhysicsConstants.NANO_TO_METER)**2
+        force_magnitude *= 1e12  # Converte para pN
+        
+        accumulate_pair_forces(self.particles.F, i, j, r_vec, force_magnitude, r)
     
-    def _apply_van_der_waals_forces(self, nanobot: SimulatedNanobot):
+    def _apply_van_der_waals_forces(self, i: np.ndarray, j: np.ndarray,
+                                    r_vec: np.ndarray, r: np.ndarray):
         """Aplica forças de van der Waals (Lennard-Jones)"""
         epsilon = 1e-21  # J (energia de poço)
         sigma = 2.0  # nm (distância de equilíbrio)
         
-        for other_id, other in self.nanobots.items():
-            if other_id == nanobot.bot_id or not other.is_operational():
-                continue
-            
-            # Calcula distância
-            r_vec = np.array([
-                other.position.x - nanobot.position.x,
-                other.position.y - nanobot.position.y,
-                other.position.z - nanobot.position.z
-            ])
-            
-            r = np.linalg.norm(r_vec)
-            if r < 0.1:  # Evita singularidade
-                r = 0.1
-            
-            # Potencial Lennard-Jones: V(r) = 4ε[(σ/r)^12 - (σ/r)^6]
-            # Força: F = -dV/dr
-            sigma_r = sigma / r
-            force_magnitude = 24 * epsilon / r * (2 * sigma_r**12 - sigma_r**6)
-            force_magnitude *= 1e12 / PhysicsConstants.NANO_TO_METER  # Converte para pN
-            
-            # Aplica força
-            if r > 0:
-                force_direction = r_vec / r
-                nanobot.force += force_magnitude * force_direction
+        r_eff = np.maximum(r, 0.1)  # Evita singularidade
+        
+        # Potencial Lennard-Jones: V(r) = 4ε[(σ/r)^12 - (σ/r)^6]
+        # Força: F = -dV/dr
+        sigma_r = sigma / r_eff
+        force_magnitude = 24 * epsilon / r_eff * (2 * sigma_r**12 - sigma_r**6)
+        force_magnitude *= 1e12 / PhysicsConstants.NANO_TO_METER  # Converte para pN
+        
+        accumulate_pair_forces(self.particles.F, i, j, r_vec, force_magnitude, r)
     
-    def _integrate_motion(self, nanobot: SimulatedNanobot):
+    def _integrate_motion(self, active: np.ndarray):
         """Integra equações de movimento usando método de Verlet"""
+        particles = self.particles
+        masses = particles.masses[:particles.count][active]
+        
         # Aceleração: a = F/m
-        acceleration = nanobot.force / (nanobot.mass * 1e12)  # nm/s²
+        acceleration = particles.F[active] / (masses[:, np.newaxis] * 1e12)  # nm/s²
         
         # Atualiza velocidade: v = v + a*dt
-        nanobot.velocity += acceleration * self.params.time_step
+        particles.V[active] += acceleration * self.params.time_step
         
         # Atualiza posição: x = x + v*dt
-        new_position = np.array([
-            nanobot.position.x + nanobot.velocity[0] * self.params.time_step,
-            nanobot.position.y + nanobot.velocity[1] * self.params.time_step,
-            nanobot.position.z + nanobot.velocity[2] * self.params.time_step
-        ])
-        
-        nanobot.position = NanoPosition(new_position[0], new_position[1], new_position[2])
+        particles.P[active] += particles.V[active] * self.params.time_step
     
-    def _apply_boundary_conditions(self, nanobot: SimulatedNanobot):
+    def _apply_boundary_conditions(self, active: np.ndarray):
         """Aplica condições de contorno (periódicas ou reflexivas)"""
+        box = np.asarray(self.params.box_size, dtype=float)
+        P, V = self.particles.P, self.particles.V
+        
         if self.params.periodic_boundary:
             # Condições periódicas
-            nanobot.position.x = nanobot.position.x % self.params.box_size[0]
-            nanobot.position.y = nanobot.position.y % self.params.box_size[1]
-            nanobot.position.z = nanobot.position.z % self.params.box_size[2]
+            P[active] = np.mod(P[active], box)
         else:
             # Condições reflexivas
-            for i, (pos, vel, size) in enumerate([
-                (nanobot.position.x, nanobot.velocity[0], self.params.box_size[0]),
-                (nanobot.position.y, nanobot.velocity[1], self.params.box_size[1]),
-                (nanobot.position.z, nanobot.velocity[2], self.params.box_size[2])
-            ]):
-                if pos < 0:
-                    if i == 0:
-                        nanobot.position.x = -pos
-                    elif i == 1:
-                        nanobot.position.y = -pos
-                    else:
-                        nanobot.position.z = -pos
-                    nanobot.velocity[i] = -vel
-                elif pos > size:
-                    if i == 0:
-                        nanobot.position.x = 2 * size - pos
-                    elif i == 1:
-                        nanobot.position.y = 2 * size - pos
-                    else:
-                        nanobot.position.z = 2 * size - pos
-                    nanobot.velocity[i] = -vel
-    
-    def _check_collisions(self, nanobot: SimulatedNanobot):
+            below = (P < 0) & active[:, np.newaxis]
+            above = (P > box) & active[:, np.newaxis]
+            P[below] = -P[below]
+            P[above] = (2 * box - P)[above]
+            V[below | above] = -V[below | above]
+    
+    def _check_collisions(self, i: np.ndarray, j: np.ndarray):
         """Verifica e processa colisões"""
-        for other_id, other in self.nanobots.items():
-            if other_id == nanobot.bot_id or not other.is_operational():
-                continue
-            
-            distance = nanobot.position.distance_to(other.position)
-            min_distance = nanobot.radius + other.radius
-            
-            if distance < min_distance:
-                # Colisão detectada
-                self._handle_collision(nanobot, other)
-    
-    def _handle_collision(self, bot1: SimulatedNanobot, bot2: SimulatedNanobot):
-        """Processa colisão entre dois nanobots"""
-        # Calcula velocidades após colisão elástica
-        m1, m2 = bot1.mass, bot2.mass
-        v1, v2 = bot1.velocity, bot2.velocity
-        
-        # Vetor normal de colisão
-        n = np.array([
-            bot2.position.x - bot1.position.x,
-            bot2.position.y - bot1.position.y,
-            bot2.position.z - bot1.position.z
-        ])
-        n = n / np.linalg.norm(n)
-        
-        # Velocidades relativas
-        v_rel = v1 - v2
-        v_rel_n = np.dot(v_rel, n)
-        
-        # Novas velocidades (conservação de momento)
-        if v_rel_n > 0:  # Bots se aproximando
-            impulse = 2 * v_rel_n / (1/m1 + 1/m2)
-            bot1.velocity -= impulse * n / m1
-            bot2.velocity += impulse * n / m2
-        
-        # Separa bots para evitar sobreposição
-        overlap = (bot1.radius + bot2.radius) - bot1.position.distance_to(bot2.position)
-        if overlap > 0:
-            separation = n * overlap / 2
-            bot1.position.x -= separation[0]
-            bot1.position.y -= separation[1]
-            bot1.position.z -= separation[2]
-            bot2.position.x += separation[0]
-            bot2.position.y += separation[1]
-            bot2.position.z += separation[2]
+        box = np.asarray(self.params.box_size, dtype=float)
+        hit_i, hit_j, impact = resolve_collisions(self.particles, i, j, box, self.params.periodic_boundary)
         
         # Dispara evento de colisão
-        self._trigger_event("collision", {
-            "bot1": bot1.bot_id,
-            "bot2": bot2.bot_id,
-            "time": self.time,
-            "impact_velocity": v_rel_n
-        })
+        if self.event_callbacks["collision"]:
+            for a, b, v_rel_n in zip(hit_i, hit_j, impact):
+                self._trigger_event("collision", {
+                    "bot1": self._bot_order[a].bot_id,
+                    "bot2": self._bot_order[b].bot_id,
+                    "time": self.time,
+                    "impact_velocity": float(v_rel_n)
+                })
     
     async def _process_interactions(self):
         """Processa interações entre nanobots e moléculas"""
-        # Interações nanobot-nanobot
-        for bot1_id, bot1 in self.nanobots.items():
-            if not bot1.is_operational():
+        particles = self.particles
+        active = particles.operational[:particles.count]
+        
+        # Interações nanobot-nanobot (apenas emissores em comunicação)
+        for sender_index, bot1 in enumerate(self._bot_order):
+            if bot1.state != NanobotState.COMMUNICATING or not active[sender_index]:
                 continue
             
-            for bot2_id, bot2 in self.nanobots.items():
-                if bot1_id >= bot2_id or not bot2.is_operational():
+            # Comunicação de curto alcance
+            distances = np.linalg.norm(particles.P - particles.P[sender_index], axis=1)
+            for receiver_index in np.flatnonzero((distances < 100) & active):
+                bot2_id = self._bot_order[receiver_index].bot_id
+                if bot1.bot_id >= bot2_id:
                     continue
                 
-                distance = bot1.position.distance_to(bot2.position)
-                
-                # Comunicação de curto alcance
-                if distance < 100 and bot1.state == NanobotState.COMMUNICATING:
-                    self._trigger_event("communication", {
-                        "sender": bot1_id,
-                        "receiver": bot2_id,
-                        "distance": distance,
-                        "time": self.time
-                    })
+                self._trigger_event("communication", {
+                    "sender": bot1.bot_id,
+                    "receiver": bot2_id,
+                    "distance": float(distances[receiver_index]),
+                    "time": self.time
+                })
         
         # Interações nanobot-molécula
-        for bot in self.nanobots.values():
-            if bot.bot_type == NanobotType.ASSEMBLER and bot.is_operational():
+        assemblers = [
+            index for index, bot in enumerate(self._bot_order)
+            if bot.bot_type == NanobotType.ASSEMBLER and active[index]
+        ]
+        if assemblers and self.molecules:
+            # Simplificado - verifica distância ao centro de massa
+            mol_centers = {mol_id: self._get_molecule_center(mol) for mol_id, mol in self.molecules.items()}
+            
+            for index in assemblers:
+                bot = self._bot_order[index]
+                bot_pos = particles.P[index]
+                
                 # Verifica moléculas próximas para montagem
                 for mol in self.molecules.values():
-                    # Simplificado - verifica distância ao centro de massa
-                    mol_center = self._get_molecule_center(mol)
-                    bot_pos = np.array([bot.position.x, bot.position.y, bot.position.z])
+                    mol_center = mol_centers[mol.structure_id]
                     
                     if np.linalg.norm(mol_center - bot_pos) < 200:
                         self._trigger_event("assembly", {
@@ -677,78 +734,142 @@ class NanoSimulator:
         
         return weighted_pos / total_mass if total_mass > 0 else np.zeros(3)
     
+    def _create_segment(self, index: int, num_bots: int) -> TrajectoryStore:
+        """Cria o armazenamento de um segmento da trajetória conforme os parâmetros"""
+        if self.params.trajectory_path:
+            return MappedTrajectory(
+                os.path.join(self.params.trajectory_path, f"segment_{index:03d}"),
+                num_bots,
+                chunk_frames=self.params.trajectory_chunk_frames,
+                bot_ids=[bot.bot_id for bot in self._bot_order]
+            )
+        return RingBufferTrajectory(num_bots, capacity=self.params.trajectory_capacity)
+    
     def _record_state(self):
-        """Registra estado atual da simulação"""
-        state = {
-            "time": self.time,
-            "nanobots": {
-                bot_id: {
-                    "position": bot.position.to_dict(),
-                    "velocity": bot.velocity.tolist(),
-                    "energy": bot.energy_level,
-                    "state": bot.state.value
-                }
-                for bot_id, bot in self.nanobots.items()
-            },
-            "statistics": self._calculate_statistics()
-        }
+        """
+        Registra estado atual da simulação na trajetória.
+        
+        Copia apenas as colunas SoA e as estatísticas agregadas; dicionários
+        por nanobot só são montados na leitura. Se a população mudar após o
+        início da gravação, um novo segmento é iniciado sem descartar os
+        quadros já gravados.
+        """
+        if self.trajectory is None:
+            # Em memória, a capacidade vale para a trajetória inteira (todos os segmentos)
+            self.trajectory = SegmentedTrajectory(
+                self._create_segment,
+                capacity=None if self.params.trajectory_path else self.params.trajectory_capacity
+            )
         
-        self.history.append(state)
-        self.visualization_data.append(self._prepare_visualization_frame())
+        energy, state, operational = self._bot_columns()
+        self.trajectory.append(
+            self.time,
+            self.particles.P,
+            self.particles.V,
+            energy,
+            state,
+            self._statistics_vector(energy, operational)
+        )
     
-    def _calculate_statistics(self) -> Dict[str, Any]:
-        """Calcula estatísticas da simulação"""
-        if not self.nanobots:
-            return {}
+    def _bot_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Energia, código de estado e flag operacional de cada nanobot (ordem SoA)"""
+        n = len(self._bot_order)
+        energy = np.fromiter((bot.energy_level for bot in self._bot_order), dtype=float, count=n)
+        state = np.fromiter((STATE_CODES[bot.state] for bot in self._bot_order), dtype=np.uint8, count=n)
+        operational = np.fromiter((bot.is_operational() for bot in self._bot_order), dtype=bool, count=n)
+        return energy, state, operational
+    
+    def _statistics_vector(self, energy: np.ndarray, operational: np.ndarray) -> np.ndarray:
+        """Estatísticas agregadas (na ordem de STATISTICS_FIELDS), vetorizadas"""
+        n = self.particles.count
+        if n == 0:
+            return np.zeros(len(STATISTICS_FIELDS))
         
-        velocities = [np.linalg.norm(bot.velocity) for bot in self.nanobots.values()]
-        energies = [bot.energy_level for bot in self.nanobots.values()]
+        speeds = np.linalg.norm(self.particles.V, axis=1)
+        masses = self.particles.masses[:n]
         
         # Temperatura cinética
-        total_kinetic_energy = sum(
-            0.5 * bot.mass * np.linalg.norm(bot.velocity)**2 
-            for bot in self.nanobots.values()
-        )
+        total_kinetic_energy = 0.5 * np.sum(masses * speeds**2)
+        kinetic_temperature = (2 * total_kinetic_energy) / (3 * n * PhysicsConstants.BOLTZMANN)
         
-        kinetic_temperature = (2 * total_kinetic_energy) / (3 * len(self.nanobots) * PhysicsConstants.BOLTZMANN)
+        return np.array([
+            speeds.mean(),
+            speeds.max(),
+            energy.mean(),
+            kinetic_temperature,
+            operational.sum()
+        ], dtype=float)
+    
+    def _calculate_statistics(self) -> Dict[str, Any]:
+        """Calcula estatísticas da simulação"""
+        if not self.nanobots:
+            return {}
         
+        energy, _, operational = self._bot_columns()
+        return self._statistics_dict(self._statistics_vector(energy, operational))
+    
+    @staticmethod
+    def _statistics_dict(values: np.ndarray) -> Dict[str, Any]:
+        """Converte vetor de estatísticas em dicionário"""
+        statistics = dict(zip(STATISTICS_FIELDS, values.tolist()))
+        statistics["operational_bots"] = int(statistics["operational_bots"])
+        return statistics
+    
+    def _history_entry(self, frame: TrajectoryFrame) -> Dict[str, Any]:
+        """Reconstrói o registro de estado de um quadro gravado"""
+        positions = frame.positions.tolist()
+        velocities = frame.velocities.tolist()
+        energy = frame.energy.tolist()
         return {
-            "avg_velocity": np.mean(velocities) if velocities else 0,
-            "max_velocity": np.max(velocities) if velocities else 0,
-            "avg_energy": np.mean(energies) if energies else 0,
-            "kinetic_temperature": kinetic_temperature,
-            "operational_bots": sum(1 for bot in self.nanobots.values() if bot.is_operational())
+            "time": float(frame.time),
+            "nanobots": {
+                bot.bot_id: {
+                    "position": dict(zip("xyz", positions[index])),
+                    "velocity": velocities[index],
+                    "energy": energy[index],
+                    "state": STATES_BY_CODE[code].value
+                }
+                for index, (bot, code) in enumerate(zip(self._bot_order, frame.state.tolist()))
+            },
+            "statistics": self._statistics_dict(frame.statistics)
         }
     
-    def _prepare_visualization_frame(self) -> Dict[str, Any]:
-        """Prepara dados para visualização"""
+    def _molecules_visualization(self) -> List[Dict[str, Any]]:
+        """Dados de visualização das moléculas (estáticas durante a simulação)"""
+        return [
+            {
+                "id": mol.structure_id,
+                "atoms": [
+                    {
+                        "position": atom.position,
+                        "type": atom.atom_type.symbol,
+                        "radius": self._get_atom_radius(atom.atom_type)
+                    }
+                    for atom in mol.atoms.values()
+                ]
+            }
+            for mol in self.molecules.values()
+        ]
+    
+    def _visualization_frame(self,
+                             frame: TrajectoryFrame,
+                             molecules: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Prepara dados para visualização de um quadro gravado"""
+        positions = frame.positions.tolist()
         return {
-            "time": self.time,
+            "time": float(frame.time),
             "nanobots": [
                 {
                     "id": bot.bot_id,
                     "type": bot.bot_type.value,
-                    "position": bot.position.to_dict(),
+                    "position": dict(zip("xyz", positions[index])),
                     "radius": bot.radius,
                     "color": self._get_bot_color(bot),
-                    "state": bot.state.value
+                    "state": STATES_BY_CODE[code].value
                 }
-                for bot in self.nanobots.values()
+                for index, (bot, code) in enumerate(zip(self._bot_order, frame.state.tolist()))
             ],
-            "molecules": [
-                {
-                    "id": mol.structure_id,
-                    "atoms": [
-                        {
-                            "position": atom.position,
-                            "type": atom.atom_type.symbol,
-                            "radius": self._get_atom_radius(atom.atom_type)
-                        }
-                        for atom in mol.atoms.values()
-                    ]
-                }
-                for mol in self.molecules.values()
-            ]
+            "molecules": molecules
         }
     
     def _get_bot_color(self, bot: SimulatedNanobot) -> str:
@@ -788,6 +909,7 @@ class NanoSimulator:
         return {
             "duration": self.time,
             "time_steps": len(self.history),
+            "trajectory": self._summarize_trajectory(),
             "parameters": {
                 "time_step": self.params.time_step,
                 "temperature": self.params.temperature,
@@ -816,6 +938,19 @@ class NanoSimulator:
             "events_summary": self._summarize_events()
         }
     
+    def _summarize_trajectory(self) -> Dict[str, Any]:
+        """Resumo da trajetória gravada (médias acumuladas em streaming)"""
+        store = self.trajectory
+        return {
+            "storage": "disk" if self.params.trajectory_path else "memory",
+            "segments": len(store.segments) if store is not None else 0,
+            "record_stride": self.params.record_stride,
+            "steps": self.step_count,
+            "frames_recorded": store.frames_recorded if store is not None else 0,
+            "frames_available": len(store) if store is not None else 0,
+            "mean_statistics": store.mean_statistics() if store is not None else {}
+        }
+    
     def _summarize_events(self) -> Dict[str, int]:
         """Resumo de eventos ocorridos"""
         # Implementação simplificada - contaria eventos reais
@@ -827,16 +962,27 @@ class NanoSimulator:
         }
     
     def export_visualization(self, filename: str, format: str = "json"):
-        """Exporta dados de visualização"""
+        """
+        Exporta dados de visualização.
+        
+        Os quadros são lidos da trajetória e escritos um a um, sem montar
+        a lista completa em memória.
+        """
         if format == "json":
+            frames = self.visualization_data
+            metadata = {
+                "duration": self.time,
+                "frames": len(frames),
+                "box_size": self.params.box_size
+            }
             with open(filename, 'w') as f:
-                json.dump({
-                    "metadata": {
-                        "duration": self.time,
-                        "frames": len(self.visualization_data),
-                        "box_size": self.params.box_size
-                    },
-                    "frames": self.visualization_data
-                }, f, indent=2)
+                f.write('{"metadata": ')
+                json.dump(metadata, f)
+                f.write(', "frames": [')
+                for index, frame in enumerate(frames):
+                    if index:
+                        f.write(', ')
+                    json.dump(frame, f)
+                f.write(']}')
         else:
-            raise ValueError(f"Formato não suportado: {format}") 
\ No newline at end of file
+            raise ValueError(f"Formato não suportado: {format}") 
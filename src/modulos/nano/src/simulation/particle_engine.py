@@ -0,0 +1,231 @@
+"""
+Motor de Partículas SoA
+Fase Delta - Sistema AutoCura
+
+Implementa:
+- Armazenamento structure-of-arrays (posições, velocidades, forças,
+  massas e raios em arrays NumPy contíguos)
+- Lista de vizinhos com raio de corte (KD-tree periódica ou força bruta)
+- Forças pareadas, integração, contorno e colisões vetorizados
+"""
+
+import numpy as np
+from typing import Iterable, Optional, Tuple
+
+from ..interfaces.nanobot_interface import NanoPosition
+
+try:
+    from scipy.spatial import cKDTree
+    KDTREE_AVAILABLE = True
+except ImportError:
+    KDTREE_AVAILABLE = False
+
+
+class ParticleArrays:
+    """
+    Armazenamento SoA do estado físico de todos os nanobots.
+
+    `add` pode realocar os arrays (ver `_grow`): views obtidas antes dela
+    (P, V, F ou linhas indexadas) passam a apontar para os buffers antigos
+    e não devem ser mantidas entre inserções.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.count = 0
+        self.positions = np.zeros((capacity, 3))  # nm
+        self.velocities = np.zeros((capacity, 3))  # nm/s
+        self.forces = np.zeros((capacity, 3))  # pN
+        self.masses = np.zeros(capacity)  # kg
+        self.radii = np.zeros(capacity)  # nm
+        self.drag = np.zeros(capacity)  # kg/s
+        self.operational = np.zeros(capacity, dtype=bool)
+
+    @property
+    def capacity(self) -> int:
+        return self.positions.shape[0]
+
+    def _grow(self) -> None:
+        """Dobra a capacidade dos arrays (invalida views existentes)"""
+        new_capacity = max(1, self.capacity * 2)
+        for name in ("positions", "velocities", "forces", "masses", "radii", "drag", "operational"):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self,
+            position: Tuple[float, float, float],
+            velocity: Iterable[float],
+            force: Iterable[float],
+            mass: float,
+            radius: float,
+            drag: float) -> int:
+        """Adiciona partícula e retorna seu índice (pode invalidar views existentes)"""
+        if self.count == self.capacity:
+            self._grow()
+
+        index = self.count
+        self.positions[index] = position
+        self.velocities[index] = velocity
+        self.forces[index] = force
+        self.masses[index] = mass
+        self.radii[index] = radius
+        self.drag[index] = drag
+        self.operational[index] = True
+        self.count += 1
+        return index
+
+    # Views sobre as partículas ativas
+    @property
+    def P(self) -> np.ndarray:
+        return self.positions[:self.count]
+
+    @property
+    def V(self) -> np.ndarray:
+        return self.velocities[:self.count]
+
+    @property
+    def F(self) -> np.ndarray:
+        return self.forces[:self.count]
+
+
+class BoundNanoPosition(NanoPosition):
+    """
+    NanoPosition que lê e escreve diretamente na linha do array de posições.
+
+    A linha é resolvida por `ParticleArrays.positions` a cada acesso, então
+    a instância continua válida depois que `add` realoca os arrays.
+    """
+
+    def __init__(self, particles: ParticleArrays, index: int):
+        object.__setattr__(self, "_particles", particles)
+        object.__setattr__(self, "_index", index)
+
+    def _get(axis: int):
+        def getter(self) -> float:
+            return float(self._particles.positions[self._index, axis])
+
+        def setter(self, value: float) -> None:
+            self._particles.positions[self._index, axis] = value
+
+        return property(getter, setter)
+
+    x = _get(0)
+    y = _get(1)
+    z = _get(2)
+    del _get
+
+
+def minimum_image(r_vec: np.ndarray, box: np.ndarray) -> np.ndarray:
+    """Aplica convenção de imagem mínima para caixa periódica"""
+    return r_vec - box * np.round(r_vec / box)
+
+
+def neighbor_pairs(positions: np.ndarray,
+                   cutoff: Optional[float],
+                   box: np.ndarray,
+                   periodic: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pares (i < j) a menos de `cutoff` nm.
+
+    Usa cKDTree (com caixa periódica quando aplicável) para escala
+    aproximadamente linear; sem scipy ou sem cutoff, recorre a força
+    bruta vetorizada.
+
+    Returns:
+        Arrays de índices (i, j)
+    """
+    n = positions.shape[0]
+    if n < 2:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+
+    if cutoff is not None and KDTREE_AVAILABLE:
+        if periodic:
+            # np.mod de valores negativos ínfimos arredonda para o próprio box
+            wrapped = np.mod(positions, box)
+            wrapped[wrapped >= box] = 0.0
+            tree = cKDTree(wrapped, boxsize=box)
+        else:
+            tree = cKDTree(positions)
+        pairs = tree.query_pairs(cutoff, output_type="ndarray")
+        return pairs[:, 0], pairs[:, 1]
+
+    i, j = np.triu_indices(n, k=1)
+    if cutoff is None:
+        return i, j
+
+    r_vec = positions[j] - positions[i]
+    if periodic:
+        r_vec = minimum_image(r_vec, box)
+    mask = np.einsum("ij,ij->i", r_vec, r_vec) < cutoff**2
+    return i[mask], j[mask]
+
+
+def pair_geometry(positions: np.ndarray,
+                  i: np.ndarray,
+                  j: np.ndarray,
+                  box: np.ndarray,
+                  periodic: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """Vetores i->j e distâncias dos pares"""
+    r_vec = positions[j] - positions[i]
+    if periodic:
+        r_vec = minimum_image(r_vec, box)
+    return r_vec, np.linalg.norm(r_vec, axis=1)
+
+
+def accumulate_pair_forces(forces: np.ndarray,
+                           i: np.ndarray,
+                           j: np.ndarray,
+                           r_vec: np.ndarray,
+                           magnitude: np.ndarray,
+                           r: np.ndarray) -> None:
+    """
+    Soma forças pareadas: +magnitude na direção i->j em i e o oposto em j.
+
+    Mantém a convenção do simulador de que a força em cada bot aponta
+    para o outro bot quando a magnitude é positiva.
+    """
+    safe_r = np.where(r > 0, r, 1.0)
+    contribution = (magnitude / safe_r)[:, np.newaxis] * r_vec
+    contribution[r <= 0] = 0.0
+    np.add.at(forces, i, contribution)
+    np.add.at(forces, j, -contribution)
+
+
+def resolve_collisions(particles: ParticleArrays,
+                       i: np.ndarray,
+                       j: np.ndarray,
+                       box: np.ndarray,
+                       periodic: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Colisões elásticas entre pares sobrepostos.
+
+    Returns:
+        (i, j, velocidade de impacto) dos pares em colisão
+    """
+    P, V = particles.P, particles.V
+    m = particles.masses[:particles.count]
+    radii = particles.radii[:particles.count]
+
+    r_vec, distance = pair_geometry(P, i, j, box, periodic)
+    colliding = (distance < radii[i] + radii[j]) & (distance > 0)
+    i, j, r_vec, distance = i[colliding], j[colliding], r_vec[colliding], distance[colliding]
+    if i.size == 0:
+        return i, j, np.zeros(0)
+
+    n = r_vec / distance[:, np.newaxis]
+
+    # Velocidade relativa na direção normal (positiva = se aproximando)
+    v_rel_n = np.einsum("ij,ij->i", V[i] - V[j], n)
+    impulse = np.where(v_rel_n > 0, 2 * v_rel_n / (1 / m[i] + 1 / m[j]), 0.0)
+
+    np.add.at(V, i, -(impulse / m[i])[:, np.newaxis] * n)
+    np.add.at(V, j, (impulse / m[j])[:, np.newaxis] * n)
+
+    # Separa bots para evitar sobreposição
+    separation = ((radii[i] + radii[j] - distance) / 2)[:, np.newaxis] * n
+    np.add.at(P, i, -separation)
+    np.add.at(P, j, separation)
+
+    return i, j, v_rel_n
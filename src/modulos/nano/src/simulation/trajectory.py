@@ -0,0 +1,429 @@
+"""
+Gravação de Trajetória
+Fase Delta - Sistema AutoCura
+
+Implementa:
+- Armazenamento colunar de quadros (tempo, posições, velocidades,
+  energia, estado e estatísticas) desacoplado do laço de integração
+- Ring buffer pré-alocado em memória (mantém os últimos N quadros)
+- Arquivo colunar append-only em disco, gravado em blocos de quadros
+  e lido via memory-map
+- Encadeamento de segmentos quando a população muda durante a gravação
+- Sequências preguiçosas que materializam quadros sob demanda
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+
+# Estatísticas agregadas gravadas a cada quadro (na ordem das colunas)
+STATISTICS_FIELDS = (
+    "avg_velocity",
+    "max_velocity",
+    "avg_energy",
+    "kinetic_temperature",
+    "operational_bots"
+)
+
+
+class TrajectoryFrame(NamedTuple):
+    """Quadro gravado da trajetória"""
+    time: float
+    positions: np.ndarray  # (N, 3) nm
+    velocities: np.ndarray  # (N, 3) nm/s
+    energy: np.ndarray  # (N,)
+    state: np.ndarray  # (N,) códigos de NanobotState
+    statistics: np.ndarray  # (len(STATISTICS_FIELDS),)
+
+
+def column_layout(num_bots: int) -> Dict[str, tuple]:
+    """Formato (por quadro) e dtype de cada coluna"""
+    return {
+        "time": ((), np.float64),
+        "positions": ((num_bots, 3), np.float32),
+        "velocities": ((num_bots, 3), np.float32),
+        "energy": ((num_bots,), np.float32),
+        "state": ((num_bots,), np.uint8),
+        "statistics": ((len(STATISTICS_FIELDS),), np.float64)
+    }
+
+
+def _allocate(num_bots: int, frames: int) -> Dict[str, np.ndarray]:
+    """Aloca um bloco colunar com espaço para `frames` quadros"""
+    return {
+        name: np.zeros((frames,) + shape, dtype=dtype)
+        for name, (shape, dtype) in column_layout(num_bots).items()
+    }
+
+
+class TrajectoryStore(ABC):
+    """
+    Interface comum dos armazenamentos de trajetória.
+
+    O número de nanobots é fixo por armazenamento; mudanças de população
+    durante a gravação são tratadas por SegmentedTrajectory.
+    """
+
+    def __init__(self, num_bots: int):
+        self.num_bots = num_bots
+        self.frames_recorded = 0  # Total gravado (inclui quadros descartados)
+
+    @abstractmethod
+    def append(self,
+               time: float,
+               positions: np.ndarray,
+               velocities: np.ndarray,
+               energy: np.ndarray,
+               state: np.ndarray,
+               statistics: np.ndarray) -> None:
+        """Grava um quadro"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Número de quadros disponíveis para leitura"""
+
+    @abstractmethod
+    def frame(self, index: int) -> TrajectoryFrame:
+        """Lê o quadro `index` (0 = mais antigo disponível)"""
+
+    @abstractmethod
+    def iter_chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        """Itera blocos colunares em ordem cronológica"""
+
+    def iter_frames(self) -> Iterator[TrajectoryFrame]:
+        """Itera quadros em ordem cronológica, bloco a bloco"""
+        for chunk in self.iter_chunks():
+            for k in range(len(chunk["time"])):
+                yield TrajectoryFrame(**{name: column[k] for name, column in chunk.items()})
+
+    def mean_statistics(self) -> Dict[str, float]:
+        """Média temporal das estatísticas, acumulada em streaming"""
+        total = np.zeros(len(STATISTICS_FIELDS))
+        frames = 0
+        for chunk in self.iter_chunks():
+            total += chunk["statistics"].sum(axis=0)
+            frames += len(chunk["statistics"])
+        if frames == 0:
+            return {}
+        return dict(zip(STATISTICS_FIELDS, (total / frames).tolist()))
+
+    def flush(self) -> None:
+        """Torna os quadros pendentes visíveis a leitores externos"""
+
+    def close(self) -> None:
+        """Libera recursos (arquivos)"""
+
+
+class RingBufferTrajectory(TrajectoryStore):
+    """
+    Trajetória em memória com capacidade fixa (descarta os quadros mais antigos).
+
+    Os arrays começam com até INITIAL_FRAMES quadros e dobram sob demanda
+    até `capacity`, então trajetórias curtas não reservam a capacidade toda.
+    """
+
+    INITIAL_FRAMES = 64
+
+    def __init__(self, num_bots: int, capacity: int = 1000):
+        super().__init__(num_bots)
+        if capacity < 1:
+            raise ValueError("Trajectory capacity must be at least 1 frame")
+        self.capacity = capacity
+        self._columns = _allocate(num_bots, min(capacity, self.INITIAL_FRAMES))
+
+    def _grow(self) -> None:
+        """Dobra os arrays (limitado à capacidade); só ocorre antes da primeira volta"""
+        frames = min(self.capacity, 2 * len(self._columns["time"]))
+        columns = _allocate(self.num_bots, frames)
+        for name, column in self._columns.items():
+            columns[name][:len(column)] = column
+        self._columns = columns
+
+    def append(self, time, positions, velocities, energy, state, statistics) -> None:
+        slot = self.frames_recorded % self.capacity
+        if slot >= len(self._columns["time"]):
+            self._grow()
+        columns = self._columns
+        columns["time"][slot] = time
+        columns["positions"][slot] = positions
+        columns["velocities"][slot] = velocities
+        columns["energy"][slot] = energy
+        columns["state"][slot] = state
+        columns["statistics"][slot] = statistics
+        self.frames_recorded += 1
+
+    def __len__(self) -> int:
+        return min(self.frames_recorded, self.capacity)
+
+    @property
+    def frames_dropped(self) -> int:
+        return self.frames_recorded - len(self)
+
+    def _slot(self, index: int) -> int:
+        if not 0 <= index < len(self):
+            raise IndexError("Trajectory frame index out of range")
+        return (self.frames_dropped + index) % self.capacity
+
+    def frame(self, index: int) -> TrajectoryFrame:
+        slot = self._slot(index)
+        return TrajectoryFrame(**{name: column[slot] for name, column in self._columns.items()})
+
+    def iter_chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        if not len(self):
+            return
+        start = self.frames_dropped % self.capacity
+        end = start + len(self)
+        # No máximo dois trechos contíguos: [start, capacity) e [0, resto)
+        yield {name: column[start:min(end, self.capacity)] for name, column in self._columns.items()}
+        if end > self.capacity:
+            yield {name: column[:end - self.capacity] for name, column in self._columns.items()}
+
+
+class MappedTrajectory(TrajectoryStore):
+    """
+    Trajetória em disco: um arquivo binário append-only por coluna.
+
+    Quadros são acumulados em um bloco pré-alocado de `chunk_frames`
+    quadros e anexados aos arquivos quando o bloco enche; a leitura usa
+    np.memmap, então o consumo de memória independe da duração.
+    O diretório contém também `trajectory.json` com o layout e os ids
+    dos nanobots, permitindo leitura externa.
+    """
+
+    METADATA_FILE = "trajectory.json"
+
+    def __init__(self,
+                 directory: str,
+                 num_bots: int,
+                 chunk_frames: int = 64,
+                 bot_ids: Optional[List[str]] = None):
+        super().__init__(num_bots)
+        if chunk_frames < 1:
+            raise ValueError("Trajectory chunk must be at least 1 frame")
+        self.directory = directory
+        self.chunk_frames = chunk_frames
+        self.bot_ids = list(bot_ids or [])
+        self.frames_flushed = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._layout = column_layout(num_bots)
+        self._buffer = _allocate(num_bots, chunk_frames)
+        self._buffered = 0
+        self._files = {
+            name: open(self._column_path(name), "wb")
+            for name in self._layout
+        }
+        self._maps: Dict[str, np.memmap] = {}
+        self._mapped_frames = 0
+        self._write_metadata()
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def _write_metadata(self) -> None:
+        metadata = {
+            "num_bots": self.num_bots,
+            "frames": self.frames_flushed,
+            "bot_ids": self.bot_ids,
+            "statistics_fields": list(STATISTICS_FIELDS),
+            "columns": {
+                name: {"shape": list(shape), "dtype": np.dtype(dtype).str}
+                for name, (shape, dtype) in self._layout.items()
+            }
+        }
+        with open(os.path.join(self.directory, self.METADATA_FILE), "w") as f:
+            json.dump(metadata, f)
+
+    def append(self, time, positions, velocities, energy, state, statistics) -> None:
+        slot = self._buffered
+        buffer = self._buffer
+        buffer["time"][slot] = time
+        buffer["positions"][slot] = positions
+        buffer["velocities"][slot] = velocities
+        buffer["energy"][slot] = energy
+        buffer["state"][slot] = state
+        buffer["statistics"][slot] = statistics
+        self._buffered += 1
+        self.frames_recorded += 1
+
+        if self._buffered == self.chunk_frames:
+            self.flush()
+
+    def flush(self) -> None:
+        """Anexa o bloco pendente aos arquivos de coluna"""
+        if not self._buffered:
+            return
+        for name, f in self._files.items():
+            f.write(self._buffer[name][:self._buffered].tobytes())
+            f.flush()
+        self.frames_flushed += self._buffered
+        self._buffered = 0
+        self._write_metadata()
+
+    def __len__(self) -> int:
+        return self.frames_recorded
+
+    def _mapped(self) -> Dict[str, np.memmap]:
+        """Memory-maps sobre os quadros já anexados (recriados quando crescem)"""
+        if self._mapped_frames != self.frames_flushed:
+            # Colunas sem dados (população vazia) não podem ser mapeadas
+            self._maps = {
+                name: np.memmap(self._column_path(name), dtype=dtype, mode="r",
+                                shape=(self.frames_flushed,) + shape)
+                if np.prod(shape, dtype=int) else np.zeros((self.frames_flushed,) + shape, dtype=dtype)
+                for name, (shape, dtype) in self._layout.items()
+            }
+            self._mapped_frames = self.frames_flushed
+        return self._maps
+
+    def frame(self, index: int) -> TrajectoryFrame:
+        if not 0 <= index < len(self):
+            raise IndexError("Trajectory frame index out of range")
+        if index < self.frames_flushed:
+            source, row = self._mapped(), index
+        else:
+            source, row = self._buffer, index - self.frames_flushed
+        return TrajectoryFrame(**{name: np.array(source[name][row]) for name in self._layout})
+
+    def iter_chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        flushed = self.frames_flushed
+        if flushed:
+            maps = self._mapped()
+            for start in range(0, flushed, self.chunk_frames):
+                stop = min(start + self.chunk_frames, flushed)
+                yield {name: np.array(column[start:stop]) for name, column in maps.items()}
+        if self._buffered:
+            yield {name: column[:self._buffered] for name, column in self._buffer.items()}
+
+    def close(self) -> None:
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        self._maps = {}
+        self._mapped_frames = 0
+
+
+class SegmentedTrajectory(TrajectoryStore):
+    """
+    Trajetória encadeada em segmentos, um por tamanho de população.
+
+    Cada segmento é um armazenamento criado por `factory(indice, num_bots)`;
+    quando um quadro chega com outro número de nanobots, o segmento atual é
+    fechado (continua legível) e a gravação segue em um novo. Leitura e
+    iteração percorrem os segmentos em ordem cronológica.
+
+    Com `capacity`, no máximo esse número de quadros fica disponível: os
+    mais antigos são ocultados e os segmentos que ficam inteiramente fora
+    da janela são descartados.
+    """
+
+    def __init__(self,
+                 factory: Callable[[int, int], TrajectoryStore],
+                 capacity: Optional[int] = None):
+        super().__init__(0)
+        if capacity is not None and capacity < 1:
+            raise ValueError("Trajectory capacity must be at least 1 frame")
+        self._factory = factory
+        self.capacity = capacity
+        self.segments: List[TrajectoryStore] = []
+        self.segments_created = 0
+        self._skipped = 0  # Quadros ocultados no início do segmento mais antigo
+
+    def append(self, time, positions, velocities, energy, state, statistics) -> None:
+        num_bots = len(positions)
+        if not self.segments or num_bots != self.num_bots:
+            if self.segments:
+                self.segments[-1].close()
+            self.segments.append(self._factory(self.segments_created, num_bots))
+            self.segments_created += 1
+            self.num_bots = num_bots
+        self.segments[-1].append(time, positions, velocities, energy, state, statistics)
+        self.frames_recorded += 1
+        if self.capacity is not None:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Mantém no máximo `capacity` quadros disponíveis"""
+        excess = len(self) - self.capacity
+        # O segmento atual já é limitado pela própria capacidade
+        while excess > 0 and len(self.segments) > 1:
+            remaining = len(self.segments[0]) - self._skipped
+            if remaining <= excess:
+                self.segments.pop(0).close()
+                self._skipped = 0
+                excess -= remaining
+            else:
+                self._skipped += excess
+                excess = 0
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments) - self._skipped
+
+    def frame(self, index: int) -> TrajectoryFrame:
+        if index >= 0:
+            index += self._skipped
+            for segment in self.segments:
+                if index < len(segment):
+                    return segment.frame(index)
+                index -= len(segment)
+        raise IndexError("Trajectory frame index out of range")
+
+    def iter_chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        skip = self._skipped
+        for segment in self.segments:
+            for chunk in segment.iter_chunks():
+                size = len(chunk["time"])
+                if skip >= size:
+                    skip -= size
+                    continue
+                if skip:
+                    chunk = {name: column[skip:] for name, column in chunk.items()}
+                    skip = 0
+                yield chunk
+
+    def flush(self) -> None:
+        if self.segments:
+            self.segments[-1].flush()
+
+    def close(self) -> None:
+        for segment in self.segments:
+            segment.close()
+
+
+class FrameSequence(Sequence):
+    """
+    Sequência somente leitura sobre uma trajetória.
+
+    Cada item é construído sob demanda por `builder` a partir do quadro
+    gravado; a iteração percorre o armazenamento bloco a bloco.
+    """
+
+    def __init__(self,
+                 store: Optional[TrajectoryStore],
+                 builder: Callable[[TrajectoryFrame], Dict[str, Any]]):
+        self._store = store
+        self._builder = builder
+
+    def __len__(self) -> int:
+        return len(self._store) if self._store is not None else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Trajectory frame index out of range")
+        return self._builder(self._store.frame(index))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._store is None:
+            return
+        for frame in self._store.iter_frames():
+            yield self._builder(frame)
@@ -10,30 +10,74 @@ import numpy as np
 from typing import Dict, List, Optional, Any, Union, Tuple
 import logging
 from collections import defaultdict
-import random
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from ..interfaces.circuit_interface import QuantumCircuitInterface, QuantumGate, QuantumBackend
+from ..simulators import statevector_kernels as kernels
+from ..simulators.measurement_sampler import MeasurementSampler, marginal_probabilities
+from ..simulators.statevector_kernels import (
+    GATE_MATRICES, SingleQubitFuser, rotation_x, rotation_y, rotation_z
+)
 
 logger = logging.getLogger(__name__)
 
+# Quando ativo, circuitos apenas registram portas sem simular o statevector
+_record_only: ContextVar[bool] = ContextVar('simulator_record_only', default=False)
+
+
+@contextmanager
+def record_only():
+    """
+    Contexto em que novos SimulatorCircuit apenas registram a lista de portas.
+    
+    Permite rastrear a estrutura de um ansatz (portas e ângulos) sem custo
+    de simulação, ex: para montar lotes de parâmetros deslocados.
+    """
+    token = _record_only.set(True)
+    try:
+        yield
+    finally:
+        _record_only.reset(token)
+
 
 class SimulatorCircuit(QuantumCircuitInterface):
     """
     Implementação de circuito quântico usando simulador básico.
     Mantém o estado quântico completo em memória.
+    
+    As portas são aplicadas por kernels vetorizados (ver
+    simulators.statevector_kernels) e portas consecutivas de um qubit
+    no mesmo fio são fundidas em uma única matriz antes de aplicadas.
     """
     
-    def __init__(self):
+    def __init__(self, fuse_single_qubit_gates: bool = True, seed: Optional[int] = None):
+        self.fuse_single_qubit_gates = fuse_single_qubit_gates
+        self.rng = np.random.default_rng(seed)
+        self._fuser = SingleQubitFuser()
+        self._statevector = None
         super().__init__(QuantumBackend.SIMULATOR)
         self.gates = []  # Lista de portas aplicadas
         self.measurements = []  # Lista de medições
         self.statevector = None
         self.measured_qubits = set()
+        self.mid_circuit_measurement = False
     
     def _initialize_backend(self) -> None:
         """Inicializa o simulador"""
         logger.info("Initializing quantum simulator backend")
-        self.max_qubits = 20  # Limite prático para simulação
+        self.max_qubits = 24  # Limite prático para simulação (16 bytes * 2^n)
+    
+    @property
+    def statevector(self) -> Optional[np.ndarray]:
+        """Statevector com todas as portas pendentes já aplicadas"""
+        self._flush_fused_gates()
+        return self._statevector
+    
+    @statevector.setter
+    def statevector(self, value: Optional[np.ndarray]) -> None:
+        self._fuser.clear()
+        self._statevector = value
     
     def create_circuit(self, num_qubits: int, num_classical_bits: Optional[int] = None) -> None:
         """Cria um novo circuito quântico"""
@@ -44,13 +88,17 @@ class SimulatorCircuit(QuantumCircuitInterface):
         self.num_classical_bits = num_classical_bits or num_qubits
         
         # Inicializar estado |00...0>
-        self.statevector = np.zeros(2**num_qubits, dtype=complex)
-        self.statevector[0] = 1.0
+        if _record_only.get():
+            self.statevector = None
+        else:
+            self.statevector = np.zeros(2**num_qubits, dtype=complex)
+            self.statevector[0] = 1.0
         
         # Limpar listas
         self.gates = []
         self.measurements = []
         self.measured_qubits = set()
+        self.mid_circuit_measurement = False
         
         logger.info(f"Created circuit with {num_qubits} qubits and {self.num_classical_bits} classical bits")
     
@@ -65,6 +113,10 @@ class SimulatorCircuit(QuantumCircuitInterface):
             if q >= self.num_qubits or q < 0:
                 raise ValueError(f"Qubit index {q} out of range")
         
+        # Porta após medição no mesmo qubit: amostragem terminal não se aplica
+        if self.measured_qubits.intersection(qubits):
+            self.mid_circuit_measurement = True
+        
         # Armazenar porta
         self.gates.append({
             'gate': gate,
@@ -73,7 +125,8 @@ class SimulatorCircuit(QuantumCircuitInterface):
         })
         
         # Aplicar porta ao statevector
-        self._apply_gate_to_statevector(gate, qubits, params)
+        if self._statevector is not None:
+            self._apply_gate_to_statevector(gate, qubits, params)
     
     def add_measurement(self, qubit: int, classical_bit: int) -> None:
         """Adiciona medição de um qubit"""
@@ -88,8 +141,20 @@ class SimulatorCircuit(QuantumCircuitInterface):
         })
         self.measured_qubits.add(qubit)
     
-    def execute(self, shots: int = 1024, optimization_level: int = 1) -> Dict[str, Any]:
-        """Executa o circuito"""
+    def execute(self, shots: int = 1024, optimization_level: int = 1,
+                memory: bool = True) -> Dict[str, Any]:
+        """
+        Executa o circuito.
+        
+        Medições terminais são amostradas de uma vez a partir da distribuição
+        marginal dos qubits medidos; o colapso shot a shot só é usado quando
+        há portas aplicadas após medições (medição no meio do circuito).
+        
+        Args:
+            shots: Número de execuções
+            optimization_level: Nível de otimização do circuito
+            memory: Se False, retorna apenas contagens (sem lista por shot)
+        """
         logger.info(f"Executing circuit with {shots} shots")
         
         if not self.measurements:
@@ -100,9 +165,19 @@ class SimulatorCircuit(QuantumCircuitInterface):
                 'memory': []
             }
         
-        # Simular medições
+        if not self.mid_circuit_measurement:
+            sampler = MeasurementSampler(self.measurements, self.num_qubits,
+                                         self.num_classical_bits, self.rng)
+            results = sampler.sample(self.statevector, shots, memory=memory)
+            results['statevector'] = None
+            return results
+        
+        return self._execute_with_collapse(shots, memory)
+    
+    def _execute_with_collapse(self, shots: int, memory: bool = True) -> Dict[str, Any]:
+        """Simula medições shot a shot com colapso do statevector"""
         counts = defaultdict(int)
-        memory = []
+        shot_memory = []
         
         for shot in range(shots):
             # Copiar statevector para esta execução
@@ -125,12 +200,13 @@ class SimulatorCircuit(QuantumCircuitInterface):
             # Registrar resultado
             bitstring = ''.join(measurement_result)
             counts[bitstring] += 1
-            memory.append(bitstring)
+            if memory:
+                shot_memory.append(bitstring)
         
         return {
             'counts': dict(counts),
-            'memory': memory,
-            'statevector': self.statevector.copy() if not self.measured_qubits else None
+            'memory': shot_memory,
+            'statevector': None
         }
     
     def get_statevector(self) -> np.ndarray:
@@ -342,166 +418,114 @@ class SimulatorCircuit(QuantumCircuitInterface):
             self._apply_swap(qubits[0], qubits[1])
         elif gate == QuantumGate.TOFFOLI:
             self._apply_toffoli(qubits[0], qubits[1], qubits[2])
+        elif gate == QuantumGate.FREDKIN:
+            self._apply_fredkin(qubits[0], qubits[1], qubits[2])
         else:
             logger.warning(f"Gate {gate} not implemented in simulator")
     
     def _apply_hadamard(self, qubit: int) -> None:
         """Aplica porta Hadamard"""
-        H = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
-        self._apply_single_qubit_gate(H, qubit)
+        self._queue_single_qubit_gate(GATE_MATRICES['hadamard'], qubit)
     
     def _apply_pauli_x(self, qubit: int) -> None:
         """Aplica porta Pauli-X"""
-        X = np.array([[0, 1], [1, 0]])
-        self._apply_single_qubit_gate(X, qubit)
+        self._queue_single_qubit_gate(GATE_MATRICES['pauli_x'], qubit)
     
     def _apply_pauli_y(self, qubit: int) -> None:
         """Aplica porta Pauli-Y"""
-        Y = np.array([[0, -1j], [1j, 0]])
-        self._apply_single_qubit_gate(Y, qubit)
+        self._queue_single_qubit_gate(GATE_MATRICES['pauli_y'], qubit)
     
     def _apply_pauli_z(self, qubit: int) -> None:
         """Aplica porta Pauli-Z"""
-        Z = np.array([[1, 0], [0, -1]])
-        self._apply_single_qubit_gate(Z, qubit)
+        self._queue_single_qubit_gate(GATE_MATRICES['pauli_z'], qubit)
     
     def _apply_phase_s(self, qubit: int) -> None:
         """Aplica porta S (phase)"""
-        S = np.array([[1, 0], [0, 1j]])
-        self._apply_single_qubit_gate(S, qubit)
+        self._queue_single_qubit_gate(GATE_MATRICES['phase_s'], qubit)
     
     def _apply_phase_t(self, qubit: int) -> None:
         """Aplica porta T"""
-        T = np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]])
-        self._apply_single_qubit_gate(T, qubit)
+        self._queue_single_qubit_gate(GATE_MATRICES['phase_t'], qubit)
     
     def _apply_rotation_x(self, qubit: int, angle: float) -> None:
         """Aplica rotação em X"""
-        c = np.cos(angle / 2)
-        s = np.sin(angle / 2)
-        RX = np.array([[c, -1j * s], [-1j * s, c]])
-        self._apply_single_qubit_gate(RX, qubit)
+        self._queue_single_qubit_gate(rotation_x(angle), qubit)
     
     def _apply_rotation_y(self, qubit: int, angle: float) -> None:
         """Aplica rotação em Y"""
-        c = np.cos(angle / 2)
-        s = np.sin(angle / 2)
-        RY = np.array([[c, -s], [s, c]])
-        self._apply_single_qubit_gate(RY, qubit)
+        self._queue_single_qubit_gate(rotation_y(angle), qubit)
     
     def _apply_rotation_z(self, qubit: int, angle: float) -> None:
         """Aplica rotação em Z"""
-        RZ = np.array([[np.exp(-1j * angle / 2), 0], 
-                      [0, np.exp(1j * angle / 2)]])
-        self._apply_single_qubit_gate(RZ, qubit)
+        self._queue_single_qubit_gate(rotation_z(angle), qubit)
+    
+    def _queue_single_qubit_gate(self, gate_matrix: np.ndarray, qubit: int) -> None:
+        """Enfileira porta de um qubit para fusão com as seguintes no mesmo fio"""
+        if self.fuse_single_qubit_gates:
+            self._fuser.push(gate_matrix, qubit)
+        else:
+            self._apply_single_qubit_gate(gate_matrix, qubit)
+    
+    def _flush_fused_gates(self, qubits: Optional[List[int]] = None) -> None:
+        """Aplica portas de um qubit pendentes (todas ou só dos fios indicados)"""
+        if self._fuser:
+            self._fuser.flush(self._statevector, self.num_qubits, qubits)
     
     def _apply_single_qubit_gate(self, gate_matrix: np.ndarray, qubit: int) -> None:
         """Aplica matriz 2x2 em um qubit específico"""
-        n = self.num_qubits
-        
-        # Para cada estado base computacional
-        new_statevector = np.zeros_like(self.statevector)
-        
-        for state in range(2**n):
-            # Extrair bit do qubit alvo
-            qubit_bit = (state >> (n - qubit - 1)) & 1
-            
-            # Estados que diferem apenas no qubit alvo
-            state0 = state & ~(1 << (n - qubit - 1))  # Bit do qubit = 0
-            state1 = state | (1 << (n - qubit - 1))   # Bit do qubit = 1
-            
-            # Aplicar porta
-            if qubit_bit == 0:
-                new_statevector[state0] += gate_matrix[0, 0] * self.statevector[state0]
-                new_statevector[state1] += gate_matrix[1, 0] * self.statevector[state0]
-            else:
-                new_statevector[state0] += gate_matrix[0, 1] * self.statevector[state1]
-                new_statevector[state1] += gate_matrix[1, 1] * self.statevector[state1]
-        
-        self.statevector = new_statevector
+        self._flush_fused_gates([qubit])
+        kernels.apply_single_qubit(self._statevector, gate_matrix, qubit, self.num_qubits)
     
     def _apply_cnot(self, control: int, target: int) -> None:
         """Aplica porta CNOT"""
-        n = self.num_qubits
-        new_statevector = self.statevector.copy()
-        
-        for state in range(2**n):
-            control_bit = (state >> (n - control - 1)) & 1
-            
-            if control_bit == 1:
-                # Flip target bit
-                target_mask = 1 << (n - target - 1)
-                flipped_state = state ^ target_mask
-                
-                # Trocar amplitudes
-                new_statevector[state] = self.statevector[flipped_state]
-                new_statevector[flipped_state] = self.statevector[state]
-        
-        self.statevector = new_statevector
+        self._flush_fused_gates([control, target])
+        kernels.apply_single_qubit(self._statevector, GATE_MATRICES['pauli_x'],
+                                   target, self.num_qubits, controls=[control])
     
     def _apply_cz(self, control: int, target: int) -> None:
         """Aplica porta CZ"""
-        n = self.num_qubits
-        
-        for state in range(2**n):
-            control_bit = (state >> (n - control - 1)) & 1
-            target_bit = (state >> (n - target - 1)) & 1
-            
-            if control_bit == 1 and target_bit == 1:
-                self.statevector[state] *= -1
+        self._flush_fused_gates([control, target])
+        kernels.apply_controlled_phase(self._statevector, -1, [control, target], self.num_qubits)
     
     def _apply_swap(self, qubit1: int, qubit2: int) -> None:
         """Aplica porta SWAP"""
-        n = self.num_qubits
-        new_statevector = self.statevector.copy()
-        
-        for state in range(2**n):
-            bit1 = (state >> (n - qubit1 - 1)) & 1
-            bit2 = (state >> (n - qubit2 - 1)) & 1
-            
-            if bit1 != bit2:
-                # Trocar bits
-                mask1 = 1 << (n - qubit1 - 1)
-                mask2 = 1 << (n - qubit2 - 1)
-                swapped_state = state ^ mask1 ^ mask2
-                
-                new_statevector[swapped_state] = self.statevector[state]
-        
-        self.statevector = new_statevector
+        self._flush_fused_gates([qubit1, qubit2])
+        kernels.apply_swap(self._statevector, qubit1, qubit2, self.num_qubits)
     
     def _apply_toffoli(self, control1: int, control2: int, target: int) -> None:
         """Aplica porta Toffoli (CCNOT)"""
-        n = self.num_qubits
-        new_statevector = self.statevector.copy()
-        
-        for state in range(2**n):
-            control1_bit = (state >> (n - control1 - 1)) & 1
-            control2_bit = (state >> (n - control2 - 1)) & 1
-            
-            if control1_bit == 1 and control2_bit == 1:
-                # Flip target bit
-                target_mask = 1 << (n - target - 1)
-                flipped_state = state ^ target_mask
-                
-                # Trocar amplitudes
-                new_statevector[state] = self.statevector[flipped_state]
-                new_statevector[flipped_state] = self.statevector[state]
+        self._flush_fused_gates([control1, control2, target])
+        kernels.apply_single_qubit(self._statevector, GATE_MATRICES['pauli_x'],
+                                   target, self.num_qubits, controls=[control1, control2])
+    
+    def _apply_fredkin(self, control: int, target1: int, target2: int) -> None:
+        """Aplica porta Fredkin (CSWAP)"""
+        self._flush_fused_gates([control, target1, target2])
+        kernels.apply_swap(self._statevector, target1, target2, self.num_qubits,
+                           controls=[control])
+    
+    def apply_unitary(self, matrix: np.ndarray, qubits: List[int]) -> None:
+        """
+        Aplica unitário arbitrário de k qubits ao statevector.
+        
+        Args:
+            matrix: Matriz 2**k x 2**k (qubits[0] é o bit mais significativo)
+            qubits: Qubits alvo
+        """
+        for q in qubits:
+            if q >= self.num_qubits or q < 0:
+                raise ValueError(f"Qubit index {q} out of range")
         
-        self.statevector = new_statevector
+        self._flush_fused_gates(qubits)
+        kernels.apply_unitary(self._statevector, np.asarray(matrix, dtype=complex),
+                              qubits, self.num_qubits)
     
     def _measure_qubit(self, statevector: np.ndarray, qubit: int) -> int:
         """Mede um qubit e retorna 0 ou 1"""
-        n = self.num_qubits
-        
-        # Calcular probabilidade de medir 0
-        prob_0 = 0.0
-        for state in range(2**n):
-            qubit_bit = (state >> (n - qubit - 1)) & 1
-            if qubit_bit == 0:
-                prob_0 += abs(statevector[state])**2
+        prob_0 = marginal_probabilities(statevector, [qubit], self.num_qubits)[0]
         
         # Decidir resultado da medição
-        if random.random() < prob_0:
+        if self.rng.random() < prob_0:
             return 0
         else:
             return 1
@@ -511,20 +535,16 @@ class SimulatorCircuit(QuantumCircuitInterface):
                              qubit: int,
                              measurement: int) -> np.ndarray:
         """Colapsa statevector após medição"""
-        n = self.num_qubits
         collapsed = statevector.copy()
+        tensor = kernels.as_tensor(collapsed, self.num_qubits)
         
         # Zerar estados incompatíveis com medição
-        norm = 0.0
-        for state in range(2**n):
-            qubit_bit = (state >> (n - qubit - 1)) & 1
-            
-            if qubit_bit != measurement:
-                collapsed[state] = 0.0
-            else:
-                norm += abs(collapsed[state])**2
+        index = [slice(None)] * self.num_qubits
+        index[qubit] = 1 - measurement
+        tensor[tuple(index)] = 0.0
         
         # Renormalizar
+        norm = np.vdot(collapsed, collapsed).real
         if norm > 0:
             collapsed /= np.sqrt(norm)
         
@@ -596,7 +616,7 @@ class SimulatorCircuit(QuantumCircuitInterface):
         if not parts:
             return
         
-        gate_name = parts[0].lower()
+        gate_name = parts[0].lower().split('(')[0]
         
         # Mapear para QuantumGate
         gate_map = {
@@ -0,0 +1,262 @@
+"""
+Batched Gradient - Sistema AutoCura
+Fase GAMMA: Avaliação em Lote de Gradientes Variacionais
+
+Monta todos os conjuntos de parâmetros deslocados de uma vez e os
+avalia em um simulador de statevectors empilhados ([batch, 2**n]).
+Quando o lote não cabe no limite de memória, ele é dividido em blocos
+avaliados em paralelo em um pool de processos.
+
+Suporta gradiente analítico por parameter-shift (portas RX/RY/RZ) e
+diferenças finitas centrais; evaluate() também serve às avaliações
+perturbadas do SPSA.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..circuits.simulator_circuit import record_only
+from ..interfaces.circuit_interface import QuantumCircuitInterface, QuantumGate
+from ..simulators import statevector_kernels as kernels
+from ..simulators.pauli_expectation import PauliExpectationEngine
+
+logger = logging.getLogger(__name__)
+
+# Portas cujo gerador é σ/2: ∂E/∂θ = [E(θ + π/2) - E(θ - π/2)] / 2
+ROTATION_GATES = (QuantumGate.RX, QuantumGate.RY, QuantumGate.RZ)
+PARAMETER_SHIFT = np.pi / 2
+
+Hamiltonian = Union[np.ndarray, List[Tuple[float, str]]]
+
+
+def simulate_batch(template: List[Dict[str, Any]],
+                   angles: np.ndarray,
+                   num_qubits: int) -> np.ndarray:
+    """
+    Simula um lote de circuitos com a mesma estrutura e ângulos distintos.
+
+    Args:
+        template: Lista de portas ({'gate', 'qubits', 'params'}) do circuito
+        angles: Ângulos das portas de rotação, forma [batch, num_rotações]
+        num_qubits: Número de qubits
+
+    Returns:
+        Statevectors empilhados, forma [batch, 2**n]
+    """
+    states = np.zeros((angles.shape[0], 2**num_qubits), dtype=complex)
+    states[:, 0] = 1.0
+
+    column = 0
+    for gate_info in template:
+        gate = gate_info['gate']
+        qubits = gate_info['qubits']
+
+        if gate in ROTATION_GATES:
+            matrices = kernels.rotation_matrices(gate.value, angles[:, column])
+            kernels.apply_single_qubit_batch(states, matrices, qubits[0], num_qubits)
+            column += 1
+        elif gate.value in kernels.GATE_MATRICES:
+            kernels.apply_single_qubit_batch(states, kernels.GATE_MATRICES[gate.value],
+                                             qubits[0], num_qubits)
+        elif gate == QuantumGate.CNOT:
+            kernels.apply_single_qubit_batch(states, kernels.GATE_MATRICES['pauli_x'],
+                                             qubits[1], num_qubits, controls=[qubits[0]])
+        elif gate == QuantumGate.TOFFOLI:
+            kernels.apply_single_qubit_batch(states, kernels.GATE_MATRICES['pauli_x'],
+                                             qubits[2], num_qubits, controls=qubits[:2])
+        elif gate == QuantumGate.CZ:
+            kernels.apply_controlled_phase_batch(states, -1, qubits, num_qubits)
+        elif gate == QuantumGate.SWAP:
+            kernels.apply_swap_batch(states, qubits[0], qubits[1], num_qubits)
+        elif gate == QuantumGate.FREDKIN:
+            kernels.apply_swap_batch(states, qubits[1], qubits[2], num_qubits,
+                                     controls=[qubits[0]])
+        else:
+            raise ValueError(f"Gate {gate} not supported in batched simulation")
+
+    return states
+
+
+def batch_energies(states: np.ndarray,
+                   hamiltonian: Hamiltonian,
+                   num_qubits: int,
+                   engine: Optional[PauliExpectationEngine] = None) -> np.ndarray:
+    """Valor esperado do Hamiltoniano para cada statevector do lote"""
+    if isinstance(hamiltonian, np.ndarray):
+        return np.real(np.einsum('bi,ij,bj->b', np.conj(states), hamiltonian, states))
+
+    engine = engine or PauliExpectationEngine(hamiltonian, num_qubits)
+    return engine.expectation_batch(states)
+
+
+def _evaluate_chunk(template: List[Dict[str, Any]],
+                    angles: np.ndarray,
+                    num_qubits: int,
+                    hamiltonian: Hamiltonian) -> np.ndarray:
+    """Avalia um bloco do lote (executado em processo do pool)"""
+    states = simulate_batch(template, angles, num_qubits)
+    return batch_energies(states, hamiltonian, num_qubits)
+
+
+class BatchedGradientEvaluator:
+    """
+    Avaliador em lote da função custo ⟨ψ(θ)|H|ψ(θ)⟩ e de seus gradientes.
+
+    A estrutura do ansatz (sequência de portas) é rastreada sem simulação
+    via record_only(); apenas os ângulos das rotações variam entre os
+    elementos do lote.
+    """
+
+    def __init__(self,
+                 ansatz: Callable[[List[float]], QuantumCircuitInterface],
+                 hamiltonian: Hamiltonian,
+                 max_batch_bytes: int = 256 * 2**20,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            ansatz: Função que cria o circuito parametrizado
+            hamiltonian: Hamiltoniano como matriz ou lista de termos Pauli
+            max_batch_bytes: Memória máxima de um bloco de statevectors empilhados
+            max_workers: Processos para blocos excedentes (None = nº de CPUs, 1 = serial)
+        """
+        self.ansatz = ansatz
+        self.hamiltonian = hamiltonian
+        self.max_batch_bytes = max_batch_bytes
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.evaluations = 0
+
+        self._structure: Optional[Tuple] = None
+        self._template: Optional[List[Dict[str, Any]]] = None
+        self.num_qubits: Optional[int] = None
+        self._engine: Optional[PauliExpectationEngine] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def trace(self, params: Sequence[float]) -> np.ndarray:
+        """
+        Rastreia o ansatz e retorna os ângulos de suas rotações.
+
+        Raises:
+            ValueError: Se a estrutura do circuito depender dos parâmetros
+        """
+        with record_only():
+            circuit = self.ansatz(params)
+
+        gates = getattr(circuit, 'gates', None)
+        if gates is None:
+            raise ValueError("Ansatz circuit does not expose its gate list")
+
+        structure = tuple((g['gate'], tuple(g['qubits'])) for g in gates)
+        if self._structure is None:
+            self._structure = structure
+            self._template = gates
+            self.num_qubits = circuit.num_qubits
+            if not isinstance(self.hamiltonian, np.ndarray):
+                self._engine = PauliExpectationEngine(self.hamiltonian, self.num_qubits)
+        elif structure != self._structure:
+            raise ValueError("Ansatz structure depends on parameters; cannot batch")
+
+        return np.array([g['params']['angle'] for g in gates if g['gate'] in ROTATION_GATES],
+                        dtype=float)
+
+    def evaluate(self, param_sets: Sequence[Sequence[float]]) -> np.ndarray:
+        """
+        Avalia a função custo para vários vetores de parâmetros de uma vez.
+
+        Args:
+            param_sets: Conjuntos de parâmetros
+
+        Returns:
+            Valores esperados, um por conjunto
+        """
+        angles = np.stack([self.trace(params) for params in param_sets])
+        return self.evaluate_angles(angles)
+
+    def evaluate_angles(self, angles: np.ndarray) -> np.ndarray:
+        """Avalia a função custo para uma matriz de ângulos [batch, num_rotações]"""
+        if self._template is None:
+            raise ValueError("Call trace() before evaluating angles")
+
+        self.evaluations += angles.shape[0]
+
+        state_bytes = 16 * 2**self.num_qubits
+        chunk = max(1, self.max_batch_bytes // state_bytes)
+
+        if angles.shape[0] <= chunk:
+            states = simulate_batch(self._template, angles, self.num_qubits)
+            return batch_energies(states, self.hamiltonian, self.num_qubits, self._engine)
+
+        blocks = [angles[i:i + chunk] for i in range(0, angles.shape[0], chunk)]
+
+        if self.max_workers <= 1:
+            return np.concatenate([
+                _evaluate_chunk(self._template, block, self.num_qubits, self.hamiltonian)
+                for block in blocks
+            ])
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        futures = [
+            self._pool.submit(_evaluate_chunk, self._template, block, self.num_qubits, self.hamiltonian)
+            for block in blocks
+        ]
+        return np.concatenate([future.result() for future in futures])
+
+    def angle_jacobian(self, params: np.ndarray, step: float = 1e-6) -> np.ndarray:
+        """
+        Jacobiano ∂θ/∂p dos ângulos das portas em relação aos parâmetros.
+
+        Obtido por diferenças centrais sobre circuitos apenas rastreados,
+        portanto exato para ansatzes afins (o caso de VQE e QAOA).
+        """
+        params = np.asarray(params, dtype=float)
+        columns = []
+        for j in range(len(params)):
+            offset = np.zeros_like(params)
+            offset[j] = step
+            columns.append((self.trace(params + offset) - self.trace(params - offset)) / (2 * step))
+        return np.stack(columns, axis=1)
+
+    def parameter_shift_gradient(self, params: np.ndarray) -> np.ndarray:
+        """
+        Gradiente analítico por parameter-shift.
+
+        Cada rotação dependente dos parâmetros gera dois circuitos (θ ± π/2);
+        todos são avaliados em um único lote e combinados pela regra da cadeia.
+        """
+        params = np.asarray(params, dtype=float)
+        theta = self.trace(params)
+        jacobian = self.angle_jacobian(params)
+
+        active = np.flatnonzero(np.any(jacobian != 0, axis=1))
+        if active.size == 0:
+            return np.zeros_like(params)
+
+        angles = np.repeat(theta[np.newaxis, :], 2 * active.size, axis=0)
+        rows = np.arange(active.size)
+        angles[2 * rows, active] += PARAMETER_SHIFT
+        angles[2 * rows + 1, active] -= PARAMETER_SHIFT
+
+        energies = self.evaluate_angles(angles)
+        gate_gradient = (energies[0::2] - energies[1::2]) / 2
+
+        return jacobian[active].T @ gate_gradient
+
+    def finite_difference_gradient(self, params: np.ndarray, epsilon: float = 1e-5) -> np.ndarray:
+        """Gradiente por diferenças centrais, com os 2·P pontos em um único lote"""
+        params = np.asarray(params, dtype=float)
+        shifts = np.eye(len(params)) * epsilon
+        param_sets = np.concatenate([params + shifts, params - shifts])
+
+        energies = self.evaluate(param_sets)
+        return (energies[:len(params)] - energies[len(params):]) / (2 * epsilon)
+
+    def close(self) -> None:
+        """Encerra o pool de processos, se criado"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -15,8 +15,11 @@ from enum import Enum
 import logging
 from scipy.optimize import minimize
 import time
+from collections import OrderedDict
 
 from ..interfaces.circuit_interface import QuantumCircuitInterface, QuantumBackend, QuantumCircuitFactory
+from ..simulators.pauli_expectation import PauliExpectationEngine, group_qubit_wise_commuting
+from .batched_gradient import BatchedGradientEvaluator
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +72,11 @@ class HybridOptimizer:
     def __init__(self, 
                  backend: QuantumBackend = QuantumBackend.SIMULATOR,
                  classical_optimizer: ClassicalOptimizer = ClassicalOptimizer.COBYLA,
-                 shots: int = 1024):
+                 shots: int = 1024,
+                 exact_expectation: bool = True,
+                 statevector_cache_size: int = 32,
+                 max_batch_bytes: int = 256 * 2**20,
+                 gradient_workers: Optional[int] = None):
         """
         Inicializa o otimizador híbrido.
         
@@ -77,10 +84,25 @@ class HybridOptimizer:
             backend: Backend quântico a usar
             classical_optimizer: Otimizador clássico para parâmetros
             shots: Número de medições por avaliação
+            exact_expectation: Em simuladores, calcula ⟨H⟩ exatamente a partir
+                do statevector em vez de amostrar com shots
+            statevector_cache_size: Statevectors preparados mantidos em cache
+                (indexados pelo vetor de parâmetros)
+            max_batch_bytes: Memória máxima de statevectors empilhados na
+                avaliação em lote de gradientes
+            gradient_workers: Processos para lotes que excedem max_batch_bytes
+                (None = nº de CPUs)
         """
         self.backend = backend
         self.classical_optimizer = classical_optimizer
         self.shots = shots
+        self.exact_expectation = exact_expectation and backend == QuantumBackend.SIMULATOR
+        self.statevector_cache_size = statevector_cache_size
+        self._statevector_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self.statevector_cache_hits = 0
+        self.max_batch_bytes = max_batch_bytes
+        self.gradient_workers = gradient_workers
+        self._gradient_evaluator: Optional[BatchedGradientEvaluator] = None
         self.circuit_factory = QuantumCircuitFactory()
         self.convergence_history = []
         self.quantum_evaluations = 0
@@ -113,6 +135,8 @@ class HybridOptimizer:
         self.start_time = time.time()
         self.convergence_history = []
         self.quantum_evaluations = 0
+        self._statevector_cache.clear()
+        self.statevector_cache_hits = 0
         
         # Inferir número de qubits se necessário
         if num_qubits is None:
@@ -129,18 +153,31 @@ class HybridOptimizer:
             num_params = self._count_parameters(test_circuit)
             initial_params = np.random.uniform(0, 2*np.pi, num_params)
         
+        # Agrupamento dos termos de Pauli é feito uma única vez
+        pauli_engine = None
+        if self.exact_expectation and not isinstance(hamiltonian, np.ndarray):
+            pauli_engine = PauliExpectationEngine(hamiltonian, num_qubits)
+        
         # Função objetivo para VQE
         def objective_function(params):
             quantum_start = time.time()
             
-            # Criar circuito com parâmetros atuais
-            circuit = ansatz(params)
-            
-            # Calcular valor esperado do Hamiltoniano
-            if isinstance(hamiltonian, np.ndarray):
-                expectation = self._compute_expectation_matrix(circuit, hamiltonian)
+            if self.exact_expectation:
+                # Valor esperado exato a partir de um único statevector
+                statevector = self._prepared_statevector(ansatz, params)
+                if pauli_engine is not None:
+                    expectation = pauli_engine.expectation(statevector)
+                else:
+                    expectation = float(np.real(np.vdot(statevector, hamiltonian @ statevector)))
             else:
-                expectation = self._compute_expectation_pauli(circuit, hamiltonian)
+                # Criar circuito com parâmetros atuais
+                circuit = ansatz(params)
+                
+                # Calcular valor esperado do Hamiltoniano
+                if isinstance(hamiltonian, np.ndarray):
+                    expectation = self._compute_expectation_matrix(circuit, hamiltonian)
+                else:
+                    expectation = self._compute_expectation_pauli(circuit, hamiltonian)
             
             self.quantum_time += time.time() - quantum_start
             self.quantum_evaluations += 1
@@ -151,14 +188,28 @@ class HybridOptimizer:
             
             return expectation
         
+        # Gradientes em lote (parameter-shift) para ADAM/SPSA no simulador
+        if self.exact_expectation:
+            self._gradient_evaluator = BatchedGradientEvaluator(
+                ansatz,
+                hamiltonian,
+                max_batch_bytes=self.max_batch_bytes,
+                max_workers=self.gradient_workers
+            )
+        
         # Otimização clássica
         classical_start = time.time()
-        result = self._optimize_classical(
-            objective_function,
-            initial_params,
-            max_iterations,
-            tolerance
-        )
+        try:
+            result = self._optimize_classical(
+                objective_function,
+                initial_params,
+                max_iterations,
+                tolerance
+            )
+        finally:
+            if self._gradient_evaluator is not None:
+                self._gradient_evaluator.close()
+                self._gradient_evaluator = None
         self.classical_time = time.time() - classical_start
         
         total_time = time.time() - self.start_time
@@ -180,7 +231,10 @@ class HybridOptimizer:
                 "num_qubits": num_qubits,
                 "backend": self.backend.value,
                 "classical_optimizer": self.classical_optimizer.value,
-                "shots": self.shots
+                "shots": self.shots,
+                "exact_expectation": self.exact_expectation,
+                "pauli_groups": pauli_engine.num_groups if pauli_engine else None,
+                "statevector_cache_hits": self.statevector_cache_hits
             }
         )
     
@@ -437,9 +491,8 @@ class HybridOptimizer:
                                      [b[0] for b in bounds],
                                      [b[1] for b in bounds])
             
-            # Gradiente estimado
-            y_plus = objective(params_plus)
-            y_minus = objective(params_minus)
+            # Gradiente estimado (ambas avaliações em um único lote)
+            y_plus, y_minus = self._evaluate_batch(objective, [params_plus, params_minus])
             gradient = (y_plus - y_minus) / (2 * ck * delta)
             
             # Atualização
@@ -497,8 +550,8 @@ class HybridOptimizer:
         for iteration in range(max_iterations):
             t += 1
             
-            # Calcular gradiente numérico
-            gradient = self._numerical_gradient(objective, params)
+            # Calcular gradiente (parameter-shift em lote quando disponível)
+            gradient = self._gradient(objective, params)
             
             # Atualizar momentos
             m = beta1 * m + (1 - beta1) * gradient
@@ -539,6 +592,43 @@ class HybridOptimizer:
         
         return ADAMResult(best_params, best_value, iteration + 1)
     
+    def _gradient(self, objective: Callable, params: np.ndarray) -> np.ndarray:
+        """Gradiente analítico em lote se disponível, senão numérico serial"""
+        if self._gradient_evaluator is not None:
+            quantum_start = time.time()
+            try:
+                return self._gradient_evaluator.parameter_shift_gradient(params)
+            except ValueError as e:
+                logger.warning(f"Batched gradient unavailable, using numerical gradient: {e}")
+                self._gradient_evaluator.close()
+                self._gradient_evaluator = None
+            finally:
+                self._record_batch_time(quantum_start)
+        
+        return self._numerical_gradient(objective, params)
+    
+    def _evaluate_batch(self, objective: Callable, param_sets: List[np.ndarray]) -> np.ndarray:
+        """Avalia vários vetores de parâmetros de uma vez quando possível"""
+        if self._gradient_evaluator is not None:
+            quantum_start = time.time()
+            try:
+                return self._gradient_evaluator.evaluate(param_sets)
+            except ValueError as e:
+                logger.warning(f"Batched evaluation unavailable, evaluating serially: {e}")
+                self._gradient_evaluator.close()
+                self._gradient_evaluator = None
+            finally:
+                self._record_batch_time(quantum_start)
+        
+        return np.array([objective(params) for params in param_sets])
+    
+    def _record_batch_time(self, quantum_start: float) -> None:
+        """Contabiliza tempo e avaliações feitas pelo avaliador em lote"""
+        self.quantum_time += time.time() - quantum_start
+        if self._gradient_evaluator is not None:
+            self.quantum_evaluations += self._gradient_evaluator.evaluations
+            self._gradient_evaluator.evaluations = 0
+    
     def _numerical_gradient(self, 
                           objective: Callable,
                           params: np.ndarray,
@@ -569,18 +659,39 @@ class HybridOptimizer:
         
         return float(expectation)
     
+    def _prepared_statevector(self,
+                              ansatz: Callable[[List[float]], QuantumCircuitInterface],
+                              params: np.ndarray) -> np.ndarray:
+        """Statevector do ansatz para os parâmetros dados (com cache LRU)"""
+        key = np.asarray(params, dtype=float).tobytes()
+        
+        cached = self._statevector_cache.get(key)
+        if cached is not None:
+            self._statevector_cache.move_to_end(key)
+            self.statevector_cache_hits += 1
+            return cached
+        
+        statevector = ansatz(params).get_statevector()
+        
+        self._statevector_cache[key] = statevector
+        if len(self._statevector_cache) > self.statevector_cache_size:
+            self._statevector_cache.popitem(last=False)
+        
+        return statevector
+    
     def _compute_expectation_pauli(self,
                                  circuit: QuantumCircuitInterface,
                                  pauli_terms: List[Tuple[float, str]]) -> float:
         """Calcula valor esperado para Hamiltoniano em termos de Pauli"""
         total_expectation = 0.0
         
-        for coefficient, pauli_string in pauli_terms:
+        # Termos que comutam qubit a qubit compartilham o mesmo circuito de medição
+        for basis, group_terms in group_qubit_wise_commuting(pauli_terms, circuit.num_qubits):
             # Criar cópia do circuito para medição
             measurement_circuit = self._copy_circuit(circuit)
             
             # Aplicar rotações para medir no basis correto
-            for i, pauli in enumerate(pauli_string):
+            for i, pauli in enumerate(basis):
                 if pauli == 'X':
                     measurement_circuit.add_rotation_y(i, -np.pi/2)
                 elif pauli == 'Y':
@@ -593,21 +704,22 @@ class HybridOptimizer:
             # Executar e obter contagens
             results = measurement_circuit.execute(shots=self.shots)
             counts = results.get('counts', {})
-            
-            # Calcular valor esperado do termo Pauli
-            pauli_expectation = 0.0
             total_counts = sum(counts.values())
             
-            for bitstring, count in counts.items():
-                # Calcular paridade
-                parity = 1
-                for i, pauli in enumerate(pauli_string):
-                    if pauli != 'I' and bitstring[i] == '1':
-                        parity *= -1
+            for coefficient, pauli_string in group_terms:
+                # Calcular valor esperado do termo Pauli
+                pauli_expectation = 0.0
                 
-                pauli_expectation += parity * count / total_counts
-            
-            total_expectation += coefficient * pauli_expectation
+                for bitstring, count in counts.items():
+                    # Calcular paridade
+                    parity = 1
+                    for i, pauli in enumerate(pauli_string):
+                        if pauli != 'I' and bitstring[i] == '1':
+                            parity *= -1
+                    
+                    pauli_expectation += parity * count / total_counts
+                
+                total_expectation += coefficient * pauli_expectation
         
         return total_expectation
     
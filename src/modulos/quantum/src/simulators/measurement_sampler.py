@@ -0,0 +1,126 @@
+"""
+Measurement Sampler - Sistema AutoCura
+Fase GAMMA: Amostragem Vetorizada de Medições Terminais
+
+Calcula o vetor de probabilidades uma única vez, marginaliza sobre os
+qubits medidos e sorteia todos os shots em uma chamada vetorizada
+(multinomial para contagens, choice para memória por shot).
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .statevector_kernels import as_tensor
+
+
+def marginal_probabilities(statevector: np.ndarray,
+                           qubits: Sequence[int],
+                           num_qubits: int) -> np.ndarray:
+    """
+    Distribuição marginal sobre um subconjunto de qubits.
+
+    Args:
+        statevector: Vetor de estado
+        qubits: Qubits medidos (qubits[0] é o bit mais significativo do resultado)
+        num_qubits: Número total de qubits
+
+    Returns:
+        Vetor de 2**len(qubits) probabilidades normalizadas
+    """
+    probs = as_tensor(np.abs(statevector) ** 2, num_qubits)
+
+    other_axes = tuple(q for q in range(num_qubits) if q not in qubits)
+    if other_axes:
+        probs = probs.sum(axis=other_axes)
+
+    # Após a soma os eixos restantes seguem a ordem crescente dos qubits
+    remaining = sorted(qubits)
+    probs = np.transpose(probs, [remaining.index(q) for q in qubits]).reshape(-1)
+
+    total = probs.sum()
+    if total <= 0:
+        raise ValueError("Statevector has zero norm")
+    return probs / total
+
+
+class MeasurementSampler:
+    """
+    Amostrador de medições terminais.
+
+    Converte índices de resultado (sobre os qubits medidos) em bitstrings
+    do registrador clássico, respeitando o mapeamento qubit -> bit clássico.
+    """
+
+    def __init__(self,
+                 measurements: List[Dict[str, int]],
+                 num_qubits: int,
+                 num_classical_bits: int,
+                 rng: Optional[np.random.Generator] = None):
+        """
+        Args:
+            measurements: Lista de {'qubit', 'classical_bit'} na ordem do circuito
+            num_qubits: Número de qubits
+            num_classical_bits: Tamanho do registrador clássico
+            rng: Gerador aleatório (None = novo gerador)
+        """
+        self.num_qubits = num_qubits
+        self.num_classical_bits = num_classical_bits
+        self.rng = rng or np.random.default_rng()
+
+        # Última medição escrita em cada bit clássico prevalece
+        cbit_to_qubit: Dict[int, int] = {}
+        for measurement in measurements:
+            cbit_to_qubit[measurement['classical_bit']] = measurement['qubit']
+
+        self.qubits: List[int] = sorted(set(cbit_to_qubit.values()))
+        self._cbit_positions: List[Tuple[int, int]] = [
+            (cbit, self.qubits.index(qubit)) for cbit, qubit in cbit_to_qubit.items()
+        ]
+
+    def _bitstring(self, outcome: int) -> str:
+        """Converte índice de resultado em bitstring clássica"""
+        k = len(self.qubits)
+        bits = ['0'] * self.num_classical_bits
+        for cbit, position in self._cbit_positions:
+            bits[cbit] = str((outcome >> (k - position - 1)) & 1)
+        return ''.join(bits)
+
+    def sample(self,
+               statevector: np.ndarray,
+               shots: int,
+               memory: bool = True) -> Dict[str, Any]:
+        """
+        Sorteia todos os shots de uma vez.
+
+        Args:
+            statevector: Vetor de estado final
+            shots: Número de shots
+            memory: Se True, retorna também a lista de resultados por shot
+
+        Returns:
+            Dicionário com 'counts' e 'memory'
+        """
+        probs = marginal_probabilities(statevector, self.qubits, self.num_qubits)
+
+        if not memory:
+            # Contagens diretamente da multinomial: O(2^k), sem vetor por shot
+            histogram = self.rng.multinomial(shots, probs)
+            outcomes = np.flatnonzero(histogram)
+            counts: Dict[str, int] = {}
+            for outcome in outcomes:
+                bitstring = self._bitstring(int(outcome))
+                counts[bitstring] = counts.get(bitstring, 0) + int(histogram[outcome])
+            return {'counts': counts, 'memory': []}
+
+        samples = self.rng.choice(len(probs), size=shots, p=probs)
+        outcomes, inverse, frequencies = np.unique(samples, return_inverse=True, return_counts=True)
+
+        strings = [self._bitstring(int(outcome)) for outcome in outcomes]
+        counts = {}
+        for bitstring, frequency in zip(strings, frequencies):
+            counts[bitstring] = counts.get(bitstring, 0) + int(frequency)
+
+        return {
+            'counts': counts,
+            'memory': np.array(strings, dtype=object)[inverse].tolist()
+        }
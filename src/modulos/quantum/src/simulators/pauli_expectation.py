@@ -0,0 +1,171 @@
+"""
+Pauli Expectation - Sistema AutoCura
+Fase GAMMA: Valor Esperado Exato de Hamiltonianos de Pauli
+
+Calcula ⟨ψ|H|ψ⟩ para H = Σ c_k P_k a partir de um único statevector,
+sem re-simular o circuito por termo. Termos que comutam qubit a qubit
+compartilham a mesma base de medição: o statevector é rotacionado uma
+vez por grupo e cada termo vira uma soma de paridade sobre a
+distribuição marginal do seu suporte.
+"""
+
+import numpy as np
+from typing import List, Optional, Tuple
+
+from .statevector_kernels import (
+    apply_single_qubit, apply_single_qubit_batch, as_batch_tensor, as_tensor, rotation_x, rotation_y
+)
+
+
+# Rotações que levam a base de cada Pauli para a base Z
+BASIS_ROTATIONS = {
+    'X': rotation_y(-np.pi / 2),
+    'Y': rotation_x(np.pi / 2),
+}
+
+
+def qubit_wise_commute(basis: str, pauli_string: str) -> bool:
+    """Verifica se uma string de Pauli é compatível com a base do grupo"""
+    return all(b == 'I' or p == 'I' or b == p for b, p in zip(basis, pauli_string))
+
+
+def group_qubit_wise_commuting(pauli_terms: List[Tuple[float, str]],
+                               num_qubits: int) -> List[Tuple[str, List[Tuple[float, str]]]]:
+    """
+    Agrupa termos de Pauli que comutam qubit a qubit (first-fit guloso).
+
+    Args:
+        pauli_terms: Lista de (coeficiente, string de Pauli)
+        num_qubits: Número de qubits
+
+    Returns:
+        Lista de (base de medição, termos do grupo)
+    """
+    groups: List[Tuple[List[str], List[Tuple[float, str]]]] = []
+
+    # Termos com maior suporte primeiro tendem a gerar menos grupos
+    ordered = sorted(pauli_terms, key=lambda term: -sum(p != 'I' for p in term[1]))
+
+    for coefficient, pauli_string in ordered:
+        pauli_string = pauli_string.upper().ljust(num_qubits, 'I')
+        for basis, terms in groups:
+            if qubit_wise_commute(''.join(basis), pauli_string):
+                for i, p in enumerate(pauli_string):
+                    if p != 'I':
+                        basis[i] = p
+                terms.append((coefficient, pauli_string))
+                break
+        else:
+            groups.append((list(pauli_string), [(coefficient, pauli_string)]))
+
+    return [(''.join(basis), terms) for basis, terms in groups]
+
+
+class PauliExpectationEngine:
+    """
+    Avaliador exato de Hamiltonianos em termos de Pauli sobre statevectors.
+
+    O agrupamento é feito uma única vez na construção; cada chamada de
+    expectation() custa uma rotação de base por grupo mais uma soma
+    marginal por termo.
+    """
+
+    def __init__(self, pauli_terms: List[Tuple[float, str]], num_qubits: int):
+        self.num_qubits = num_qubits
+        self.groups = group_qubit_wise_commuting(pauli_terms, num_qubits)
+
+        # Pré-computa suporte e vetor de paridade de cada termo
+        self._compiled: List[Tuple[str, List[Tuple[float, Tuple[int, ...], Optional[np.ndarray]]]]] = []
+        for basis, terms in self.groups:
+            compiled_terms = []
+            for coefficient, pauli_string in terms:
+                support = tuple(i for i, p in enumerate(pauli_string) if p != 'I')
+                compiled_terms.append((coefficient, support, self._parity_tensor(len(support))))
+            self._compiled.append((basis, compiled_terms))
+
+    @staticmethod
+    def _parity_tensor(k: int) -> Optional[np.ndarray]:
+        """Tensor (2,)*k com (-1)^(soma dos bits)"""
+        if k == 0:
+            return None
+        parity = np.array([1.0])
+        for _ in range(k):
+            parity = np.kron(parity, np.array([1.0, -1.0]))
+        return parity.reshape((2,) * k)
+
+    @property
+    def num_groups(self) -> int:
+        """Número de bases de medição distintas"""
+        return len(self.groups)
+
+    def rotate_to_basis(self, statevector: np.ndarray, basis: str) -> np.ndarray:
+        """Retorna cópia do statevector rotacionada para a base Z do grupo"""
+        rotated = statevector.copy()
+        for qubit, pauli in enumerate(basis):
+            if pauli in BASIS_ROTATIONS:
+                apply_single_qubit(rotated, BASIS_ROTATIONS[pauli], qubit, self.num_qubits)
+        return rotated
+
+    def expectation(self, statevector: np.ndarray) -> float:
+        """
+        Calcula ⟨ψ|H|ψ⟩.
+
+        Args:
+            statevector: Vetor de estado normalizado
+
+        Returns:
+            Valor esperado real
+        """
+        total = 0.0
+        for basis, compiled_terms in self._compiled:
+            probs = self._basis_probabilities(statevector, basis)
+            for coefficient, support, parity in compiled_terms:
+                total += coefficient * self._parity_expectation(probs, support, parity)
+        return float(total)
+
+    def expectation_batch(self, states: np.ndarray) -> np.ndarray:
+        """
+        Calcula ⟨ψ_b|H|ψ_b⟩ para statevectors empilhados.
+
+        Args:
+            states: Array [batch, 2**n] de vetores normalizados
+
+        Returns:
+            Valores esperados, forma [batch]
+        """
+        totals = np.zeros(states.shape[0])
+        for basis, compiled_terms in self._compiled:
+            rotated = states
+            if any(p in BASIS_ROTATIONS for p in basis):
+                rotated = states.copy()
+                for qubit, pauli in enumerate(basis):
+                    if pauli in BASIS_ROTATIONS:
+                        apply_single_qubit_batch(rotated, BASIS_ROTATIONS[pauli], qubit, self.num_qubits)
+            probs = as_batch_tensor(np.abs(rotated) ** 2, self.num_qubits)
+
+            for coefficient, support, parity in compiled_terms:
+                if parity is None:
+                    totals += coefficient * probs.reshape(states.shape[0], -1).sum(axis=1)
+                    continue
+                other_axes = tuple(q + 1 for q in range(self.num_qubits) if q not in support)
+                marginal = probs.sum(axis=other_axes) if other_axes else probs
+                totals += coefficient * (marginal * parity).reshape(states.shape[0], -1).sum(axis=1)
+        return totals
+
+    def _basis_probabilities(self, statevector: np.ndarray, basis: str) -> np.ndarray:
+        """Distribuição (como tensor) após rotação para a base do grupo"""
+        if any(p in BASIS_ROTATIONS for p in basis):
+            statevector = self.rotate_to_basis(statevector, basis)
+        return as_tensor(np.abs(statevector) ** 2, self.num_qubits)
+
+    def _parity_expectation(self,
+                            probs: np.ndarray,
+                            support: Tuple[int, ...],
+                            parity: Optional[np.ndarray]) -> float:
+        """⟨Z_S⟩ = Σ_x p_S(x) (-1)^|x| sobre a marginal do suporte S"""
+        if parity is None:
+            return float(probs.sum())
+
+        other_axes = tuple(q for q in range(self.num_qubits) if q not in support)
+        marginal = probs.sum(axis=other_axes) if other_axes else probs
+        return float(np.sum(marginal * parity))
@@ -0,0 +1,358 @@
+"""
+Statevector Kernels - Sistema AutoCura
+Fase GAMMA: Kernels Vetorizados para Simulação de Statevector
+
+Aplica portas de k qubits diretamente sobre o statevector usando
+reshape/strides do NumPy, sem laço Python por estado da base.
+
+Convenção de ordenação: o qubit 0 é o bit mais significativo do
+índice da base computacional, de forma que o statevector de n qubits
+visto como tensor de forma (2,)*n tem o qubit q no eixo q.
+"""
+
+import numpy as np
+from typing import Dict, Optional, Sequence
+
+
+# Matrizes das portas fixas de um qubit
+GATE_MATRICES: Dict[str, np.ndarray] = {
+    "hadamard": np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2),
+    "pauli_x": np.array([[0, 1], [1, 0]], dtype=complex),
+    "pauli_y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "pauli_z": np.array([[1, 0], [0, -1]], dtype=complex),
+    "phase_s": np.array([[1, 0], [0, 1j]], dtype=complex),
+    "phase_t": np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=complex),
+}
+
+
+def rotation_x(angle: float) -> np.ndarray:
+    """Matriz de rotação em X"""
+    c = np.cos(angle / 2)
+    s = np.sin(angle / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]], dtype=complex)
+
+
+def rotation_y(angle: float) -> np.ndarray:
+    """Matriz de rotação em Y"""
+    c = np.cos(angle / 2)
+    s = np.sin(angle / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def rotation_z(angle: float) -> np.ndarray:
+    """Matriz de rotação em Z"""
+    return np.array([[np.exp(-1j * angle / 2), 0],
+                     [0, np.exp(1j * angle / 2)]], dtype=complex)
+
+
+def as_tensor(statevector: np.ndarray, num_qubits: int) -> np.ndarray:
+    """
+    Retorna view do statevector como tensor (2,)*n.
+
+    Args:
+        statevector: Vetor contíguo de 2**n amplitudes
+        num_qubits: Número de qubits
+
+    Returns:
+        View (sem cópia) do statevector
+    """
+    tensor = statevector.reshape((2,) * num_qubits)
+    if not np.shares_memory(tensor, statevector):
+        raise ValueError("Statevector must be contiguous to be updated in place")
+    return tensor
+
+
+def _slices(num_qubits: int,
+            fixed: Dict[int, int]) -> tuple:
+    """Monta índice básico fixando bits de alguns qubits (sempre gera views)"""
+    index = [slice(None)] * num_qubits
+    for qubit, bit in fixed.items():
+        index[qubit] = slice(bit, bit + 1)
+    return tuple(index)
+
+
+def apply_single_qubit(statevector: np.ndarray,
+                       matrix: np.ndarray,
+                       target: int,
+                       num_qubits: int,
+                       controls: Sequence[int] = ()) -> None:
+    """
+    Aplica matriz 2x2 (opcionalmente controlada) in place.
+
+    As metades |0> e |1> do qubit alvo são views estriadas do
+    statevector; apenas uma cópia temporária de meia amplitude
+    (restrita ao subespaço dos controles) é alocada.
+
+    Args:
+        statevector: Vetor de estado (modificado in place)
+        matrix: Matriz unitária 2x2
+        target: Qubit alvo
+        num_qubits: Número de qubits
+        controls: Qubits de controle (ativos em |1>)
+    """
+    tensor = as_tensor(statevector, num_qubits)
+    fixed = {c: 1 for c in controls}
+
+    a0 = tensor[_slices(num_qubits, {**fixed, target: 0})]
+    a1 = tensor[_slices(num_qubits, {**fixed, target: 1})]
+
+    m00, m01, m10, m11 = matrix[0, 0], matrix[0, 1], matrix[1, 0], matrix[1, 1]
+
+    if m01 == 0 and m10 == 0:
+        # Porta diagonal: apenas fases
+        if m00 != 1:
+            a0 *= m00
+        if m11 != 1:
+            a1 *= m11
+        return
+
+    if m00 == 0 and m11 == 0:
+        # Porta anti-diagonal (X, Y): troca com fases
+        tmp = a0.copy()
+        np.multiply(a1, m01, out=a0)
+        np.multiply(tmp, m10, out=a1)
+        return
+
+    tmp = a0.copy()
+    a0 *= m00
+    a0 += m01 * a1
+    a1 *= m11
+    a1 += m10 * tmp
+
+
+def apply_controlled_phase(statevector: np.ndarray,
+                           phase: complex,
+                           qubits: Sequence[int],
+                           num_qubits: int) -> None:
+    """
+    Multiplica por uma fase as amplitudes com todos os qubits em |1> (ex: CZ).
+
+    Args:
+        statevector: Vetor de estado (modificado in place)
+        phase: Fase complexa
+        qubits: Qubits que devem estar em |1>
+        num_qubits: Número de qubits
+    """
+    tensor = as_tensor(statevector, num_qubits)
+    tensor[_slices(num_qubits, {q: 1 for q in qubits})] *= phase
+
+
+def apply_swap(statevector: np.ndarray,
+               qubit1: int,
+               qubit2: int,
+               num_qubits: int,
+               controls: Sequence[int] = ()) -> None:
+    """
+    Troca dois qubits (opcionalmente controlada, ex: Fredkin) in place.
+
+    Args:
+        statevector: Vetor de estado (modificado in place)
+        qubit1: Primeiro qubit
+        qubit2: Segundo qubit
+        num_qubits: Número de qubits
+        controls: Qubits de controle (ativos em |1>)
+    """
+    if qubit1 == qubit2:
+        return
+
+    tensor = as_tensor(statevector, num_qubits)
+    fixed = {c: 1 for c in controls}
+
+    a01 = tensor[_slices(num_qubits, {**fixed, qubit1: 0, qubit2: 1})]
+    a10 = tensor[_slices(num_qubits, {**fixed, qubit1: 1, qubit2: 0})]
+
+    tmp = a01.copy()
+    a01[...] = a10
+    a10[...] = tmp
+
+
+def apply_unitary(statevector: np.ndarray,
+                  matrix: np.ndarray,
+                  qubits: Sequence[int],
+                  num_qubits: int) -> None:
+    """
+    Aplica unitário genérico de k qubits via tensordot.
+
+    O resultado é escrito de volta no mesmo buffer do statevector.
+
+    Args:
+        statevector: Vetor de estado (modificado in place)
+        matrix: Matriz 2**k x 2**k (qubits[0] é o bit mais significativo)
+        qubits: Qubits alvo
+        num_qubits: Número de qubits
+    """
+    k = len(qubits)
+    if matrix.shape != (2**k, 2**k):
+        raise ValueError(f"Matrix shape {matrix.shape} does not match {k} qubits")
+
+    if k == 1:
+        apply_single_qubit(statevector, matrix, qubits[0], num_qubits)
+        return
+
+    tensor = as_tensor(statevector, num_qubits)
+    gate_tensor = matrix.reshape((2,) * (2 * k))
+
+    # Contrai índices de entrada da porta com os eixos dos qubits alvo
+    result = np.tensordot(gate_tensor, tensor, axes=(list(range(k, 2 * k)), list(qubits)))
+
+    # tensordot coloca os eixos de saída da porta no início
+    tensor[...] = np.moveaxis(result, list(range(k)), list(qubits))
+
+
+# ---------------------------------------------------------------------------
+# Kernels em lote: statevectors empilhados em um array [batch, 2**n]
+# ---------------------------------------------------------------------------
+
+def rotation_matrices(gate_name: str, angles: np.ndarray) -> np.ndarray:
+    """
+    Matrizes de rotação para um vetor de ângulos.
+
+    Args:
+        gate_name: 'rotation_x', 'rotation_y' ou 'rotation_z'
+        angles: Ângulos, forma [batch]
+
+    Returns:
+        Array [batch, 2, 2]
+    """
+    angles = np.asarray(angles, dtype=float)
+    c = np.cos(angles / 2)
+    s = np.sin(angles / 2)
+    matrices = np.zeros(angles.shape + (2, 2), dtype=complex)
+
+    if gate_name == "rotation_x":
+        matrices[..., 0, 0] = c
+        matrices[..., 0, 1] = -1j * s
+        matrices[..., 1, 0] = -1j * s
+        matrices[..., 1, 1] = c
+    elif gate_name == "rotation_y":
+        matrices[..., 0, 0] = c
+        matrices[..., 0, 1] = -s
+        matrices[..., 1, 0] = s
+        matrices[..., 1, 1] = c
+    elif gate_name == "rotation_z":
+        matrices[..., 0, 0] = np.exp(-1j * angles / 2)
+        matrices[..., 1, 1] = np.exp(1j * angles / 2)
+    else:
+        raise ValueError(f"Unknown rotation gate {gate_name}")
+
+    return matrices
+
+
+def as_batch_tensor(states: np.ndarray, num_qubits: int) -> np.ndarray:
+    """Retorna view de states [batch, 2**n] como tensor (batch,)+(2,)*n"""
+    tensor = states.reshape((states.shape[0],) + (2,) * num_qubits)
+    if not np.shares_memory(tensor, states):
+        raise ValueError("States must be contiguous to be updated in place")
+    return tensor
+
+
+def apply_single_qubit_batch(states: np.ndarray,
+                             matrices: np.ndarray,
+                             target: int,
+                             num_qubits: int,
+                             controls: Sequence[int] = ()) -> None:
+    """
+    Aplica uma matriz 2x2 por elemento do lote (ou a mesma para todos) in place.
+
+    Args:
+        states: Statevectors empilhados [batch, 2**n] (modificados in place)
+        matrices: Matriz [2, 2] compartilhada ou [batch, 2, 2]
+        target: Qubit alvo
+        num_qubits: Número de qubits
+        controls: Qubits de controle (ativos em |1>)
+    """
+    if matrices.ndim == 2:
+        matrices = matrices[np.newaxis]
+
+    tensor = as_batch_tensor(states, num_qubits)
+    fixed = {c: 1 for c in controls}
+
+    a0 = tensor[(slice(None),) + _slices(num_qubits, {**fixed, target: 0})]
+    a1 = tensor[(slice(None),) + _slices(num_qubits, {**fixed, target: 1})]
+
+    # Coeficientes por elemento do lote, prontos para broadcast
+    shape = (matrices.shape[0],) + (1,) * num_qubits
+    m00 = matrices[:, 0, 0].reshape(shape)
+    m01 = matrices[:, 0, 1].reshape(shape)
+    m10 = matrices[:, 1, 0].reshape(shape)
+    m11 = matrices[:, 1, 1].reshape(shape)
+
+    tmp = a0.copy()
+    a0 *= m00
+    a0 += m01 * a1
+    a1 *= m11
+    a1 += m10 * tmp
+
+
+def apply_controlled_phase_batch(states: np.ndarray,
+                                 phase: complex,
+                                 qubits: Sequence[int],
+                                 num_qubits: int) -> None:
+    """Versão em lote de apply_controlled_phase"""
+    tensor = as_batch_tensor(states, num_qubits)
+    tensor[(slice(None),) + _slices(num_qubits, {q: 1 for q in qubits})] *= phase
+
+
+def apply_swap_batch(states: np.ndarray,
+                     qubit1: int,
+                     qubit2: int,
+                     num_qubits: int,
+                     controls: Sequence[int] = ()) -> None:
+    """Versão em lote de apply_swap"""
+    if qubit1 == qubit2:
+        return
+
+    tensor = as_batch_tensor(states, num_qubits)
+    fixed = {c: 1 for c in controls}
+
+    a01 = tensor[(slice(None),) + _slices(num_qubits, {**fixed, qubit1: 0, qubit2: 1})]
+    a10 = tensor[(slice(None),) + _slices(num_qubits, {**fixed, qubit1: 1, qubit2: 0})]
+
+    tmp = a01.copy()
+    a01[...] = a10
+    a10[...] = tmp
+
+
+class SingleQubitFuser:
+    """
+    Acumula portas consecutivas de um qubit por fio e as funde em uma
+    única matriz 2x2, aplicada apenas quando o fio é usado por uma porta
+    multi-qubit ou quando o statevector é lido.
+    """
+
+    def __init__(self):
+        self.pending: Dict[int, np.ndarray] = {}
+        self.fused_gates = 0
+
+    def push(self, matrix: np.ndarray, qubit: int) -> None:
+        """Enfileira porta no fio (compõe à esquerda da matriz pendente)"""
+        current = self.pending.get(qubit)
+        if current is None:
+            self.pending[qubit] = np.asarray(matrix, dtype=complex)
+        else:
+            self.pending[qubit] = matrix @ current
+            self.fused_gates += 1
+
+    def flush(self,
+              statevector: np.ndarray,
+              num_qubits: int,
+              qubits: Optional[Sequence[int]] = None) -> None:
+        """
+        Aplica as matrizes pendentes.
+
+        Args:
+            statevector: Vetor de estado (modificado in place)
+            num_qubits: Número de qubits
+            qubits: Fios a descarregar (None = todos)
+        """
+        wires = list(self.pending) if qubits is None else [q for q in qubits if q in self.pending]
+        for qubit in wires:
+            apply_single_qubit(statevector, self.pending.pop(qubit), qubit, num_qubits)
+
+    def clear(self) -> None:
+        """Descarta portas pendentes"""
+        self.pending.clear()
+        self.fused_gates = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.pending)
@@ -307,8 +307,20 @@ def correlacoes():
         periodo = request.args.get('periodo')
         if periodo:
             periodo = timedelta(minutes=int(periodo))
+        
+        # Largura dos bins da grade de alinhamento, em segundos
+        resolucao = request.args.get('resolucao')
+        if resolucao:
+            resolucao = timedelta(seconds=float(resolucao))
             
-        matriz = visualizador_4d.gerar_matriz_correlacao(periodo)
+        matriz = visualizador_4d.gerar_matriz_correlacao(periodo, resolucao)
+        
+        # Correlações móveis, com janela em número de bins
+        janela = request.args.get('janela')
+        if janela:
+            moveis = visualizador_4d.gerar_correlacoes_moveis(int(janela), periodo, resolucao)
+            return jsonify({"matriz": matriz, "moveis": moveis})
+        
         return jsonify(matriz)
     except Exception as e:
         return jsonify({"erro": str(e)}), 500
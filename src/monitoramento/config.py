@@ -129,6 +129,8 @@ class Config:
     DIAGNOSTICO_HISTORICO: int = 7  # dias
     VISUALIZACAO_PERIODO: timedelta = timedelta(days=7)  # dias
     VISUALIZACAO_INTERVALO: int = 60  # segundos
+    VISUALIZACAO_RETENCAO_PONTOS: int = 10000  # pontos por dimensão
+    VISUALIZACAO_DIMENSOES_DINAMICAS: bool = False  # aceita dimensões além das padrão
     VISUALIZACAO_ANOMALIA_THRESHOLD: float = 2.0  # desvios padrão
     VISUALIZACAO_CORRELACAO_THRESHOLD: float = 0.7  # coeficiente de correlação
     VISUALIZACAO_TENDENCIA_THRESHOLD: float = 0.1  # inclinação mínima
@@ -0,0 +1,321 @@
+"""
+Série temporal colunar em buffer circular.
+
+Armazena pontos (timestamp, valor) de uma dimensão em arrays NumPy de
+capacidade fixa, com os contextos guardados à parte, e mantém
+estatísticas incrementais da janela retida.
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class SerieTemporal:
+    """Buffer circular de pontos (timestamp, valor) com estatísticas incrementais.
+
+    Cada ponto é gravado em duas posições de arrays de tamanho
+    2 x alocado, de modo que a janela retida é sempre uma fatia
+    contígua (sem cópia) e pode ser consultada por busca binária.
+    A alocação começa em TAMANHO_INICIAL pontos e dobra sob demanda até
+    a capacidade. Os timestamps devem ser não decrescentes.
+
+    Média, variância e co-momentos timestamp/valor são mantidos por
+    Welford (inclusão e remoção); mínimo e máximo por filas monotônicas.
+    A cada volta completa do buffer os acumuladores são recalculados a
+    partir dos arrays para não acumular erro de arredondamento.
+    """
+
+    TAMANHO_INICIAL = 1024
+
+    def __init__(self, capacidade: int):
+        """Inicializa a série.
+
+        Args:
+            capacidade: Número máximo de pontos retidos
+        """
+        if capacidade < 1:
+            raise ValueError("capacidade must be positive")
+
+        self.capacidade = capacidade
+        # Posições alocadas (a posição de uma sequência é sequencia % alocado)
+        self._alocado = min(capacidade, self.TAMANHO_INICIAL)
+        self._timestamps = np.zeros(2 * self._alocado, dtype=np.float64)
+        self._valores = np.zeros(2 * self._alocado, dtype=np.float64)
+        self._contextos: List[Optional[Dict[str, Any]]] = [None] * self._alocado
+
+        # Sequência absoluta do ponto mais antigo e do próximo ponto
+        self._inicio = 0
+        self._fim = 0
+
+        # Origem dos timestamps nos acumuladores (reduz a magnitude dos termos)
+        self._origem: Optional[float] = None
+        self._zerar_acumuladores()
+
+        # Sequências candidatas a mínimo / máximo da janela
+        self._minimos: deque = deque()
+        self._maximos: deque = deque()
+
+    def __len__(self) -> int:
+        return self._fim - self._inicio
+
+    def _zerar_acumuladores(self) -> None:
+        self._media_t = 0.0
+        self._media_v = 0.0
+        self._m2_t = 0.0
+        self._m2_v = 0.0
+        self._c_tv = 0.0
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamps retidos (visão somente leitura, ordem cronológica)."""
+        return self._fatia(self._timestamps, self._inicio, self._fim)
+
+    @property
+    def valores(self) -> np.ndarray:
+        """Valores retidos (visão somente leitura, ordem cronológica)."""
+        return self._fatia(self._valores, self._inicio, self._fim)
+
+    def _fatia(self, array: np.ndarray, inicio: int, fim: int) -> np.ndarray:
+        posicao = inicio % self._alocado
+        visao = array[posicao:posicao + (fim - inicio)]
+        visao.flags.writeable = False
+        return visao
+
+    @property
+    def ultimo_timestamp(self) -> Optional[float]:
+        if not len(self):
+            return None
+        return float(self._timestamps[(self._fim - 1) % self._alocado])
+
+    def adicionar(self, timestamp: float, valor: float, contexto: Optional[Dict[str, Any]] = None) -> None:
+        """Adiciona um ponto, descartando o mais antigo se o buffer estiver cheio.
+
+        Args:
+            timestamp: Instante em segundos (epoch); valores menores que o
+                último timestamp são ajustados para ele
+            valor: Valor do ponto
+            contexto: Contexto adicional
+        """
+        timestamp = float(timestamp)
+        valor = float(valor)
+        ultimo = self.ultimo_timestamp
+        if ultimo is not None and timestamp < ultimo:
+            timestamp = ultimo
+        if self._origem is None:
+            self._origem = timestamp
+
+        if len(self) == self._alocado < self.capacidade:
+            self._crescer()
+        if len(self) == self.capacidade:
+            self._remover_mais_antigo()
+
+        sequencia = self._fim
+        posicao = sequencia % self._alocado
+        self._timestamps[posicao] = self._timestamps[posicao + self._alocado] = timestamp
+        self._valores[posicao] = self._valores[posicao + self._alocado] = valor
+        self._contextos[posicao] = contexto
+        self._fim += 1
+
+        # Welford (inclusão)
+        t = timestamp - self._origem
+        n = len(self)
+        delta_t = t - self._media_t
+        delta_v = valor - self._media_v
+        self._media_t += delta_t / n
+        self._media_v += delta_v / n
+        self._m2_t += delta_t * (t - self._media_t)
+        self._m2_v += delta_v * (valor - self._media_v)
+        self._c_tv += delta_t * (valor - self._media_v)
+
+        while self._minimos and self._valor(self._minimos[-1]) >= valor:
+            self._minimos.pop()
+        self._minimos.append(sequencia)
+        while self._maximos and self._valor(self._maximos[-1]) <= valor:
+            self._maximos.pop()
+        self._maximos.append(sequencia)
+
+        if self._fim % self._alocado == 0:
+            self._recalcular()
+
+    def _crescer(self) -> None:
+        """Dobra a alocação (limitada à capacidade), reposicionando os pontos retidos."""
+        alocado = min(self.capacidade, 2 * self._alocado)
+        sequencias = np.arange(self._inicio, self._fim)
+        posicoes = sequencias % alocado
+        contextos: List[Optional[Dict[str, Any]]] = [None] * alocado
+        for sequencia in range(self._inicio, self._fim):
+            contextos[sequencia % alocado] = self._contextos[sequencia % self._alocado]
+
+        for nome in ("_timestamps", "_valores"):
+            retidos = self._fatia(getattr(self, nome), self._inicio, self._fim)
+            novo = np.zeros(2 * alocado, dtype=np.float64)
+            novo[posicoes] = retidos
+            novo[posicoes + alocado] = retidos
+            setattr(self, nome, novo)
+        self._contextos = contextos
+        self._alocado = alocado
+
+    def _valor(self, sequencia: int) -> float:
+        return float(self._valores[sequencia % self._alocado])
+
+    def _remover_mais_antigo(self) -> None:
+        posicao = self._inicio % self._alocado
+        t = float(self._timestamps[posicao]) - self._origem
+        valor = float(self._valores[posicao])
+        self._contextos[posicao] = None
+        self._inicio += 1
+
+        # Welford (remoção): desfaz a inclusão do ponto
+        n = len(self)
+        if n == 0:
+            self._zerar_acumuladores()
+        else:
+            media_t = (self._media_t * (n + 1) - t) / n
+            media_v = (self._media_v * (n + 1) - valor) / n
+            self._m2_t -= (t - media_t) * (t - self._media_t)
+            self._m2_v -= (valor - media_v) * (valor - self._media_v)
+            self._c_tv -= (t - media_t) * (valor - self._media_v)
+            self._media_t = media_t
+            self._media_v = media_v
+
+        for fila in (self._minimos, self._maximos):
+            if fila and fila[0] < self._inicio:
+                fila.popleft()
+
+    def _recalcular(self) -> None:
+        """Recalcula os acumuladores a partir dos arrays (uma vez por volta)."""
+        if not len(self):
+            self._zerar_acumuladores()
+            return
+        t = self.timestamps - self._origem
+        v = self.valores
+        self._media_t = float(t.mean())
+        self._media_v = float(v.mean())
+        dt = t - self._media_t
+        dv = v - self._media_v
+        self._m2_t = float(dt @ dt)
+        self._m2_v = float(dv @ dv)
+        self._c_tv = float(dt @ dv)
+
+    def remover_anteriores(self, timestamp: float) -> int:
+        """Remove os pontos anteriores a um instante.
+
+        Args:
+            timestamp: Pontos com timestamp menor são removidos
+
+        Returns:
+            Número de pontos removidos
+        """
+        removidos = int(np.searchsorted(self.timestamps, timestamp, side="left"))
+        if not removidos:
+            return 0
+
+        for sequencia in range(self._inicio, self._inicio + removidos):
+            self._contextos[sequencia % self._alocado] = None
+        self._inicio += removidos
+        for fila in (self._minimos, self._maximos):
+            while fila and fila[0] < self._inicio:
+                fila.popleft()
+        self._recalcular()
+        return removidos
+
+    def intervalo(self, inicio: Optional[float] = None) -> Tuple[int, int]:
+        """Sequências [primeira, fim) dos pontos com timestamp >= inicio (busca binária)."""
+        if inicio is None:
+            return self._inicio, self._fim
+        return self._inicio + int(np.searchsorted(self.timestamps, inicio, side="left")), self._fim
+
+    def colunas(self, inicio: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps e valores (visões sem cópia) dos pontos com timestamp >= inicio."""
+        primeira, fim = self.intervalo(inicio)
+        return self._fatia(self._timestamps, primeira, fim), self._fatia(self._valores, primeira, fim)
+
+    def pontos(self, inicio: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, List[Optional[Dict[str, Any]]]]:
+        """Timestamps, valores e contextos dos pontos com timestamp >= inicio."""
+        primeira, fim = self.intervalo(inicio)
+        contextos = [self._contextos[sequencia % self._alocado] for sequencia in range(primeira, fim)]
+        return (self._fatia(self._timestamps, primeira, fim),
+                self._fatia(self._valores, primeira, fim),
+                contextos)
+
+    def contexto(self, sequencia: int) -> Optional[Dict[str, Any]]:
+        """Contexto do ponto de uma sequência retornada por `intervalo`."""
+        return self._contextos[sequencia % self._alocado]
+
+    def janela_completa(self, inicio: Optional[float]) -> bool:
+        """Indica se a consulta a partir de `inicio` cobre todos os pontos retidos."""
+        return self.intervalo(inicio)[0] == self._inicio
+
+    def momentos(self) -> Tuple[float, float]:
+        """Média e desvio padrão populacional da janela retida em O(1)."""
+        n = len(self)
+        if not n:
+            return 0.0, 0.0
+        return self._media_v, float(np.sqrt(max(self._m2_v, 0.0) / n))
+
+    def estatisticas(self) -> Dict[str, float]:
+        """Estatísticas da janela retida em O(1) (exceto a mediana).
+
+        Returns:
+            Dicionário com estatísticas (vazio se não houver pontos)
+        """
+        if not len(self):
+            return {}
+        media, desvio = self.momentos()
+        return {
+            "media": media,
+            "mediana": float(np.median(self.valores)),
+            "desvio_padrao": desvio,
+            "min": self._valor(self._minimos[0]),
+            "max": self._valor(self._maximos[0])
+        }
+
+    def regressao(self) -> Optional[Tuple[float, float, float]]:
+        """Regressão linear valor x timestamp da janela retida em O(1).
+
+        Returns:
+            Tupla (inclinação, intercepto em timestamp 0, R²) ou None se
+            não houver ao menos dois timestamps distintos
+        """
+        if len(self) < 2 or self._m2_t <= 0:
+            return None
+        inclinacao = self._c_tv / self._m2_t
+        intercepto = self._media_v - inclinacao * (self._media_t + self._origem)
+        r2 = inclinacao * self._c_tv / self._m2_v if self._m2_v > 0 else 0.0
+        return inclinacao, intercepto, r2
+
+
+def reamostrar_alinhado(colunas: List[Tuple[np.ndarray, np.ndarray]], inicio: float,
+                        passo: float, num_bins: int) -> np.ndarray:
+    """Reamostra várias séries numa grade de tempo comum.
+
+    Cada série é agregada pela média dos pontos em cada bin
+    [inicio + k * passo, inicio + (k + 1) * passo) em uma única passada
+    vetorizada; bins sem pontos repetem o último valor conhecido da série
+    (antes do primeiro ponto ficam NaN).
+
+    Args:
+        colunas: Pares (timestamps, valores) de cada série
+        inicio: Instante inicial da grade (epoch)
+        passo: Largura de cada bin em segundos
+        num_bins: Número de bins da grade
+
+    Returns:
+        Matriz num_bins x len(colunas)
+    """
+    matriz = np.full((num_bins, len(colunas)), np.nan)
+    for coluna, (timestamps, valores) in enumerate(colunas):
+        bins = ((timestamps - inicio) // passo).astype(np.int64)
+        dentro = (bins >= 0) & (bins < num_bins)
+        bins = bins[dentro]
+        contagens = np.bincount(bins, minlength=num_bins)
+        somas = np.bincount(bins, weights=valores[dentro], minlength=num_bins)
+        preenchidos = contagens > 0
+        matriz[preenchidos, coluna] = somas[preenchidos] / contagens[preenchidos]
+
+    # Preenchimento para frente: índice do último bin com valor em cada coluna
+    indices = np.where(~np.isnan(matriz), np.arange(num_bins)[:, None], 0)
+    np.maximum.accumulate(indices, axis=0, out=indices)
+    return matriz[indices, np.arange(len(colunas))]
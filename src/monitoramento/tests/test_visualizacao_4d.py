@@ -9,7 +9,8 @@ from ..visualizacao_4d import Visualizacao4D, Dimensao4D
 class TestVisualizacao4D(unittest.TestCase):
     def setUp(self):
         """Configuração inicial para os testes."""
-        self.visualizador = Visualizacao4D({})
+        # Os testes usam dimensões além das quatro padrão
+        self.visualizador = Visualizacao4D({"dimensoes_dinamicas": True})
         self.dados_teste = {
             "performance": [
                 Dimensao4D("performance", 0.8, datetime.now(), {"host": "server1"}),
@@ -152,12 +153,10 @@ class TestVisualizacao4D(unittest.TestCase):
         self.visualizador.atualizar_dimensao(
             "teste",
             0.5,
-            {"test": True}
+            {"test": True},
+            timestamp=datetime.now() - timedelta(days=1)
         )
         
-        # Força timestamp antigo
-        self.visualizador.dimensoes["teste"][-1].timestamp = datetime.now() - timedelta(days=1)
-        
         # Limpa dados mais antigos que 12 horas
         self.visualizador.limpar_dados_antigos(timedelta(hours=12))
         
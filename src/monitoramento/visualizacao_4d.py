@@ -10,13 +10,23 @@ Este módulo implementa visualização multidimensional de métricas, incluindo:
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 import numpy as np
 from prometheus_client import Gauge, Counter, Histogram, Summary
 
+from .serie_temporal import SerieTemporal, reamostrar_alinhado
+
 logger = logging.getLogger(__name__)
 
+# Pontos retidos por dimensão quando a configuração não define outro valor
+# (os buffers crescem sob demanda até esse limite)
+RETENCAO_PADRAO = 10000
+
+# Resolução padrão (segundos) e tamanho máximo da grade usada nas correlações
+RESOLUCAO_CORRELACAO_PADRAO = 60.0
+MAX_BINS_CORRELACAO = 10000
+
 @dataclass
 class Dimensao4D:
     """Representa uma dimensão 4D do sistema."""
@@ -48,12 +58,23 @@ class Visualizacao4D:
             "conexoes_ativas": Gauge("conexoes_ativas", "Conexões ativas", ["servico"])
         }
         
-        # Dimensões 4D
-        self.dimensoes = {
-            "performance": [],
-            "saude": [],
-            "seguranca": [],
-            "custo": []
+        # Dimensões 4D (séries em buffer circular)
+        if isinstance(config, dict):
+            retencao = config.get("retencao_pontos")
+            resolucao = config.get("resolucao_correlacao")
+            dinamicas = config.get("dimensoes_dinamicas", False)
+        else:
+            retencao = getattr(config, "VISUALIZACAO_RETENCAO_PONTOS", None)
+            resolucao = getattr(config, "VISUALIZACAO_INTERVALO", None)
+            dinamicas = getattr(config, "VISUALIZACAO_DIMENSOES_DINAMICAS", False)
+        self.retencao_pontos = retencao or RETENCAO_PADRAO
+        self.resolucao_correlacao = float(resolucao or RESOLUCAO_CORRELACAO_PADRAO)
+        # Dimensões fora das quatro padrão só são criadas se a configuração permitir
+        self.dimensoes_dinamicas = bool(dinamicas)
+        
+        self.dimensoes: Dict[str, SerieTemporal] = {
+            nome: SerieTemporal(self.retencao_pontos)
+            for nome in ("performance", "saude", "seguranca", "custo")
         }
         
         # Cache de métricas
@@ -62,28 +83,46 @@ class Visualizacao4D:
         
         self.logger.info("Visualizador 4D inicializado")
     
-    def atualizar_dimensao(self, nome: str, valor: float, contexto: Dict[str, Any]) -> None:
+    def atualizar_dimensao(self, nome: str, valor: float, contexto: Dict[str, Any],
+                           timestamp: Optional[datetime] = None) -> None:
         """Atualiza uma dimensão 4D.
         
         Args:
             nome: Nome da dimensão
             valor: Valor da dimensão
             contexto: Contexto adicional
+            timestamp: Instante do valor (padrão: agora); valores anteriores
+                ao último ponto da dimensão são registrados no último instante
+        """
+        if nome not in self.dimensoes:
+            if not self.dimensoes_dinamicas:
+                self.logger.debug("Dimensão desconhecida ignorada: %s", nome)
+                return
+            self.dimensoes[nome] = SerieTemporal(self.retencao_pontos)
+        
+        instante = (timestamp or datetime.now()).timestamp()
+        self.dimensoes[nome].adicionar(instante, valor, contexto)
+        
+        self.logger.debug("Dimensão %s atualizada: %s", nome, valor)
+    
+    def _inicio_periodo(self, periodo: Optional[timedelta]) -> Optional[float]:
+        return (datetime.now() - periodo).timestamp() if periodo else None
+    
+    def obter_serie(self, nome: str, periodo: Optional[timedelta] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Obtém timestamps (epoch) e valores de uma dimensão sem materializar objetos.
+        
+        Args:
+            nome: Nome da dimensão
+            periodo: Período de tempo (opcional)
+            
+        Returns:
+            Tupla (timestamps, valores) como arrays somente leitura
         """
-        dimensao = Dimensao4D(
-            nome=nome,
-            valor=valor,
-            timestamp=datetime.now(),
-            contexto=contexto
-        )
-        
-        if nome in self.dimensoes:
-            self.dimensoes[nome].append(dimensao)
-            # Mantém apenas as últimas 1000 dimensões
-            if len(self.dimensoes[nome]) > 1000:
-                self.dimensoes[nome] = self.dimensoes[nome][-1000:]
-        
-        self.logger.debug(f"Dimensão {nome} atualizada: {valor}")
+        if nome not in self.dimensoes:
+            vazio = np.empty(0, dtype=np.float64)
+            return vazio, vazio
+        
+        return self.dimensoes[nome].colunas(self._inicio_periodo(periodo))
     
     def obter_dimensao(self, nome: str, periodo: Optional[timedelta] = None) -> List[Dimensao4D]:
         """Obtém as dimensões 4D de um período.
@@ -98,13 +137,12 @@ class Visualizacao4D:
         if nome not in self.dimensoes:
             return []
         
-        dimensoes = self.dimensoes[nome]
+        timestamps, valores, contextos = self.dimensoes[nome].pontos(self._inicio_periodo(periodo))
         
-        if periodo:
-            inicio = datetime.now() - periodo
-            dimensoes = [d for d in dimensoes if d.timestamp >= inicio]
-        
-        return dimensoes
+        return [
+            Dimensao4D(nome=nome, valor=valor, timestamp=datetime.fromtimestamp(instante), contexto=contexto)
+            for instante, valor, contexto in zip(timestamps.tolist(), valores.tolist(), contextos)
+        ]
     
     def calcular_estatisticas(self, nome: str, periodo: Optional[timedelta] = None) -> Dict[str, float]:
         """Calcula estatísticas de uma dimensão.
@@ -116,12 +154,19 @@ class Visualizacao4D:
         Returns:
             Dicionário com estatísticas
         """
-        dimensoes = self.obter_dimensao(nome, periodo)
-        
-        if not dimensoes:
+        if nome not in self.dimensoes:
             return {}
         
-        valores = [d.valor for d in dimensoes]
+        serie = self.dimensoes[nome]
+        inicio = self._inicio_periodo(periodo)
+        
+        # Período cobre toda a janela retida: estatísticas incrementais
+        if serie.janela_completa(inicio):
+            return serie.estatisticas()
+        
+        _, valores = serie.colunas(inicio)
+        if not len(valores):
+            return {}
         
         return {
             "media": float(np.mean(valores)),
@@ -141,27 +186,37 @@ class Visualizacao4D:
         Returns:
             Lista de anomalias detectadas
         """
-        dimensoes = self.obter_dimensao(nome, periodo)
+        if nome not in self.dimensoes:
+            return []
         
-        if not dimensoes:
+        serie = self.dimensoes[nome]
+        inicio = self._inicio_periodo(periodo)
+        timestamps, valores = serie.colunas(inicio)
+        
+        if not len(valores):
             return []
         
-        valores = np.array([d.valor for d in dimensoes])
-        media = np.mean(valores)
-        desvio = np.std(valores)
-        
-        anomalias = []
-        for i, dimensao in enumerate(dimensoes):
-            z_score = abs(dimensao.valor - media) / desvio
-            if z_score > 3:  # Mais de 3 desvios padrão
-                anomalias.append({
-                    "timestamp": dimensao.timestamp.isoformat(),
-                    "valor": float(dimensao.valor),
-                    "z_score": float(z_score),
-                    "contexto": dimensao.contexto
-                })
-        
-        return anomalias
+        if serie.janela_completa(inicio):
+            media, desvio = serie.momentos()
+        else:
+            media, desvio = np.mean(valores), np.std(valores)
+        
+        if desvio == 0:
+            return []
+        
+        z_scores = np.abs(valores - media) / desvio
+        indices = np.flatnonzero(z_scores > 3)  # Mais de 3 desvios padrão
+        
+        primeira, _ = serie.intervalo(inicio)
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(timestamps[i]).isoformat(),
+                "valor": float(valores[i]),
+                "z_score": float(z_scores[i]),
+                "contexto": serie.contexto(primeira + int(i))
+            }
+            for i in indices
+        ]
     
     def atualizar_metricas(self, metricas: Dict[str, Any]) -> None:
         """Atualiza as métricas do sistema.
@@ -223,62 +278,156 @@ class Visualizacao4D:
         Args:
             periodo: Período de tempo para manter
         """
-        inicio = datetime.now() - periodo
+        inicio = (datetime.now() - periodo).timestamp()
         
-        for nome in self.dimensoes:
-            self.dimensoes[nome] = [
-                d for d in self.dimensoes[nome]
-                if d.timestamp >= inicio
-            ]
+        for serie in self.dimensoes.values():
+            serie.remover_anteriores(inicio)
         
         self.logger.info(f"Dados antigos removidos (período: {periodo})")
     
-    def calcular_correlacoes(self, dimensao1: str, dimensao2: str, periodo: Optional[timedelta] = None) -> float:
+    def reamostrar(self, nomes: Optional[List[str]] = None, periodo: Optional[timedelta] = None,
+                   resolucao: Optional[timedelta] = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """Alinha dimensões numa grade de tempo comum.
+        
+        Args:
+            nomes: Dimensões a alinhar (padrão: todas)
+            periodo: Período de tempo (opcional)
+            resolucao: Largura dos bins (padrão: resolução configurada)
+            
+        Returns:
+            Tupla (início de cada bin em epoch, matriz bins x dimensões,
+            nomes das dimensões com dados no período, na ordem das colunas)
+        """
+        inicio_periodo = self._inicio_periodo(periodo)
+        colunas = []
+        presentes = []
+        for nome in nomes if nomes is not None else list(self.dimensoes):
+            if nome not in self.dimensoes:
+                continue
+            timestamps, valores = self.dimensoes[nome].colunas(inicio_periodo)
+            if len(valores):
+                colunas.append((timestamps, valores))
+                presentes.append(nome)
+        
+        if not colunas:
+            return np.empty(0), np.empty((0, 0)), []
+        
+        inicio = inicio_periodo if inicio_periodo is not None else min(t[0] for t, _ in colunas)
+        fim = max(t[-1] for t, _ in colunas)
+        passo = resolucao.total_seconds() if resolucao else self.resolucao_correlacao
+        passo = max(passo, (fim - inicio) / MAX_BINS_CORRELACAO, 1e-6)
+        num_bins = int((fim - inicio) // passo) + 1
+        
+        matriz = reamostrar_alinhado(colunas, inicio, passo, num_bins)
+        return inicio + passo * np.arange(num_bins), matriz, presentes
+    
+    @staticmethod
+    def _linhas_completas(instantes: np.ndarray, matriz: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Após o preenchimento para frente só os bins iniciais podem estar incompletos
+        completas = ~np.isnan(matriz).any(axis=1)
+        return instantes[completas], matriz[completas]
+    
+    def calcular_correlacoes(self, dimensao1: str, dimensao2: str, periodo: Optional[timedelta] = None,
+                             resolucao: Optional[timedelta] = None) -> float:
         """Calcula correlação entre duas dimensões.
         
         Args:
             dimensao1: Nome da primeira dimensão
             dimensao2: Nome da segunda dimensão
             periodo: Período de tempo (opcional)
+            resolucao: Largura dos bins de alinhamento (opcional)
             
         Returns:
             Coeficiente de correlação
         """
-        dim1 = self.obter_dimensao(dimensao1, periodo)
-        dim2 = self.obter_dimensao(dimensao2, periodo)
-        
-        if not dim1 or not dim2:
-            return 0.0
-        
-        # Alinha os timestamps
-        timestamps = set(d.timestamp for d in dim1) & set(d.timestamp for d in dim2)
-        
-        valores1 = [d.valor for d in dim1 if d.timestamp in timestamps]
-        valores2 = [d.valor for d in dim2 if d.timestamp in timestamps]
-        
-        if not valores1 or not valores2:
-            return 0.0
-        
-        return float(np.corrcoef(valores1, valores2)[0, 1])
+        nomes = list(dict.fromkeys([dimensao1, dimensao2]))
+        return self.gerar_matriz_correlacao(periodo, resolucao, nomes)[dimensao1][dimensao2]
     
-    def gerar_matriz_correlacao(self, periodo: Optional[timedelta] = None) -> Dict[str, Dict[str, float]]:
+    def gerar_matriz_correlacao(self, periodo: Optional[timedelta] = None,
+                                resolucao: Optional[timedelta] = None,
+                                nomes: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
         """Gera matriz de correlação entre todas as dimensões.
         
+        As dimensões são reamostradas numa grade de tempo comum e a matriz
+        inteira sai de um único np.corrcoef. Correlações indefinidas (sem
+        sobreposição ou variância nula) são reportadas como 0.0.
+        
         Args:
             periodo: Período de tempo (opcional)
+            resolucao: Largura dos bins de alinhamento (opcional)
+            nomes: Dimensões incluídas (padrão: todas)
             
         Returns:
             Matriz de correlação
         """
-        dimensoes = list(self.dimensoes.keys())
+        dimensoes = nomes if nomes is not None else list(self.dimensoes.keys())
         matriz = {d1: {d2: 0.0 for d2 in dimensoes} for d1 in dimensoes}
         
-        for d1 in dimensoes:
-            for d2 in dimensoes:
-                matriz[d1][d2] = self.calcular_correlacoes(d1, d2, periodo)
+        instantes, valores, presentes = self.reamostrar(dimensoes, periodo, resolucao)
+        _, valores = self._linhas_completas(instantes, valores)
+        
+        correlacoes = np.full((len(presentes), len(presentes)), np.nan)
+        if len(valores) >= 2:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                correlacoes = np.atleast_2d(np.corrcoef(valores, rowvar=False))
+        np.fill_diagonal(correlacoes, 1.0)
+        correlacoes = np.nan_to_num(correlacoes, nan=0.0)
+        
+        for i, d1 in enumerate(presentes):
+            for j, d2 in enumerate(presentes):
+                matriz[d1][d2] = float(correlacoes[i, j])
         
         return matriz
     
+    def gerar_correlacoes_moveis(self, janela: int, periodo: Optional[timedelta] = None,
+                                 resolucao: Optional[timedelta] = None,
+                                 nomes: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Calcula correlações em janela deslizante entre pares de dimensões.
+        
+        As somas de cada janela são obtidas incrementalmente por somas
+        acumuladas sobre a grade alinhada (O(bins) para todos os pares).
+        
+        Args:
+            janela: Tamanho da janela em bins da grade
+            periodo: Período de tempo (opcional)
+            resolucao: Largura dos bins de alinhamento (opcional)
+            nomes: Dimensões incluídas (padrão: todas)
+            
+        Returns:
+            Dicionário com os timestamps de fim de cada janela e, para cada
+            par (d1, d2), a série de correlações
+        """
+        if janela < 2:
+            raise ValueError("janela must be at least 2")
+        
+        instantes, valores, presentes = self.reamostrar(nomes, periodo, resolucao)
+        instantes, valores = self._linhas_completas(instantes, valores)
+        resultado = {"timestamps": [], "correlacoes": {}}
+        if len(valores) < janela:
+            return resultado
+        
+        # Centraliza para reduzir o cancelamento numérico das somas
+        x = valores - valores.mean(axis=0)
+        soma = np.concatenate([np.zeros((1, x.shape[1])), np.cumsum(x, axis=0)])
+        produtos = np.einsum("ti,tj->tij", x, x)
+        soma_produtos = np.concatenate([np.zeros((1,) + produtos.shape[1:]), np.cumsum(produtos, axis=0)])
+        
+        s = soma[janela:] - soma[:-janela]
+        sp = soma_produtos[janela:] - soma_produtos[:-janela]
+        covariancia = sp - s[:, :, None] * s[:, None, :] / janela
+        variancia = np.diagonal(covariancia, axis1=1, axis2=2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlacoes = covariancia / np.sqrt(variancia[:, :, None] * variancia[:, None, :])
+        correlacoes = np.clip(np.nan_to_num(correlacoes, nan=0.0), -1.0, 1.0)
+        
+        resultado["timestamps"] = [datetime.fromtimestamp(t).isoformat() for t in instantes[janela - 1:]]
+        for i, d1 in enumerate(presentes):
+            resultado["correlacoes"][d1] = {
+                d2: correlacoes[:, i, j].tolist()
+                for j, d2 in enumerate(presentes) if j > i
+            }
+        return resultado
+    
     def detectar_tendencias(self, nome: str, periodo: Optional[timedelta] = None) -> Dict[str, Any]:
         """Detecta tendências em uma dimensão.
         
@@ -289,21 +438,33 @@ class Visualizacao4D:
         Returns:
             Dicionário com informações sobre tendências
         """
-        dimensoes = self.obter_dimensao(nome, periodo)
-        
-        if not dimensoes:
+        if nome not in self.dimensoes:
             return {}
         
-        valores = np.array([d.valor for d in dimensoes])
-        timestamps = np.array([d.timestamp.timestamp() for d in dimensoes])
-        
-        # Regressão linear
-        z = np.polyfit(timestamps, valores, 1)
-        p = np.poly1d(z)
-        
-        # Calcula R²
-        y_pred = p(timestamps)
-        r2 = 1 - (np.sum((valores - y_pred) ** 2) / np.sum((valores - np.mean(valores)) ** 2))
+        serie = self.dimensoes[nome]
+        inicio = self._inicio_periodo(periodo)
+        
+        if serie.janela_completa(inicio):
+            # Regressão incremental sobre toda a janela retida
+            regressao = serie.regressao()
+            if regressao is None:
+                return {}
+            z = regressao[:2]
+            r2 = regressao[2]
+        else:
+            timestamps, valores = self.obter_serie(nome, periodo)
+            if len(valores) < 2 or timestamps[0] == timestamps[-1]:
+                return {}
+            
+            # Regressão linear (timestamps centrados para estabilidade numérica)
+            origem = timestamps[0]
+            inclinacao, intercepto = np.polyfit(timestamps - origem, valores, 1)
+            z = (inclinacao, intercepto - inclinacao * origem)
+            
+            # Calcula R²
+            y_pred = inclinacao * (timestamps - origem) + intercepto
+            soma_total = np.sum((valores - np.mean(valores)) ** 2)
+            r2 = 1 - np.sum((valores - y_pred) ** 2) / soma_total if soma_total > 0 else 0.0
         
         return {
             "inclinacao": float(z[0]),